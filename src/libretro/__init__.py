@@ -1,7 +1,11 @@
 """A Pythonic libretro frontend intended for testing cores."""
 
 from .api import *
+from .bench import *
 from .core import *
 from .drivers import *
 from .error import *
+from .frameskip import *
+from .memory import *
 from .session import *
+from .sweep import *
@@ -19,6 +19,7 @@ from ctypes import (
     addressof,
     c_char_p,
     c_int,
+    c_size_t,
     c_ssize_t,
     c_ubyte,
     c_uint8,
@@ -206,10 +207,14 @@ def deepcopy_buffer(ptr: c_void_p | int | None, size: int) -> Array[c_uint8] | N
 
 @contextmanager
 def mmap_file(
-    path: str | bytes | PathLike[str] | PathLike[bytes], mode: str = "rb"
+    path: str | bytes | PathLike[str] | PathLike[bytes],
+    mode: str = "rb",
+    access: int = mmap.ACCESS_COPY,
 ) -> Generator[memoryview[int]]:
+    # ACCESS_COPY gives a writable view (as ctypes.Array.from_buffer requires)
+    # without ever writing to the file; pass ACCESS_WRITE with mode "r+b" to write through
     with open(path, mode, buffering=0) as f:
-        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY) as m:
+        with mmap.mmap(f.fileno(), 0, access=access) as m:
             view = memoryview(m)
             try:
                 yield view
@@ -231,6 +236,29 @@ def addressof_buffer(buffer: SizedBuffer) -> int:
     return ctypes.addressof(buffer_array)
 
 
+if sys.platform == "win32":
+    _memcmp = ctypes.cdll.msvcrt.memcmp
+else:
+    _memcmp = ctypes.CDLL(None).memcmp
+
+_memcmp.argtypes = (c_void_p, c_void_p, c_size_t)
+_memcmp.restype = c_int
+
+
+def buffers_equal(a: SizedBuffer, b: SizedBuffer) -> bool:
+    """
+    Return :obj:`True` if two writable byte buffers have the same length and contents.
+
+    Unlike ``==`` on two :class:`memoryview` objects, which compares them one item at a time,
+    this compares them with ``memcmp`` and without copying either one.
+    """
+    size = len(a)
+    if size != len(b):
+        return False
+
+    return size == 0 or _memcmp(addressof_buffer(a), addressof_buffer(b), size) == 0
+
+
 if sys.version_info >= (3, 14):
     from ctypes import memoryview_at
 else:
@@ -290,6 +318,7 @@ __all__ = [
     "deepcopy_buffer",
     "mmap_file",
     "addressof_buffer",
+    "buffers_equal",
     "memoryview_at",
     "c_uintptr",
     "MAX_POINTER_VALUE",
@@ -166,7 +166,10 @@ class retro_throttle_state(Structure):
     mode: ThrottleMode
     """Current throttle mode."""
     rate: float
-    """Rate at which the frontend is trying to run, as a multiple of normal speed."""
+    """
+    How many times per second the frontend is trying to call :c:func:`retro_run`,
+    or 0 if it has no fixed rate in the current mode.
+    """
 
     _fields_ = (
         ("mode", c_uint),
@@ -0,0 +1,751 @@
+"""
+Measure libretro.py's own overhead on the bundled sample cores,
+and compare the measurements across commits.
+
+Each benchmark times one kind of operation many times over
+and summarizes it as a :class:`BenchmarkResult`.
+The sample cores do almost no work of their own,
+so nearly all of the time measured is spent in libretro.py and :mod:`ctypes`.
+
+.. seealso::
+
+    :mod:`libretro.py.bench`
+        A command-line interface for timing any core with this module.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import platform
+import sys
+from collections.abc import Callable, Collection, Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from ctypes import addressof, c_bool, c_char, c_uint, cast
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter_ns
+from typing import IO, TYPE_CHECKING, Any
+
+from libretro.api import (
+    EnvironmentCall,
+    VfsFileAccess,
+    VfsFileAccessHint,
+    VfsSeekPosition,
+    retro_core_option_v2_definition,
+    retro_core_options_v2,
+    retro_environment_t,
+    retro_variable,
+    retro_vfs_file_handle,
+    retro_vfs_interface_info,
+)
+from libretro.core import Core
+from libretro.ctypes import TypedPointer, c_void_ptr
+from libretro.drivers import CallbackProfiler, CallbackStats, DictOptionDriver
+from libretro.error import CoreShutDownException
+from libretro.samples._loader import load_sample_core
+from libretro.session import Session
+
+if TYPE_CHECKING:
+    from ctypes import _SimpleCData  # pyright: ignore[reportPrivateUsage]
+
+type BenchmarkCore = Core | str | os.PathLike[str]
+"""A core to benchmark, either already loaded or as a path to its shared library."""
+
+SUITE_CORES: Sequence[str] = (
+    "audio_query_test",
+    "input_query_test",
+    "video_query_test",
+    "perf_test",
+    "savestate_test",
+    "vfs_test",
+)
+"""The sample cores in :mod:`libretro.samples.custom` that :func:`run_suite` runs frames on."""
+
+ENVIRONMENT_CALLS: Mapping[EnvironmentCall, type[_SimpleCData[Any]]] = {
+    EnvironmentCall.GET_CAN_DUPE: c_bool,
+    EnvironmentCall.GET_OVERSCAN: c_bool,
+    EnvironmentCall.GET_LANGUAGE: c_uint,
+    EnvironmentCall.GET_VARIABLE_UPDATE: c_bool,
+}
+"""
+The environment calls timed by :func:`bench_environment` by default,
+each mapped to the type of the value it writes.
+All of them are cheap queries with no side effects,
+so their cost is mostly dispatch.
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class BenchmarkResult:
+    """Aggregate timings for one benchmark on one core."""
+
+    name: str
+    """
+    What was measured,
+    e.g. ``frames``, ``serialize``, ``environment.GET_CAN_DUPE``, or ``callback.video_refresh``.
+    """
+    core: str
+    """The name of the core it was measured on."""
+    count: int
+    """The number of operations timed."""
+    total: int
+    """Nanoseconds spent in all operations."""
+    max: int
+    """Nanoseconds spent in the slowest operation."""
+    nbytes: int = 0
+    """Bytes processed by all operations, or 0 if this benchmark doesn't measure throughput."""
+    percentiles: Mapping[str, int] = field(default_factory=dict[str, int])
+    """
+    Nanoseconds per operation at selected percentiles, keyed like ``p50`` or ``p99``.
+    Empty unless the result was built with :meth:`from_samples`.
+    """
+
+    @classmethod
+    def from_stats(
+        cls, name: str, core: str, stats: CallbackStats, nbytes: int = 0
+    ) -> BenchmarkResult:
+        """
+        Summarize timings collected in a :class:`.CallbackStats`.
+
+        :param name: What was measured.
+        :param core: The name of the core it was measured on.
+        :param stats: The collected timings.
+        :param nbytes: Bytes processed by all operations.
+        """
+        return cls(name, core, stats.calls, stats.total, stats.max, nbytes)
+
+    @classmethod
+    def from_samples(
+        cls, name: str, core: str, samples: Sequence[int], nbytes: int = 0
+    ) -> BenchmarkResult:
+        """
+        Summarize individually-timed operations, including their :func:`percentiles`.
+
+        :param name: What was measured.
+        :param core: The name of the core it was measured on.
+        :param samples: Nanoseconds spent in each operation.
+        :param nbytes: Bytes processed by all operations.
+        """
+        return cls(
+            name,
+            core,
+            len(samples),
+            sum(samples),
+            max(samples, default=0),
+            nbytes,
+            percentiles(samples),
+        )
+
+    @property
+    def key(self) -> str:
+        """Identifies this benchmark across reports, as ``core:name``."""
+        return f"{self.core}:{self.name}"
+
+    @property
+    def mean(self) -> float:
+        """Mean nanoseconds per operation, or 0 if no operations were timed."""
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def rate(self) -> float:
+        """Operations per second, or 0 if no time was measured."""
+        return self.count * 1e9 / self.total if self.total else 0.0
+
+    @property
+    def throughput(self) -> float | None:
+        """Bytes per second, or :obj:`None` if this benchmark doesn't measure throughput."""
+        if not self.nbytes:
+            return None
+
+        return self.nbytes * 1e9 / self.total if self.total else 0.0
+
+
+@dataclass(frozen=True, slots=True)
+class BenchmarkComparison:
+    """How one benchmark's mean time per operation changed between two reports."""
+
+    key: str
+    """The :attr:`BenchmarkResult.key` of the compared benchmark."""
+    baseline: float
+    """Mean nanoseconds per operation in the baseline report."""
+    current: float
+    """Mean nanoseconds per operation in the current report."""
+
+    @property
+    def ratio(self) -> float:
+        """``current / baseline``; above 1 means the benchmark got slower."""
+        return self.current / self.baseline if self.baseline else float("inf")
+
+    def regressed(self, threshold: float = 0.1) -> bool:
+        """
+        Whether the benchmark slowed down by more than ``threshold``.
+
+        :param threshold: The tolerated slowdown, as a fraction of the baseline.
+        """
+        return self.ratio > 1 + threshold
+
+
+@dataclass(frozen=True, slots=True)
+class BenchmarkReport:
+    """The results of one benchmark run, with enough context to compare it to others."""
+
+    results: Sequence[BenchmarkResult]
+    """Every result in the run, in the order they were measured."""
+    metadata: Mapping[str, str] = field(default_factory=lambda: environment_metadata())
+    """
+    Describes the environment the benchmarks ran in.
+    Defaults to :func:`environment_metadata`.
+    """
+
+    def write(self, file: IO[str]) -> None:
+        """
+        Write this report as JSON.
+
+        :param file: An open text file to write to.
+        """
+        json.dump(
+            {"metadata": dict(self.metadata), "results": [asdict(r) for r in self.results]},
+            file,
+            indent=2,
+        )
+        file.write("\n")
+
+    @classmethod
+    def read(cls, file: IO[str]) -> BenchmarkReport:
+        """
+        Read a report written by :meth:`write`.
+
+        :param file: An open text file to read from.
+        :raises ValueError: If the file isn't a valid report.
+        """
+        try:
+            document = json.load(file)
+            return cls(
+                [BenchmarkResult(**r) for r in document["results"]],
+                {str(k): str(v) for k, v in document["metadata"].items()},
+            )
+        except (KeyError, TypeError, AttributeError) as e:
+            raise ValueError(f"Not a benchmark report: {e}") from e
+
+    def compare(self, baseline: BenchmarkReport) -> list[BenchmarkComparison]:
+        """
+        Compare this report's results to an earlier one.
+
+        :param baseline: The report to compare against.
+        :return: One comparison for each benchmark that appears in both reports,
+            in the order they appear in this report.
+        """
+        before = {r.key: r for r in baseline.results}
+        return [
+            BenchmarkComparison(r.key, before[r.key].mean, r.mean)
+            for r in self.results
+            if r.key in before
+        ]
+
+
+def percentiles(samples: Sequence[int], points: Sequence[int] = (50, 90, 99)) -> dict[str, int]:
+    """
+    Compute nearest-rank percentiles of a set of timings.
+
+    >>> from libretro.bench import percentiles
+    >>> percentiles(range(1, 201))
+    {'p50': 100, 'p90': 180, 'p99': 198}
+
+    :param samples: The timings, in any order.
+    :param points: The percentiles to compute, each between 1 and 100.
+    :return: Each percentile keyed like ``p50``,
+        or an empty :class:`dict` if there are no samples.
+    """
+    ordered = sorted(samples)
+    if not ordered:
+        return {}
+
+    return {f"p{p}": ordered[max(0, math.ceil(p * len(ordered) / 100) - 1)] for p in points}
+
+
+def time_frames(session: Session, frames: int) -> list[int]:
+    """
+    Run a session for a number of frames, timing each call to :meth:`.Session.run` individually.
+
+    :param session: The session to run.
+    :param frames: The most frames to run.
+        Fewer are run if the core shuts itself down.
+    :return: Nanoseconds spent in each frame that was run.
+    """
+    samples: list[int] = []
+    try:
+        for _ in range(frames):
+            start = perf_counter_ns()
+            session.run()
+            samples.append(perf_counter_ns() - start)
+    except CoreShutDownException:
+        # The core may exit on its own, that's not necessarily an error
+        pass
+
+    return samples
+
+
+def environment_metadata() -> dict[str, str]:
+    """
+    Describe the environment benchmarks are running in.
+
+    :return: The libretro.py and Python versions, the platform, and the current time.
+        Also includes the ``GITHUB_SHA`` environment variable as ``commit`` if it's set.
+    """
+    try:
+        package_version = version("libretro.py")
+    except PackageNotFoundError:
+        package_version = "unknown"
+
+    metadata = {
+        "libretro.py": package_version,
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "timestamp": datetime.now(UTC).isoformat(timespec="seconds"),
+    }
+    if commit := os.environ.get("GITHUB_SHA"):
+        metadata["commit"] = commit
+
+    return metadata
+
+
+def _core_name(core: BenchmarkCore) -> str:
+    path = core.path if isinstance(core, Core) else os.fspath(core)
+    return Path(path).stem.removesuffix("_libretro")
+
+
+def bench_frames(
+    core: BenchmarkCore, *, frames: int = 600, warmup: int = 60
+) -> list[BenchmarkResult]:
+    """
+    Time :meth:`.Session.run` with the default drivers.
+
+    :param core: The core to run, with no content.
+    :param frames: The number of frames to time.
+    :param warmup: The number of frames to run before timing starts.
+    :return: A ``frames`` result, with :attr:`~BenchmarkResult.percentiles`.
+    """
+    with Session(core, None) as session:
+        time_frames(session, warmup)
+        samples = time_frames(session, frames)
+
+    return [BenchmarkResult.from_samples("frames", _core_name(core), samples)]
+
+
+def bench_callbacks(
+    core: BenchmarkCore, *, frames: int = 600, warmup: int = 60
+) -> list[BenchmarkResult]:
+    """
+    Run frames under a :class:`.CallbackProfiler`
+    to measure the overhead of each callback the core invokes.
+
+    :param core: The core to run, with no content.
+    :param frames: The number of frames to profile.
+    :param warmup: The number of frames to run before profiling starts.
+    :return: A ``frames.core`` result with the time spent inside ``retro_run`` but outside callbacks,
+        and a ``callback.<name>`` result for each callback the core invoked.
+    """
+    profiler = CallbackProfiler()
+    with Session(core, None, profiler=profiler) as session:
+        for _ in range(warmup):
+            session.run()
+
+        profiler.reset()
+        for _ in range(frames):
+            session.run()
+
+    return profile_results(profiler, _core_name(core))
+
+
+def profile_results(profiler: CallbackProfiler, core: str) -> list[BenchmarkResult]:
+    """
+    Summarize everything a :class:`.CallbackProfiler` has measured as benchmark results.
+
+    :param profiler: The profiler to summarize.
+    :param core: The name of the core it profiled.
+    :return: A ``frames.core`` result with the time spent inside ``retro_run`` but outside callbacks,
+        and a ``callback.<name>`` result for each callback the core invoked.
+    """
+    core_time = CallbackStats()
+    for frame in profiler.frames:
+        core_time.add(frame.core_time)
+
+    return [
+        BenchmarkResult.from_stats("frames.core", core, core_time),
+        *(
+            BenchmarkResult.from_stats(f"callback.{callback}", core, stats)
+            for callback, stats in sorted(profiler.report().callbacks.items())
+        ),
+    ]
+
+
+def bench_environment(
+    core: BenchmarkCore,
+    *,
+    iterations: int = 10000,
+    calls: Mapping[EnvironmentCall, type[_SimpleCData[Any]]] = ENVIRONMENT_CALLS,
+) -> list[BenchmarkResult]:
+    """
+    Time environment calls made through a :mod:`ctypes` function pointer,
+    just as a core would make them.
+
+    :param core: The core whose session handles the calls.
+    :param iterations: The number of times to make each call.
+    :param calls: The calls to make, each mapped to the type of the value it writes.
+    :return: An ``environment.<name>`` result for each call.
+    """
+    name = _core_name(core)
+    results: list[BenchmarkResult] = []
+    with Session(core, None) as session:
+        environment = retro_environment_t(session.environment)
+        for call, datatype in calls.items():
+            data = datatype()
+            pointer = c_void_ptr(addressof(data))
+            stats = CallbackStats()
+            for _ in range(iterations):
+                start = perf_counter_ns()
+                environment(call, pointer)
+                stats.add(perf_counter_ns() - start)
+
+            results.append(BenchmarkResult.from_stats(f"environment.{call.name}", name, stats))
+
+    return results
+
+
+def bench_options(
+    core: BenchmarkCore, *, iterations: int = 10000, options: int = 256
+) -> list[BenchmarkResult]:
+    """
+    Time ``RETRO_ENVIRONMENT_GET_VARIABLE`` calls made through a :mod:`ctypes` function pointer
+    against a :class:`.DictOptionDriver` with many v2 core options,
+    just as a core would query its options on every frame.
+
+    The options are registered with ``RETRO_ENVIRONMENT_SET_CORE_OPTIONS_V2``
+    and each read once before timing starts.
+    Each iteration then reads the next option in turn,
+    first as is (answered from the driver's cache)
+    and then right after changing its value (so the driver must validate the new one).
+
+    :param core: The core whose session handles the calls.
+    :param iterations: The number of times to read an option in each pass.
+    :param options: The number of options to register.
+    :return: An ``options.GET_VARIABLE`` result for unchanged options
+        and an ``options.GET_VARIABLE.changed`` result for changed ones.
+    :raises RuntimeError: If the session doesn't accept v2 core options
+        or doesn't return an option's value.
+    """
+    name = _core_name(core)
+    keys = [f"libretro_py_bench_{i}".encode() for i in range(options)]
+    definitions = (retro_core_option_v2_definition * (options + 1))()
+    for key, definition in zip(keys, definitions):
+        definition.key = key
+        definition.values[0].value = b"enabled"
+        definition.values[1].value = b"disabled"
+        definition.default_value = b"enabled"
+
+    registered = retro_core_options_v2(None, definitions)
+    driver = DictOptionDriver()
+    cached = CallbackStats()
+    changed = CallbackStats()
+    with Session(core, None, options=driver) as session:
+        environment = retro_environment_t(session.environment)
+        if not environment(EnvironmentCall.SET_CORE_OPTIONS_V2, c_void_ptr(addressof(registered))):
+            raise RuntimeError("Session doesn't accept v2 core options")
+
+        variable = retro_variable()
+        pointer = c_void_ptr(addressof(variable))
+        for key in keys:
+            variable.key = key
+            environment(EnvironmentCall.GET_VARIABLE, pointer)
+
+        for i in range(iterations):
+            variable.key = keys[i % options]
+            start = perf_counter_ns()
+            environment(EnvironmentCall.GET_VARIABLE, pointer)
+            cached.add(perf_counter_ns() - start)
+
+        for i in range(iterations):
+            variable.key = keys[i % options]
+            # Alternate every option between its two values on each pass
+            driver.set_variable(
+                variable.key, b"disabled" if (i // options) % 2 == 0 else b"enabled"
+            )
+            start = perf_counter_ns()
+            environment(EnvironmentCall.GET_VARIABLE, pointer)
+            changed.add(perf_counter_ns() - start)
+
+        if variable.value is None:
+            raise RuntimeError(f"Session didn't return a value for {variable.key!r}")
+
+    return [
+        BenchmarkResult.from_stats("options.GET_VARIABLE", name, cached),
+        BenchmarkResult.from_stats("options.GET_VARIABLE.changed", name, changed),
+    ]
+
+
+def bench_serialize(core: BenchmarkCore, *, iterations: int = 1000) -> list[BenchmarkResult]:
+    """
+    Time ``retro_serialize`` and ``retro_unserialize`` into and out of a preallocated buffer.
+
+    :param core: The core to serialize, with no content.
+        Must support savestates.
+    :param iterations: The number of times to serialize and unserialize.
+    :return: A ``serialize`` and an ``unserialize`` result, both with :attr:`~BenchmarkResult.nbytes` set.
+    :raises RuntimeError: If the core doesn't support savestates.
+    """
+    name = _core_name(core)
+    serialized = CallbackStats()
+    unserialized = CallbackStats()
+    with Session(core, None) as session:
+        session.run()
+        size = session.core.serialize_size()
+        if not size:
+            raise RuntimeError(f"{name} doesn't support savestates")
+
+        buffer = bytearray(size)
+        for _ in range(iterations):
+            start = perf_counter_ns()
+            ok = session.core.serialize(buffer)
+            serialized.add(perf_counter_ns() - start)
+            if not ok:
+                raise RuntimeError(f"{name} failed to serialize its state")
+
+            start = perf_counter_ns()
+            ok = session.core.unserialize(buffer)
+            unserialized.add(perf_counter_ns() - start)
+            if not ok:
+                raise RuntimeError(f"{name} failed to unserialize its state")
+
+    return [
+        BenchmarkResult.from_stats("serialize", name, serialized, size * iterations),
+        BenchmarkResult.from_stats("unserialize", name, unserialized, size * iterations),
+    ]
+
+
+def bench_vfs(
+    core: BenchmarkCore,
+    directory: str | os.PathLike[str],
+    *,
+    iterations: int = 1000,
+    size: int = 4096,
+) -> list[BenchmarkResult]:
+    """
+    Time VFS operations made through the interface a core gets from
+    ``RETRO_ENVIRONMENT_GET_VFS_INTERFACE``.
+
+    Each iteration opens a file, writes to it, seeks back to the start,
+    reads it back, and closes it.
+
+    :param core: The core whose session provides the VFS interface.
+    :param directory: An existing directory to create the file in.
+    :param iterations: The number of times to repeat the sequence.
+    :param size: The number of bytes written and read in each iteration.
+    :return: A ``vfs.<operation>`` result for each operation,
+        with :attr:`~BenchmarkResult.nbytes` set for reads and writes.
+    :raises RuntimeError: If the session doesn't provide a VFS interface
+        or an operation fails.
+    """
+    name = _core_name(core)
+    path = os.fsencode(Path(directory, "libretro_py_bench.tmp"))
+    buffer = (c_char * size)()
+    data = c_void_ptr(addressof(buffer))
+    stats = {op: CallbackStats() for op in ("open", "write", "seek", "read", "close")}
+    with Session(core, None) as session:
+        info = retro_vfs_interface_info(3, None)
+        if not session.environment(EnvironmentCall.GET_VFS_INTERFACE, c_void_ptr(addressof(info))):
+            raise RuntimeError("Session doesn't provide a VFS interface")
+
+        assert info.iface
+        vfs = info.iface[0]
+        assert vfs.open and vfs.write and vfs.seek and vfs.read and vfs.close
+        mode = VfsFileAccess.READ_WRITE
+        for _ in range(iterations):
+            start = perf_counter_ns()
+            opened = vfs.open(path, mode, VfsFileAccessHint.NONE)
+            stats["open"].add(perf_counter_ns() - start)
+            if not opened:
+                raise RuntimeError(f"Failed to open {path!r} through the VFS interface")
+
+            # Function pointers that return pointers return them as plain addresses
+            handle = cast(opened, TypedPointer[retro_vfs_file_handle])
+
+            start = perf_counter_ns()
+            written = vfs.write(handle, data, size)
+            stats["write"].add(perf_counter_ns() - start)
+
+            start = perf_counter_ns()
+            vfs.seek(handle, 0, VfsSeekPosition.START)
+            stats["seek"].add(perf_counter_ns() - start)
+
+            start = perf_counter_ns()
+            read = vfs.read(handle, data, size)
+            stats["read"].add(perf_counter_ns() - start)
+
+            start = perf_counter_ns()
+            vfs.close(handle)
+            stats["close"].add(perf_counter_ns() - start)
+
+            if written != size or read != size:
+                raise RuntimeError(
+                    f"Expected to write and read {size} bytes, got {written} and {read}"
+                )
+
+    os.remove(path)
+    nbytes = {"write": size * iterations, "read": size * iterations}
+    return [
+        BenchmarkResult.from_stats(f"vfs.{op}", name, s, nbytes.get(op, 0))
+        for op, s in stats.items()
+    ]
+
+
+def bench_session(core: BenchmarkCore, *, iterations: int = 20) -> list[BenchmarkResult]:
+    """
+    Time entering and exiting a :class:`.Session` with the default drivers.
+
+    Entering a session initializes the core and registers its callbacks;
+    exiting it unloads the core's content and deinitializes it.
+
+    :param core: The core to start and stop, with no content.
+    :param iterations: The number of sessions to start and stop.
+    :return: A ``session.enter`` and a ``session.exit`` result.
+    """
+    name = _core_name(core)
+    entered = CallbackStats()
+    exited = CallbackStats()
+    for _ in range(iterations):
+        session = Session(core, None)
+        start = perf_counter_ns()
+        session.__enter__()
+        entered.add(perf_counter_ns() - start)
+
+        start = perf_counter_ns()
+        session.__exit__(None, None, None)
+        exited.add(perf_counter_ns() - start)
+
+    return [
+        BenchmarkResult.from_stats("session.enter", name, entered),
+        BenchmarkResult.from_stats("session.exit", name, exited),
+    ]
+
+
+def _bench_sample(
+    benchmark: Callable[..., list[BenchmarkResult]], name: str, kwargs: Mapping[str, Any]
+) -> list[BenchmarkResult]:
+    return benchmark(load_sample_core("custom", name), **kwargs)
+
+
+def run_suite(
+    *,
+    frames: int = 600,
+    warmup: int = 60,
+    iterations: int = 1000,
+    cores: Collection[str] = SUITE_CORES,
+) -> BenchmarkReport:
+    """
+    Run every benchmark in this module on the bundled sample cores.
+
+    Frames and callbacks are measured on each of ``cores``;
+    environment calls, core options, and sessions on ``video_query_test``,
+    savestates on ``savestate_test``,
+    and VFS operations on ``vfs_test`` in a temporary directory.
+    Each benchmark runs in a fresh process, one at a time,
+    so no benchmark sees a core that an earlier one has already initialized.
+
+    .. code-block:: python
+
+        report = run_suite()
+        with open("bench.json", "w") as f:
+            report.write(f)
+
+        with open("baseline.json") as f:
+            baseline = BenchmarkReport.read(f)
+
+        for comparison in report.compare(baseline):
+            if comparison.regressed():
+                print(f"{comparison.key} is {comparison.ratio:.2f}x slower")
+
+    :param frames: The number of frames to time on each core.
+    :param warmup: The number of frames to run on each core before timing starts.
+    :param iterations: The number of times to repeat each operation
+        (sessions are started a tenth as often).
+    :param cores: The names of the cores in :mod:`libretro.samples.custom` to run frames on.
+    :return: A report of every result.
+    :raises ImportError: If the sample cores aren't bundled with this installation.
+    """
+    run = {"frames": frames, "warmup": warmup}
+    results: list[BenchmarkResult] = []
+    with (
+        TemporaryDirectory() as tmp,
+        ProcessPoolExecutor(max_workers=1, max_tasks_per_child=1) as executor,
+    ):
+        jobs: list[tuple[Callable[..., list[BenchmarkResult]], str, Mapping[str, Any]]] = [
+            *((bench_frames, name, run) for name in cores),
+            *((bench_callbacks, name, run) for name in cores),
+            (bench_environment, "video_query_test", {"iterations": iterations}),
+            (bench_options, "video_query_test", {"iterations": iterations}),
+            (bench_session, "video_query_test", {"iterations": max(1, iterations // 10)}),
+            (bench_serialize, "savestate_test", {"iterations": iterations}),
+            (bench_vfs, "vfs_test", {"directory": tmp, "iterations": iterations}),
+        ]
+        futures = [executor.submit(_bench_sample, *job) for job in jobs]
+        for future in futures:
+            results.extend(future.result())
+
+    return BenchmarkReport(results)
+
+
+def format_report(report: BenchmarkReport) -> str:
+    """
+    Format a report as a compact plain-text table.
+
+    :param report: The report to format.
+    :return: One row per result, with its mean and worst time per operation
+        and its throughput, if it measures one.
+    """
+    header = ["benchmark", "count", "mean us", "max us", "ops/s", "MB/s"]
+    rows = [
+        [
+            r.key,
+            str(r.count),
+            f"{r.mean / 1e3:.2f}",
+            f"{r.max / 1e3:.2f}",
+            f"{r.rate:.0f}",
+            "" if r.throughput is None else f"{r.throughput / 1e6:.1f}",
+        ]
+        for r in report.results
+    ]
+    widths = [max(len(c) for c in column) for column in zip(header, *rows, strict=True)]
+    return "\n".join(
+        "  ".join(c.ljust(w) for c, w in zip(row, widths, strict=True)).rstrip()
+        for row in (header, *rows)
+    )
+
+
+__all__ = [
+    "ENVIRONMENT_CALLS",
+    "SUITE_CORES",
+    "BenchmarkComparison",
+    "BenchmarkCore",
+    "BenchmarkReport",
+    "BenchmarkResult",
+    "bench_callbacks",
+    "bench_environment",
+    "bench_frames",
+    "bench_options",
+    "bench_serialize",
+    "bench_session",
+    "bench_vfs",
+    "environment_metadata",
+    "format_report",
+    "percentiles",
+    "profile_results",
+    "run_suite",
+    "time_frames",
+]
@@ -9,6 +9,7 @@ so long as it implements the necessary methods.
 
 from .audio import *
 from .camera import *
+from .clock import *
 from .content import *
 from .disk import *
 from .environment import *
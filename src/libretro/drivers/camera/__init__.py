@@ -8,3 +8,8 @@ Driver protocols and implementations for emulated camera input.
 """
 
 from .driver import *
+
+try:
+    from .buffer import *
+except ImportError:
+    pass
@@ -0,0 +1,332 @@
+"""
+:class:`.CameraDriver` implementation that delivers frames from preloaded arrays.
+
+Requires :mod:`numpy`, which is installed with the ``numpy`` extra.
+
+.. seealso::
+
+    :class:`.CameraDriver`
+        The protocol this driver implements.
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Callable, Iterable, Iterator
+from ctypes import c_uint32, cast
+from typing import Any, override
+
+import numpy as np
+from numpy.typing import NDArray
+
+from libretro.api.camera import (
+    CameraCapabilityFlags,
+    retro_camera_frame_opengl_texture_t,
+    retro_camera_frame_raw_framebuffer_t,
+    retro_camera_lifetime_status_t,
+)
+from libretro.ctypes import TypedPointer
+
+from .driver import CameraDriver
+
+type CameraFrame = NDArray[Any]
+"""
+One or more camera frames, as an array of shape
+``(height, width)`` or ``(count, height, width)`` of ``XRGB8888`` pixels (:class:`numpy.uint32`),
+or ``(height, width, channels)`` or ``(count, height, width, channels)`` of 8-bit RGB or RGBA.
+"""
+
+type CameraFrameSource = (
+    CameraFrame
+    | str
+    | os.PathLike[str]
+    | Iterable[CameraFrame]
+    | Callable[[], Iterator[CameraFrame]]
+)
+"""Anything that a :class:`BufferCameraDriver` can read frames from."""
+
+
+def _to_xrgb(frames: CameraFrame) -> NDArray[np.uint32]:
+    # Returns a C-contiguous (count, height, width) array of XRGB8888 pixels,
+    # without copying if the input already is one
+    if frames.dtype == np.uint32:
+        if frames.ndim == 2:
+            frames = frames[np.newaxis]
+
+        if frames.ndim != 3:
+            raise ValueError(f"Expected XRGB8888 frames with 2 or 3 dimensions, got {frames.ndim}")
+
+        return np.ascontiguousarray(frames, np.uint32)
+
+    if frames.dtype != np.uint8 or frames.shape[-1] not in (3, 4):
+        raise ValueError(
+            f"Expected uint32 XRGB8888 pixels or uint8 RGB(A) pixels, got {frames.dtype} with shape {frames.shape}"
+        )
+
+    if frames.ndim == 3:
+        frames = frames[np.newaxis]
+
+    if frames.ndim != 4:
+        raise ValueError(f"Expected RGB(A) frames with 3 or 4 dimensions, got {frames.ndim}")
+
+    rgb = frames[..., :3].astype(np.uint32)
+    xrgb = (rgb[..., 0] << 16) | (rgb[..., 1] << 8) | rgb[..., 2]
+    return np.ascontiguousarray(xrgb, np.uint32)
+
+
+def _resize(frames: NDArray[np.uint32], width: int, height: int) -> NDArray[np.uint32]:
+    # Nearest-neighbor scaling; a no-op if the frames are already the requested size
+    _, h, w = frames.shape
+    width = width or w
+    height = height or h
+    if (w, h) == (width, height):
+        return frames
+
+    rows = np.arange(height) * h // height
+    columns = np.arange(width) * w // width
+    return np.ascontiguousarray(frames[:, rows[:, np.newaxis], columns])
+
+
+class BufferCameraDriver(CameraDriver):
+    """
+    A :class:`.CameraDriver` that delivers frames from an array stack,
+    a memory-mapped raw video file, or a generator.
+
+    Each call to :meth:`poll` passes the next frame to the core's
+    :attr:`frame_raw_framebuffer` callback as a pointer into the frames' own memory,
+    so delivering a frame costs no copies.
+    Frames from an array or file are converted to ``XRGB8888``
+    and scaled to the size the core requested at most once,
+    when the camera is first started;
+    frames from a generator are converted as they're produced,
+    unless they're already ``XRGB8888`` at the requested size.
+
+    :attr:`frame_opengl_texture` is not supported.
+
+    .. code-block:: python
+
+        frames = np.zeros((60, 240, 320, 3), np.uint8)
+        frames[:, :, :, 0] = np.linspace(0, 255, 60, dtype=np.uint8)[:, None, None]
+        with Session(core, game, camera=BufferCameraDriver(frames)) as session:
+            for _ in range(600):
+                session.run()
+    """
+
+    def __init__(
+        self,
+        frames: CameraFrameSource,
+        *,
+        width: int | None = None,
+        height: int | None = None,
+        loop: bool = True,
+    ):
+        """
+        Load the frames.
+
+        :param frames: One of the following:
+
+            - A :obj:`CameraFrame` array.
+              Converted to ``XRGB8888`` here if it isn't already.
+            - The path to a raw video file of ``XRGB8888`` frames
+              (e.g. from ``ffmpeg -pix_fmt bgr0 -f rawvideo``).
+              Memory-mapped read-only; ``width`` and ``height`` are required.
+            - An iterable of :obj:`CameraFrame` arrays, one frame each.
+            - A zero-argument callable that returns such an iterator,
+              called again each time the camera starts.
+
+        :param width: Width of the frames in the file at ``frames``, in pixels.
+        :param height: Height of the frames in the file at ``frames``, in pixels.
+        :param loop: If :obj:`True`, restart from the first frame after the last one.
+            Otherwise, keep delivering the last frame.
+            Iterables that aren't callables can't loop,
+            so they keep delivering their last frame once they're exhausted.
+        :raises ValueError: If ``frames`` is a path and ``width`` or ``height`` isn't given,
+            or if ``frames`` is an array that isn't a :obj:`CameraFrame`.
+        """
+        self._source: NDArray[np.uint32] | Callable[[], Iterator[CameraFrame]] | None = None
+        self._iterable: Iterable[CameraFrame] | None = None
+        match frames:
+            case np.ndarray():
+                self._source = _to_xrgb(frames)
+            case str() | os.PathLike():
+                if not width or not height:
+                    raise ValueError("width and height are required to read a raw video file")
+
+                self._source = np.memmap(frames, np.uint32, "r").reshape(-1, height, width)
+            case Callable():
+                self._source = frames
+            case _:
+                self._iterable = frames
+
+        self._loop = loop
+        self._frames: NDArray[np.uint32] | None = None
+        self._iterator: Iterator[CameraFrame] | None = None
+        self._current: NDArray[np.uint32] | None = None
+        self._index = 0
+        self._delivered = 0
+        self._started = False
+        self._caps = CameraCapabilityFlags.RAW_FRAMEBUFFER
+        self._width = 0
+        self._height = 0
+        self._frame_raw_framebuffer: retro_camera_frame_raw_framebuffer_t | None = None
+        self._frame_opengl_texture: retro_camera_frame_opengl_texture_t | None = None
+        self._initialized: retro_camera_lifetime_status_t | None = None
+        self._deinitialized: retro_camera_lifetime_status_t | None = None
+
+    @property
+    def started(self) -> bool:
+        """:obj:`True` if the core has started the camera and hasn't stopped it."""
+        return self._started
+
+    @property
+    def delivered(self) -> int:
+        """The number of frames passed to the core so far."""
+        return self._delivered
+
+    @property
+    @override
+    def caps(self) -> CameraCapabilityFlags:
+        return self._caps
+
+    @caps.setter
+    @override
+    def caps(self, value: CameraCapabilityFlags) -> None:
+        self._caps = CameraCapabilityFlags(value)
+
+    @override
+    def start(self) -> bool:
+        """
+        Start delivering frames.
+
+        Scales array and file frames to the core's requested size the first time it's called.
+
+        :return: :obj:`False` if the core didn't request raw framebuffers
+            or its frame callback isn't set.
+        """
+        if not (self._caps & CameraCapabilityFlags.RAW_FRAMEBUFFER):
+            return False
+
+        if self._frame_raw_framebuffer is None:
+            return False
+
+        match self._source:
+            case np.ndarray() if self._frames is None:
+                self._frames = _resize(self._source, self._width, self._height)
+            case np.ndarray():
+                pass  # Already scaled
+            case None:
+                if self._iterator is None and self._iterable is not None:
+                    self._iterator = iter(self._iterable)
+            case factory:
+                self._iterator = factory()
+                self._current = None
+
+        self._started = True
+        return True
+
+    @override
+    def stop(self) -> None:
+        self._started = False
+
+    def _next_frame(self) -> NDArray[np.uint32] | None:
+        if self._frames is not None:
+            count = len(self._frames)
+            if self._index >= count:
+                self._index = 0 if self._loop else count - 1
+
+            frame = self._frames[self._index]
+            self._index += 1
+            return frame
+
+        if self._iterator is not None:
+            frame = next(self._iterator, None)
+            if frame is None and self._loop and callable(self._source):
+                self._iterator = self._source()
+                frame = next(self._iterator, None)
+
+            if frame is not None:
+                self._current = _resize(_to_xrgb(frame), self._width, self._height)[0]
+
+        return self._current
+
+    @override
+    def poll(self) -> None:
+        """Pass the next frame to the core, if the camera is started."""
+        callback = self._frame_raw_framebuffer
+        if not self._started or callback is None:
+            return
+
+        frame = self._next_frame()
+        if frame is None:
+            return
+
+        height, width = frame.shape
+        callback(cast(frame.ctypes.data, TypedPointer[c_uint32]), width, height, frame.strides[0])
+        self._delivered += 1
+
+    @property
+    @override
+    def width(self) -> int:
+        return self._width
+
+    @width.setter
+    @override
+    def width(self, value: int) -> None:
+        self._width = value
+
+    @property
+    @override
+    def height(self) -> int:
+        return self._height
+
+    @height.setter
+    @override
+    def height(self, value: int) -> None:
+        self._height = value
+
+    @property
+    @override
+    def frame_raw_framebuffer(self) -> retro_camera_frame_raw_framebuffer_t | None:
+        return self._frame_raw_framebuffer
+
+    @frame_raw_framebuffer.setter
+    @override
+    def frame_raw_framebuffer(self, value: retro_camera_frame_raw_framebuffer_t | None) -> None:
+        self._frame_raw_framebuffer = value
+
+    @property
+    @override
+    def frame_opengl_texture(self) -> retro_camera_frame_opengl_texture_t | None:
+        return self._frame_opengl_texture
+
+    @frame_opengl_texture.setter
+    @override
+    def frame_opengl_texture(self, value: retro_camera_frame_opengl_texture_t | None) -> None:
+        self._frame_opengl_texture = value
+
+    @property
+    @override
+    def initialized(self) -> retro_camera_lifetime_status_t | None:
+        return self._initialized
+
+    @initialized.setter
+    @override
+    def initialized(self, value: retro_camera_lifetime_status_t | None) -> None:
+        self._initialized = value
+
+    @property
+    @override
+    def deinitialized(self) -> retro_camera_lifetime_status_t | None:
+        return self._deinitialized
+
+    @deinitialized.setter
+    @override
+    def deinitialized(self, value: retro_camera_lifetime_status_t | None) -> None:
+        self._deinitialized = value
+
+
+__all__ = [
+    "BufferCameraDriver",
+    "CameraFrame",
+    "CameraFrameSource",
+]
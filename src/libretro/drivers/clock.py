@@ -0,0 +1,84 @@
+"""A virtual clock that drivers can share to make a session's notion of time reproducible."""
+
+from typing import override
+
+
+class VirtualClock:
+    """
+    A monotonic clock that only moves when :meth:`advance` is called.
+
+    Share one instance between a :class:`.VirtualTimingDriver`,
+    a :class:`.DefaultPerfDriver`, and a :class:`.VirtualLocationDriver`
+    and every time the core can observe
+    (frame times, ``get_time_usec``, the perf counter, and location fixes)
+    is derived from the number of frames run,
+    so repeated runs of the same inputs are bit-for-bit identical
+    regardless of the host's speed or load.
+
+    .. code-block:: python
+
+        clock = VirtualClock()
+        with Session(
+            core,
+            content,
+            perf=DefaultPerfDriver(clock),
+            timing=VirtualTimingDriver(clock),
+        ) as session:
+            for _ in range(600):
+                session.run()  # Each frame advances the clock by exactly 1 / fps
+
+    Can be called like :func:`time.monotonic_ns`.
+
+    >>> from libretro.drivers import VirtualClock
+    >>> clock = VirtualClock()
+    >>> clock.advance(16_666_667)
+    >>> clock(), clock.usec
+    (16666667, 16666)
+    """
+
+    __slots__ = ("_ns",)
+
+    def __init__(self, start: int = 0):
+        """
+        Initialize the clock.
+
+        :param start: The initial time in nanoseconds.
+        :raises ValueError: If ``start`` is negative.
+        """
+        if start < 0:
+            raise ValueError(f"start must not be negative, not {start}")
+
+        self._ns = start
+
+    def __call__(self) -> int:
+        """Return the current time in nanoseconds."""
+        return self._ns
+
+    @override
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._ns})"
+
+    @property
+    def ns(self) -> int:
+        """The current time in nanoseconds."""
+        return self._ns
+
+    @property
+    def usec(self) -> int:
+        """The current time in whole microseconds."""
+        return self._ns // 1000
+
+    def advance(self, ns: int) -> None:
+        """
+        Move the clock forward.
+
+        :param ns: How many nanoseconds to advance by.
+        :raises ValueError: If ``ns`` is negative.
+        """
+        if ns < 0:
+            raise ValueError(f"A clock can't go backwards, but was told to advance by {ns} ns")
+
+        self._ns += ns
+
+
+__all__ = ["VirtualClock"]
@@ -1,5 +1,5 @@
 """
-Driver protocols for the emulated system's disk drives.
+Driver protocols and implementations for the emulated system's disk drives.
 
 .. seealso::
 
@@ -8,3 +8,4 @@ Driver protocols for the emulated system's disk drives.
 """
 
 from .driver import *
+from .scripted import *
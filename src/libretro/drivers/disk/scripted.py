@@ -0,0 +1,309 @@
+"""
+:class:`.DiskDriver` implementation that swaps disk images on a frame-by-frame script.
+
+.. seealso::
+
+    :class:`.DiskDriver`
+        The protocol this driver implements.
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Mapping, Sequence
+from contextlib import ExitStack
+from ctypes import cast, pointer
+from os import PathLike
+from pathlib import Path
+from typing import Self, override
+
+from libretro.api._utils import addressof_buffer, mmap_file
+from libretro.api.content import retro_game_info
+from libretro.api.disk import retro_disk_control_callback, retro_disk_control_ext_callback
+from libretro.ctypes import TypedPointer
+from libretro.error import UnsupportedEnvCall
+
+from .driver import DiskDriver
+
+type DiskImages = str | PathLike[str] | Sequence[str | PathLike[str]]
+"""
+The disk images a :class:`ScriptedDiskDriver` manages:
+either the path to an ``.m3u`` playlist, the path to a single image, or a sequence of image paths.
+"""
+
+
+def read_m3u(path: str | PathLike[str]) -> list[Path]:
+    """
+    Read the disk image paths listed in an ``.m3u`` playlist.
+
+    Blank lines and ``#`` comments are skipped,
+    RetroArch-style ``|label`` suffixes are removed,
+    and relative paths are resolved against the playlist's directory.
+
+    :param path: Path to the playlist.
+    :return: The listed image paths, in order.
+    :raises OSError: If the playlist can't be read.
+    """
+    playlist = Path(path)
+    images: list[Path] = []
+    with playlist.open(encoding="utf-8-sig") as f:
+        for line in f:
+            entry = line.strip()
+            if entry and not entry.startswith("#"):
+                images.append(playlist.parent / entry.partition("|")[0].strip())
+
+    return images
+
+
+class ScriptedDiskDriver(DiskDriver):
+    """
+    A :class:`.DiskDriver` that inserts disk images at scripted frame numbers,
+    for testing multi-disc content without driving the eject/insert sequence by hand.
+
+    :meth:`poll` is called by :meth:`.Session.run` once per frame, before ``retro_run``;
+    whenever the number of frames polled so far is a key of ``swaps``,
+    the corresponding action is carried out through the core's disk-control callback.
+    :meth:`insert` and :attr:`eject_state` can also be used directly.
+
+    If an image index is past the end of the core's own image list,
+    the images from :attr:`images` needed to reach it
+    are appended with ``add_image_index`` and ``replace_image_index``.
+    When ``premap`` is set, every image is memory-mapped up front
+    and passed to the core as in-memory data alongside its path,
+    so a swap never waits on disk I/O.
+    The mappings are released by :meth:`close`;
+    call it (or use this driver as a context manager) after the session exits.
+
+    .. code-block:: python
+
+        # Open the tray at frame 600, then insert the second disc 30 frames later
+        with ScriptedDiskDriver("game.m3u", swaps={600: None, 630: 1}) as disk:
+            with Session(core, "game.m3u", disk=disk) as session:
+                for _ in range(1200):
+                    session.run()
+    """
+
+    def __init__(
+        self,
+        images: DiskImages = (),
+        *,
+        swaps: Mapping[int, int | None] | None = None,
+        premap: bool = True,
+    ):
+        """
+        Load the image list and map the images.
+
+        :param images: The :obj:`DiskImages` to manage.
+            Paths ending in ``.m3u`` are read with :func:`read_m3u`.
+        :param swaps: Maps frame numbers (counted from 0) to the action taken just before that frame.
+            An :class:`int` inserts the image with that index, as in :meth:`insert`;
+            :obj:`None` opens the tray.
+            Defaults to no swaps.
+        :param premap: If :obj:`True`, memory-map every image now
+            so that appended images can be passed to the core as data.
+        :raises OSError: If the playlist or an image can't be opened.
+        :raises ValueError: If ``premap`` is set and an image is empty.
+        """
+        match images:
+            case str() | PathLike() if os.fspath(images).lower().endswith(".m3u"):
+                self._images = read_m3u(images)
+            case str() | PathLike():
+                self._images = [Path(images)]
+            case _:
+                self._images = [Path(image) for image in images]
+
+        self._swaps = dict(swaps or {})
+        self._stack = ExitStack()
+        self._buffers: list[memoryview[int] | None] = [None] * len(self._images)
+        self._callback: retro_disk_control_callback | retro_disk_control_ext_callback | None = None
+        self._frame = 0
+
+        if premap:
+            try:
+                for i, image in enumerate(self._images):
+                    self._buffers[i] = self._stack.enter_context(mmap_file(image))
+            except BaseException:
+                self._stack.close()
+                raise
+
+    @property
+    def images(self) -> Sequence[Path]:
+        """The paths of the disk images this driver manages."""
+        return tuple(self._images)
+
+    @property
+    def frame(self) -> int:
+        """The number of times :meth:`poll` has been called."""
+        return self._frame
+
+    @property
+    def num_images(self) -> int:
+        """
+        The number of images in the core's image list.
+
+        :raises UnsupportedEnvCall: If no disk-control callback has been registered.
+        """
+        callback = self._require_callback()
+        return callback.get_num_images() if callback.get_num_images else 0
+
+    @property
+    def index(self) -> int:
+        """
+        The index of the image currently in the core's disk tray.
+
+        :raises UnsupportedEnvCall: If no disk-control callback has been registered.
+        """
+        callback = self._require_callback()
+        return callback.get_image_index() if callback.get_image_index else 0
+
+    @property
+    @override
+    def version(self) -> int:
+        match self._callback:
+            case retro_disk_control_ext_callback():
+                return 2
+            case retro_disk_control_callback():
+                return 1
+            case None:
+                return 0
+
+    @property
+    @override
+    def callback(self) -> retro_disk_control_callback | retro_disk_control_ext_callback | None:
+        return self._callback
+
+    @callback.setter
+    @override
+    def callback(
+        self, value: retro_disk_control_callback | retro_disk_control_ext_callback
+    ) -> None:
+        if not isinstance(value, retro_disk_control_callback):
+            raise TypeError(
+                f"Expected retro_disk_control_callback or retro_disk_control_ext_callback, got {type(value).__name__}"
+            )
+
+        self._callback = value
+
+    @callback.deleter
+    @override
+    def callback(self) -> None:
+        self._callback = None
+
+    @property
+    @override
+    def eject_state(self) -> bool:
+        callback = self._require_callback()
+        return bool(callback.get_eject_state and callback.get_eject_state())
+
+    @eject_state.setter
+    @override
+    def eject_state(self, value: bool) -> None:
+        callback = self._require_callback()
+        if not callback.set_eject_state or not callback.set_eject_state(value):
+            raise RuntimeError(f"Core refused to {'open' if value else 'close'} the disk tray")
+
+    def insert(self, index: int) -> None:
+        """
+        Swap the image with the given index into the disk tray.
+
+        Opens the tray if it's closed, selects the image, then closes the tray.
+        If ``index`` is past the end of the core's image list,
+        appends images from :attr:`images` until it isn't.
+
+        :param index: Index of the image to insert.
+        :raises UnsupportedEnvCall: If no disk-control callback has been registered.
+        :raises IndexError: If ``index`` is past the end of both the core's image list and :attr:`images`.
+        :raises RuntimeError: If the core refuses any step of the swap.
+        """
+        callback = self._require_callback()
+        if index < 0:
+            raise IndexError(f"Expected a non-negative image index, got {index}")
+
+        self._append_through(callback, index)
+
+        if not self.eject_state:
+            self.eject_state = True
+
+        if not callback.set_image_index or not callback.set_image_index(index):
+            raise RuntimeError(f"Core refused to select disk image {index}")
+
+        self.eject_state = False
+
+    def poll(self) -> None:
+        """
+        Carry out the action scripted for the current frame, if any,
+        then advance the frame counter.
+
+        :raises UnsupportedEnvCall: If an action is due
+            but no disk-control callback has been registered.
+        """
+        frame = self._frame
+        self._frame += 1
+        if frame not in self._swaps:
+            return
+
+        match self._swaps[frame]:
+            case None:
+                self.eject_state = True
+            case int(index):
+                self.insert(index)
+
+    def close(self) -> None:
+        """
+        Release the memory-mapped images.
+
+        The core must not read images this driver appended after this is called.
+        Does nothing if the images are already released.
+        """
+        self._buffers = [None] * len(self._images)
+        self._stack.close()
+
+    def __enter__(self) -> Self:
+        """Return this driver."""
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        """Close this driver."""
+        self.close()
+
+    def _require_callback(
+        self,
+    ) -> retro_disk_control_callback | retro_disk_control_ext_callback:
+        if self._callback is None:
+            raise UnsupportedEnvCall("The core hasn't registered a disk-control interface")
+
+        return self._callback
+
+    def _append_through(self, callback: retro_disk_control_callback, index: int) -> None:
+        count = self.num_images
+        if index < count:
+            return
+
+        if index >= len(self._images):
+            raise IndexError(
+                f"Disk image {index} is past the end of the core's {count} images and this driver's {len(self._images)}"
+            )
+
+        if not callback.add_image_index or not callback.replace_image_index:
+            raise RuntimeError("Core doesn't support appending disk images")
+
+        for i in range(count, index + 1):
+            image = self._images[i]
+            buffer = self._buffers[i]
+            if buffer is None:
+                info = retro_game_info(os.fsencode(image), None, 0, None)
+            else:
+                info = retro_game_info(
+                    os.fsencode(image), addressof_buffer(buffer), len(buffer), None
+                )
+
+            info_ptr = cast(pointer(info), TypedPointer[retro_game_info])
+            if not callback.add_image_index() or not callback.replace_image_index(i, info_ptr):
+                raise RuntimeError(f"Core refused to append disk image {i} ({image})")
+
+
+__all__ = [
+    "DiskImages",
+    "ScriptedDiskDriver",
+    "read_m3u",
+]
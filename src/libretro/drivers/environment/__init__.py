@@ -7,3 +7,4 @@ from .composite import *
 from .default import *
 from .dict import *
 from .driver import *
+from .profiler import *
@@ -13,7 +13,7 @@ Default :class:`.EnvironmentDriver` that composes per-feature drivers into a sin
 from __future__ import annotations
 
 import typing
-from collections.abc import Sequence
+from collections.abc import Callable, Sequence
 from copy import deepcopy
 from ctypes import (
     c_bool,
@@ -45,12 +45,13 @@ from libretro.ctypes import TypedFunctionPointer, TypedPointer, c_void_ptr
 from libretro.drivers.audio import AudioDriver
 from libretro.drivers.camera import CameraDriver
 from libretro.drivers.content import ContentDriver
+from libretro.drivers.disk import DiskDriver
 from libretro.drivers.input import InputDriver
 from libretro.drivers.led import LedDriver
 from libretro.drivers.location import LocationDriver
 from libretro.drivers.log import LogDriver
 from libretro.drivers.message import MessageDriver
-from libretro.drivers.microphone import MicrophoneDriver
+from libretro.drivers.microphone import DirectMicrophoneDriver, MicrophoneDriver
 from libretro.drivers.midi import MidiDriver
 from libretro.drivers.options import OptionDriver
 from libretro.drivers.path import PathDriver
@@ -66,6 +67,7 @@ from libretro.drivers.video.driver import UnsupportedContextError
 
 from .default import DefaultEnvironmentDriver
 from .dict import DictEnvironmentDriver
+from .profiler import CallbackProfiler
 
 # TODO: Match envcalls even if the experimental flag is unset (but still consider it for ABI differences)
 if TYPE_CHECKING:
@@ -115,6 +117,8 @@ class CompositeEnvironmentDriver(DefaultEnvironmentDriver):
         jit_capable: bool | None = None,
         mic: MicrophoneDriver | None = None,
         device_power: PowerDriver | None = None,
+        profiler: CallbackProfiler | None = None,
+        disk: DiskDriver | None = None,
     ):
         super().__init__()
         # isinstance(thing, ThingProtocol) is True if `thing` is itself a class,
@@ -249,6 +253,7 @@ class CompositeEnvironmentDriver(DefaultEnvironmentDriver):
         if isinstance(mic, type) or (mic is not None and not isinstance(mic, MicrophoneDriver)):
             raise TypeError(f"Expected MicrophoneDriver or None, got {type(mic).__qualname__}")
         self._mic = mic
+        self._mic_direct = mic if isinstance(mic, DirectMicrophoneDriver) else None
 
         if isinstance(device_power, type) or (
             device_power is not None and not isinstance(device_power, PowerDriver)
@@ -256,6 +261,16 @@ class CompositeEnvironmentDriver(DefaultEnvironmentDriver):
             raise TypeError(f"Expected PowerDriver or None, got {type(device_power).__qualname__}")
         self._device_power = device_power
 
+        if profiler is not None and not isinstance(profiler, CallbackProfiler):
+            raise TypeError(
+                f"Expected CallbackProfiler or None, got {type(profiler).__qualname__}"
+            )
+        self._profiler = profiler
+
+        if isinstance(disk, type) or (disk is not None and not isinstance(disk, DiskDriver)):
+            raise TypeError(f"Expected DiskDriver or None, got {type(disk).__qualname__}")
+        self._disk = disk
+
         self._hw_render_callback: retro_hw_render_callback | None = None
         self._rumble_interface: retro_rumble_interface | None = None
         self._camera_callback: retro_camera_callback | None = None
@@ -298,6 +313,11 @@ class CompositeEnvironmentDriver(DefaultEnvironmentDriver):
         """Return the :class:`.CameraDriver` supplied at construction time, or ``None`` if absent."""
         return self._camera
 
+    @property
+    def disk(self) -> DiskDriver | None:
+        """Return the :class:`.DiskDriver` supplied at construction time, or ``None`` if absent."""
+        return self._disk
+
     @property
     def user(self) -> UserDriver | None:
         """Return the :class:`.UserDriver` supplied at construction time, or ``None`` if absent."""
@@ -318,12 +338,27 @@ class CompositeEnvironmentDriver(DefaultEnvironmentDriver):
         """Return the :class:`.RumbleDriver` supplied at construction time, or ``None`` if absent."""
         return self._rumble
 
+    @property
+    def profiler(self) -> CallbackProfiler | None:
+        """Return the :class:`.CallbackProfiler` supplied at construction time, or ``None`` if absent."""
+        return self._profiler
+
+    def _profiled[**P, T](self, name: str, callback: Callable[P, T]) -> Callable[P, T]:
+        """
+        Return ``callback`` wrapped with :meth:`.CallbackProfiler.wrap` if there's a profiler,
+        or ``callback`` itself if not.
+        """
+        if self._profiler is None:
+            return callback
+
+        return self._profiler.wrap(name, callback)
+
     @override
     @_return_on_raise(None)
     def video_refresh(self, data: c_void_ptr, width: int, height: int, pitch: int) -> None:
         # Handle the constants and their equivalent ints, just to be safe
         match data.value:
-            case 0:
+            case 0 | None:
                 # Passing NULL to retro_video_refresh_t means "redraw the frame"
                 self._video.refresh(FrameBufferSpecial.DUPE, width, height, pitch)
             case int(i) if i == MAX_POINTER_VALUE:
@@ -576,7 +611,14 @@ class CompositeEnvironmentDriver(DefaultEnvironmentDriver):
     def _set_disk_control_interface(
         self, callback: TypedPointer[retro_disk_control_callback]
     ) -> bool:
-        return False  # TODO: Implement
+        if self._disk is None:
+            return False
+
+        if not callback:
+            raise ValueError("RETRO_ENVIRONMENT_SET_DISK_CONTROL_INTERFACE doesn't accept NULL")
+
+        self._disk.callback = deepcopy(callback[0])
+        return True
 
     @override
     def _set_hw_render(self, callback: TypedPointer[retro_hw_render_callback]) -> bool:
@@ -816,6 +858,7 @@ class CompositeEnvironmentDriver(DefaultEnvironmentDriver):
             )
 
         callback = interface[0]
+        self._camera.caps = CameraCapabilityFlags(callback.caps)
         self._camera.width = callback.width
         self._camera.height = callback.height
         self._camera.frame_raw_framebuffer = callback.frame_raw_framebuffer
@@ -879,13 +922,13 @@ class CompositeEnvironmentDriver(DefaultEnvironmentDriver):
 
         if not self._perf_callback:
             self._perf_callback = retro_perf_callback(
-                get_time_usec=self._get_time_usec,
-                get_cpu_features=self._get_cpu_features,
-                get_perf_counter=self._get_perf_counter,
-                perf_register=self._perf_register,
-                perf_start=self._perf_start,
-                perf_stop=self._perf_stop,
-                perf_log=self._perf_log,
+                get_time_usec=retro_perf_get_time_usec_t(self._get_time_usec),
+                get_cpu_features=retro_get_cpu_features_t(self._get_cpu_features),
+                get_perf_counter=retro_perf_get_counter_t(self._get_perf_counter),
+                perf_register=retro_perf_register_t(self._perf_register),
+                perf_start=retro_perf_start_t(self._perf_start),
+                perf_stop=retro_perf_stop_t(self._perf_stop),
+                perf_log=retro_perf_log_t(self._perf_log),
             )
 
         interface[0] = self._perf_callback
@@ -1037,6 +1080,9 @@ class CompositeEnvironmentDriver(DefaultEnvironmentDriver):
         av_info = info[0]
         self._video.system_av_info = av_info
         self._audio.system_av_info = av_info
+        if self._timing is not None:
+            self._timing.system_av_info = av_info
+
         self._system_av_info = deepcopy(av_info)
         return True
 
@@ -1350,33 +1396,67 @@ class CompositeEnvironmentDriver(DefaultEnvironmentDriver):
             self._vfs_interface = retro_vfs_interface()
 
             if self._vfs.version >= 1:
-                self._vfs_interface.get_path = retro_vfs_get_path_t(self._vfs_get_path)
-                self._vfs_interface.open = retro_vfs_open_t(self._vfs_open)
-                self._vfs_interface.close = retro_vfs_close_t(self._vfs_close)
-                self._vfs_interface.size = retro_vfs_size_t(self._vfs_size)
-                self._vfs_interface.tell = retro_vfs_tell_t(self._vfs_tell)
-                self._vfs_interface.seek = retro_vfs_seek_t(self._vfs_seek)
-                self._vfs_interface.read = retro_vfs_read_t(self._vfs_read)
-                self._vfs_interface.write = retro_vfs_write_t(self._vfs_write)
-                self._vfs_interface.flush = retro_vfs_flush_t(self._vfs_flush)
-                self._vfs_interface.remove = retro_vfs_remove_t(self._vfs_remove)
-                self._vfs_interface.rename = retro_vfs_rename_t(self._vfs_rename)
+                self._vfs_interface.get_path = retro_vfs_get_path_t(
+                    self._profiled("vfs.get_path", self._vfs_get_path)
+                )
+                self._vfs_interface.open = retro_vfs_open_t(
+                    self._profiled("vfs.open", self._vfs_open)
+                )
+                self._vfs_interface.close = retro_vfs_close_t(
+                    self._profiled("vfs.close", self._vfs_close)
+                )
+                self._vfs_interface.size = retro_vfs_size_t(
+                    self._profiled("vfs.size", self._vfs_size)
+                )
+                self._vfs_interface.tell = retro_vfs_tell_t(
+                    self._profiled("vfs.tell", self._vfs_tell)
+                )
+                self._vfs_interface.seek = retro_vfs_seek_t(
+                    self._profiled("vfs.seek", self._vfs_seek)
+                )
+                self._vfs_interface.read = retro_vfs_read_t(
+                    self._profiled("vfs.read", self._vfs_read)
+                )
+                self._vfs_interface.write = retro_vfs_write_t(
+                    self._profiled("vfs.write", self._vfs_write)
+                )
+                self._vfs_interface.flush = retro_vfs_flush_t(
+                    self._profiled("vfs.flush", self._vfs_flush)
+                )
+                self._vfs_interface.remove = retro_vfs_remove_t(
+                    self._profiled("vfs.remove", self._vfs_remove)
+                )
+                self._vfs_interface.rename = retro_vfs_rename_t(
+                    self._profiled("vfs.rename", self._vfs_rename)
+                )
 
             if self._vfs.version >= 2:
-                self._vfs_interface.truncate = retro_vfs_truncate_t(self._vfs_truncate)
+                self._vfs_interface.truncate = retro_vfs_truncate_t(
+                    self._profiled("vfs.truncate", self._vfs_truncate)
+                )
 
             if self._vfs.version >= 3:
-                self._vfs_interface.stat = retro_vfs_stat_t(self._vfs_stat)
-                self._vfs_interface.mkdir = retro_vfs_mkdir_t(self._vfs_mkdir)
-                self._vfs_interface.opendir = retro_vfs_opendir_t(self._vfs_opendir)
-                self._vfs_interface.readdir = retro_vfs_readdir_t(self._vfs_readdir)
+                self._vfs_interface.stat = retro_vfs_stat_t(
+                    self._profiled("vfs.stat", self._vfs_stat)
+                )
+                self._vfs_interface.mkdir = retro_vfs_mkdir_t(
+                    self._profiled("vfs.mkdir", self._vfs_mkdir)
+                )
+                self._vfs_interface.opendir = retro_vfs_opendir_t(
+                    self._profiled("vfs.opendir", self._vfs_opendir)
+                )
+                self._vfs_interface.readdir = retro_vfs_readdir_t(
+                    self._profiled("vfs.readdir", self._vfs_readdir)
+                )
                 self._vfs_interface.dirent_get_name = retro_vfs_dirent_get_name_t(
-                    self._vfs_dirent_get_name
+                    self._profiled("vfs.dirent_get_name", self._vfs_dirent_get_name)
                 )
                 self._vfs_interface.dirent_is_dir = retro_vfs_dirent_is_dir_t(
-                    self._vfs_dirent_is_dir
+                    self._profiled("vfs.dirent_is_dir", self._vfs_dirent_is_dir)
+                )
+                self._vfs_interface.closedir = retro_vfs_closedir_t(
+                    self._profiled("vfs.closedir", self._vfs_closedir)
                 )
-                self._vfs_interface.closedir = retro_vfs_closedir_t(self._vfs_closedir)
 
         vfs_info.required_interface_version = self._vfs.version
         vfs_info.iface = pointer(self._vfs_interface)
@@ -1820,13 +1900,32 @@ class CompositeEnvironmentDriver(DefaultEnvironmentDriver):
 
     @override
     def _get_disk_control_interface_version(self, version: TypedPointer[c_uint]) -> bool:
-        return False  # TODO: Implement
+        if self._disk is None:
+            return False
+
+        if not version:
+            raise ValueError(
+                "RETRO_ENVIRONMENT_GET_DISK_CONTROL_INTERFACE_VERSION doesn't accept NULL"
+            )
+
+        # Version 1 means RETRO_ENVIRONMENT_SET_DISK_CONTROL_EXT_INTERFACE is supported
+        version[0] = 1
+        return True
 
     @override
     def _set_disk_control_ext_interface(
         self, interface: TypedPointer[retro_disk_control_ext_callback]
     ) -> bool:
-        return False  # TODO: Implement
+        if self._disk is None:
+            return False
+
+        if not interface:
+            raise ValueError(
+                "RETRO_ENVIRONMENT_SET_DISK_CONTROL_EXT_INTERFACE doesn't accept NULL"
+            )
+
+        self._disk.callback = deepcopy(interface[0])
+        return True
 
     @override
     def _get_message_interface_version(self, version: TypedPointer[c_uint]) -> bool:
@@ -2164,6 +2263,11 @@ class CompositeEnvironmentDriver(DefaultEnvironmentDriver):
         if self._mic is None or not mic or not buffer or frames < 0:
             return -1
 
+        if self._mic_direct is not None:
+            view = memoryview_at(buffer, frames * sizeof(c_int16)).cast("h")
+            written = self._mic_direct.read_mic_into(mic[0], view)
+            return -1 if written is None else written
+
         returned_frames = self._mic.read_mic(mic[0], frames)
         if returned_frames is None:
             return -1
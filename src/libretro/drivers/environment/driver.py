@@ -438,17 +438,30 @@ class EnvironmentDriver(Protocol):
 
     # ruff: enable[ARG002]
 
+    _suspend_callbacks: bool = False
+    """
+    If :obj:`True`, every method wrapped with :meth:`return_on_raise`
+    returns its default value immediately instead of running.
+    Lets an implementation cut a call into the core short once it's known to have failed.
+    """
+
     @staticmethod
     def return_on_raise[T, **P](default: T) -> Callable[[Callable[P, T]], Callable[P, T]]:
         """
         Ctypes doesn't propagate exceptions out of callbacks,
         so this is necessary to detect an error in a driver
         instead of just swallowing it with a warning.
+
+        While :attr:`_suspend_callbacks` is set,
+        the wrapped method isn't called at all and ``default`` is returned.
         """
 
         def decorator(fn: Callable[P, T]) -> Callable[P, T]:
             @functools.wraps(fn)
             def wrapper(self: Self, *args: P.args, **kwargs: P.kwargs) -> T:
+                if self._suspend_callbacks:
+                    return default
+
                 try:
                     return fn(self, *args, **kwargs)  # type: ignore
                     # "fn" is the original method, including the "self" parameter
@@ -0,0 +1,295 @@
+"""
+Opt-in timing of the Python callbacks that a core calls into.
+
+.. seealso::
+
+    :class:`.CompositeEnvironmentDriver`
+        Instruments its callbacks with a :class:`.CallbackProfiler` if given one.
+"""
+
+from __future__ import annotations
+
+import functools
+from collections import deque
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass
+from time import perf_counter_ns
+from typing import TYPE_CHECKING, override
+
+from libretro.api import EnvironmentCall
+
+if TYPE_CHECKING:
+    from libretro.ctypes import c_void_ptr
+    from libretro.drivers.perf import HistogramPerfDriver
+
+
+@dataclass(slots=True)
+class CallbackStats:
+    """Aggregate timings for one kind of callback."""
+
+    calls: int = 0
+    """The number of times the callback was invoked."""
+    total: int = 0
+    """Nanoseconds spent in the callback, summed over all calls."""
+    max: int = 0
+    """Nanoseconds spent in the longest call."""
+
+    @property
+    def mean(self) -> float:
+        """Mean nanoseconds per call, or 0 if the callback was never invoked."""
+        return self.total / self.calls if self.calls else 0.0
+
+    def add(self, elapsed: int) -> None:
+        """
+        Record one call.
+
+        :param elapsed: Nanoseconds spent in the call.
+        """
+        self.calls += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+
+
+@dataclass(frozen=True, slots=True)
+class FrameProfile:
+    """How the time spent in one call to ``retro_run`` was divided between the core and libretro.py."""
+
+    frame: int
+    """The zero-based index of this frame, counted from the first profiled ``retro_run``."""
+    run: int
+    """Nanoseconds spent in ``retro_run``, including the callbacks it invoked."""
+    callbacks: Mapping[str, int]
+    """Nanoseconds spent in each kind of callback invoked during ``retro_run``."""
+
+    @property
+    def callback_time(self) -> int:
+        """Nanoseconds spent in libretro.py callbacks during ``retro_run``."""
+        return sum(self.callbacks.values())
+
+    @property
+    def core_time(self) -> int:
+        """Nanoseconds spent in ``retro_run`` outside of libretro.py callbacks."""
+        return self.run - self.callback_time
+
+
+@dataclass(frozen=True, slots=True)
+class ProfileReport:
+    """A summary of everything a :class:`CallbackProfiler` has measured."""
+
+    frames: int
+    """The number of profiled calls to ``retro_run``."""
+    run: CallbackStats
+    """Timings for ``retro_run`` itself, including the callbacks it invoked."""
+    callback_time: int
+    """Nanoseconds spent in libretro.py callbacks during ``retro_run``."""
+    callbacks: Mapping[str, CallbackStats]
+    """
+    Timings for each kind of callback, keyed by name,
+    including calls made outside of ``retro_run`` (e.g. during ``retro_load_game``).
+    """
+
+    @property
+    def core_time(self) -> int:
+        """Nanoseconds spent in ``retro_run`` outside of libretro.py callbacks."""
+        return self.run.total - self.callback_time
+
+    @override
+    def __str__(self) -> str:
+        """Return this report as a plain-text table, sorted by total time spent in each callback."""
+        lines = [
+            f"{self.frames} frames, {self.run.total / 1e6:.3f} ms in retro_run: "
+            f"{self.core_time / 1e6:.3f} ms in the core, "
+            f"{self.callback_time / 1e6:.3f} ms in libretro.py callbacks",
+            f"{'callback':<40} {'calls':>10} {'total ms':>12} {'mean us':>10} {'max us':>10}",
+        ]
+        for name, stats in sorted(self.callbacks.items(), key=lambda i: i[1].total, reverse=True):
+            lines.append(
+                f"{name:<40} {stats.calls:>10} {stats.total / 1e6:>12.3f} "
+                f"{stats.mean / 1e3:>10.2f} {stats.max / 1e3:>10.2f}"
+            )
+
+        return "\n".join(lines)
+
+
+class CallbackProfiler:
+    """
+    Measures the time spent in each Python callback that a core invokes.
+
+    Pass one to :class:`.Session` (or :class:`.CompositeEnvironmentDriver`)
+    to instrument the AV and input callbacks,
+    each :class:`.EnvironmentCall` (timed separately),
+    and each VFS operation.
+    ``retro_run`` is timed too,
+    so each :class:`FrameProfile` can tell how much of a frame
+    was spent in the core and how much in libretro.py.
+
+    Callbacks are named ``video_refresh``, ``audio_sample_batch``, ``input_state``, etc.;
+    environment calls are named like ``environment.GET_VARIABLE``;
+    VFS operations are named like ``vfs.read``.
+
+    Each timed call costs two :func:`time.perf_counter_ns` calls and a few integer operations.
+    Sessions without a profiler pay nothing,
+    since their callbacks aren't wrapped at all.
+
+    .. code-block:: python
+
+        profiler = CallbackProfiler()
+        with Session(core, game, profiler=profiler) as session:
+            for _ in range(600):
+                session.run()
+
+        print(profiler.report())
+    """
+
+    def __init__(self, *, trace: HistogramPerfDriver | None = None, max_frames: int | None = None):
+        """
+        Initialize a profiler with no measurements.
+
+        :param trace: If given, every timed callback is also recorded as a host-side span
+            with :meth:`.HistogramPerfDriver.add_trace_event`,
+            so it appears on the same timeline as the core's own performance counters.
+        :param max_frames: The number of :class:`FrameProfile` objects to keep;
+            older frames are discarded first.
+            If :obj:`None`, all frames are kept.
+        """
+        self._trace = trace
+        self._stats: dict[str, CallbackStats] = {}
+        self._run = CallbackStats()
+        self._callback_time = 0
+        self._frames: deque[FrameProfile] = deque(maxlen=max_frames)
+        # Only set while retro_run is being timed,
+        # so that callbacks outside of it aren't attributed to a frame
+        self._frame_callbacks: dict[str, int] | None = None
+        self._envcall_names: dict[int, str] = {}
+
+    @property
+    def stats(self) -> Mapping[str, CallbackStats]:
+        """A live mapping of callback names to their aggregate timings."""
+        return self._stats
+
+    @property
+    def frames(self) -> Sequence[FrameProfile]:
+        """The profile of each timed ``retro_run``, oldest first."""
+        return self._frames
+
+    def _record(self, name: str, start: int, elapsed: int) -> None:
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = self._stats[name] = CallbackStats()
+        stats.add(elapsed)
+
+        frame = self._frame_callbacks
+        if frame is not None:
+            frame[name] = frame.get(name, 0) + elapsed
+
+        if self._trace is not None:
+            self._trace.add_trace_event(name, start, elapsed)
+
+    def wrap[**P, T](self, name: str, callback: Callable[P, T]) -> Callable[P, T]:
+        """
+        Wrap a callback so that each call to it is timed.
+
+        :param name: The name to record the callback's timings under.
+        :param callback: The callback to time.
+        :return: A callable with the same signature as ``callback``.
+        """
+
+        @functools.wraps(callback)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            start = perf_counter_ns()
+            try:
+                return callback(*args, **kwargs)
+            finally:
+                self._record(name, start, perf_counter_ns() - start)
+
+        return wrapper
+
+    def wrap_environment(
+        self, environment: Callable[[int, c_void_ptr], bool]
+    ) -> Callable[[int, c_void_ptr], bool]:
+        """
+        Wrap an environment callback so that each :class:`.EnvironmentCall` is timed separately.
+
+        :param environment: The callback to time,
+            usually :meth:`.EnvironmentDriver.environment`.
+        :return: A callable with the same signature as ``environment``.
+        """
+        names = self._envcall_names
+
+        @functools.wraps(environment)
+        def wrapper(cmd: int, data: c_void_ptr) -> bool:
+            start = perf_counter_ns()
+            try:
+                return environment(cmd, data)
+            finally:
+                elapsed = perf_counter_ns() - start
+                name = names.get(cmd)
+                if name is None:
+                    name = names[cmd] = _envcall_name(cmd)
+                self._record(name, start, elapsed)
+
+        return wrapper
+
+    def run(self, run: Callable[[], object]) -> FrameProfile:
+        """
+        Time one call to ``retro_run``, attributing the callbacks it makes to a new frame.
+
+        :param run: The function to time, usually :meth:`.Core.run`.
+        :return: The profile of the new frame.
+        """
+        callbacks: dict[str, int] = {}
+        self._frame_callbacks = callbacks
+        start = perf_counter_ns()
+        try:
+            run()
+        finally:
+            elapsed = perf_counter_ns() - start
+            self._frame_callbacks = None
+
+        self._run.add(elapsed)
+        frame = FrameProfile(self._run.calls - 1, elapsed, callbacks)
+        self._callback_time += frame.callback_time
+        self._frames.append(frame)
+        if self._trace is not None:
+            self._trace.add_trace_event("retro_run", start, elapsed, "core")
+
+        return frame
+
+    def report(self) -> ProfileReport:
+        """
+        Summarize everything measured so far.
+
+        :return: A snapshot of the current timings;
+            later measurements don't affect it.
+        """
+        return ProfileReport(
+            frames=self._run.calls,
+            run=CallbackStats(self._run.calls, self._run.total, self._run.max),
+            callback_time=self._callback_time,
+            callbacks={
+                name: CallbackStats(s.calls, s.total, s.max) for name, s in self._stats.items()
+            },
+        )
+
+    def reset(self) -> None:
+        """Discard all measurements."""
+        self._stats.clear()
+        self._run = CallbackStats()
+        self._callback_time = 0
+        self._frames.clear()
+
+
+def _envcall_name(cmd: int) -> str:
+    if cmd in EnvironmentCall:
+        return f"environment.{EnvironmentCall(cmd).name}"
+
+    return f"environment.{cmd:#x}"
+
+
+__all__ = [
+    "CallbackProfiler",
+    "CallbackStats",
+    "FrameProfile",
+    "ProfileReport",
+]
@@ -8,3 +8,4 @@ Driver protocols for geolocation services exposed to the core.
 """
 
 from .driver import *
+from .virtual import *
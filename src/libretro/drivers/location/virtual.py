@@ -0,0 +1,195 @@
+"""
+:class:`.LocationDriver` implementation that replays a track of positions against a :class:`.VirtualClock`.
+
+.. seealso::
+
+    :class:`.LocationDriver`
+        The protocol this driver implements.
+"""
+
+from bisect import bisect_right
+from collections.abc import Iterable, Mapping
+from math import asin, cos, radians, sin, sqrt
+from typing import cast, override
+
+from libretro.api.location import retro_location_lifetime_status_t
+from libretro.drivers.clock import VirtualClock
+
+from .driver import LocationDriver, Position
+
+_EARTH_RADIUS = 6_371_000.0
+"""Mean radius of the Earth in meters."""
+
+type Track = Mapping[int, Position] | Iterable[tuple[int, Position]]
+"""
+The positions a :class:`VirtualLocationDriver` reports:
+pairs of a time in microseconds on the driver's clock
+and the position reached at that time.
+"""
+
+
+def _time(point: tuple[int, Position]) -> int:
+    return point[0]
+
+
+def _distance(a: Position, b: Position) -> float | None:
+    if a.latitude is None or a.longitude is None or b.latitude is None or b.longitude is None:
+        return None
+
+    # Haversine formula
+    lat1, lat2 = radians(a.latitude), radians(b.latitude)
+    dlat = lat2 - lat1
+    dlon = radians(b.longitude - a.longitude)
+    h = sin(dlat / 2) ** 2 + cos(lat1) * cos(lat2) * sin(dlon / 2) ** 2
+    return 2 * _EARTH_RADIUS * asin(min(1.0, sqrt(h)))
+
+
+class VirtualLocationDriver(LocationDriver):
+    """
+    A :class:`.LocationDriver` whose position depends only on the time on a :class:`.VirtualClock`,
+    so that cores reading the location behave identically on every run.
+
+    Reports the last position in its track whose time has been reached,
+    or :obj:`None` before the first one or while stopped.
+    Honors the core's :meth:`set_interval`:
+    the reported position only changes once at least ``interval`` milliseconds
+    have passed on the clock since the last change
+    and the new position is at least ``distance`` meters from the old one.
+
+    >>> from libretro.drivers import Position, VirtualClock, VirtualLocationDriver
+    >>> clock = VirtualClock()
+    >>> here = Position(51.5, -0.12, 5.0, 10.0)
+    >>> driver = VirtualLocationDriver(clock, {1_000_000: here})
+    >>> driver.start()
+    True
+    >>> driver.get_position() is None
+    True
+    >>> clock.advance(1_000_000_000)
+    >>> driver.get_position() == here
+    True
+    """
+
+    def __init__(self, clock: VirtualClock, track: Track = ()):
+        """
+        Initialize the driver.
+
+        :param clock: The clock that decides which position in ``track`` has been reached.
+        :param track: The :obj:`Track` to replay.
+        :raises TypeError: If ``clock`` isn't a :class:`.VirtualClock`.
+        :raises ValueError: If two positions in ``track`` share a time.
+        """
+        if not isinstance(clock, VirtualClock):
+            raise TypeError(f"Expected VirtualClock, got {type(clock).__name__}")
+
+        points: list[tuple[int, Position]]
+        if isinstance(track, Mapping):
+            points = list(cast(Mapping[int, Position], track).items())
+        else:
+            points = list(track)
+
+        points.sort(key=_time)
+        times = [t for t, _ in points]
+        if len(set(times)) != len(times):
+            raise ValueError("Each time in the track must have exactly one position")
+
+        self._clock = clock
+        self._times = times
+        self._positions = [p for _, p in points]
+        self._interval = 0
+        self._distance = 0
+        self._started = False
+        self._reported: Position | None = None
+        self._reported_at: int | None = None
+        self._initialized: retro_location_lifetime_status_t | None = None
+        self._deinitialized: retro_location_lifetime_status_t | None = None
+
+    @property
+    def clock(self) -> VirtualClock:
+        """The clock this driver reads."""
+        return self._clock
+
+    @property
+    def started(self) -> bool:
+        """Whether the core has started the location service."""
+        return self._started
+
+    @property
+    def interval(self) -> tuple[int, int]:
+        """The minimum time in milliseconds and distance in meters between updates, as set by the core."""
+        return self._interval, self._distance
+
+    @override
+    def start(self) -> bool:
+        if not self._started:
+            self._started = True
+            if self._initialized:
+                self._initialized()
+
+        return True
+
+    @override
+    def stop(self) -> None:
+        if self._started:
+            self._started = False
+            self._reported = None
+            self._reported_at = None
+            if self._deinitialized:
+                self._deinitialized()
+
+    @override
+    def get_position(self) -> Position | None:
+        if not self._started:
+            return None
+
+        now = self._clock.usec
+        index = bisect_right(self._times, now) - 1
+        if index < 0:
+            return None
+
+        position = self._positions[index]
+        reported = self._reported
+        if reported is not None and self._reported_at is not None:
+            if now - self._reported_at < self._interval * 1000:
+                return reported
+
+            if self._distance > 0:
+                moved = _distance(reported, position)
+                if moved is not None and moved < self._distance:
+                    return reported
+
+        if position != reported:
+            self._reported = position
+            self._reported_at = now
+
+        return position
+
+    @override
+    def set_interval(self, interval: int, distance: int) -> None:
+        self._interval = max(0, interval)
+        self._distance = max(0, distance)
+
+    @property
+    @override
+    def initialized(self) -> retro_location_lifetime_status_t | None:
+        return self._initialized
+
+    @initialized.setter
+    @override
+    def initialized(self, value: retro_location_lifetime_status_t | None) -> None:
+        self._initialized = value
+
+    @property
+    @override
+    def deinitialized(self) -> retro_location_lifetime_status_t | None:
+        return self._deinitialized
+
+    @deinitialized.setter
+    @override
+    def deinitialized(self, value: retro_location_lifetime_status_t | None) -> None:
+        self._deinitialized = value
+
+
+__all__ = [
+    "Track",
+    "VirtualLocationDriver",
+]
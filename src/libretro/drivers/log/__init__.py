@@ -8,4 +8,5 @@ Drivers that receive log output from the core.
 """
 
 from .driver import *
+from .queued import *
 from .unformatted import *
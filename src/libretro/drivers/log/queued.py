@@ -0,0 +1,174 @@
+"""
+A log driver that hands core messages to a background thread
+before forwarding them to Python's :mod:`logging` module.
+
+.. seealso::
+
+    :mod:`libretro.api.log`
+        Defines the log callback structure this driver implements.
+"""
+
+import logging
+import queue
+from collections import deque
+from logging import Logger, LogRecord
+from logging.handlers import QueueListener
+from typing import Self, override
+
+from libretro.api.log import LogLevel
+
+from .driver import LogDriver
+
+type _Message = tuple[LogLevel, bytes]
+
+
+class _RingQueue(queue.Queue[_Message | None]):
+    # A queue that never blocks producers; once full, each put discards the oldest message
+    def __init__(self, capacity: int):
+        self.dropped = 0
+        self._capacity = capacity
+        super().__init__()
+
+    @override
+    def _init(self, maxsize: int) -> None:
+        self.queue: deque[_Message | None] = deque(maxlen=self._capacity)
+
+    @override
+    def _put(self, item: _Message | None) -> None:
+        if len(self.queue) == self._capacity:
+            # The discarded message will never be passed to task_done()
+            self.dropped += 1
+            self.unfinished_tasks -= 1
+
+        self.queue.append(item)
+
+
+class _MessageListener(QueueListener):
+    def __init__(self, messages: _RingQueue, logger: Logger):
+        super().__init__(messages)
+        self._logger = logger
+
+    @override
+    def prepare(self, record: _Message) -> LogRecord:  # pyright: ignore[reportIncompatibleMethodOverride]
+        level, message = record
+        return self._logger.makeRecord(
+            self._logger.name,
+            level.logging_level,
+            "(libretro)",
+            0,
+            message.decode(errors="replace").rstrip(),
+            (),
+            None,
+        )
+
+    @override
+    def handle(self, record: _Message) -> None:  # pyright: ignore[reportIncompatibleMethodOverride]
+        self._logger.handle(self.prepare(record))
+
+
+class QueuedLogDriver(LogDriver):
+    """
+    A :class:`.LogDriver` that forwards core log messages
+    to a Python :class:`~logging.Logger` without blocking the core.
+
+    :meth:`log` only appends the raw message to a bounded ring buffer;
+    decoding and handler dispatch happen on a
+    :class:`~logging.handlers.QueueListener` thread.
+    Messages below ``level`` are discarded before they're queued.
+    If the core logs faster than the logger can keep up,
+    the oldest queued messages are discarded and counted in :attr:`dropped`.
+
+    Suitable for debug builds of cores that log many lines per frame.
+    Call :meth:`close` (or use this driver as a context manager)
+    to flush the remaining messages and stop the thread.
+
+    .. code-block:: python
+
+        with QueuedLogDriver(level=LogLevel.INFO) as log:
+            with Session(core, game, log=log) as session:
+                for _ in range(600):
+                    session.run()
+    """
+
+    def __init__(
+        self,
+        logger: Logger | None = None,
+        *,
+        capacity: int = 4096,
+        level: LogLevel = LogLevel.DEBUG,
+    ):
+        """
+        Start the background thread.
+
+        :param logger: An existing :class:`~logging.Logger` to forward messages to.
+            If :obj:`None`, a default logger named ``"libretro"`` is created
+            that writes to :data:`sys.stderr` at :data:`~logging.DEBUG` level.
+        :param capacity: The most messages that can wait to be handled.
+        :param level: The least severe message to forward.
+        :raises ValueError: If ``capacity`` is less than 1.
+        """
+        if capacity < 1:
+            raise ValueError(f"Expected capacity to be at least 1, got {capacity}")
+
+        if logger:
+            self._logger = logger
+        else:
+            self._logger = logging.getLogger("libretro")
+            self._logger.setLevel(logging.DEBUG)
+            self._logger.addHandler(logging.StreamHandler())
+
+        self._level = level
+        self._queue = _RingQueue(capacity)
+        self._listener = _MessageListener(self._queue, self._logger)
+        self._closed = False
+        self._listener.start()
+
+    @property
+    def logger(self) -> Logger:
+        """The logger that messages are forwarded to."""
+        return self._logger
+
+    @property
+    def level(self) -> LogLevel:
+        """The least severe message that this driver forwards."""
+        return self._level
+
+    @level.setter
+    def level(self, level: LogLevel) -> None:
+        self._level = LogLevel(level)
+
+    @property
+    def dropped(self) -> int:
+        """The number of messages discarded because the queue was full."""
+        return self._queue.dropped
+
+    @override
+    def log(self, level: LogLevel, fmt: bytes) -> None:
+        if level >= self._level and not self._closed:
+            self._queue.put_nowait((level, fmt))
+
+    def flush(self) -> None:
+        """Wait until every queued message has been handled."""
+        self._queue.join()
+
+    def close(self) -> None:
+        """
+        Handle every queued message, then stop the background thread.
+        Messages logged after this are discarded.
+
+        Does nothing if the driver is already closed.
+        """
+        if not self._closed:
+            self._closed = True
+            self._listener.stop()
+
+    def __enter__(self) -> Self:
+        """Return this driver."""
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        """Close this driver."""
+        self.close()
+
+
+__all__ = ["QueuedLogDriver"]
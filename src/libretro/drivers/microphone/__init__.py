@@ -7,5 +7,6 @@ Driver protocols and implementations for microphone audio capture.
         The matching :mod:`ctypes` types and callback definitions.
 """
 
+from .buffer import *
 from .driver import *
 from .generator import *
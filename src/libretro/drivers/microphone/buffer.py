@@ -0,0 +1,477 @@
+"""
+:class:`.MicrophoneDriver` implementation that copies samples from buffers in blocks.
+
+.. seealso::
+
+    :class:`.MicrophoneDriver`
+        The protocol this driver implements.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import sys
+import wave
+from array import array
+from collections.abc import Buffer, Callable, Collection, Iterable, Iterator
+from typing import Self, override
+
+from libretro.api.microphone import (
+    INTERFACE_VERSION,
+    retro_microphone,
+    retro_microphone_params,
+)
+
+from .driver import DirectMicrophoneDriver, Microphone
+
+type MicrophoneChunkIterator = Iterator[Buffer]
+type MicrophoneChunkSource = Iterable[Buffer] | Callable[[], MicrophoneChunkIterator]
+type MicrophoneBufferSource = Buffer | str | os.PathLike[str] | MicrophoneChunkSource
+
+_WAVE_FORMAT_PCM = 1
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+def _as_samples(buffer: Buffer) -> memoryview[int]:
+    view = memoryview(buffer)
+    if view.format == "h":
+        return view.cast("B").cast("h") if view.ndim != 1 else view
+
+    if view.format in ("B", "b", "c"):
+        return view.cast("B").cast("h")
+
+    raise ValueError(f"Expected signed 16-bit samples, got a buffer with format {view.format!r}")
+
+
+def _load_wav(path: str | os.PathLike[str]) -> tuple[memoryview[int], int, mmap.mmap | None]:
+    # Mono 16-bit PCM is already in the format the core wants,
+    # so it's mapped in place on little-endian hosts; anything else is decoded once.
+    # The mapping is returned too, so that it can be closed
+    with open(path, "rb") as f:
+        header = f.read(12)
+        if header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+            raise ValueError(f"{os.fsdecode(path)} is not a WAV file")
+
+        fmt: tuple[int, int, int, int] | None = None
+        while chunk := f.read(8):
+            kind, size = struct.unpack("<4sI", chunk)
+            if kind == b"fmt ":
+                tag, channels, rate, _, _, bits = struct.unpack("<HHIIHH", f.read(16))
+                fmt = (tag, channels, rate, bits)
+                f.seek(size - 16 + (size & 1), os.SEEK_CUR)
+            elif kind == b"data" and fmt is not None:
+                tag, channels, rate, bits = fmt
+                if (
+                    tag in (_WAVE_FORMAT_PCM, _WAVE_FORMAT_EXTENSIBLE)
+                    and channels == 1
+                    and bits == 16
+                    and sys.byteorder == "little"
+                ):
+                    mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                    start = f.tell()
+                    end = min(start + size, len(mapped))
+                    samples = memoryview(mapped)[start : end - (end - start) % 2].cast("h")
+                    return samples, rate, mapped
+                break
+            else:
+                f.seek(size + (size & 1), os.SEEK_CUR)
+
+    with wave.open(os.fsdecode(path), "rb") as w:
+        channels = w.getnchannels()
+        width = w.getsampwidth()
+        rate = w.getframerate()
+        data = w.readframes(w.getnframes())
+
+    # Keep the first channel's most significant 16 bits
+    stride = channels * width
+    match width:
+        case 1:
+            samples = array("h", ((b - 128) << 8 for b in data[::stride]))
+        case 2:
+            samples = array("h", data)[::channels]
+            if sys.byteorder == "big":
+                samples.byteswap()
+        case _:
+            samples = array(
+                "h",
+                (
+                    int.from_bytes(data[i + width - 2 : i + width], "little", signed=True)
+                    for i in range(0, len(data), stride)
+                ),
+            )
+
+    return memoryview(samples), rate, None
+
+
+class _RingBuffer:
+    """A growable ring of 16-bit samples, filled from an iterator of chunks."""
+
+    __slots__ = ("_chunks", "_ring", "_start", "_size")
+
+    def __init__(self, chunks: MicrophoneChunkIterator, capacity: int = 4096):
+        self._chunks: MicrophoneChunkIterator | None = chunks
+        self._ring = memoryview(bytearray(capacity * 2)).cast("h")
+        self._start = 0
+        self._size = 0
+
+    def _push(self, samples: memoryview[int]) -> None:
+        ring = self._ring
+        capacity = len(ring)
+        needed = self._size + len(samples)
+        if needed > capacity:
+            capacity = 1 << (needed - 1).bit_length()
+            grown = memoryview(bytearray(capacity * 2)).cast("h")
+            self._copy_out(grown, self._size)
+            self._ring = ring = grown
+            self._start = 0
+
+        end = (self._start + self._size) % capacity
+        first = min(len(samples), capacity - end)
+        ring[end : end + first] = samples[:first]
+        ring[: len(samples) - first] = samples[first:]
+        self._size += len(samples)
+
+    def _copy_out(self, dest: memoryview[int], count: int) -> None:
+        ring = self._ring
+        start = self._start
+        first = min(count, len(ring) - start)
+        dest[:first] = ring[start : start + first]
+        dest[first:count] = ring[: count - first]
+
+    def read_into(self, dest: memoryview[int]) -> int:
+        frames = len(dest)
+        while self._size < frames and self._chunks is not None:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                self._chunks = None
+            else:
+                self._push(_as_samples(chunk))
+
+        count = min(frames, self._size)
+        self._copy_out(dest, count)
+        self._start = (self._start + count) % len(self._ring)
+        self._size -= count
+        return count
+
+
+class BufferMicrophone(Microphone):
+    """
+    A :class:`.Microphone` that copies samples from a buffer in blocks.
+
+    Each read is at most a few slice assignments,
+    with no per-sample Python code,
+    so cores that read the microphone at audio rate aren't slowed down by it.
+    Once the source runs out, reads return silence.
+
+    .. seealso::
+
+        :class:`.Microphone`
+            The protocol this class implements.
+    """
+
+    def __init__(
+        self,
+        source: memoryview[int] | MicrophoneChunkIterator | None,
+        params: retro_microphone_params | None,
+        *,
+        loop: bool = False,
+    ):
+        """
+        Initialize the microphone with a sample source and capture parameters.
+
+        :param source: A view of signed 16-bit samples,
+            an iterator of sample buffers (which are queued in a ring buffer as needed),
+            or :obj:`None` for silence.
+        :param params: The capture parameters to advertise,
+            or :obj:`None` to default to 44.1 kHz mono.
+        :param loop: Whether to restart a sample view from the beginning when it runs out.
+            Has no effect on iterators.
+        """
+        self._params = params or retro_microphone_params(44100)
+        self._enabled = False
+        self._closed = False
+        self._handle = retro_microphone(id(self))
+        self._loop = loop
+        self._position = 0
+        self._samples: memoryview[int] | None = None
+        self._ring: _RingBuffer | None = None
+        match source:
+            case memoryview():
+                self._samples = source
+            case None:
+                pass
+            case _:
+                self._ring = _RingBuffer(source)
+
+    @override
+    def close(self) -> None:
+        self._closed = True
+
+    @property
+    @override
+    def params(self) -> retro_microphone_params | None:
+        if self._closed:
+            return None
+
+        return self._params
+
+    @property
+    @override
+    def state(self) -> bool:
+        if self._closed:
+            return False
+
+        return self._enabled
+
+    @state.setter
+    @override
+    def state(self, state: bool) -> None:
+        if self._closed:
+            raise RuntimeError("Cannot set state on a closed microphone")
+
+        self._enabled = bool(state)
+
+    @property
+    def position(self) -> int:
+        """The number of frames read from this microphone so far, including silence."""
+        return self._position
+
+    @property
+    def handle(self) -> retro_microphone:
+        """The opaque :class:`.retro_microphone` handle exposed to the core."""
+        return self._handle
+
+    def read_into(self, buffer: memoryview[int]) -> int | None:
+        """
+        Fill ``buffer`` with the next frames from this microphone.
+
+        :param buffer: A writable view of signed 16-bit samples.
+        :return: The number of frames written (always ``len(buffer)``),
+            or :obj:`None` if this microphone is closed or off.
+        """
+        if self._closed or not self._enabled:
+            return None
+
+        frames = len(buffer)
+        written = 0
+        if (samples := self._samples) is not None:
+            total = len(samples)
+            offset = self._position % total if self._loop and total else self._position
+            while written < frames and offset < total:
+                count = min(frames - written, total - offset)
+                buffer[written : written + count] = samples[offset : offset + count]
+                written += count
+                offset += count
+                if offset == total and self._loop:
+                    offset = 0
+        elif self._ring is not None:
+            written = self._ring.read_into(buffer)
+
+        if written < frames:
+            # Silence once the source has run out
+            buffer[written:frames] = _silence(frames - written)
+
+        self._position += frames
+        return frames
+
+    @override
+    def read(self, frames: int) -> array[int] | None:
+        if self._closed or not self._enabled or not frames:
+            return None
+
+        samples = array("h", bytes(frames * 2))
+        with memoryview(samples) as view:
+            self.read_into(view)
+
+        return samples
+
+
+_SILENCE = memoryview(bytes(8192)).cast("h")
+
+
+def _silence(frames: int) -> memoryview[int]:
+    if frames <= len(_SILENCE):
+        return _SILENCE[:frames]
+
+    return memoryview(bytes(frames * 2)).cast("h")
+
+
+class BufferMicrophoneDriver(DirectMicrophoneDriver):
+    """
+    A :class:`.MicrophoneDriver` that opens :class:`BufferMicrophone` instances on demand.
+
+    Reads are copied straight into the core's buffer,
+    since this driver implements :class:`.DirectMicrophoneDriver`.
+
+    .. code-block:: python
+
+        with (
+            BufferMicrophoneDriver("voice.wav") as mic,
+            Session(core, game, mic=mic) as session,
+        ):
+            for _ in range(600):
+                session.run()
+
+    .. seealso::
+
+        :class:`.MicrophoneDriver`
+            The protocol this class implements.
+    """
+
+    def __init__(self, source: MicrophoneBufferSource | None = None, *, loop: bool = False):
+        """
+        Initialize the driver with a sample source.
+
+        :param source: The audio every microphone the core opens will read.
+            May be one of the following:
+
+            :class:`str`, :class:`~os.PathLike`
+                Path to a WAV file, decoded once when this driver is created.
+                Mono 16-bit PCM files are memory-mapped rather than decoded
+                and stay mapped until :meth:`close` is called.
+                Only the first channel of a multi-channel file is used,
+                and the file's sample rate is advertised as each microphone's actual rate.
+
+            :class:`~collections.abc.Buffer`
+                Signed 16-bit samples (e.g. :class:`array.array` with type code ``"h"``
+                or a NumPy ``int16`` array), shared without copying.
+                Raw bytes are interpreted as native-endian samples.
+
+            :class:`~collections.abc.Callable` () -> :class:`~collections.abc.Iterator` [ :class:`~collections.abc.Buffer` ]
+                Called once per opened microphone
+                to get an iterator of sample chunks of any size.
+
+            :class:`~collections.abc.Iterable` [ :class:`~collections.abc.Buffer` ]
+                Sample chunks shared by every opened microphone.
+
+            :obj:`None`
+                Every microphone produces silence.
+
+        :param loop: Whether to replay a WAV file or sample buffer from the start when it runs out.
+        :raises ValueError: If ``source`` is a buffer that doesn't hold 16-bit samples,
+            or a path to a file that isn't a WAV file.
+        """
+        self._microphones: dict[int, BufferMicrophone] = {}
+        self._loop = loop
+        self._rate: int | None = None
+        self._samples: memoryview[int] | None = None
+        self._chunks: Callable[[], MicrophoneChunkIterator] | None = None
+        self._shared_chunks: MicrophoneChunkIterator | None = None
+        self._mmap: mmap.mmap | None = None
+        match source:
+            case str() | os.PathLike():
+                self._samples, self._rate, self._mmap = _load_wav(source)
+            case Buffer():
+                self._samples = _as_samples(source)
+            case Callable():
+                self._chunks = source
+            case Iterable():
+                self._shared_chunks = iter(source)
+            case None:
+                pass
+
+    def close(self) -> None:
+        """
+        Close every open microphone and unmap the WAV file this driver reads, if any.
+
+        The core must not open or read microphones after this is called.
+        Does nothing if the driver is already closed.
+        """
+        for mic in self._microphones.values():
+            mic.close()
+
+        self._microphones.clear()
+        if self._mmap is not None:
+            if self._samples is not None:
+                self._samples.release()
+                self._samples = None
+
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self) -> Self:
+        """Return this driver."""
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        """Close this driver."""
+        self.close()
+
+    @property
+    @override
+    def version(self) -> int:
+        return INTERFACE_VERSION
+
+    @override
+    def open_mic(self, params: retro_microphone_params | None) -> retro_microphone | None:
+        if self._rate is not None:
+            params = retro_microphone_params(self._rate)
+
+        source: memoryview[int] | MicrophoneChunkIterator | None
+        if self._chunks is not None:
+            source = self._chunks()
+        elif self._shared_chunks is not None:
+            source = self._shared_chunks
+        else:
+            source = self._samples
+
+        mic = BufferMicrophone(source, params, loop=self._loop)
+        handle = mic.handle
+        self._microphones[handle.id] = mic
+        return handle
+
+    @override
+    def close_mic(self, mic: retro_microphone) -> None:
+        mic_id = mic.id
+        if m := self._microphones.get(mic_id):
+            m.close()
+            del self._microphones[mic_id]
+
+    @override
+    def get_mic_params(self, mic: retro_microphone) -> retro_microphone_params | None:
+        if (m := self._microphones.get(mic.id)) is not None:
+            return m.params
+
+        return None
+
+    @override
+    def get_mic_state(self, mic: retro_microphone) -> bool:
+        if (m := self._microphones.get(mic.id)) is not None:
+            return m.state
+
+        return False
+
+    @override
+    def set_mic_state(self, mic: retro_microphone, state: bool) -> None:
+        if (m := self._microphones.get(mic.id)) is not None:
+            m.state = state
+
+    @override
+    def read_mic(self, mic: retro_microphone, frames: int) -> array[int] | None:
+        if (m := self._microphones.get(mic.id)) is not None:
+            return m.read(frames)
+
+        return None
+
+    @override
+    def read_mic_into(self, mic: retro_microphone, buffer: memoryview[int]) -> int | None:
+        if (m := self._microphones.get(mic.id)) is not None:
+            return m.read_into(buffer)
+
+        return None
+
+    @property
+    @override
+    def microphones(self) -> Collection[BufferMicrophone]:
+        return self._microphones.values()
+
+
+__all__ = [
+    "BufferMicrophone",
+    "BufferMicrophoneDriver",
+    "MicrophoneBufferSource",
+    "MicrophoneChunkIterator",
+    "MicrophoneChunkSource",
+]
@@ -7,6 +7,8 @@
         The matching :mod:`ctypes` types and callback definitions.
 """
 
+from __future__ import annotations
+
 from abc import abstractmethod
 from array import array
 from collections.abc import Collection
@@ -170,4 +172,28 @@ class MicrophoneDriver(Protocol):
         ...
 
 
-__all__ = ["Microphone", "MicrophoneDriver"]
+@runtime_checkable
+class DirectMicrophoneDriver(MicrophoneDriver, Protocol):
+    """
+    A :class:`MicrophoneDriver` that can write samples straight into the core's buffer.
+
+    :class:`.CompositeEnvironmentDriver` prefers :meth:`read_mic_into` over :meth:`read_mic`
+    when its microphone driver implements this protocol,
+    saving an allocation and a copy on every read.
+    """
+
+    @abstractmethod
+    def read_mic_into(self, mic: retro_microphone, buffer: memoryview[int]) -> int | None:
+        """
+        Read audio frames from ``mic`` into ``buffer``.
+
+        :param mic: The microphone handle to read from.
+        :param buffer: A writable view of signed 16-bit mono frames (format ``"h"``)
+            whose length is the number of frames the core asked for.
+        :return: The number of frames written to the start of ``buffer``,
+            or :obj:`None` if the microphone is closed or no samples are available.
+        """
+        ...
+
+
+__all__ = ["DirectMicrophoneDriver", "Microphone", "MicrophoneDriver"]
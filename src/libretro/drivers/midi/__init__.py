@@ -7,5 +7,7 @@ Driver protocols and implementations for MIDI input and output.
         The matching :mod:`ctypes` types and callback definitions.
 """
 
+from .buffer import *
 from .driver import *
 from .generator import *
+from .smf import *
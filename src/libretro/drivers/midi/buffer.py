@@ -0,0 +1,216 @@
+"""
+:class:`.MidiDriver` implementation that reads and writes MIDI in bulk.
+
+.. seealso::
+
+    :class:`.MidiDriver`
+        The protocol this driver implements.
+"""
+
+import os
+from array import array
+from collections.abc import Buffer, Sequence
+from typing import IO, override
+
+from .driver import MidiDriver
+from .smf import MidiFileWriter, MidiStream, read_midi_file
+
+
+class BufferMidiDriver(MidiDriver):
+    """
+    A :class:`.MidiDriver` that replays input from a buffer
+    and records output into flat arrays.
+
+    Unlike :class:`.GeneratorMidiDriver`,
+    reading a byte is an index into a buffer
+    and writing one is two :class:`~array.array` appends,
+    so MIDI-heavy cores spend their time emulating rather than in this driver.
+
+    Input bytes may be stamped with the time they become available,
+    in which case the core can only read bytes whose time has come;
+    advance the clock with :meth:`advance`,
+    typically from a :meth:`.Session.add_frame_hook`.
+
+    .. code-block:: python
+
+        midi = BufferMidiDriver("song.mid", output="recorded.mid")
+        with Session(core, game, midi=midi) as session:
+            session.add_frame_hook(lambda: midi.advance(16_667))
+            for _ in range(600):
+                session.run()
+
+        midi.close()
+
+    .. seealso::
+
+        :class:`.MidiDriver`
+            The protocol this class implements.
+    """
+
+    def __init__(
+        self,
+        source: Buffer | MidiStream | str | os.PathLike[str] | None = None,
+        *,
+        times: Sequence[int] | None = None,
+        output: str | os.PathLike[str] | IO[bytes] | MidiFileWriter | None = None,
+    ):
+        """
+        Initialize the driver with an optional input source and output file.
+
+        :param source: The MIDI input to replay. May be one of the following:
+
+            :class:`str`, :class:`~os.PathLike`
+                Path to a Standard MIDI File,
+                whose events become available at the times the file specifies.
+
+            :class:`.MidiStream`
+                Raw MIDI bytes and their times, as returned by :func:`.read_midi_file`.
+
+            :class:`~collections.abc.Buffer`
+                Raw MIDI bytes,
+                available immediately unless ``times`` is given.
+
+            :obj:`None`
+                MIDI input is disabled.
+
+        :param times: For each byte in a raw ``source`` buffer,
+            the microseconds since the start of the stream
+            at which it becomes available.
+            Must be non-decreasing.
+        :param output: Where to write a Standard MIDI File of the core's output
+            each time the core calls :meth:`flush`.
+            May be a path, a seekable binary file, or a :class:`.MidiFileWriter`.
+            Call :meth:`close` to finish the file.
+        :raises ValueError: If ``times`` has a different length than ``source``.
+        """
+        match source:
+            case MidiStream(data=data, times=stream_times):
+                self._input: memoryview | None = memoryview(data)
+                self._times: Sequence[int] | None = stream_times
+            case str() | os.PathLike():
+                data, self._times = read_midi_file(source)
+                self._input = memoryview(data)
+            case None:
+                self._input = None
+                self._times = None
+            case _:
+                self._input = memoryview(source).cast("B")
+                self._times = times
+
+        if self._times is not None and len(self._times) != len(self._input or ()):
+            raise ValueError(
+                f"Expected one time per input byte, got {len(self._times)} times "
+                f"for {len(self._input or ())} bytes"
+            )
+
+        match output:
+            case MidiFileWriter() | None:
+                self._writer = output
+            case _:
+                self._writer = MidiFileWriter(output)
+
+        self._position = 0
+        self._time = 0
+        self._output_bytes = array("B")
+        self._output_delta_times = array("I")
+        self._flushed = 0
+        self._input_enabled = True
+        self._output_enabled = True
+
+    @property
+    @override
+    def input_enabled(self) -> bool:
+        return bool(
+            self._input is not None and self._input_enabled and self._position < len(self._input)
+        )
+
+    @input_enabled.setter
+    def input_enabled(self, value: bool):
+        self._input_enabled = bool(value)
+
+    @property
+    @override
+    def output_enabled(self) -> bool:
+        return self._output_enabled
+
+    @output_enabled.setter
+    def output_enabled(self, value: bool):
+        self._output_enabled = bool(value)
+
+    @property
+    def time(self) -> int:
+        """Microseconds of input that have elapsed, as advanced by :meth:`advance`."""
+        return self._time
+
+    @property
+    def position(self) -> int:
+        """The number of input bytes the core has read."""
+        return self._position
+
+    @property
+    def output_bytes(self) -> array[int]:
+        """Every byte the core has written, in send order."""
+        return self._output_bytes
+
+    @property
+    def output_delta_times(self) -> array[int]:
+        """For each byte in :attr:`output_bytes`, microseconds since the previous byte."""
+        return self._output_delta_times
+
+    def advance(self, microseconds: int) -> None:
+        """
+        Make more timed input available to the core.
+
+        Has no effect on input without times.
+
+        :param microseconds: How far to advance the input clock.
+        """
+        self._time += microseconds
+
+    @override
+    def read(self) -> int | None:
+        data = self._input
+        position = self._position
+        if data is None or position >= len(data):
+            return None
+
+        times = self._times
+        if times is not None and times[position] > self._time:
+            return None
+
+        self._position = position + 1
+        return data[position]
+
+    @override
+    def write(self, byte: int, delta_time: int) -> bool:
+        self._output_bytes.append(byte)
+        self._output_delta_times.append(delta_time)
+        return True
+
+    @override
+    def flush(self) -> bool:
+        if self._writer is not None:
+            start = self._flushed
+            with memoryview(self._output_bytes) as pending:
+                self._writer.write(pending[start:], self._output_delta_times[start:])
+            self._writer.flush()
+            self._flushed = len(self._output_bytes)
+
+        return True
+
+    def clear_output(self) -> None:
+        """Discard the recorded output, writing anything that hasn't been flushed first."""
+        self.flush()
+        self._output_bytes = array("B")
+        self._output_delta_times = array("I")
+        self._flushed = 0
+
+    def close(self) -> None:
+        """Write any unflushed output and finish the output file, if there is one."""
+        if self._writer is not None:
+            self.flush()
+            self._writer.close()
+            self._writer = None
+
+
+__all__ = ["BufferMidiDriver"]
@@ -0,0 +1,318 @@
+"""
+Reading and writing Standard MIDI Files (``.mid``).
+
+Only what's needed to replay a file into a core
+or to record a core's output is supported:
+channel and system messages are converted to and from
+the raw byte stream that :class:`.MidiDriver` uses,
+tempo changes are honored when reading,
+and every other meta event is ignored.
+
+.. seealso::
+
+    :class:`.BufferMidiDriver`
+        Replays and records MIDI with these functions.
+"""
+
+import os
+import struct
+from array import array
+from collections.abc import Buffer, Iterable
+from typing import IO, BinaryIO, NamedTuple
+
+_DEFAULT_TEMPO = 500_000
+"""Microseconds per quarter note if a file doesn't set a tempo (i.e. 120 BPM)."""
+
+# Written files use one tick per microsecond,
+# so a core's delta times can be written as-is
+_WRITE_DIVISION = 1000
+_WRITE_TEMPO = 1000
+
+
+class MidiStream(NamedTuple):
+    """A stream of raw MIDI bytes, each paired with the time it should be sent."""
+
+    data: bytes
+    """The raw MIDI bytes, as a core would read them."""
+    times: array[int]
+    """For each byte in :attr:`data`, microseconds since the start of the stream."""
+
+
+def _read_varlen(data: bytes, pos: int) -> tuple[int, int]:
+    value = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value = (value << 7) | (byte & 0x7F)
+        if not byte & 0x80:
+            return value, pos
+
+
+def _write_varlen(value: int) -> bytes:
+    out = bytearray([value & 0x7F])
+    value >>= 7
+    while value:
+        out.append(0x80 | (value & 0x7F))
+        value >>= 7
+    out.reverse()
+    return bytes(out)
+
+
+def _message_length(status: int) -> int:
+    # Total length of a message with this status byte, including the status itself;
+    # 0 for SysEx, which runs until the next 0xF7
+    match status & 0xF0:
+        case 0xC0 | 0xD0:
+            return 2
+        case 0xF0:
+            match status:
+                case 0xF0:
+                    return 0
+                case 0xF1 | 0xF3:
+                    return 2
+                case 0xF2:
+                    return 3
+                case _:
+                    return 1
+        case _:
+            return 3
+
+
+def _parse_track(data: bytes) -> list[tuple[int, int, bytes | int]]:
+    # Returns (tick, order, payload) triples,
+    # where payload is either raw MIDI bytes or a tempo in microseconds per quarter note
+    events: list[tuple[int, int, bytes | int]] = []
+    tick = 0
+    pos = 0
+    running = 0
+    while pos < len(data):
+        delta, pos = _read_varlen(data, pos)
+        tick += delta
+        status = data[pos]
+        if status == 0xFF:
+            kind = data[pos + 1]
+            length, pos = _read_varlen(data, pos + 2)
+            if kind == 0x51 and length == 3:
+                events.append((tick, len(events), int.from_bytes(data[pos : pos + 3])))
+            elif kind == 0x2F:
+                break
+            pos += length
+        elif status in (0xF0, 0xF7):
+            length, start = _read_varlen(data, pos + 1)
+            # 0xF7 events are "escapes" that carry arbitrary bytes
+            prefix = b"\xf0" if status == 0xF0 else b""
+            events.append((tick, len(events), prefix + data[start : start + length]))
+            pos = start + length
+            running = 0
+        else:
+            if status & 0x80:
+                running = status
+                pos += 1
+            elif not running:
+                raise ValueError(f"Data byte {status:#04x} without a status byte at offset {pos}")
+            length = _message_length(running) - 1
+            events.append((tick, len(events), bytes([running]) + data[pos : pos + length]))
+            pos += length
+
+    return events
+
+
+def read_midi_file(file: str | os.PathLike[str] | BinaryIO | Buffer) -> MidiStream:
+    """
+    Convert a Standard MIDI File into a timed stream of raw MIDI bytes.
+
+    Format 0 and format 1 files are supported;
+    format 1 tracks are merged into one stream.
+
+    :param file: A path, an open binary file, or the file's contents.
+    :return: The file's MIDI messages,
+        with each message's bytes stamped with the time it should be sent.
+    :raises ValueError: If the file isn't a valid Standard MIDI File.
+    """
+    match file:
+        case str() | os.PathLike():
+            with open(file, "rb") as f:
+                data = f.read()
+        case Buffer():
+            data = bytes(file)
+        case _:
+            data = file.read()
+
+    if data[:4] != b"MThd":
+        raise ValueError("Not a Standard MIDI File (missing MThd header)")
+
+    (header_length,) = struct.unpack_from(">I", data, 4)
+    fmt, track_count, division = struct.unpack_from(">HHH", data, 8)
+    if fmt > 1:
+        raise ValueError(f"Unsupported Standard MIDI File format {fmt}")
+
+    pos = 8 + header_length
+    events: list[tuple[int, int, int, bytes | int]] = []
+    for track in range(track_count):
+        kind, length = struct.unpack_from(">4sI", data, pos)
+        pos += 8
+        if kind == b"MTrk":
+            events.extend((t, track, o, p) for t, o, p in _parse_track(data[pos : pos + length]))
+        pos += length
+
+    # Tempo changes in any track (usually the first) apply to all of them
+    events.sort(key=lambda e: e[:3])
+
+    out = bytearray()
+    times = array("Q")
+    if division & 0x8000:
+        # SMPTE: frames per second (negated) and ticks per frame
+        fps = 256 - (division >> 8)
+        tick_us = 1_000_000 / (fps * (division & 0xFF))
+        ticks_per_quarter = None
+    else:
+        tick_us = _DEFAULT_TEMPO / division
+        ticks_per_quarter = division
+
+    tick = 0
+    now = 0.0
+    for event_tick, _, _, payload in events:
+        now += (event_tick - tick) * tick_us
+        tick = event_tick
+        if isinstance(payload, int):
+            if ticks_per_quarter is not None:
+                tick_us = payload / ticks_per_quarter
+        else:
+            out += payload
+            times.extend([round(now)] * len(payload))
+
+    return MidiStream(bytes(out), times)
+
+
+class MidiFileWriter:
+    """
+    Streams raw MIDI bytes into a single-track Standard MIDI File.
+
+    Bytes are grouped into complete messages as they arrive,
+    so a core's output can be written incrementally
+    (e.g. each time it calls :meth:`.MidiDriver.flush`).
+    System real-time bytes (``0xF8`` to ``0xFF``) have no representation in a file
+    and are dropped.
+    Call :meth:`close` to finish the file;
+    the output must be seekable so the track length can be filled in.
+
+    .. code-block:: python
+
+        with MidiFileWriter("out.mid") as writer:
+            writer.write(bytes([0x90, 60, 64]), [0, 0, 0])  # Note on
+            writer.write(bytes([0x80, 60, 0]), [500_000, 0, 0])  # Note off, 0.5s later
+    """
+
+    def __init__(self, file: str | os.PathLike[str] | IO[bytes]):
+        """
+        Start a new file.
+
+        :param file: A path to create, or an open, seekable binary file to write into.
+            Files opened by this writer are closed by :meth:`close`.
+        """
+        if isinstance(file, (str, os.PathLike)):
+            self._file: IO[bytes] = open(file, "wb")
+            self._owns_file = True
+        else:
+            self._file = file
+            self._owns_file = False
+
+        self._file.write(b"MThd" + struct.pack(">IHHH", 6, 0, 1, _WRITE_DIVISION))
+        self._track_start = self._file.tell() + 8
+        self._file.write(b"MTrk\0\0\0\0")
+        # Set the tempo so that one tick is one microsecond
+        self._file.write(b"\x00\xff\x51\x03" + _WRITE_TEMPO.to_bytes(3))
+        self._message = bytearray()
+        self._expected = 0
+        self._running = 0
+        self._delta = 0
+        self._closed = False
+
+    def __enter__(self):
+        """Return this writer."""
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        """Finish the file."""
+        self.close()
+
+    def _emit(self, message: bytes | bytearray) -> None:
+        if message[0] == 0xF0:
+            event = b"\xf0" + _write_varlen(len(message) - 1) + message[1:]
+        else:
+            event = message
+        self._file.write(_write_varlen(self._delta) + event)
+        self._delta = 0
+
+    def write(self, data: Buffer, delta_times: Iterable[int]) -> None:
+        """
+        Append raw MIDI bytes to the track.
+
+        :param data: The bytes to write, as a core would send them.
+            Messages may be split across calls.
+        :param delta_times: For each byte in ``data``,
+            microseconds since the previous byte.
+        :raises ValueError: If the writer has been closed.
+        """
+        if self._closed:
+            raise ValueError("MidiFileWriter is closed")
+
+        message = self._message
+        for byte, delta in zip(memoryview(data).cast("B"), delta_times, strict=True):
+            self._delta += delta
+            if byte >= 0xF8:
+                continue
+
+            if byte & 0x80:
+                if message and message[0] == 0xF0 and byte == 0xF7:
+                    message.append(byte)
+                    self._emit(message)
+                    message.clear()
+                    continue
+                # A new status byte abandons any incomplete message
+                message.clear()
+                message.append(byte)
+                self._expected = _message_length(byte)
+                self._running = byte if byte < 0xF0 else 0
+            elif message and message[0] == 0xF0:
+                message.append(byte)
+                continue
+            elif not message:
+                if not self._running:
+                    continue  # Stray data byte with no status to apply it to
+                message.append(self._running)
+                message.append(byte)
+                self._expected = _message_length(self._running)
+            else:
+                message.append(byte)
+
+            if len(message) == self._expected:
+                self._emit(message)
+                message.clear()
+
+    def flush(self) -> None:
+        """Flush the underlying file."""
+        self._file.flush()
+
+    def close(self) -> None:
+        """
+        Finish the track and fill in its length.
+
+        Any incomplete message is discarded.
+        Does nothing if the writer is already closed.
+        """
+        if self._closed:
+            return
+
+        self._closed = True
+        self._file.write(_write_varlen(self._delta) + b"\xff\x2f\x00")
+        end = self._file.tell()
+        self._file.seek(self._track_start - 4)
+        self._file.write(struct.pack(">I", end - self._track_start))
+        self._file.seek(end)
+        self._file.flush()
+        if self._owns_file:
+            self._file.close()
+
+
+__all__ = ["MidiFileWriter", "MidiStream", "read_midi_file"]
@@ -61,6 +61,8 @@ class DictOptionDriver(OptionDriver):
     _options_us: dict[bytes, retro_core_option_v2_definition]
     _categories_intl: dict[bytes, retro_core_option_v2_category]
     _options_intl: dict[bytes, retro_core_option_v2_definition]
+    _legal_values: dict[bytes, frozenset[bytes]]
+    _resolved: dict[bytes, bytes]
 
     def __init__(
         self,
@@ -97,9 +99,34 @@ class DictOptionDriver(OptionDriver):
         self._options_us = {}
         self._categories_intl = {}
         self._options_intl = {}
+        self._legal_values = {}
+        self._resolved = {}
+
+    def _reindex(self) -> None:
+        """
+        Rebuild the index of each option's legal values from :attr:`_options_us`.
+
+        Must be called whenever the option definitions change.
+        """
+        self._legal_values = {
+            key: frozenset(v.value for v in option.values if v.value is not None)
+            for key, option in self._options_us.items()
+        }
+        self._resolved.clear()
+        self._variables_dirty = True
+
+    def _is_legal(self, key: bytes, value: bytes) -> bool:
+        legal = self._legal_values.get(key)
+        return legal is not None and value in legal
 
     @override
     def get_variable(self, key: bytes) -> bytes | None:
+        # Cores may call GET_VARIABLE for every option on every frame,
+        # so each key's result is cached until its value or the definitions change
+        if (value := self._resolved.get(key)) is not None:
+            self._variables_dirty = False
+            return value
+
         if not self._options_us or not key:
             # Options can't be fetched until their definitions are set
             return None
@@ -118,13 +145,13 @@ class DictOptionDriver(OptionDriver):
                 f"Option {key!r} has no default value, it should've been filtered out when initializing"
             )
             self._options[key] = _Option(value=value, visible=True)
+            self._resolved[key] = value
             return value
 
         # The option does exist, let's get it and ensure it's valid
         value = self._options[key].value
 
-        registered_values = (v.value for v in self._options_us[key].values)
-        if value not in registered_values:
+        if not self._is_legal(key, value):
             # Return the default value if the current value isn't in the definition,
             # but don't actually change the value in the dict
             # (RetroArch does this to handle cases like updated options)
@@ -133,6 +160,7 @@ class DictOptionDriver(OptionDriver):
                 f"Option {key!r} has no default value, it should've been filtered out when initializing"
             )
 
+        self._resolved[key] = value
         return value
 
     @override
@@ -159,7 +187,7 @@ class DictOptionDriver(OptionDriver):
                     default_value=values[0],
                 )
 
-        self._variables_dirty = True
+        self._reindex()
 
     @property
     @override
@@ -193,7 +221,7 @@ class DictOptionDriver(OptionDriver):
                 )
                 self._options_us[o.key] = opt
 
-        self._variables_dirty = True
+        self._reindex()
 
     @override
     def set_options_intl(self, options: retro_core_options_intl | None):
@@ -229,7 +257,7 @@ class DictOptionDriver(OptionDriver):
                         default_value=o.default_value,
                     )
 
-        self._variables_dirty = True
+        self._reindex()
 
     @override
     def set_display(self, key: bytes, visible: bool):
@@ -268,7 +296,7 @@ class DictOptionDriver(OptionDriver):
                 if o.key:
                     self._options_us[o.key] = deepcopy(o)
 
-        self._variables_dirty = True
+        self._reindex()
 
     @override
     def set_options_v2_intl(self, options: retro_core_options_v2_intl | None):
@@ -294,7 +322,7 @@ class DictOptionDriver(OptionDriver):
                     if o.key:
                         self._options_intl[o.key] = deepcopy(o)
 
-        self._variables_dirty = True
+        self._reindex()
 
     @property
     @override
@@ -327,8 +355,7 @@ class DictOptionDriver(OptionDriver):
         if var not in self._options_us:
             return False
 
-        values = self._options_us[var].values
-        if not any(value == v.value for v in values):
+        if not self._is_legal(var, value):
             return False
 
         if var in self._options:
@@ -336,6 +363,7 @@ class DictOptionDriver(OptionDriver):
         else:
             self._options[var] = _Option(value=value, visible=True)
 
+        self._resolved.pop(var, None)
         self._variables_dirty = True
 
         return True
@@ -397,15 +425,14 @@ class DictOptionDriver(OptionDriver):
             v = as_bytes(value)
 
             option_def = self._options._options_us.get(k, None)
-            is_value_valid = option_def is not None and any(
-                v == opt.value for opt in option_def.values
-            )
+            is_value_valid = self._options._is_legal(k, v)
 
             if existing_option := self._options._options.get(k, None):
                 existing_option.value = v
             else:
                 self._options._options[k] = _Option(value=v, visible=True)
 
+            self._options._resolved.pop(k, None)
             if option_def and is_value_valid:
                 if self._options._update_display_callback:
                     self._options._update_display_callback()
@@ -422,6 +449,7 @@ class DictOptionDriver(OptionDriver):
             k = as_bytes(key)
             if k in self._options._options:
                 del self._options._options[k]
+                self._options._resolved.pop(k, None)
 
         @override
         def __len__(self):
@@ -9,3 +9,4 @@ Driver protocols and implementations for the performance counter interface.
 
 from .default import *
 from .driver import *
+from .histogram import *
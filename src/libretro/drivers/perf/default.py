@@ -12,6 +12,7 @@ from time import process_time_ns, time_ns
 from typing import override
 
 from libretro.api.perf import CpuFeatures, retro_perf_counter
+from libretro.drivers.clock import VirtualClock
 
 from .driver import PerfDriver
 
@@ -21,7 +22,8 @@ class DefaultPerfDriver(PerfDriver):
     The default :class:`.PerfDriver` used when a :class:`.Session` is given no other.
 
     Backed by the standard :mod:`time` module
-    (:func:`time.time_ns` for wall-clock and :func:`time.process_time_ns` for the perf counter).
+    (:func:`time.time_ns` for wall-clock and :func:`time.process_time_ns` for the perf counter),
+    or by a :class:`.VirtualClock` if one is given.
 
     .. seealso::
 
@@ -29,10 +31,23 @@ class DefaultPerfDriver(PerfDriver):
             The protocol this class implements.
     """
 
-    def __init__(self):
-        """Initialize the driver with an empty performance-counter registry."""
+    def __init__(self, clock: VirtualClock | None = None):
+        """
+        Initialize the driver with an empty performance-counter registry.
+
+        :param clock: If given, both the wall-clock time and the perf counter
+            are read from this clock instead of the host's,
+            so the times a core observes depend only on how many frames it has run.
+            Perf counters then measure virtual time,
+            so a counter started and stopped within one frame totals zero.
+        :raises TypeError: If ``clock`` is neither a :class:`.VirtualClock` nor :obj:`None`.
+        """
         super().__init__()
         self._perf_counters: dict[bytes, retro_perf_counter] = {}
+        if clock is not None and not isinstance(clock, VirtualClock):
+            raise TypeError(f"Expected VirtualClock or None, got {type(clock).__name__}")
+
+        self._clock = clock
 
     def __del__(self):
         """Drop references to the registered counters before this driver is collected."""
@@ -45,12 +60,23 @@ class DefaultPerfDriver(PerfDriver):
         """A live mapping of registered performance-counter identifiers to their structs."""
         return self._perf_counters
 
+    @property
+    def clock(self) -> VirtualClock | None:
+        """The :class:`.VirtualClock` this driver reads, or :obj:`None` if it reads the host's clocks."""
+        return self._clock
+
     @override
     def get_time_usec(self) -> int:
+        if self._clock is not None:
+            return self._clock.usec
+
         return time_ns() // 1000
 
     @override
     def get_perf_counter(self) -> int:
+        if self._clock is not None:
+            return self._clock.ns
+
         return process_time_ns()
 
     @override
@@ -7,5 +7,6 @@ Driver protocols and implementations for accelerometer and gyroscope sensors.
         The matching :mod:`ctypes` types and callback definitions.
 """
 
+from .array import *
 from .driver import *
 from .iterable import *
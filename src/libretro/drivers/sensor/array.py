@@ -0,0 +1,175 @@
+"""
+Preloaded sensor recordings for :class:`.IterableSensorDriver`.
+
+.. seealso::
+
+    :class:`.IterableSensorDriver`
+        Replays a :class:`SensorArray` one frame at a time.
+"""
+
+import mmap
+import os
+from collections.abc import Buffer
+from os import PathLike
+from typing import Literal
+
+from libretro.api.sensor import Sensor
+
+SENSOR_COUNT = len(Sensor)
+"""The number of readings stored for each port in each frame of a :class:`SensorArray`."""
+
+type SensorArrayFormat = Literal["f", "d"]
+"""The :mod:`struct` format of a :class:`SensorArray`'s elements: ``float`` or ``double``."""
+
+
+class SensorArray:
+    """
+    A recording of sensor readings,
+    indexed by frame, port, and :class:`.Sensor`.
+
+    Readings are read straight out of the underlying buffer,
+    so a :class:`.IterableSensorDriver` that replays one
+    doesn't allocate or pattern-match anything per frame.
+    Any C-contiguous buffer of native-endian ``float`` or ``double`` values works,
+    including a NumPy array of shape ``(frames, ports, 7)``
+    and a memory-mapped recording (see :meth:`from_file`).
+
+    >>> from array import array
+    >>> from libretro.api import Sensor
+    >>> from libretro.drivers import SensorArray
+    >>> readings = SensorArray(array("f", [0.5] * 7 + [1.0] * 7), ports=1)
+    >>> len(readings), readings.ports
+    (2, 1)
+    >>> readings[1, 0, Sensor.GYROSCOPE_Y]
+    1.0
+    """
+
+    __slots__ = ("_view", "_ports", "_mmap")
+
+    def __init__(
+        self,
+        readings: Buffer,
+        *,
+        ports: int | None = None,
+        format: SensorArrayFormat = "f",
+    ):
+        """
+        Wrap a buffer of sensor readings without copying it.
+
+        :param readings: The readings to replay.
+            If it has three dimensions (e.g. a NumPy array),
+            they're interpreted as ``(frames, ports, sensors)``.
+            Otherwise it's treated as a flat sequence of elements in that order.
+        :param ports: The number of ports that each frame contains readings for.
+            Required unless ``readings`` has three dimensions.
+        :param format: The element type of ``readings``
+            if it doesn't declare one (e.g. :class:`bytes` or :class:`mmap.mmap`).
+        :raises ValueError: If ``readings`` isn't C-contiguous,
+            contains elements that aren't ``float`` or ``double``,
+            or can't be evenly divided into at least one frame.
+        """
+        view = memoryview(readings)
+        if not view.c_contiguous:
+            raise ValueError("Sensor readings must be C-contiguous")
+
+        match view.format:
+            case "f" | "d" as f:
+                format = f
+            case "B" | "b" | "c":
+                pass
+            case f:
+                raise ValueError(f"Expected float or double sensor readings, got format {f!r}")
+
+        if view.ndim == 3:
+            if view.shape is None or view.shape[2] != SENSOR_COUNT:
+                raise ValueError(f"Expected {SENSOR_COUNT} readings per port, got {view.shape}")
+            ports = view.shape[1]
+
+        if ports is None or ports < 1:
+            raise ValueError(f"Expected a positive number of ports, got {ports}")
+
+        frames = _frame_count(view.nbytes, ports, format)
+        if frames == 0:
+            # memoryview.cast rejects views with a zero in their shape
+            raise ValueError("Sensor readings must contain at least one frame")
+
+        self._view = view.cast("B").cast(format, (frames, ports, SENSOR_COUNT))
+        self._ports = ports
+        self._mmap: mmap.mmap | None = None
+
+    @classmethod
+    def from_file(
+        cls,
+        path: str | PathLike[str],
+        *,
+        ports: int = 1,
+        format: SensorArrayFormat = "f",
+    ) -> "SensorArray":
+        """
+        Memory-map a raw recording of sensor readings.
+
+        The file is read lazily by the OS as frames are replayed,
+        so recordings larger than memory are fine.
+
+        :param path: Path to a file of native-endian ``float`` or ``double`` values,
+            laid out as ``(frames, ports, sensors)``.
+        :param ports: The number of ports that each frame contains readings for.
+        :param format: The element type of the file.
+        :return: A :class:`SensorArray` backed by the mapped file.
+            Call :meth:`close` to unmap it.
+        :raises ValueError: If the file is empty or can't be evenly divided into frames.
+        """
+        if ports < 1:
+            raise ValueError(f"Expected a positive number of ports, got {ports}")
+
+        with open(path, "rb") as f:
+            # Check the layout before mapping,
+            # since a map can't be closed while a failed constructor's views still export it
+            size = os.fstat(f.fileno()).st_size
+            if _frame_count(size, ports, format) == 0:
+                raise ValueError(f"Sensor recording {os.fsdecode(path)!r} is empty")
+
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        readings = cls(mapped, ports=ports, format=format)
+
+        readings._mmap = mapped
+        return readings
+
+    def __len__(self) -> int:
+        """Return the number of frames in this recording."""
+        return len(self._view)
+
+    def __getitem__(self, item: tuple[int, int, int]) -> float:
+        """Return the reading for a ``(frame, port, sensor)`` triple."""
+        return self._view[item]
+
+    @property
+    def ports(self) -> int:
+        """The number of ports that each frame contains readings for."""
+        return self._ports
+
+    def close(self) -> None:
+        """Release the underlying buffer, unmapping it if it came from :meth:`from_file`."""
+        self._view.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+
+def _frame_count(size: int, ports: int, format: SensorArrayFormat) -> int:
+    frame_size = ports * SENSOR_COUNT * (4 if format == "f" else 8)
+    frames, remainder = divmod(size, frame_size)
+    if remainder:
+        raise ValueError(
+            f"Sensor readings are {size} bytes, not a multiple of the {frame_size}-byte frame size"
+        )
+
+    return frames
+
+
+__all__ = [
+    "SENSOR_COUNT",
+    "SensorArray",
+    "SensorArrayFormat",
+]
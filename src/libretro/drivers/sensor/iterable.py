@@ -10,11 +10,13 @@
 from collections import defaultdict
 from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
 from dataclasses import dataclass, field
+from operator import attrgetter
 from typing import override
 
 from libretro.api.input import Port
 from libretro.api.sensor import Sensor, SensorAction, SensorType
 
+from .array import SensorArray
 from .driver import SensorDriver
 
 
@@ -98,6 +100,13 @@ SensorStateIterable = Iterable[SensorPollResult | Sequence[SensorPollResult]]
 SensorStateGenerator = Callable[[], SensorStateIterator]
 SensorStateSource = SensorStateIterator | SensorStateIterable | SensorStateGenerator
 
+# Indexed by Sensor, so a reading's enabled state can be found without a match statement
+_SENSOR_STATES: tuple[Callable[[PortState], SensorState], ...] = (
+    *(attrgetter("accelerometer"),) * 3,
+    *(attrgetter("gyroscope"),) * 3,
+    attrgetter("illuminance"),
+)
+
 
 class IterableSensorDriver(SensorDriver):
     """
@@ -105,12 +114,16 @@ class IterableSensorDriver(SensorDriver):
     from the output of an iterator.
     """
 
-    def __init__(self, source: SensorStateSource | None = None):
+    def __init__(self, source: SensorStateSource | SensorArray | None = None):
         """
         Initialize this sensor driver.
         If a sensor is disabled, then it will always output 0.0.
 
-        :param source: An iterator or iterable whose elements are each one of the following:
+        :param source: A :class:`.SensorArray`,
+            in which case each :meth:`poll` advances to its next frame
+            and readings are looked up directly
+            (ports beyond the array's and frames past its end read as 0.0).
+            Otherwise, an iterator or iterable whose elements are each one of the following:
 
             :obj:`None`
                 All sensors on all ports will return 0.0.
@@ -132,7 +145,9 @@ class IterableSensorDriver(SensorDriver):
                 for its corresponding port's sensor readings
                 based on the aforementioned rules.
         """
-        self._generator = source
+        self._array = source if isinstance(source, SensorArray) else None
+        self._frame = -1
+        self._generator = None if isinstance(source, SensorArray) else source
         self._generator_state: SensorStateIterator | None = None
         self._poll_result: SensorPollResult | Sequence[SensorPollResult] | None = None
         self._ports: defaultdict[Port, PortState] = defaultdict(PortState)
@@ -144,6 +159,10 @@ class IterableSensorDriver(SensorDriver):
 
     @override
     def poll(self) -> None:
+        if self._array is not None:
+            self._frame += 1
+            return
+
         if not self._generator:
             return
 
@@ -187,6 +206,17 @@ class IterableSensorDriver(SensorDriver):
 
     @override
     def get_sensor_input(self, port: Port, sensor: Sensor) -> float:
+        if (array := self._array) is not None:
+            frame = self._frame
+            if not 0 <= frame < len(array) or port >= array.ports:
+                return 0.0
+
+            state = self._ports.get(port)
+            if state is None or not _SENSOR_STATES[sensor](state).enabled:
+                return 0.0
+
+            return array[frame, port, sensor]
+
         if not self._generator:
             # An unassigned generator will default to 0
             return 0.0
@@ -9,3 +9,5 @@ Driver protocols and implementations for frame and audio timing.
 
 from .default import *
 from .driver import *
+from .pacing import *
+from .virtual import *
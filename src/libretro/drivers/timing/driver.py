@@ -10,6 +10,7 @@
 from abc import abstractmethod
 from typing import Protocol, runtime_checkable
 
+from libretro.api.av import retro_system_av_info
 from libretro.api.timing import (
     retro_fastforwarding_override,
     retro_frame_time_callback,
@@ -64,6 +65,26 @@ class TimingDriver(Protocol):
         if callback:
             callback(time if time is not None else callback.reference)
 
+    @property
+    def system_av_info(self) -> retro_system_av_info | None:
+        """
+        The AV info most recently set by the core, if this driver uses it.
+
+        Assigned by :class:`.Session` when content is loaded
+        and whenever the core calls ``RETRO_ENVIRONMENT_SET_SYSTEM_AV_INFO``,
+        as with :attr:`.VideoDriver.system_av_info` and :attr:`.AudioDriver.system_av_info`.
+        Optional; by default it's ignored and reads as :obj:`None`.
+        Drivers that pace frames to the core's frame rate should override it.
+
+        :param info: The :class:`~libretro.api.av.retro_system_av_info` reported by the core.
+        """
+        return None
+
+    @system_av_info.setter
+    def system_av_info(self, info: retro_system_av_info) -> None:
+        """See :attr:`system_av_info`."""
+        pass
+
     @property
     @abstractmethod
     def fastforwarding_override(self) -> retro_fastforwarding_override | None:
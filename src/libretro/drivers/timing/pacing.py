@@ -0,0 +1,299 @@
+"""
+:class:`.TimingDriver` implementation that paces frames to the core's frame rate in real time.
+
+.. seealso::
+
+    :class:`.TimingDriver`
+        The protocol this driver implements.
+"""
+
+import time
+from collections.abc import Callable
+from copy import deepcopy
+from typing import override
+
+from libretro.api.av import retro_system_av_info
+from libretro.api.timing import ThrottleMode, retro_throttle_state
+
+from .default import DefaultTimingDriver
+
+_UNPACED_MODES = frozenset(
+    (ThrottleMode.FRAME_STEPPING, ThrottleMode.FAST_FORWARD, ThrottleMode.UNBLOCKED)
+)
+
+
+class PacingTimingDriver(DefaultTimingDriver):
+    """
+    A :class:`.TimingDriver` that holds each frame back until its turn comes,
+    so that a :class:`.Session` runs at the core's own frame rate
+    instead of as fast as possible.
+
+    :meth:`.Session.run` calls :meth:`frame_time` once per frame, before ``retro_run``;
+    this driver sleeps until shortly before the frame is due,
+    then spins for the remainder to keep jitter low.
+    The core's frame-time callback, if any,
+    receives the real number of microseconds elapsed since the previous frame.
+
+    The pace depends on :attr:`mode`:
+
+    - :attr:`~.ThrottleMode.NONE`, :attr:`~.ThrottleMode.REWINDING`:
+      :attr:`fps` frames per second.
+    - :attr:`~.ThrottleMode.VSYNC`: :attr:`target_refresh_rate` frames per second.
+    - :attr:`~.ThrottleMode.SLOW_MOTION`: :attr:`fps` divided by ``slowmotion_ratio``.
+    - :attr:`~.ThrottleMode.FAST_FORWARD`: :attr:`fps` multiplied by ``fastforward_ratio``,
+      or the core's own ratio if it has set a :attr:`fastforwarding_override`.
+      Ratios below 1 are unthrottled.
+    - :attr:`~.ThrottleMode.FRAME_STEPPING`, :attr:`~.ThrottleMode.UNBLOCKED`: unthrottled.
+
+    If the core sets a :attr:`fastforwarding_override`,
+    its ``fastforward`` flag takes precedence over :attr:`mode`
+    whenever it's set or ``inhibit_toggle`` is.
+    The throttle state reported to the core always reflects the effective mode and rate.
+
+    Headless sessions that want to run as fast as possible
+    should keep using :class:`.DefaultTimingDriver`.
+
+    >>> from libretro.drivers import PacingTimingDriver
+    >>> PacingTimingDriver(50.0).rate
+    50.0
+    """
+
+    def __init__(
+        self,
+        fps: float | None = None,
+        *,
+        mode: ThrottleMode = ThrottleMode.NONE,
+        fastforward_ratio: float = 0.0,
+        slowmotion_ratio: float = 3.0,
+        target_refresh_rate: float | None = 60.0,
+        spin: float = 0.002,
+        clock: Callable[[], int] = time.perf_counter_ns,
+        sleep: Callable[[float], object] = time.sleep,
+    ):
+        """
+        Initialize the driver.
+
+        :param fps: The frame rate to pace to in :attr:`~.ThrottleMode.NONE` mode.
+            If :obj:`None`, the core's reported ``retro_system_timing.fps`` is used
+            once the session assigns :attr:`system_av_info`.
+        :param mode: The initial throttle mode.
+        :param fastforward_ratio: The speed multiplier used in :attr:`~.ThrottleMode.FAST_FORWARD` mode.
+            Values below 1 (including the default of 0) fast-forward without limit.
+        :param slowmotion_ratio: The speed divisor used in :attr:`~.ThrottleMode.SLOW_MOTION` mode.
+        :param target_refresh_rate: The display refresh rate in Hz to report to the core
+            and to pace to in :attr:`~.ThrottleMode.VSYNC` mode,
+            or :obj:`None` to report none.
+        :param spin: How many seconds before each frame is due to stop sleeping and start spinning.
+            Larger values reduce jitter at the cost of CPU time.
+        :param clock: Returns the current time in nanoseconds.
+            Must be monotonic.
+        :param sleep: Blocks for the given number of seconds.
+        :raises ValueError: If ``fps`` or ``slowmotion_ratio`` isn't positive,
+            or if ``spin`` is negative.
+        """
+        if fps is not None and fps <= 0:
+            raise ValueError(f"fps must be positive, not {fps}")
+
+        if slowmotion_ratio <= 0:
+            raise ValueError(f"slowmotion_ratio must be positive, not {slowmotion_ratio}")
+
+        if spin < 0:
+            raise ValueError(f"spin must not be negative, not {spin}")
+
+        super().__init__(None, target_refresh_rate)
+        self._fps = fps
+        self._system_av_info: retro_system_av_info | None = None
+        self._mode = ThrottleMode(mode)
+        self._fastforward_ratio = fastforward_ratio
+        self._slowmotion_ratio = slowmotion_ratio
+        self._spin = round(spin * 1_000_000_000)
+        self._clock = clock
+        self._sleep = sleep
+        self._deadline: int | None = None
+        self._last: int | None = None
+        self._elapsed: int | None = None
+
+    @property
+    @override
+    def system_av_info(self) -> retro_system_av_info | None:
+        """
+        The AV info most recently set by the core.
+
+        Assigned by :class:`.Session` when content is loaded
+        and whenever the core calls ``RETRO_ENVIRONMENT_SET_SYSTEM_AV_INFO``;
+        supplies :attr:`fps` if none was given explicitly.
+
+        :raises TypeError: If assigned something other than a :class:`.retro_system_av_info`.
+        """
+        return self._system_av_info
+
+    @system_av_info.setter
+    @override
+    def system_av_info(self, info: retro_system_av_info) -> None:
+        if not isinstance(info, retro_system_av_info):
+            raise TypeError(f"info must be a retro_system_av_info, not {type(info).__name__}")
+
+        self._system_av_info = deepcopy(info)
+
+    @property
+    def fps(self) -> float | None:
+        """
+        The core's nominal frame rate,
+        or :obj:`None` if neither the constructor nor the core has provided one.
+        """
+        if self._fps is not None:
+            return self._fps
+
+        if self._system_av_info is not None and self._system_av_info.timing.fps > 0:
+            return self._system_av_info.timing.fps
+
+        return None
+
+    @property
+    def mode(self) -> ThrottleMode:
+        """
+        The throttle mode selected by the frontend.
+
+        May differ from the mode reported to the core
+        if the core has set a :attr:`fastforwarding_override`.
+        """
+        return self._mode
+
+    @mode.setter
+    def mode(self, value: ThrottleMode) -> None:
+        self._mode = ThrottleMode(value)
+        self._deadline = None
+
+    @property
+    def effective_mode(self) -> ThrottleMode:
+        """The throttle mode after applying the core's :attr:`fastforwarding_override`, if any."""
+        override = self.fastforwarding_override
+        if override is not None and (override.fastforward or override.inhibit_toggle):
+            if override.fastforward:
+                return ThrottleMode.FAST_FORWARD
+
+            if self._mode == ThrottleMode.FAST_FORWARD:
+                return ThrottleMode.NONE
+
+        return self._mode
+
+    @property
+    def rate(self) -> float:
+        """
+        The number of frames per second this driver currently paces to,
+        or 0 if it isn't pacing.
+        """
+        fps = self.fps or 0.0
+        match self.effective_mode:
+            case ThrottleMode.VSYNC:
+                return self.target_refresh_rate or fps
+            case ThrottleMode.SLOW_MOTION:
+                return fps / self._slowmotion_ratio
+            case ThrottleMode.FAST_FORWARD:
+                override = self.fastforwarding_override
+                ratio = self._fastforward_ratio
+                if override is not None and override.fastforward and override.ratio >= 0:
+                    ratio = override.ratio
+
+                return fps * ratio if ratio >= 1 else 0.0
+            case ThrottleMode.FRAME_STEPPING | ThrottleMode.UNBLOCKED:
+                return 0.0
+            case _:
+                return fps
+
+    @property
+    def elapsed(self) -> int | None:
+        """
+        The number of microseconds passed to the core for the most recent frame,
+        or :obj:`None` if no frame has been paced yet.
+        """
+        return self._elapsed
+
+    @property
+    @override
+    def throttle_state(self) -> retro_throttle_state:
+        """
+        The :attr:`effective_mode` and :attr:`rate`, in frames per second.
+
+        Assigning a throttle state sets :attr:`mode`; its ``rate`` is ignored.
+        Deleting it resets :attr:`mode` to :attr:`~.ThrottleMode.NONE`.
+        """
+        return retro_throttle_state(self.effective_mode, self.rate)
+
+    @throttle_state.setter
+    @override
+    def throttle_state(self, value: retro_throttle_state) -> None:
+        if not isinstance(value, retro_throttle_state):
+            raise TypeError(f"value must be a retro_throttle_state, not {type(value).__name__}")
+
+        self.mode = ThrottleMode(value.mode)
+
+    @throttle_state.deleter
+    @override
+    def throttle_state(self) -> None:
+        self.mode = ThrottleMode.NONE
+
+    @override
+    def frame_time(self, time: int | None) -> None:
+        """
+        Wait until the next frame is due, then invoke the registered :attr:`frame_time_callback`.
+
+        :param time: Microseconds to report to the core,
+            or :obj:`None` to report the real time elapsed since the previous call.
+            The callback's reference time is reported instead
+            on the first frame after :meth:`reset`,
+            and while the :attr:`effective_mode` is fast-forwarding, frame stepping, or unblocked.
+            In slow motion, the elapsed time is divided by ``slowmotion_ratio``.
+        """
+        now = self._wait()
+        last, self._last = self._last, now
+
+        if time is None:
+            mode = self.effective_mode
+            if last is not None and mode not in _UNPACED_MODES:
+                time = (now - last) // 1000
+                if mode == ThrottleMode.SLOW_MOTION:
+                    time = round(time / self._slowmotion_ratio)
+
+        callback = self.frame_time_callback
+        if callback:
+            self._elapsed = time if time is not None else callback.reference
+            callback(self._elapsed)
+
+    def reset(self) -> None:
+        """
+        Forget when the previous frame ran,
+        so that the next frame runs immediately and reports the reference frame time.
+
+        Call this after pausing a session, so the pause isn't reported to the core.
+        """
+        self._deadline = None
+        self._last = None
+
+    def _wait(self) -> int:
+        rate = self.rate
+        now = self._clock()
+        if rate <= 0:
+            self._deadline = None
+            return now
+
+        period = round(1_000_000_000 / rate)
+        deadline = self._deadline
+        if deadline is not None:
+            remaining = deadline - now
+            if remaining > self._spin:
+                self._sleep((remaining - self._spin) / 1_000_000_000)
+
+            while (now := self._clock()) < deadline:
+                pass
+
+        if deadline is None or now - deadline >= period:
+            # Start over instead of running a burst of frames to catch up
+            self._deadline = now + period
+        else:
+            self._deadline = deadline + period
+
+        return now
+
+
+__all__ = ["PacingTimingDriver"]
@@ -0,0 +1,96 @@
+"""
+:class:`.TimingDriver` implementation that advances a :class:`.VirtualClock` instead of waiting.
+
+.. seealso::
+
+    :class:`.TimingDriver`
+        The protocol this driver implements.
+"""
+
+from typing import override
+
+from libretro.api.timing import ThrottleMode
+from libretro.drivers.clock import VirtualClock
+
+from .pacing import PacingTimingDriver
+
+
+class VirtualTimingDriver(PacingTimingDriver):
+    """
+    A :class:`.PacingTimingDriver` that never waits;
+    each call to :meth:`frame_time`, made once per :meth:`.Session.run`,
+    advances a :class:`.VirtualClock` by exactly one frame period instead.
+
+    The frame period follows the same rules as :class:`.PacingTimingDriver`:
+    it's the reciprocal of :attr:`rate`,
+    or of :attr:`fps` in modes that aren't paced (e.g. :attr:`~.ThrottleMode.UNBLOCKED`).
+    The core's frame-time callback is passed the virtual time elapsed since the previous frame,
+    so it, the clock, and anything else reading the clock
+    see the same times on every run no matter how fast the host is.
+    If the core hasn't reported a frame rate, :attr:`target_refresh_rate` is used,
+    then 60 frames per second.
+
+    >>> from libretro.drivers import VirtualClock, VirtualTimingDriver
+    >>> clock = VirtualClock()
+    >>> timing = VirtualTimingDriver(clock, 50.0)
+    >>> for _ in range(3):
+    ...     timing.frame_time(None)
+    >>> clock.ns
+    60000000
+    """
+
+    def __init__(
+        self,
+        clock: VirtualClock,
+        fps: float | None = None,
+        *,
+        mode: ThrottleMode = ThrottleMode.NONE,
+        fastforward_ratio: float = 0.0,
+        slowmotion_ratio: float = 3.0,
+        target_refresh_rate: float | None = 60.0,
+    ):
+        """
+        Initialize the driver.
+
+        :param clock: The clock to advance once per frame.
+        :param fps: The nominal frame rate.
+            If :obj:`None`, the core's reported ``retro_system_timing.fps`` is used
+            once the session assigns :attr:`system_av_info`.
+        :param mode: The initial throttle mode.
+        :param fastforward_ratio: See :class:`.PacingTimingDriver`.
+        :param slowmotion_ratio: See :class:`.PacingTimingDriver`.
+        :param target_refresh_rate: See :class:`.PacingTimingDriver`.
+        :raises TypeError: If ``clock`` isn't a :class:`.VirtualClock`.
+        :raises ValueError: If ``fps`` or ``slowmotion_ratio`` isn't positive.
+        """
+        if not isinstance(clock, VirtualClock):
+            raise TypeError(f"Expected VirtualClock, got {type(clock).__name__}")
+
+        super().__init__(
+            fps,
+            mode=mode,
+            fastforward_ratio=fastforward_ratio,
+            slowmotion_ratio=slowmotion_ratio,
+            target_refresh_rate=target_refresh_rate,
+            clock=clock,
+        )
+        self._virtual_clock = clock
+
+    @property
+    def clock(self) -> VirtualClock:
+        """The clock this driver advances."""
+        return self._virtual_clock
+
+    @property
+    def period(self) -> int:
+        """The number of nanoseconds the next frame will advance :attr:`clock` by."""
+        rate = self.rate or self.fps or self.target_refresh_rate or 60.0
+        return round(1_000_000_000 / rate)
+
+    @override
+    def _wait(self) -> int:
+        self._virtual_clock.advance(self.period)
+        return self._virtual_clock.ns
+
+
+__all__ = ["VirtualTimingDriver"]
@@ -12,8 +12,16 @@ Includes a software fallback and optional hardware-accelerated backends.
 from .driver import *
 from .multi import *
 from .software import *
+from .wrapper import *
 
 try:
     from .opengl import *
 except ImportError:
     pass
+
+try:
+    from .capture import *
+    from .convert import *
+    from .recording import *
+except ImportError:
+    pass
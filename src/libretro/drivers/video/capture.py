@@ -0,0 +1,464 @@
+"""
+Post-process captured frames on worker threads while the core keeps running.
+
+Requires :mod:`numpy`, which is installed with the ``numpy`` extra.
+
+.. seealso::
+
+    :meth:`.VideoDriver.screenshot`
+        The synchronous alternative.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import struct
+import threading
+import zlib
+from collections.abc import Buffer, Callable
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from enum import Enum
+from functools import partial
+from typing import Any, NamedTuple, final, override
+
+import numpy as np
+
+from libretro.api.video import PixelFormat
+
+from .convert import RgbFrame, frame_to_rgb
+from .driver import FrameBufferSpecial, Screenshot, VideoDriver
+from .software import NullVideoDriver
+from .wrapper import VideoDriverWrapper
+
+type FrameTask[T] = Callable[[RgbFrame], T]
+"""
+Called on a worker thread with a captured frame;
+its return value becomes the result of the frame's :class:`~concurrent.futures.Future`.
+"""
+
+
+class Backpressure(Enum):
+    """What a :class:`CapturePipeline` does with a frame when it's already at capacity."""
+
+    BLOCK = "block"
+    """Wait for a worker to finish a frame. Nothing is lost, but the core is slowed down."""
+
+    DROP = "drop"
+    """Don't capture the frame; its future is returned already cancelled."""
+
+    RAISE = "raise"
+    """Raise a :exc:`CaptureBacklogError`."""
+
+
+class CaptureBacklogError(RuntimeError):
+    """
+    Raised when a frame is submitted to a full :class:`CapturePipeline`
+    that was created with :attr:`Backpressure.RAISE`.
+    """
+
+    pass
+
+
+class FrameComparison(NamedTuple):
+    """The result of comparing a frame to a reference image with :func:`compare_to`."""
+
+    matches: bool
+    """:obj:`True` if the frames have the same size and no channel differs by more than the tolerance."""
+    differing_pixels: int
+    """The number of pixels with at least one channel outside the tolerance."""
+    max_difference: int
+    """The largest difference between any two corresponding channels."""
+
+
+def frame_digest(frame: RgbFrame) -> str:
+    """
+    Hash a frame's pixels and dimensions.
+
+    :param frame: The frame to hash.
+    :return: The SHA-256 digest as a hexadecimal string.
+        Frames with identical pixels have identical digests.
+    """
+    digest = hashlib.sha256(np.asarray(frame.shape, "<u4").tobytes())
+    digest.update(np.ascontiguousarray(frame).data)
+    return digest.hexdigest()
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def encode_png(frame: RgbFrame, level: int = 6) -> bytes:
+    r"""
+    Encode a frame as an 8-bit RGB PNG.
+
+    >>> import numpy as np
+    >>> from libretro.drivers.video.capture import encode_png
+    >>> encode_png(np.zeros((1, 1, 3), np.uint8))[:8]
+    b'\x89PNG\r\n\x1a\n'
+
+    :param frame: The frame to encode.
+    :param level: The :mod:`zlib` compression level, from 0 (fastest) to 9 (smallest).
+    :return: The contents of a PNG file.
+    """
+    height, width = frame.shape[:2]
+    # Each row is prefixed with filter type 0 (none)
+    rows = np.zeros((height, width * 3 + 1), np.uint8)
+    rows[:, 1:] = frame.reshape(height, width * 3)
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return b"".join(
+        (
+            b"\x89PNG\r\n\x1a\n",
+            _png_chunk(b"IHDR", header),
+            _png_chunk(b"IDAT", zlib.compress(rows.data, level)),
+            _png_chunk(b"IEND", b""),
+        )
+    )
+
+
+def save_png(path: str | os.PathLike[str], level: int = 6) -> FrameTask[str | os.PathLike[str]]:
+    """
+    Make a task that writes its frame to a PNG file.
+
+    :param path: Where to write the file.
+    :param level: The :mod:`zlib` compression level, from 0 (fastest) to 9 (smallest).
+    :return: A task that returns ``path`` once the file is written.
+    """
+
+    def _save(frame: RgbFrame) -> str | os.PathLike[str]:
+        with open(path, "wb") as file:
+            file.write(encode_png(frame, level))
+
+        return path
+
+    return _save
+
+
+def compare_to(
+    expected: RgbFrame | str | os.PathLike[str], tolerance: int = 0
+) -> FrameTask[FrameComparison]:
+    """
+    Make a task that compares its frame to a reference ("golden") image.
+
+    :param expected: The reference image,
+        or the path to one saved with :func:`numpy.save`.
+        Loaded once, when this function is called.
+    :param tolerance: The largest difference allowed between corresponding channels.
+    :return: A task that returns a :class:`FrameComparison`.
+    :raises ValueError: If ``tolerance`` is negative.
+    """
+    if tolerance < 0:
+        raise ValueError(f"Expected tolerance to be at least 0, got {tolerance}")
+
+    reference = np.load(expected) if isinstance(expected, (str, os.PathLike)) else expected
+    reference = reference.astype(np.int16)
+
+    def _compare(frame: RgbFrame) -> FrameComparison:
+        if frame.shape != reference.shape:
+            return FrameComparison(False, frame.shape[0] * frame.shape[1], 255)
+
+        difference = np.abs(frame.astype(np.int16) - reference)
+        differing = int(np.count_nonzero((difference > tolerance).any(axis=-1)))
+        return FrameComparison(differing == 0, differing, int(difference.max(initial=0)))
+
+    return _compare
+
+
+class CapturePipeline:
+    """
+    Converts and processes captured frames on a pool of worker threads.
+
+    Submitting a frame copies its pixels into a recycled buffer and returns immediately;
+    conversion to RGB and the frame's :obj:`FrameTask`
+    (e.g. :func:`frame_digest`, :func:`encode_png`, or :func:`compare_to`)
+    run on a worker thread,
+    and the task's result is delivered through a :class:`~concurrent.futures.Future`.
+
+    At most ``max_pending`` frames can be in the pipeline at once;
+    ``backpressure`` decides what happens to frames submitted beyond that.
+
+    .. code-block:: python
+
+        with CapturePipeline(workers=2) as pipeline:
+            video = CaptureVideoDriver(pipeline, ArrayVideoDriver())
+            with Session(core, game, video=video) as session:
+                digests = []
+                for _ in range(600):
+                    digests.append(video.capture_next(frame_digest))
+                    session.run()
+
+            print([d.result() for d in digests])
+
+    .. seealso::
+
+        :class:`CaptureVideoDriver`
+            Captures frames from the core without taking a screenshot.
+    """
+
+    def __init__(
+        self,
+        *,
+        workers: int = 1,
+        max_pending: int = 4,
+        backpressure: Backpressure = Backpressure.BLOCK,
+    ):
+        """
+        Start the pipeline's worker threads.
+
+        :param workers: The number of worker threads.
+        :param max_pending: The most frames that can be waiting for or undergoing processing;
+            also the most frame buffers the pipeline will allocate.
+        :param backpressure: What to do with frames submitted while ``max_pending`` frames are in flight.
+        :raises ValueError: If ``workers`` or ``max_pending`` is less than 1.
+        """
+        if workers < 1:
+            raise ValueError(f"Expected workers to be at least 1, got {workers}")
+
+        if max_pending < 1:
+            raise ValueError(f"Expected max_pending to be at least 1, got {max_pending}")
+
+        self._backpressure = backpressure
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="libretro.py capture")
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._pool: list[bytearray] = []
+        self._pool_lock = threading.Lock()
+        self._dropped = 0
+
+    @property
+    def backpressure(self) -> Backpressure:
+        """What happens to frames submitted while the pipeline is full."""
+        return self._backpressure
+
+    @property
+    def dropped(self) -> int:
+        """The number of frames that weren't captured because the pipeline was full."""
+        return self._dropped
+
+    def submit[T](
+        self,
+        task: FrameTask[T],
+        data: Buffer,
+        width: int,
+        height: int,
+        pitch: int,
+        pixel_format: PixelFormat | None,
+    ) -> Future[T]:
+        """
+        Copy a frame into the pipeline and schedule ``task`` to run on it.
+
+        :param task: The function to call with the converted frame.
+        :param data: The frame's pixels, as given to :meth:`.VideoDriver.refresh`.
+            Only needs to remain valid until this method returns.
+        :param width: Width of the frame in pixels.
+        :param height: Height of the frame in pixels.
+        :param pitch: Distance between the start of each row in bytes.
+        :param pixel_format: The format of ``data``, or :obj:`None` if it's 8-bit RGBA.
+        :return: A future that resolves to the task's result,
+            or to the exception it raised.
+            Already cancelled if the frame was dropped.
+        :raises CaptureBacklogError: If the pipeline is full and was created with :attr:`Backpressure.RAISE`.
+        :raises RuntimeError: If the pipeline is closed.
+        """
+        future: Future[T] = Future()
+        match self._backpressure:
+            case Backpressure.BLOCK:
+                self._slots.acquire()
+            case Backpressure.DROP if not self._slots.acquire(blocking=False):
+                self._dropped += 1
+                future.cancel()
+                return future
+            case Backpressure.RAISE if not self._slots.acquire(blocking=False):
+                raise CaptureBacklogError("CapturePipeline is full")
+            case _:
+                pass  # Acquired a slot in the guard
+
+        try:
+            size = height * pitch
+            with self._pool_lock:
+                buffer = self._pool.pop() if self._pool else bytearray(size)
+
+            if len(buffer) < size:
+                buffer = bytearray(size)
+
+            memoryview(buffer)[:size] = memoryview(data).cast("B")[:size]
+            self._executor.submit(
+                self._process, future, task, buffer, width, height, pitch, pixel_format
+            )
+        except BaseException:
+            self._slots.release()
+            raise
+
+        return future
+
+    def submit_screenshot[T](self, task: FrameTask[T], screenshot: Screenshot) -> Future[T]:
+        """
+        Schedule ``task`` to run on a screenshot.
+
+        :param task: The function to call with the converted screenshot.
+        :param screenshot: A screenshot from :meth:`.VideoDriver.screenshot`.
+        :return: A future that resolves to the task's result, as with :meth:`submit`.
+        :raises CaptureBacklogError: If the pipeline is full and was created with :attr:`Backpressure.RAISE`.
+        :raises RuntimeError: If the pipeline is closed.
+        """
+        return self.submit(
+            task, screenshot.data, screenshot.width, screenshot.height, screenshot.width * 4, None
+        )
+
+    def _process(
+        self,
+        future: Future[Any],
+        task: FrameTask[Any],
+        buffer: bytearray,
+        width: int,
+        height: int,
+        pitch: int,
+        pixel_format: PixelFormat | None,
+    ) -> None:
+        try:
+            if not future.set_running_or_notify_cancel():
+                return
+
+            try:
+                frame = frame_to_rgb(buffer, width, height, pitch, pixel_format)
+            finally:
+                # The converted frame doesn't share memory with the buffer
+                with self._pool_lock:
+                    self._pool.append(buffer)
+
+            try:
+                future.set_result(task(frame))
+            except BaseException as e:
+                future.set_exception(e)
+        finally:
+            self._slots.release()
+
+    def close(self, wait: bool = True) -> None:
+        """
+        Stop accepting frames.
+        Frames that were already submitted are still processed.
+
+        :param wait: If :obj:`True`, wait for every submitted frame to be processed.
+        """
+        self._executor.shutdown(wait)
+
+    def __enter__(self) -> CapturePipeline:
+        """Return this pipeline."""
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        """Close this pipeline, waiting for every submitted frame to be processed."""
+        self.close()
+
+
+def _resolve(target: Future[Any], source: Future[Any]) -> None:
+    # Copies the outcome of a pipeline's future to one returned by capture_next
+    if not target.set_running_or_notify_cancel():
+        return  # The caller cancelled the request
+
+    if source.cancelled():
+        target.set_exception(CancelledError("The frame was dropped"))
+    elif (error := source.exception()) is not None:
+        target.set_exception(error)
+    else:
+        target.set_result(source.result())
+
+
+@final
+class CaptureVideoDriver(VideoDriverWrapper):
+    """
+    A :class:`.VideoDriver` that hands frames to a :class:`CapturePipeline`
+    straight from the core, then passes them on to another driver.
+
+    Unlike :meth:`.VideoDriver.screenshot`,
+    this doesn't convert the frame on the emulation thread;
+    the only cost is one copy of the core's framebuffer per captured frame.
+    Frames rendered with a hardware context are read back with the wrapped driver's
+    :meth:`~.VideoDriver.screenshot`, which may stall the emulation thread.
+    """
+
+    def __init__(self, pipeline: CapturePipeline, inner: VideoDriver | None = None):
+        """
+        Wrap a video driver.
+
+        :param pipeline: The pipeline that processes captured frames.
+        :param inner: The driver to pass frames and requests on to.
+            Defaults to a :class:`.NullVideoDriver`.
+        """
+        super().__init__(inner if inner is not None else NullVideoDriver())
+        self._pipeline = pipeline
+        self._requests: list[tuple[Future[Any], FrameTask[Any]]] = []
+
+    @property
+    def pipeline(self) -> CapturePipeline:
+        """The pipeline that processes this driver's captured frames."""
+        return self._pipeline
+
+    def capture_next[T](self, task: FrameTask[T]) -> Future[T]:
+        """
+        Run ``task`` on the next frame the core renders.
+
+        Repeated (duped) frames are skipped;
+        the request stays pending until the core submits a new frame.
+
+        :param task: The function to call with the captured frame.
+        :return: A future that resolves to the task's result.
+            If the pipeline refuses the frame
+            (e.g. it's full and created with :attr:`Backpressure.RAISE`, or it's closed),
+            the future resolves to the exception that :meth:`CapturePipeline.submit` raised.
+        """
+        future: Future[T] = Future()
+        self._requests.append((future, task))
+        return future
+
+    @override
+    def refresh(
+        self, data: memoryview[int] | FrameBufferSpecial, width: int, height: int, pitch: int
+    ) -> None:
+        self._inner.refresh(data, width, height, pitch)
+        if not self._requests:
+            return
+
+        match data:
+            case memoryview():
+                pixel_format: PixelFormat | None = self._inner.pixel_format
+                frame: Buffer = data
+            case FrameBufferSpecial.HARDWARE:
+                screenshot = self._inner.screenshot(prerotate=False)
+                if screenshot is None:
+                    return
+
+                pixel_format = None
+                frame, width, height = screenshot.data, screenshot.width, screenshot.height
+                pitch = width * 4
+            case _:
+                return
+
+        requests, self._requests = self._requests, []
+        for i, (future, task) in enumerate(requests):
+            if future.cancelled():
+                continue
+
+            try:
+                result = self._pipeline.submit(task, frame, width, height, pitch, pixel_format)
+            except BaseException as e:
+                # Fail this request and every one after it instead of leaving them unresolved
+                for pending, _ in requests[i:]:
+                    if pending.set_running_or_notify_cancel():
+                        pending.set_exception(e)
+                raise
+
+            result.add_done_callback(partial(_resolve, future))
+
+
+__all__ = [
+    "Backpressure",
+    "CaptureBacklogError",
+    "CapturePipeline",
+    "CaptureVideoDriver",
+    "FrameComparison",
+    "FrameTask",
+    "compare_to",
+    "encode_png",
+    "frame_digest",
+    "save_png",
+]
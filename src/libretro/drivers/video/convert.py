@@ -0,0 +1,102 @@
+"""
+Vectorized conversions from a core's framebuffer to common pixel layouts.
+
+Requires :mod:`numpy`, which is installed with the ``numpy`` extra.
+
+.. seealso::
+
+    :class:`.RecordingVideoDriver`
+        Converts frames with these functions on a background thread.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Buffer
+
+import numpy as np
+from numpy.typing import NDArray
+
+from libretro.api.video import PixelFormat
+
+type RgbFrame = NDArray[np.uint8]
+"""A frame as an array of shape ``(height, width, 3)``, with channels in RGB order."""
+
+
+def _expand(channel: NDArray[np.integer], bits: int) -> NDArray[np.uint8]:
+    # Scales an n-bit channel to 8 bits by replicating its high bits into the low ones,
+    # so that the maximum value maps to 255
+    return ((channel << (8 - bits)) | (channel >> (2 * bits - 8))).astype(np.uint8)
+
+
+def frame_to_rgb(
+    data: Buffer, width: int, height: int, pitch: int, pixel_format: PixelFormat | None
+) -> RgbFrame:
+    """
+    Convert a frame, as given to :meth:`.VideoDriver.refresh`, to 8-bit RGB.
+
+    >>> from libretro.api import PixelFormat
+    >>> from libretro.drivers.video.convert import frame_to_rgb
+    >>> frame = bytes([0x00, 0x80, 0xFF, 0x00])  # XRGB8888 is stored as BGRX
+    >>> frame_to_rgb(frame, 1, 1, 4, PixelFormat.XRGB8888).tolist()
+    [[[255, 128, 0]]]
+
+    :param data: The frame's pixels.
+    :param width: Width of the frame in pixels.
+    :param height: Height of the frame in pixels.
+    :param pitch: Distance between the start of each row in bytes.
+    :param pixel_format: The format of ``data``,
+        or :obj:`None` if it's already 8-bit RGBA (e.g. from :attr:`.Screenshot.data`).
+    :return: A new array of the frame's pixels;
+        doesn't share memory with ``data``.
+    """
+    match pixel_format:
+        case PixelFormat.XRGB8888:
+            rows = np.frombuffer(data, np.uint8, height * pitch).reshape(height, pitch)
+            return rows[:, : width * 4].reshape(height, width, 4)[..., 2::-1].copy()
+        case None:
+            rows = np.frombuffer(data, np.uint8, height * pitch).reshape(height, pitch)
+            return rows[:, : width * 4].reshape(height, width, 4)[..., :3].copy()
+        case PixelFormat.RGB565:
+            pixels = np.frombuffer(data, np.uint16, height * pitch // 2).reshape(height, -1)
+            pixels = pixels[:, :width]
+            rgb = np.empty((height, width, 3), np.uint8)
+            rgb[..., 0] = _expand((pixels >> 11) & 0x1F, 5)
+            rgb[..., 1] = _expand((pixels >> 5) & 0x3F, 6)
+            rgb[..., 2] = _expand(pixels & 0x1F, 5)
+            return rgb
+        case PixelFormat.RGB1555:
+            pixels = np.frombuffer(data, np.uint16, height * pitch // 2).reshape(height, -1)
+            pixels = pixels[:, :width]
+            rgb = np.empty((height, width, 3), np.uint8)
+            rgb[..., 0] = _expand((pixels >> 10) & 0x1F, 5)
+            rgb[..., 1] = _expand((pixels >> 5) & 0x1F, 5)
+            rgb[..., 2] = _expand(pixels & 0x1F, 5)
+            return rgb
+
+
+def rgb_to_yuv444(rgb: RgbFrame) -> NDArray[np.uint8]:
+    """
+    Convert an RGB frame to planar, limited-range BT.601 Y'CbCr.
+
+    >>> import numpy as np
+    >>> from libretro.drivers.video.convert import rgb_to_yuv444
+    >>> rgb_to_yuv444(np.array([[[255, 255, 255]]], np.uint8)).ravel().tolist()
+    [235, 128, 128]
+
+    :param rgb: The frame to convert.
+    :return: An array of shape ``(3, height, width)``
+        holding the Y', Cb, and Cr planes in that order.
+    """
+    r, g, b = (rgb[..., i].astype(np.int32) for i in range(3))
+    yuv = np.empty((3, *rgb.shape[:2]), np.uint8)
+    yuv[0] = ((66 * r + 129 * g + 25 * b + 128) >> 8) + 16
+    yuv[1] = ((-38 * r - 74 * g + 112 * b + 128) >> 8) + 128
+    yuv[2] = ((112 * r - 94 * g - 18 * b + 128) >> 8) + 128
+    return yuv
+
+
+__all__ = [
+    "RgbFrame",
+    "frame_to_rgb",
+    "rgb_to_yuv444",
+]
@@ -196,6 +196,15 @@ class ModernGlVideoDriver(VideoDriver):
     """
     A video driver that exposes an OpenGL context to the :term:`core`
     via :mod:`moderngl` and PyOpenGL.
+
+    By default, :meth:`screenshot` reads the current frame back from the GPU
+    and waits for the GPU to finish rendering it.
+    If ``readback_buffers`` is given, each frame is instead copied into
+    one of a ring of pixel buffer objects as soon as it's rendered,
+    and :meth:`screenshot` returns the oldest one;
+    by then the copy has usually finished,
+    so taking a screenshot every frame doesn't stall the pipeline.
+    Either way, frames are flipped right side up on the GPU.
     """
 
     def __init__(
@@ -204,6 +213,9 @@ class ModernGlVideoDriver(VideoDriver):
         fragment_shader: str | None = None,
         varyings: Sequence[str] = ("transformedTexCoord",),
         window: str | None = None,
+        readback_buffers: int = 0,
+        finish: bool = True,
+        backend: str | None = None,
         # TODO: Add ability to configure the OpenGL message callback
         # TODO: Add ability to configure the OpenGL debug group
         # TODO: Add ability to force an OpenGL version
@@ -222,6 +234,22 @@ class ModernGlVideoDriver(VideoDriver):
         :param fragment_shader: The GLSL source of the fragment shader to use for rendering,
             or :obj:`None` to use the built-in default.
         :param varyings: The names of the "varyings" (vertex value outputs) to use.
+        :param window: The :mod:`moderngl_window` backend to show frames in,
+            ``"default"`` for the default one,
+            or :obj:`None` to render offscreen.
+        :param readback_buffers: The number of pixel buffer objects to read frames back into.
+            With ``N`` buffers, :meth:`screenshot` returns the frame from ``N - 1`` frames ago
+            (see :attr:`readback_latency`);
+            2 or 3 is usually enough to avoid stalls.
+            If 0, :meth:`screenshot` synchronously reads the most recent frame instead.
+        :param finish: If :obj:`True`, wait for the GPU to finish each frame in :meth:`refresh`.
+            Disabling this lets the CPU run ahead of the GPU,
+            which is usually faster when frames aren't shown in a window.
+        :param backend: The :mod:`glcontext` backend to create offscreen contexts with
+            (e.g. ``"egl"`` to render without a display server),
+            or :obj:`None` for the platform default.
+            Ignored if ``window`` is given.
+        :raises ValueError: If ``readback_buffers`` is negative.
         """
         package_files = resources.files(modules[__name__].__package__)
         # TODO: Support passing SPIR-V shaders as bytes
@@ -247,7 +275,13 @@ class ModernGlVideoDriver(VideoDriver):
         if not all(isinstance(v, str) for v in varyings):
             raise TypeError("All elements of 'varyings' must be str")
 
+        if readback_buffers < 0:
+            raise ValueError(f"Expected a non-negative readback_buffers, got {readback_buffers}")
+
         self._varyings = tuple(varyings)
+        self._readback_buffers = readback_buffers
+        self._finish = bool(finish)
+        self._backend = backend
         self._callback: retro_hw_render_callback | None = None
         self._pixel_format = PixelFormat.RGB1555
         self._system_av_info: retro_system_av_info | None = None
@@ -275,6 +309,15 @@ class ModernGlVideoDriver(VideoDriver):
         # Texture for CPU-rendered output
         self._cpu_color: Texture | None = None
 
+        # Framebuffer that frames are flipped into before being read back,
+        # plus the ring of pixel buffer objects they're read into (if enabled)
+        # and the size of the frame in each one
+        self._flip_fbo: Framebuffer | None = None
+        self._flip_color: Renderbuffer | None = None
+        self._readback: list[Buffer] = []
+        self._readback_sizes: list[tuple[int, int] | None] = []
+        self._readback_index = 0
+
         # Objects for the window, if requested
         self._window: BaseWindow | None = None
         self._window_class: type[BaseWindow] | None = None
@@ -289,38 +332,25 @@ class ModernGlVideoDriver(VideoDriver):
 
     def __del__(self):
         """Clean up allocated OpenGL resources and the underlying context."""
-        if self._cpu_color:
-            del self._cpu_color
-
-        if self._hw_render_depth:
-            del self._hw_render_depth
-
-        if self._hw_render_color:
-            del self._hw_render_color
-
-        if self._hw_render_fbo:
-            del self._hw_render_fbo
-
-        if self._depth:
-            del self._depth
-
-        if self._color:
-            del self._color
-
-        if self._fbo:
-            del self._fbo
-
-        if self._vbo:
-            del self._vbo
-
-        if self._vao:
-            del self._vao
-
-        if self._shader_program:
-            del self._shader_program
-
-        if self._context:
-            del self._context
+        # getattr, because __init__ may have raised before setting all of these
+        for name in (
+            "_readback",
+            "_flip_fbo",
+            "_flip_color",
+            "_cpu_color",
+            "_hw_render_depth",
+            "_hw_render_color",
+            "_hw_render_fbo",
+            "_depth",
+            "_color",
+            "_fbo",
+            "_vbo",
+            "_vao",
+            "_shader_program",
+            "_context",
+        ):
+            if getattr(self, name, None):
+                delattr(self, name)
 
     @override
     def set_context(self, callback: retro_hw_render_callback) -> None:
@@ -418,6 +448,9 @@ class ModernGlVideoDriver(VideoDriver):
 
             self._vao.render(moderngl.TRIANGLE_STRIP)
 
+            if self._readback:
+                self.__start_readback(width, height)
+
             if self._window:
                 with self._context.debug_scope(
                     "libretro.ModernGlVideoDriver.refresh.swap_buffers"
@@ -426,7 +459,9 @@ class ModernGlVideoDriver(VideoDriver):
                     self._context.copy_framebuffer(self._window.fbo, self._fbo)
                     self._window.swap_buffers()
 
-            self._context.finish()
+            if self._finish:
+                self._context.finish()
+
             self._last_size = (width, height)
 
     @property
@@ -478,6 +513,10 @@ class ModernGlVideoDriver(VideoDriver):
             del self._shader_program
             del self._vbo
             del self._cpu_color
+            self._flip_fbo = None
+            self._flip_color = None
+            self._readback = []
+            self._readback_sizes = []
             # Destroy the OpenGL context and create a new one
 
         geometry = self._system_av_info.geometry
@@ -521,15 +560,15 @@ class ModernGlVideoDriver(VideoDriver):
             case HardwareContext.NONE, None:
                 # Create a default context with OpenGL 3.3 core profile;
                 # do not expose it to the core, only use it for software rendering
-                self._context = create_context(standalone=True)
+                self._context = self.__create_standalone_context(None, False)
             case HardwareContext.OPENGL, None:
-                self._context = create_context(require=210, standalone=True, share=self._shared)
+                self._context = self.__create_standalone_context(210, self._shared)
             case HardwareContext.OPENGL_CORE, None:
                 assert self._callback is not None, (
                     "Should've been set by the core, or else this branch wouldn't have been taken"
                 )
                 ver = self._callback.version_major * 100 + self._callback.version_minor * 10
-                self._context = create_context(require=ver, standalone=True, share=self._shared)
+                self._context = self.__create_standalone_context(ver, self._shared)
 
         self._context.clear_errors()
         if self._context.version_code >= 430:
@@ -544,6 +583,7 @@ class ModernGlVideoDriver(VideoDriver):
         with self._context.debug_scope("libretro.ModernGlVideoDriver.reinit"):
             self._context.gc_mode = "auto"
             self.__init_fbo()
+            self.__init_readback()
 
             self._shader_program = self._context.program(
                 vertex_shader=self._vertex_shader,
@@ -680,6 +720,16 @@ class ModernGlVideoDriver(VideoDriver):
         self._system_av_info = deepcopy(av_info)
         self.reinit()
 
+    @property
+    def readback_latency(self) -> int:
+        """
+        How many frames old the frame returned by :meth:`screenshot` is.
+
+        0 unless ``readback_buffers`` was given,
+        in which case it's one less than the number of buffers.
+        """
+        return max(self._readback_buffers - 1, 0)
+
     @override
     def screenshot(self, prerotate: bool = True) -> Screenshot | None:
         if self._system_av_info is None:
@@ -693,40 +743,19 @@ class ModernGlVideoDriver(VideoDriver):
 
         self._context.clear_errors()
         with self._context.debug_scope("libretro.ModernGlVideoDriver.screenshot"):
-            if self._window:
-                frame = self._window.fbo.read(self._last_size, 4)
-            else:
-                if not self._fbo:
+            if self._readback:
+                size, frame = self.__finish_readback()
+                if frame is None:
                     return None
-
-                frame = self._fbo.read(self._last_size, 4)
-
-            if frame is None:
-                return None
+            else:
+                size = self._last_size
+                frame = self.__flipped_fbo(*size).read(size, 4)
 
             self._context.clear_errors()
-            if not self._callback or not self._callback.bottom_left_origin:
-                # If we're using software rendering or the origin is at the bottom-left...
-                bytes_per_row = self._last_size[0] * self._pixel_format.bytes_per_pixel
-                reversed_frame = array("B", frame)
-                reversed_frame_view = memoryview(reversed_frame)
-                frame_view = memoryview(frame)
-                frame_len = len(frame)
-                for i in range(self._last_size[1]):
-                    # For each row...
-                    start = i * bytes_per_row
-                    end = start + bytes_per_row
-                    reversed_frame_view[start:end] = frame_view[
-                        frame_len - end : frame_len - start
-                    ]
-                    # ...copy row number (height - i) to row i
-
-                frame = reversed_frame_view
-
             return Screenshot(
                 memoryview(frame),
-                self._last_size[0],
-                self._last_size[1],
+                size[0],
+                size[1],
                 self._rotation,
                 self._pixel_format,
             )
@@ -781,6 +810,18 @@ class ModernGlVideoDriver(VideoDriver):
         height = min(geometry.max_height, max_fbo_size, max_rb_size)
         return width, height
 
+    def __create_standalone_context(self, require: int | None, share: bool) -> Context:
+        if self._backend is None:
+            return create_context(require=require, standalone=True, share=share)
+
+        # moderngl's stubs mistype **settings as a dict
+        return create_context(
+            require=require,
+            standalone=True,
+            share=share,
+            backend=self._backend,  # pyright: ignore[reportArgumentType]
+        )
+
     def __init_fbo(self):
         assert self._context is not None
         with self._context.debug_scope("libretro.ModernGlVideoDriver.__init_fbo"):
@@ -810,6 +851,66 @@ class ModernGlVideoDriver(VideoDriver):
 
         self._context.clear_errors()
 
+    def __init_readback(self):
+        assert self._context is not None
+        with self._context.debug_scope("libretro.ModernGlVideoDriver.__init_readback"):
+            size = self.__get_framebuffer_size()
+            self._flip_color = self._context.renderbuffer(size, 4)
+            self._flip_fbo = self._context.framebuffer(self._flip_color)
+            self._flip_color.label = "libretro.py Readback FBO Color Attachment"
+            self._flip_fbo.label = "libretro.py Readback FBO"
+
+            frame_size = size[0] * size[1] * 4
+            self._readback = [
+                self._context.buffer(reserve=frame_size, dynamic=True)
+                for _ in range(self._readback_buffers)
+            ]
+            for i, pbo in enumerate(self._readback):
+                pbo.label = f"libretro.py Readback PBO {i}"
+
+            self._readback_sizes = [None] * self._readback_buffers
+            self._readback_index = 0
+
+    def __flipped_fbo(self, width: int, height: int) -> Framebuffer:
+        # Returns a framebuffer whose first row is the top of the most recent frame,
+        # so it can be read back without flipping it on the CPU
+        assert self._context is not None
+        assert self._fbo is not None
+        if self._callback and self._callback.bottom_left_origin:
+            # The core rendered upside-down (by OpenGL's standards), so it's already right
+            return self._fbo
+
+        assert self._flip_fbo is not None
+        bound = self._context.fbo
+        GL.glBindFramebuffer(GL.GL_READ_FRAMEBUFFER, self._fbo.glo)
+        GL.glBindFramebuffer(GL.GL_DRAW_FRAMEBUFFER, self._flip_fbo.glo)
+        GL.glBlitFramebuffer(
+            0, 0, width, height, 0, height, width, 0, GL.GL_COLOR_BUFFER_BIT, GL.GL_NEAREST
+        )
+        bound.use()
+        return self._flip_fbo
+
+    def __start_readback(self, width: int, height: int):
+        # Queues an asynchronous copy of the frame into the next PBO
+        index = self._readback_index
+        self.__flipped_fbo(width, height).read_into(
+            self._readback[index], viewport=(0, 0, width, height), components=4
+        )
+        self._readback_sizes[index] = (width, height)
+        self._readback_index = (index + 1) % len(self._readback)
+
+    def __finish_readback(self) -> tuple[tuple[int, int], bytes | None]:
+        # Maps the oldest frame that's been read back,
+        # which will be the next one overwritten
+        count = len(self._readback)
+        for i in range(count):
+            index = (self._readback_index + i) % count
+            size = self._readback_sizes[index]
+            if size is not None:
+                return size, self._readback[index].read(size[0] * size[1] * 4)
+
+        return (0, 0), None
+
     def __init_hw_render(self):
         assert self._context is not None
         with self._context.debug_scope("libretro.ModernGlVideoDriver.__init_hw_render"):
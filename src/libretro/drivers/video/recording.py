@@ -0,0 +1,485 @@
+"""
+:class:`.VideoDriver` wrapper that streams frames (and optionally audio) to disk.
+
+Requires :mod:`numpy`, which is installed with the ``numpy`` extra.
+
+.. seealso::
+
+    :class:`.VideoDriver`
+        The protocol this driver implements.
+    :mod:`libretro.drivers.video.convert`
+        The pixel-format conversions this driver uses.
+"""
+
+from __future__ import annotations
+
+import os
+import queue
+import threading
+import wave
+from abc import abstractmethod
+from copy import deepcopy
+from fractions import Fraction
+from typing import IO, NamedTuple, Protocol, final, override, runtime_checkable
+
+import numpy as np
+
+from libretro.api.audio import retro_audio_buffer_status_callback, retro_audio_callback
+from libretro.api.av import retro_system_av_info
+from libretro.api.video import (
+    PixelFormat,
+)
+from libretro.error import UnsupportedEnvCall
+
+from ..audio import AudioDriver
+from .convert import RgbFrame, frame_to_rgb, rgb_to_yuv444
+from .driver import FrameBufferSpecial, VideoDriver
+from .software import NullVideoDriver
+from .wrapper import VideoDriverWrapper
+
+type _Output = str | os.PathLike[str] | IO[bytes]
+
+
+def _open_output(file: _Output) -> tuple[IO[bytes], bool]:
+    # Returns the file and whether the caller is responsible for closing it
+    if isinstance(file, (str, os.PathLike)):
+        return open(file, "wb"), True
+
+    return file, False
+
+
+@runtime_checkable
+class FrameSink(Protocol):
+    """
+    Receives the frames recorded by a :class:`RecordingVideoDriver`.
+
+    Implement this to feed frames to an encoder of your choice
+    (e.g. PyAV or an ``ffmpeg`` subprocess).
+    All methods are called on the recorder's background thread.
+    """
+
+    @abstractmethod
+    def open(self, width: int, height: int, fps: Fraction) -> None:
+        """
+        Prepare to receive frames.
+        Called once, before the first call to :meth:`write`.
+
+        :param width: The width of every frame, in pixels.
+        :param height: The height of every frame, in pixels.
+        :param fps: The number of frames per second the core runs at.
+        """
+        ...
+
+    @abstractmethod
+    def write(self, frame: RgbFrame) -> None:
+        """
+        Receive the next frame.
+
+        :param frame: The frame's pixels, with the size given to :meth:`open`.
+        """
+        ...
+
+    @abstractmethod
+    def close(self) -> None:
+        """Finish the output. No more frames will be written."""
+        ...
+
+
+class RawVideoFrameSink(FrameSink):
+    """
+    Writes frames back-to-back as packed 8-bit RGB with no header,
+    e.g. for ``ffmpeg -f rawvideo -pix_fmt rgb24``.
+    """
+
+    def __init__(self, file: str | os.PathLike[str] | IO[bytes]):
+        """
+        Open the output.
+
+        :param file: A path to create, or a writable binary file.
+            Files opened by this sink are closed by :meth:`close`.
+        """
+        self._file, self._owns_file = _open_output(file)
+
+    @override
+    def open(self, width: int, height: int, fps: Fraction) -> None:
+        pass  # No header
+
+    @override
+    def write(self, frame: RgbFrame) -> None:
+        self._file.write(frame.data)
+
+    @override
+    def close(self) -> None:
+        self._file.flush()
+        if self._owns_file:
+            self._file.close()
+
+
+class Y4mFrameSink(FrameSink):
+    """
+    Writes frames to a YUV4MPEG2 (``.y4m``) stream
+    as uncompressed, limited-range BT.601 4:4:4 Y'CbCr.
+
+    Most video players and encoders can read these directly.
+    """
+
+    def __init__(self, file: str | os.PathLike[str] | IO[bytes]):
+        """
+        Open the output.
+
+        :param file: A path to create, or a writable binary file.
+            Files opened by this sink are closed by :meth:`close`.
+        """
+        self._file, self._owns_file = _open_output(file)
+
+    @override
+    def open(self, width: int, height: int, fps: Fraction) -> None:
+        header = f"YUV4MPEG2 W{width} H{height} F{fps.numerator}:{fps.denominator} Ip A1:1 C444\n"
+        self._file.write(header.encode("ascii"))
+
+    @override
+    def write(self, frame: RgbFrame) -> None:
+        self._file.write(b"FRAME\n")
+        self._file.write(rgb_to_yuv444(frame).data)
+
+    @override
+    def close(self) -> None:
+        self._file.flush()
+        if self._owns_file:
+            self._file.close()
+
+
+class _Frame(NamedTuple):
+    data: bytes | None  # None to repeat the previous frame
+    width: int
+    height: int
+    pitch: int
+    pixel_format: PixelFormat | None  # None for RGBA
+    audio: bytes
+    video: bool = True  # False to only write audio
+
+
+@final
+class RecordingAudioDriver(AudioDriver):
+    """
+    An :class:`.AudioDriver` that holds the core's audio
+    until its :class:`RecordingVideoDriver` writes it alongside the next frame.
+
+    Get one from :attr:`RecordingVideoDriver.audio`
+    rather than constructing it directly.
+    """
+
+    def __init__(self):
+        """Initialize with no pending audio and no AV info."""
+        self._pending = bytearray()
+        self._system_av_info: retro_system_av_info | None = None
+
+    def take(self) -> bytes:
+        """
+        Remove and return the audio received since the last call.
+
+        :return: Interleaved 16-bit stereo samples.
+        """
+        audio = bytes(self._pending)
+        self._pending.clear()
+        return audio
+
+    @override
+    def sample(self, left: int, right: int) -> None:
+        self._pending += left.to_bytes(2, "little", signed=True)
+        self._pending += right.to_bytes(2, "little", signed=True)
+
+    @override
+    def sample_batch(self, frames: memoryview) -> int:
+        self._pending += frames
+        return frames.nbytes // 4
+
+    @property
+    @override
+    def callbacks(self) -> retro_audio_callback | None:
+        """
+        Audio callbacks are not supported by this driver.
+
+        :return: :obj:`None`, always.
+        :raises UnsupportedEnvCall: If setting this property.
+        """
+        return None
+
+    @callbacks.setter
+    @override
+    def callbacks(self, callback: retro_audio_callback | None) -> None:
+        raise UnsupportedEnvCall("RecordingAudioDriver does not support setting callbacks")
+
+    @property
+    @override
+    def buffer_status(self) -> retro_audio_buffer_status_callback | None:
+        """
+        Buffer-status callbacks are not supported by this driver.
+
+        :return: :obj:`None`, always.
+        :raises UnsupportedEnvCall: If setting this property.
+        """
+        return None
+
+    @buffer_status.setter
+    @override
+    def buffer_status(self, callback: retro_audio_buffer_status_callback | None) -> None:
+        raise UnsupportedEnvCall(
+            "RecordingAudioDriver does not support setting buffer status callback"
+        )
+
+    @property
+    @override
+    def minimum_latency(self) -> int | None:
+        """
+        Setting a minimum latency is not supported by this driver.
+
+        :return: :obj:`None`, always.
+        :raises UnsupportedEnvCall: If setting this property.
+        """
+        return None
+
+    @minimum_latency.setter
+    @override
+    def minimum_latency(self, latency: int | None) -> None:
+        raise UnsupportedEnvCall("RecordingAudioDriver does not support setting minimum latency")
+
+    @property
+    @override
+    def system_av_info(self) -> retro_system_av_info | None:
+        return deepcopy(self._system_av_info)
+
+    @system_av_info.setter
+    @override
+    def system_av_info(self, info: retro_system_av_info) -> None:
+        if not isinstance(info, retro_system_av_info):
+            raise TypeError(f"Expected a retro_system_av_info, got {type(info).__name__}")
+
+        self._system_av_info = deepcopy(info)
+
+
+@final
+class RecordingVideoDriver(VideoDriverWrapper):
+    """
+    A :class:`.VideoDriver` that records every frame the core submits,
+    then passes it on to another driver.
+
+    The core's frames are copied as-is;
+    converting them to RGB and writing them out
+    both happen on a background thread,
+    so recording costs the emulation thread about one ``memcpy`` per frame.
+    Frames are queued for that thread in a bounded queue;
+    if the thread falls behind, :meth:`refresh` waits for it to catch up
+    rather than drop frames.
+
+    To record audio as well,
+    pass :attr:`audio` as a :class:`.Session`'s audio driver;
+    it's written to a WAV file that stays in sync with the video,
+    since each frame's audio is written alongside that frame.
+
+    Frames are recorded without rotation,
+    and every frame is cropped or padded to the size of the first.
+
+    .. code-block:: python
+
+        recorder = RecordingVideoDriver("run.y4m", audio="run.wav")
+        with Session(core, game, video=recorder, audio=recorder.audio) as session:
+            for _ in range(600):
+                session.run()
+
+        recorder.close()
+    """
+
+    def __init__(
+        self,
+        video: FrameSink | str | os.PathLike[str],
+        *,
+        audio: str | os.PathLike[str] | IO[bytes] | None = None,
+        inner: VideoDriver | None = None,
+        queue_size: int = 8,
+    ):
+        """
+        Start the background thread and open the outputs.
+
+        :param video: Where to write frames.
+            Paths ending in ``.y4m`` are written with :class:`Y4mFrameSink`,
+            and all other paths with :class:`RawVideoFrameSink`.
+        :param audio: Where to write a WAV file of the audio that this driver receives,
+            or :obj:`None` to discard it.
+        :param inner: The driver to pass frames and requests on to.
+            Defaults to a :class:`.NullVideoDriver`.
+            Frames rendered with a hardware context are read back with its :meth:`screenshot`.
+        :param queue_size: The number of frames that can wait to be written
+            before :meth:`refresh` blocks.
+        :raises ValueError: If ``queue_size`` is less than 1.
+        """
+        if queue_size < 1:
+            raise ValueError(f"Expected queue_size to be at least 1, got {queue_size}")
+
+        match video:
+            case FrameSink():
+                self._sink = video
+            case str() | os.PathLike() if os.fspath(video).lower().endswith(".y4m"):
+                self._sink = Y4mFrameSink(video)
+            case _:
+                self._sink = RawVideoFrameSink(video)
+
+        self._audio_file = audio
+        super().__init__(inner if inner is not None else NullVideoDriver())
+        self._system_av_info: retro_system_av_info | None = None
+        self._audio = RecordingAudioDriver()
+        self._queue: queue.Queue[_Frame | None] = queue.Queue(queue_size)
+        self._error: BaseException | None = None
+        self._frames = 0
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name="libretro.py RecordingVideoDriver", daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def audio(self) -> RecordingAudioDriver:
+        """
+        The audio driver whose output is recorded alongside this driver's frames.
+        Audio it receives is discarded if this driver wasn't given an ``audio`` output.
+        """
+        return self._audio
+
+    @property
+    def frames(self) -> int:
+        """The number of frames submitted for recording, including repeated ones."""
+        return self._frames
+
+    def _raise_worker_error(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _put(self, frame: _Frame) -> None:
+        if self._closed:
+            raise RuntimeError("RecordingVideoDriver is closed")
+
+        self._raise_worker_error()
+        self._queue.put(frame)
+        self._frames += 1
+
+    @override
+    def refresh(
+        self, data: memoryview[int] | FrameBufferSpecial, width: int, height: int, pitch: int
+    ) -> None:
+        self._inner.refresh(data, width, height, pitch)
+        match data:
+            case memoryview():
+                frame = _Frame(
+                    bytes(data), width, height, pitch, self._inner.pixel_format, self._audio.take()
+                )
+            case FrameBufferSpecial.DUPE:
+                frame = _Frame(None, width, height, pitch, None, self._audio.take())
+            case FrameBufferSpecial.HARDWARE:
+                screenshot = self._inner.screenshot(prerotate=False)
+                if screenshot is None:
+                    frame = _Frame(None, width, height, pitch, None, self._audio.take())
+                else:
+                    frame = _Frame(
+                        bytes(screenshot.data),
+                        screenshot.width,
+                        screenshot.height,
+                        screenshot.width * 4,
+                        None,
+                        self._audio.take(),
+                    )
+        self._put(frame)
+
+    def _run(self) -> None:
+        size: tuple[int, int] | None = None
+        previous: RgbFrame | None = None
+        audio: wave.Wave_write | None = None
+        audio_file: IO[bytes] | None = None
+        try:
+            while (frame := self._queue.get()) is not None:
+                if audio is None and self._audio_file is not None:
+                    audio_file, owns_audio = _open_output(self._audio_file)
+                    audio = wave.open(audio_file, "wb")
+                    audio.setnchannels(2)
+                    audio.setsampwidth(2)
+                    rate = self._system_av_info.timing.sample_rate if self._system_av_info else 0
+                    audio.setframerate(round(rate) or 44100)
+                    if not owns_audio:
+                        audio_file = None
+
+                if frame.data is not None:
+                    rgb = frame_to_rgb(
+                        frame.data, frame.width, frame.height, frame.pitch, frame.pixel_format
+                    )
+                    if size is None:
+                        size = (frame.width, frame.height)
+                        fps = self._system_av_info.timing.fps if self._system_av_info else 0
+                        self._sink.open(
+                            frame.width, frame.height, Fraction(fps or 60).limit_denominator(1001)
+                        )
+                    elif rgb.shape[:2] != (size[1], size[0]):
+                        fitted = np.zeros((size[1], size[0], 3), np.uint8)
+                        h, w = min(size[1], frame.height), min(size[0], frame.width)
+                        fitted[:h, :w] = rgb[:h, :w]
+                        rgb = fitted
+                    previous = rgb
+
+                if frame.video and previous is not None:
+                    self._sink.write(previous)
+
+                if audio is not None and frame.audio:
+                    audio.writeframesraw(frame.audio)
+        except BaseException as e:
+            self._error = e
+            # Keep draining so that the emulation thread doesn't block forever
+            while self._queue.get() is not None:
+                pass
+        finally:
+            self._sink.close()
+            if audio is not None:
+                audio.close()
+            if audio_file is not None:
+                audio_file.close()
+
+    def close(self) -> None:
+        """
+        Write any frames and audio still in the queue, then close the outputs.
+
+        Does nothing if the driver is already closed.
+
+        :raises Exception: Any exception raised while converting or writing frames
+            that hasn't already been raised by :meth:`refresh`.
+        """
+        if self._closed:
+            return
+
+        if pending_audio := self._audio.take():
+            self._queue.put(_Frame(None, 0, 0, 0, None, pending_audio, video=False))
+
+        self._closed = True
+        self._queue.put(None)  # Tells the thread to stop
+        self._thread.join()
+        self._raise_worker_error()
+
+    @property
+    @override
+    def system_av_info(self) -> retro_system_av_info | None:
+        return deepcopy(self._system_av_info)
+
+    @system_av_info.setter
+    @override
+    def system_av_info(self, av_info: retro_system_av_info) -> None:
+        if not isinstance(av_info, retro_system_av_info):
+            raise TypeError(f"Expected a retro_system_av_info, got {type(av_info).__name__}")
+
+        self._system_av_info = deepcopy(av_info)
+        self._inner.system_av_info = av_info
+
+
+__all__ = [
+    "FrameSink",
+    "RawVideoFrameSink",
+    "RecordingAudioDriver",
+    "RecordingVideoDriver",
+    "Y4mFrameSink",
+]
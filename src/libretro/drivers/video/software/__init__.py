@@ -12,3 +12,4 @@ or requested by the core.
 
 from .array import *
 from .base import *
+from .null import *
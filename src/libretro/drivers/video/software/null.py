@@ -0,0 +1,243 @@
+"""
+Software-rendered :class:`.VideoDriver` that discards every frame.
+
+.. seealso::
+
+    :class:`.VideoDriver`
+        The protocol this driver implements.
+"""
+
+from collections.abc import Sequence
+from copy import deepcopy
+from typing import NamedTuple, final, override
+from zlib import crc32
+
+from libretro.api.av import retro_game_geometry, retro_system_av_info
+from libretro.api.video import MemoryAccess, PixelFormat, Rotation, retro_framebuffer
+
+from ..driver import FrameBufferSpecial, Screenshot
+from .base import SoftwareVideoDriver
+
+
+class FrameSize(NamedTuple):
+    """The dimensions of the frames a core submitted, starting at a particular frame."""
+
+    frame: int
+    """The index of the first :meth:`~.VideoDriver.refresh` call with these dimensions."""
+    width: int
+    """Width of the frame in pixels."""
+    height: int
+    """Height of the frame in pixels."""
+    pitch: int
+    """Width of the frame in bytes, including any padding."""
+
+
+@final
+class NullVideoDriver(SoftwareVideoDriver):
+    """
+    Video driver that keeps statistics about the frames it's given
+    instead of the frames themselves.
+
+    Accepts every pixel format and rotation,
+    never copies or converts pixels,
+    and can't take screenshots,
+    so a core running with this driver is only limited by its own speed
+    (and by libretro.py's per-call overhead).
+    Useful for benchmarks, option sweeps,
+    and other runs where the output isn't inspected.
+
+    If ``checksum_rows`` is given,
+    a CRC-32 of every ``checksum_rows``-th row of each frame is kept in :attr:`checksum`;
+    this is enough to tell whether two runs produced different output
+    without paying for a full copy of each frame.
+
+    .. code-block:: python
+
+        with Session(core, game, video=NullVideoDriver) as session:
+            for _ in range(600):
+                session.run()
+
+            print(session.video.frames, session.video.size_changes)
+    """
+
+    def __init__(self, checksum_rows: int | None = None):
+        """
+        Initialize the video driver.
+
+        :param checksum_rows: If given, sample every this many rows of each frame
+            when computing :attr:`checksum`.
+            ``1`` checksums every row.
+        :raises ValueError: If ``checksum_rows`` is less than 1.
+        """
+        if checksum_rows is not None and checksum_rows < 1:
+            raise ValueError(f"Expected checksum_rows to be at least 1, got {checksum_rows}")
+
+        self._checksum_rows = checksum_rows
+        self._pixel_format: PixelFormat = PixelFormat.RGB1555
+        self._system_av_info: retro_system_av_info | None = None
+        self._rotation: Rotation = Rotation.NONE
+        self._frames = 0
+        self._dupes = 0
+        self._hardware_frames = 0
+        self._size: FrameSize | None = None
+        self._size_changes: list[FrameSize] = []
+        self._geometry_changes: list[retro_game_geometry] = []
+        self._checksum: int | None = None
+
+    def reset(self) -> None:
+        """Clear all statistics, leaving the driver's configuration as-is."""
+        self._frames = 0
+        self._dupes = 0
+        self._hardware_frames = 0
+        self._size = None
+        self._size_changes = []
+        self._geometry_changes = []
+        self._checksum = None
+
+    @property
+    def frames(self) -> int:
+        """The number of times the core has called :meth:`refresh`, including dupes."""
+        return self._frames
+
+    @property
+    def dupes(self) -> int:
+        """The number of frames the core asked to be repeated."""
+        return self._dupes
+
+    @property
+    def hardware_frames(self) -> int:
+        """The number of frames the core claimed to have rendered with a hardware context."""
+        return self._hardware_frames
+
+    @property
+    def size_changes(self) -> Sequence[FrameSize]:
+        """Each distinct frame size the core has submitted, in order."""
+        return self._size_changes
+
+    @property
+    def geometry_changes(self) -> Sequence[retro_game_geometry]:
+        """Copies of each geometry the core has set with ``RETRO_ENVIRONMENT_SET_GEOMETRY``."""
+        return self._geometry_changes
+
+    @property
+    def checksum(self) -> int | None:
+        """
+        CRC-32 of the sampled rows of the most recent non-dupe frame,
+        or :obj:`None` if checksums are disabled or no frames have been submitted.
+        """
+        return self._checksum
+
+    @override
+    def refresh(
+        self, data: memoryview | FrameBufferSpecial, width: int, height: int, pitch: int
+    ) -> None:
+        match data:
+            case memoryview():
+                if self._checksum_rows is not None:
+                    row_length = width * self._pixel_format.bytes_per_pixel
+                    checksum = 0
+                    for start in range(0, height * pitch, pitch * self._checksum_rows):
+                        checksum = crc32(data[start : start + row_length], checksum)
+                    self._checksum = checksum
+
+            case FrameBufferSpecial.DUPE:
+                self._dupes += 1
+
+            case FrameBufferSpecial.HARDWARE:
+                self._hardware_frames += 1
+
+            case _:
+                raise TypeError(
+                    f"Expected a memoryview or a FrameBufferSpecial, got {type(data).__name__}"
+                )
+
+        size = self._size
+        if size is None or (size.width, size.height, size.pitch) != (width, height, pitch):
+            self._size = FrameSize(self._frames, width, height, pitch)
+            self._size_changes.append(self._size)
+
+        self._frames += 1
+
+    @property
+    @override
+    def needs_reinit(self) -> bool:
+        return False
+
+    @override
+    def reinit(self) -> None:
+        pass  # No resources to reallocate
+
+    @property
+    @override
+    def rotation(self) -> Rotation:
+        return self._rotation
+
+    @rotation.setter
+    @override
+    def rotation(self, rotation: Rotation) -> None:
+        if not isinstance(rotation, Rotation):
+            raise TypeError(f"Expected a Rotation, got {type(rotation).__name__}")
+
+        self._rotation = rotation
+
+    @property
+    @override
+    def pixel_format(self) -> PixelFormat:
+        return self._pixel_format
+
+    @pixel_format.setter
+    @override
+    def pixel_format(self, format: PixelFormat) -> None:
+        if not isinstance(format, PixelFormat):
+            raise TypeError(f"Expected a PixelFormat, got {type(format).__name__}")
+
+        self._pixel_format = format
+
+    @override
+    def screenshot(self, prerotate: bool = True) -> Screenshot | None:
+        """:return: :obj:`None`, as this driver doesn't keep any frames."""
+        return None
+
+    @override
+    def get_software_framebuffer(
+        self, width: int, height: int, flags: MemoryAccess
+    ) -> retro_framebuffer | None:
+        return None
+
+    @property
+    @override
+    def system_av_info(self) -> retro_system_av_info | None:
+        return deepcopy(self._system_av_info) if self._system_av_info else None
+
+    @system_av_info.setter
+    @override
+    def system_av_info(self, av_info: retro_system_av_info) -> None:
+        if not isinstance(av_info, retro_system_av_info):
+            raise TypeError(f"Expected a retro_system_av_info, got {type(av_info).__name__}")
+
+        self._system_av_info = deepcopy(av_info)
+
+    @property
+    @override
+    def geometry(self) -> retro_game_geometry | None:
+        if not self._system_av_info:
+            return None
+
+        return deepcopy(self._system_av_info.geometry)
+
+    @geometry.setter
+    @override
+    def geometry(self, geometry: retro_game_geometry) -> None:
+        if not isinstance(geometry, retro_game_geometry):
+            raise TypeError(f"Expected a retro_game_geometry, got {type(geometry).__name__}")
+
+        if not self._system_av_info:
+            raise RuntimeError("Cannot set geometry without system AV info from core")
+
+        self._system_av_info.geometry.base_width = geometry.base_width
+        self._system_av_info.geometry.base_height = geometry.base_height
+        self._system_av_info.geometry.aspect_ratio = geometry.aspect_ratio
+        self._geometry_changes.append(deepcopy(geometry))
+
+
+__all__ = ["FrameSize", "NullVideoDriver"]
@@ -0,0 +1,169 @@
+"""
+Base class for :class:`.VideoDriver` s that add behavior to another driver.
+
+.. seealso::
+
+    :class:`.VideoDriver`
+        The protocol this class implements.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Set
+from typing import override
+
+from libretro.api.av import retro_game_geometry, retro_system_av_info
+from libretro.api.proc import retro_proc_address_t
+from libretro.api.video import (
+    HardwareContext,
+    MemoryAccess,
+    PixelFormat,
+    Rotation,
+    retro_framebuffer,
+    retro_hw_render_callback,
+    retro_hw_render_interface,
+)
+
+from .driver import FrameBufferSpecial, Screenshot, VideoDriver
+
+
+class VideoDriverWrapper(VideoDriver):
+    """
+    A :class:`.VideoDriver` that passes every call on to another driver.
+
+    Subclass this and override only the members whose behavior you want to extend,
+    e.g. :meth:`refresh` to inspect each frame before or after the wrapped driver sees it.
+    """
+
+    def __init__(self, inner: VideoDriver):
+        """
+        Wrap a video driver.
+
+        :param inner: The driver to pass calls on to.
+        :raises TypeError: If ``inner`` isn't a :class:`.VideoDriver`.
+        """
+        if not isinstance(inner, VideoDriver):
+            raise TypeError(f"Expected a VideoDriver, got {type(inner).__name__}")
+
+        self._inner = inner
+
+    @property
+    def inner(self) -> VideoDriver:
+        """The driver that this one passes calls on to."""
+        return self._inner
+
+    @override
+    def refresh(
+        self, data: memoryview[int] | FrameBufferSpecial, width: int, height: int, pitch: int
+    ) -> None:
+        self._inner.refresh(data, width, height, pitch)
+
+    @property
+    @override
+    def needs_reinit(self) -> bool:
+        return self._inner.needs_reinit
+
+    @override
+    def reinit(self) -> None:
+        self._inner.reinit()
+
+    @property
+    @override
+    def supported_contexts(self) -> Set[HardwareContext]:
+        return self._inner.supported_contexts
+
+    @property
+    @override
+    def active_context(self) -> HardwareContext:
+        return self._inner.active_context
+
+    @property
+    @override
+    def preferred_context(self) -> HardwareContext | None:
+        return self._inner.preferred_context
+
+    @override
+    def set_context(self, callback: retro_hw_render_callback) -> None:
+        self._inner.set_context(callback)
+
+    @property
+    @override
+    def current_framebuffer(self) -> int | None:
+        return self._inner.current_framebuffer
+
+    @override
+    def get_proc_address(self, sym: bytes) -> retro_proc_address_t | None:
+        return self._inner.get_proc_address(sym)
+
+    @property
+    @override
+    def rotation(self) -> Rotation:
+        return self._inner.rotation
+
+    @rotation.setter
+    @override
+    def rotation(self, rotation: Rotation) -> None:
+        self._inner.rotation = rotation
+
+    @property
+    @override
+    def can_dupe(self) -> bool | None:
+        return self._inner.can_dupe
+
+    @property
+    @override
+    def pixel_format(self) -> PixelFormat:
+        return self._inner.pixel_format
+
+    @pixel_format.setter
+    @override
+    def pixel_format(self, format: PixelFormat) -> None:
+        self._inner.pixel_format = format
+
+    @property
+    @override
+    def system_av_info(self) -> retro_system_av_info | None:
+        return self._inner.system_av_info
+
+    @system_av_info.setter
+    @override
+    def system_av_info(self, av_info: retro_system_av_info) -> None:
+        self._inner.system_av_info = av_info
+
+    @property
+    @override
+    def geometry(self) -> retro_game_geometry | None:
+        return self._inner.geometry
+
+    @geometry.setter
+    @override
+    def geometry(self, geometry: retro_game_geometry) -> None:
+        self._inner.geometry = geometry
+
+    @override
+    def get_software_framebuffer(
+        self, width: int, height: int, flags: MemoryAccess
+    ) -> retro_framebuffer | None:
+        return self._inner.get_software_framebuffer(width, height, flags)
+
+    @property
+    @override
+    def hw_render_interface(self) -> retro_hw_render_interface | None:
+        return self._inner.hw_render_interface
+
+    @property
+    @override
+    def shared_context(self) -> bool:
+        return self._inner.shared_context
+
+    @shared_context.setter
+    @override
+    def shared_context(self, value: bool) -> None:
+        self._inner.shared_context = value
+
+    @override
+    def screenshot(self, prerotate: bool = True) -> Screenshot | None:
+        return self._inner.screenshot(prerotate)
+
+
+__all__ = ["VideoDriverWrapper"]
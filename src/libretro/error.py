@@ -1,6 +1,8 @@
-"""Exception types raised by libretro.py's drivers and core wrapper."""
+"""Exception types raised by libretro.py's drivers and core wrapper, and a collector for them."""
 
-from collections.abc import Sequence
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from typing import override
 
 
 class UnsupportedEnvCall(Exception):
@@ -39,9 +41,203 @@ class CallbackExceptionGroup(ExceptionGroup):
         return super().__new__(cls, message, exceptions)
 
 
+@dataclass(frozen=True, slots=True)
+class ExceptionSite:
+    """
+    Where an exception was raised, for telling repeats of one bug apart from different bugs.
+
+    >>> from libretro.error import ExceptionSite
+    >>> try:
+    ...     int("x")
+    ... except ValueError as e:
+    ...     site = ExceptionSite.of(e)
+    >>> site.type.__name__, site.function
+    ('ValueError', '<module>')
+    """
+
+    type: type[BaseException]
+    """The exception's type."""
+
+    filename: str
+    """The file containing the innermost frame of the exception's traceback."""
+
+    lineno: int
+    """The line number within :attr:`filename`."""
+
+    function: str
+    """The qualified name of the function that raised the exception."""
+
+    @classmethod
+    def of(cls, exception: BaseException) -> "ExceptionSite":
+        """
+        Return the site of the innermost frame of ``exception``'s traceback.
+
+        Doesn't format the traceback or read any source files.
+
+        :param exception: The exception to locate.
+            If it has no traceback, the returned site's location is empty.
+        """
+        tb = exception.__traceback__
+        if tb is None:
+            return cls(type(exception), "", 0, "")
+
+        while tb.tb_next is not None:
+            tb = tb.tb_next
+
+        code = tb.tb_frame.f_code
+        return cls(type(exception), code.co_filename, tb.tb_lineno, code.co_qualname)
+
+    @override
+    def __str__(self) -> str:
+        """Return the exception type's name and the location it was raised at."""
+        return f"{self.type.__name__} at {self.filename}:{self.lineno} in {self.function}"
+
+
+class CallbackExceptionCollector:
+    """
+    Accumulates the exceptions raised by a core's callbacks between calls into the core,
+    cheaply enough that a core hitting the same bug on every callback doesn't grind to a halt.
+
+    Exceptions are grouped by their :class:`ExceptionSite`.
+    Only the first exception from each site is kept,
+    and only for the first ``limit`` sites;
+    later exceptions are just counted.
+
+    >>> from libretro.error import CallbackExceptionCollector
+    >>> collector = CallbackExceptionCollector(limit=1)
+    >>> for i in range(3):
+    ...     try:
+    ...         [][i]
+    ...     except IndexError as e:
+    ...         first = collector.add(e)
+    >>> first, collector.total, len(collector.exceptions)
+    (False, 3, 1)
+    """
+
+    def __init__(self, limit: int = 8, *, abort_after: int | None = None):
+        """
+        Initialize an empty collector.
+
+        :param limit: The most exceptions to keep, each from a different site.
+        :param abort_after: If given, :attr:`aborted` becomes :obj:`True`
+            once this many exceptions have been collected,
+            signalling that the rest of the call into the core should be skipped.
+        :raises ValueError: If ``limit`` is negative or ``abort_after`` isn't positive.
+        """
+        if limit < 0:
+            raise ValueError(f"limit must not be negative, not {limit}")
+
+        if abort_after is not None and abort_after <= 0:
+            raise ValueError(f"abort_after must be positive, not {abort_after}")
+
+        self._limit = limit
+        self._abort_after = abort_after
+        self._counts: dict[ExceptionSite, int] = {}
+        self._exceptions: list[Exception] = []
+        self._total = 0
+
+    def __len__(self) -> int:
+        """Return the number of exceptions collected since the last :meth:`clear`."""
+        return self._total
+
+    @property
+    def limit(self) -> int:
+        """The most exceptions this collector keeps."""
+        return self._limit
+
+    @property
+    def abort_after(self) -> int | None:
+        """The number of exceptions after which :attr:`aborted` is set, if any."""
+        return self._abort_after
+
+    @property
+    def total(self) -> int:
+        """The number of exceptions collected since the last :meth:`clear`."""
+        return self._total
+
+    @property
+    def counts(self) -> Mapping[ExceptionSite, int]:
+        """How many exceptions were collected from each site, in the order the sites were first seen."""
+        return self._counts
+
+    @property
+    def exceptions(self) -> Sequence[Exception]:
+        """The first exception collected from each of the first :attr:`limit` sites."""
+        return self._exceptions
+
+    @property
+    def aborted(self) -> bool:
+        """Whether at least :attr:`abort_after` exceptions have been collected."""
+        return self._abort_after is not None and self._total >= self._abort_after
+
+    def add(self, exception: Exception) -> bool:
+        """
+        Collect an exception.
+
+        :param exception: The exception to collect.
+        :return: :obj:`True` if it's the first exception collected from its site
+            since the last :meth:`clear`.
+        """
+        self._total += 1
+        site = ExceptionSite.of(exception)
+        count = self._counts.get(site, 0)
+        self._counts[site] = count + 1
+        if count:
+            return False
+
+        if len(self._exceptions) < self._limit:
+            self._exceptions.append(exception)
+
+        return True
+
+    def clear(self) -> None:
+        """Forget every collected exception."""
+        self._counts.clear()
+        self._exceptions.clear()
+        self._total = 0
+
+    def summarize(self, message: str) -> Exception | None:
+        """
+        Summarize the collected exceptions as a single exception, then :meth:`clear` them.
+
+        :param message: Describes what was happening when the exceptions were raised.
+        :return: :obj:`None` if nothing was collected;
+            a :class:`CallbackException` caused by the only kept exception
+            if every exception came from one site;
+            otherwise a :class:`CallbackExceptionGroup` of the kept exceptions.
+            Either way, if any exception was a repeat or wasn't kept,
+            a note is added for each site saying how many times it was hit.
+        """
+        if not self._total:
+            return None
+
+        summary: Exception
+        match self._exceptions:
+            case [exception] if len(self._counts) == 1:
+                summary = CallbackException(message)
+                summary.__cause__ = exception
+            case []:
+                summary = CallbackException(message)
+            case [*exceptions]:
+                summary = CallbackExceptionGroup(message, exceptions)
+
+        if self._total > len(self._exceptions):
+            summary.add_note(
+                f"{self._total} exceptions from {len(self._counts)} sites, "
+                f"{len(self._exceptions)} kept:"
+            )
+            for site, count in self._counts.items():
+                summary.add_note(f"  {count}x {site}")
+
+        self.clear()
+        return summary
+
+
 __all__ = [
     "UnsupportedEnvCall",
     "CoreShutDownException",
     "CallbackException",
+    "CallbackExceptionCollector",
     "CallbackExceptionGroup",
+    "ExceptionSite",
 ]
@@ -0,0 +1,226 @@
+"""
+Let a core skip rendering on frames that nobody will look at.
+
+.. seealso::
+
+    :attr:`.EnvironmentCall.GET_AUDIO_VIDEO_ENABLE`
+        How the core learns which frames to render.
+    :attr:`.EnvironmentCall.GET_FASTFORWARDING`
+        How the core learns that the frontend is running ahead.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from copy import deepcopy
+from typing import Protocol
+
+from libretro.api import AvEnableFlags, ThrottleMode, retro_throttle_state
+from libretro.drivers import TimingDriver
+
+type CaptureTrigger = Callable[[], bool]
+"""
+Called after every frame;
+returns :obj:`True` if the next frame should be rendered.
+"""
+
+type CaptureCallback = Callable[[int], object]
+"""Called with a frame's index after each frame that was rendered."""
+
+
+class _PolicyTarget(Protocol):
+    # The parts of a Session that a FrameSkipPolicy uses,
+    # so that sessions with any combination of drivers can be passed in
+    @property
+    def av_enable(self) -> AvEnableFlags | None: ...
+    @av_enable.setter
+    def av_enable(self, value: AvEnableFlags) -> None: ...
+    @av_enable.deleter
+    def av_enable(self) -> None: ...
+    @property
+    def timing(self) -> TimingDriver | None: ...
+    def add_frame_hook(self, hook: Callable[[], object]) -> None: ...
+    def remove_frame_hook(self, hook: Callable[[], object]) -> None: ...
+
+
+class FrameSkipPolicy:
+    """
+    Tells a :class:`.Session`'s core to render only the frames that will be captured.
+
+    After each frame, the policy decides whether the next one should be captured:
+    every ``every``-th frame is,
+    as is any frame whose predecessor made ``trigger`` return :obj:`True`.
+    On the frames in between, :attr:`.AvEnableFlags.VIDEO` is cleared
+    and (if the session has a timing driver) the core is told it's being fast-forwarded,
+    so cores that honor either can skip rasterization entirely.
+    Cores that ignore them still run correctly, just not any faster.
+
+    .. code-block:: python
+
+        watcher = MemoryWatcher(session.core)
+        watcher.watch_address(0xC000, 16)
+        screenshots = []
+
+        policy = FrameSkipPolicy(
+            every=600,
+            trigger=lambda: bool(watcher.poll()),
+            on_capture=lambda _: screenshots.append(session.video.screenshot()),
+        )
+        policy.attach(session)
+        for _ in range(100_000):
+            session.run()
+
+        policy.detach()
+
+    .. seealso::
+
+        :class:`.NullVideoDriver`
+            Discards even the frames the core does render.
+    """
+
+    def __init__(
+        self,
+        *,
+        every: int | None = None,
+        trigger: CaptureTrigger | None = None,
+        on_capture: CaptureCallback | None = None,
+        skip_audio: bool = False,
+        fast_forward: bool = True,
+    ):
+        """
+        Initialize the policy without attaching it to a session.
+
+        If neither ``every`` nor ``trigger`` is given,
+        no frame after the first is captured.
+
+        :param every: Capture every this many frames, starting with the first.
+        :param trigger: Called after every frame;
+            if it returns :obj:`True`, the next frame is captured.
+            Called even on frames that ``every`` already selects,
+            so it can poll a :class:`.MemoryWatcher` or similar.
+        :param on_capture: Called with the frame's index after each captured frame,
+            i.e. when the video driver holds a freshly-rendered frame.
+        :param skip_audio: Also clear :attr:`.AvEnableFlags.AUDIO` on skipped frames.
+        :param fast_forward: Report that the frontend is fast-forwarding on skipped frames.
+        :raises ValueError: If ``every`` is less than 1.
+        """
+        if every is not None and every < 1:
+            raise ValueError(f"Expected every to be at least 1, got {every}")
+
+        self._every = every
+        self._trigger = trigger
+        self._on_capture = on_capture
+        self._skip_audio = skip_audio
+        self._fast_forward = fast_forward
+        self._session: _PolicyTarget | None = None
+        self._timing: TimingDriver | None = None
+        self._original_av_enable: AvEnableFlags | None = None
+        self._original_throttle: retro_throttle_state | None = None
+        self._capture_flags = AvEnableFlags.ALL
+        self._skip_flags = AvEnableFlags.ALL
+        self._frame = 0
+        self._captured = 0
+        self._capturing = True
+
+    @property
+    def frames(self) -> int:
+        """The number of frames that have run since this policy was attached."""
+        return self._frame
+
+    @property
+    def captured(self) -> int:
+        """The number of frames that were captured since this policy was attached."""
+        return self._captured
+
+    @property
+    def capturing(self) -> bool:
+        """:obj:`True` if the next frame will be captured."""
+        return self._capturing
+
+    def attach(self, session: _PolicyTarget) -> None:
+        """
+        Start applying this policy to a session,
+        beginning with its next frame (which is always captured).
+
+        :param session: The :class:`.Session` to apply this policy to.
+        :raises RuntimeError: If this policy is already attached to a session.
+        """
+        if self._session is not None:
+            raise RuntimeError("FrameSkipPolicy is already attached to a session")
+
+        self._original_av_enable = session.av_enable
+        self._capture_flags = AvEnableFlags.ALL if session.av_enable is None else session.av_enable
+        self._skip_flags = self._capture_flags & ~AvEnableFlags.VIDEO
+        if self._skip_audio:
+            self._skip_flags &= ~AvEnableFlags.AUDIO
+
+        self._timing = session.timing if self._fast_forward else None
+        if self._timing is not None:
+            self._original_throttle = deepcopy(self._timing.throttle_state)
+
+        self._session = session
+        self._frame = 0
+        self._captured = 0
+        self._apply(True)
+        session.add_frame_hook(self._after_frame)
+
+    def detach(self) -> None:
+        """
+        Stop applying this policy,
+        restoring the session's original :attr:`~.CompositeEnvironmentDriver.av_enable`
+        and throttle state.
+
+        Does nothing if this policy isn't attached to a session.
+        """
+        session = self._session
+        if session is None:
+            return
+
+        session.remove_frame_hook(self._after_frame)
+        if self._original_av_enable is None:
+            del session.av_enable
+        else:
+            session.av_enable = self._original_av_enable
+
+        if self._timing is not None:
+            if self._original_throttle is None:
+                del self._timing.throttle_state
+            else:
+                self._timing.throttle_state = self._original_throttle
+
+        self._session = None
+        self._timing = None
+
+    def _apply(self, capture: bool) -> None:
+        assert self._session is not None
+        self._capturing = capture
+        self._session.av_enable = self._capture_flags if capture else self._skip_flags
+        if self._timing is not None:
+            if capture:
+                if self._original_throttle is None:
+                    del self._timing.throttle_state
+                else:
+                    self._timing.throttle_state = deepcopy(self._original_throttle)
+            else:
+                # A rate of 0 means "as fast as possible"
+                self._timing.throttle_state = retro_throttle_state(ThrottleMode.FAST_FORWARD, 0.0)
+
+    def _after_frame(self) -> None:
+        if self._capturing:
+            self._captured += 1
+            if self._on_capture is not None:
+                self._on_capture(self._frame)
+
+        self._frame += 1
+        triggered = self._trigger is not None and self._trigger()
+        scheduled = self._every is not None and self._frame % self._every == 0
+        capture = triggered or scheduled
+        if capture != self._capturing:
+            self._apply(capture)
+
+
+__all__ = [
+    "CaptureCallback",
+    "CaptureTrigger",
+    "FrameSkipPolicy",
+]
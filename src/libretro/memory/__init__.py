@@ -0,0 +1,30 @@
+"""
+Tools for observing, inspecting, and persisting a :class:`.Core`'s emulated memory while it runs.
+
+Everything in this package works on top of the regions a core already exposes,
+either through ``retro_get_memory_data``/``retro_get_memory_size``
+(see :meth:`.CoreInterface.get_memory`)
+or through the descriptors it registers with
+:attr:`.EnvironmentCall.SET_MEMORY_MAPS`
+(see :attr:`.CompositeEnvironmentDriver.memory_maps`).
+None of these tools copy more memory than they need to,
+so they can be used every frame without dominating the frame time.
+
+:class:`.MemorySearch` requires :mod:`numpy`,
+which is installed with the ``numpy`` extra;
+the rest of this package remains usable without it.
+
+.. seealso::
+
+    :mod:`libretro.api.memory`
+        The :mod:`ctypes` types that describe a core's address space.
+"""
+
+from .persist import *
+from .translate import *
+from .watch import *
+
+try:
+    from .search import *
+except ImportError:
+    pass
@@ -0,0 +1,239 @@
+"""
+Saving and loading a :class:`.Core`'s savestates and save RAM through memory-mapped files.
+
+Everything here moves data directly between the core's memory and the file's pages,
+so states and save RAM are never copied into Python objects
+no matter how large they are.
+
+.. seealso::
+
+    :meth:`.CoreInterface.serialize`, :meth:`.CoreInterface.unserialize`
+        The core functions that :func:`save_state` and :func:`load_state` call.
+    :meth:`.CoreInterface.get_memory`
+        How :class:`SaveRamFile` accesses the core's save RAM.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+from contextlib import ExitStack
+from os import PathLike
+from types import TracebackType
+from typing import TYPE_CHECKING, Self
+
+from libretro.api._utils import buffers_equal, mmap_file
+from libretro.api.memory import RETRO_MEMORY_SAVE_RAM
+
+if TYPE_CHECKING:
+    from libretro.core import CoreInterface
+
+type StatePath = str | PathLike[str]
+"""A path to a savestate or save RAM file."""
+
+
+def save_state(core: CoreInterface, path: StatePath) -> bool:
+    """
+    Serialize ``core``'s state directly into a memory-mapped file at ``path``.
+
+    The state is written to a temporary file of exactly
+    :meth:`~.CoreInterface.serialize_size` bytes next to ``path``,
+    which then replaces ``path`` only if the core serialized successfully,
+    so a failed save never clobbers an existing one.
+
+    :param core: The core whose state to save.
+    :param path: The file to save the state to.
+    :return: :obj:`True` if the state was saved,
+        :obj:`False` if the core doesn't support serialization or failed to serialize.
+    :raises OSError: If the file can't be created or mapped.
+    """
+    size = core.serialize_size()
+    if size <= 0:
+        return False
+
+    partial = f"{os.fspath(path)}.tmp"
+    saved = False
+    try:
+        with open(partial, "wb") as f:
+            f.truncate(size)
+
+        with mmap_file(partial, "r+b", mmap.ACCESS_WRITE) as view:
+            saved = core.serialize(view)
+
+        if saved:
+            os.replace(partial, path)
+    finally:
+        if not saved:
+            try:
+                os.remove(partial)
+            except FileNotFoundError:
+                pass
+
+    return saved
+
+
+def load_state(core: CoreInterface, path: StatePath) -> bool:
+    """
+    Restore ``core``'s state directly from a memory-mapped file at ``path``.
+
+    The file is mapped copy-on-write, so it's never modified
+    even if the core writes to the buffer it's given.
+
+    :param core: The core whose state to restore.
+    :param path: A file previously written by :func:`save_state`
+        or any other frontend's savestate for the same core.
+    :return: :obj:`True` if the core accepted the state, :obj:`False` if not.
+    :raises OSError: If the file doesn't exist or can't be mapped.
+    """
+    if os.path.getsize(path) == 0:
+        # mmap can't map empty files, and no core has an empty state
+        return False
+
+    with mmap_file(path) as view:
+        return core.unserialize(view)
+
+
+class SaveRamFile:
+    """
+    Write-back persistence for a core's save RAM (or any other ``RETRO_MEMORY_*`` region).
+
+    The file is kept mapped while open.
+    Each :meth:`flush` compares the core's memory to the mapped file
+    and copies it over only if it changed since the last flush,
+    so a frame in which the game didn't save costs one comparison and no writes.
+    To flush after every frame, register :meth:`flush` with :meth:`.Session.add_frame_hook`.
+
+    .. code-block:: python
+
+        with Session(core, content) as session, SaveRamFile(session.core, "game.srm") as sram:
+            sram.load()
+            session.add_frame_hook(sram.flush)
+            for _ in range(600):
+                session.run()
+
+    .. warning::
+
+        The core's memory is read through a live view,
+        so this must be closed before the core unloads its content.
+    """
+
+    def __init__(
+        self,
+        core: CoreInterface,
+        path: StatePath,
+        memory_id: int = RETRO_MEMORY_SAVE_RAM,
+    ):
+        """
+        Initialize the file without opening it.
+
+        :param core: The core whose memory to persist. Usually :attr:`.Session.core`.
+        :param path: The file to persist it to. Created on the first :meth:`flush` if necessary.
+        :param memory_id: The ``RETRO_MEMORY_*`` region to persist.
+        """
+        self._core = core
+        self._path = path
+        self._memory_id = memory_id
+        self._stack = ExitStack()
+        self._view: memoryview | None = None
+        self._writes = 0
+
+    def __enter__(self) -> Self:
+        """Return this file; it's flushed and closed on exit."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        """Flush and close this file."""
+        self.close()
+
+    @property
+    def path(self) -> StatePath:
+        """The file the region is persisted to."""
+        return self._path
+
+    @property
+    def memory_id(self) -> int:
+        """The ``RETRO_MEMORY_*`` region that's persisted."""
+        return self._memory_id
+
+    @property
+    def writes(self) -> int:
+        """The number of calls to :meth:`flush` that found changes and wrote them to the file."""
+        return self._writes
+
+    def load(self) -> bool:
+        """
+        Copy the file's contents into the core's memory.
+
+        Call this once the core has loaded its content and before running any frames.
+        If the file and the region differ in size, only their common prefix is copied.
+
+        :return: :obj:`True` if anything was loaded,
+            :obj:`False` if the file is missing or empty or the core doesn't expose the region.
+        """
+        region = self._core.get_memory(self._memory_id)
+        if not region or not os.path.isfile(self._path) or os.path.getsize(self._path) == 0:
+            return False
+
+        with mmap_file(self._path) as view:
+            size = min(len(view), len(region))
+            region[:size] = view[:size]
+
+        return True
+
+    def flush(self) -> bool:
+        """
+        Write the core's memory to the file if it changed since the last flush.
+
+        The file is created or resized to match the region if necessary.
+
+        :return: :obj:`True` if the file was written to,
+            :obj:`False` if nothing changed or the core doesn't expose the region.
+        :raises OSError: If the file can't be created or mapped.
+        """
+        region = self._core.get_memory(self._memory_id)
+        if not region:
+            return False
+
+        view = self._view
+        if view is None or len(view) != len(region):
+            view = self._map(len(region))
+
+        if buffers_equal(view, region):
+            return False
+
+        view[:] = region
+        self._writes += 1
+        return True
+
+    def close(self) -> None:
+        """Flush any unsaved changes and unmap the file."""
+        try:
+            self.flush()
+        finally:
+            self._view = None
+            self._stack.close()
+
+    def _map(self, size: int) -> memoryview:
+        self._view = None
+        self._stack.close()
+
+        with open(self._path, "ab") as f:
+            # Opened for appending so that existing contents survive
+            if f.tell() != size:
+                f.truncate(size)
+
+        self._view = self._stack.enter_context(mmap_file(self._path, "r+b", mmap.ACCESS_WRITE))
+        return self._view
+
+
+__all__ = [
+    "SaveRamFile",
+    "StatePath",
+    "load_state",
+    "save_state",
+]
@@ -0,0 +1,371 @@
+"""
+Cheat-search style narrowing of a :class:`.Core`'s memory to the addresses that hold a value.
+
+Requires :mod:`numpy`, which is installed with the ``numpy`` extra.
+
+.. seealso::
+
+    :mod:`libretro.api.memory`
+        The descriptor types that :meth:`.MemorySearch.from_memory_map` searches.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Buffer, Callable, Iterable, Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Literal
+
+import numpy as np
+from numpy.typing import NDArray
+
+from libretro.api._utils import memoryview_at
+from libretro.api.memory import retro_memory_descriptor, retro_memory_map
+
+from .translate import AddressTranslator, ByteOrder
+
+if TYPE_CHECKING:
+    from libretro.core import CoreInterface
+
+type ValueWidth = Literal[1, 2, 4]
+"""The size of each searched value, in bytes."""
+
+type SearchValues = NDArray[np.integer[Any]]
+"""A one-dimensional array of candidate values."""
+
+type SearchPredicate = Callable[[SearchValues, SearchValues], NDArray[np.bool_]]
+"""
+A callable that receives each region's current and previous candidate values
+and returns a mask that is :obj:`True` for each candidate to keep.
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class SearchResult:
+    """A candidate that survived every filter applied to a :class:`MemorySearch`."""
+
+    address: int
+    """The candidate's address, in the address space of the region it was found in."""
+    value: int
+    """The candidate's value as of the most recent filter or snapshot."""
+
+
+class _SearchRegion:
+    __slots__ = ("address", "step", "live", "indexes", "values")
+
+    def __init__(self, address: int, buffer: Buffer, dtype: np.dtype[Any], step: int):
+        raw = memoryview(buffer).cast("B")
+        count = (len(raw) - dtype.itemsize) // step + 1 if len(raw) >= dtype.itemsize else 0
+        self.address = address
+        self.step = step
+        # A strided view of the core's memory, so reading candidates copies only the candidates
+        self.live: SearchValues = np.ndarray((count,), dtype, buffer=raw, strides=(step,))
+        # None means every element is still a candidate,
+        # so the first filter doesn't need to materialize an index array
+        self.indexes: NDArray[np.uintp] | None = None
+        self.values: SearchValues = self.live.copy()
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def current(self) -> SearchValues:
+        return self.live.copy() if self.indexes is None else self.live[self.indexes]
+
+    def narrow(self, predicate: SearchPredicate) -> int:
+        current = self.current()
+        keep = predicate(current, self.values)
+        if self.indexes is None:
+            self.indexes = np.flatnonzero(keep).astype(np.uintp)
+        else:
+            self.indexes = self.indexes[keep]
+
+        self.values = current[keep]
+        return len(self.values)
+
+    def offsets(self) -> NDArray[np.uintp]:
+        if self.indexes is None:
+            return np.arange(len(self.live), dtype=np.uintp)
+
+        return self.indexes
+
+
+class MemorySearch:
+    """
+    Narrows one or more memory regions down to the addresses whose values pass a series of filters.
+
+    Every element of every region starts out as a candidate.
+    Each filter compares every remaining candidate's current value
+    with the value it had as of the previous filter (or :meth:`snapshot`),
+    discards the candidates that don't pass,
+    and records the survivors' current values for the next comparison.
+    For example, to find a lives counter:
+
+    .. code-block:: python
+
+        search = MemorySearch.from_memory(session.core, RETRO_MEMORY_SYSTEM_RAM)
+        search.equal_to(3)
+        # ...lose a life...
+        search.decreased(by=1)
+
+    Candidates are stored as an array of element indexes
+    alongside an array of their last known values,
+    so a search that has narrowed a large region down to a few addresses
+    reads and compares only those addresses.
+    Every filter runs as a handful of vectorized :mod:`numpy` operations,
+    so narrowing megabytes of memory takes milliseconds.
+    """
+
+    def __init__(
+        self,
+        regions: Iterable[tuple[int, Buffer]],
+        *,
+        width: ValueWidth = 1,
+        byteorder: ByteOrder = "little",
+        signed: bool = False,
+        aligned: bool = True,
+    ):
+        """
+        Start a search over the given regions with every element as a candidate.
+
+        :param regions: Pairs of the address of each region's first byte and a buffer
+            that exposes the region's live contents.
+            Addresses only determine the values reported by :meth:`results`,
+            so they may belong to any address space.
+        :param width: The size of each searched value, in bytes.
+        :param byteorder: The byte order of each searched value.
+        :param signed: Whether to interpret each searched value as two's complement.
+        :param aligned: If :obj:`True`, only consider values that start at a multiple of ``width``
+            (relative to the start of each region).
+            If :obj:`False`, consider values that start at every byte.
+        :raises ValueError: If ``width`` or ``byteorder`` isn't supported.
+        """
+        if width not in (1, 2, 4):
+            raise ValueError(f"Expected a width of 1, 2, or 4, got {width}")
+
+        if byteorder not in ("little", "big"):
+            raise ValueError(f"Expected 'little' or 'big', got {byteorder!r}")
+
+        order = "<" if byteorder == "little" else ">"
+        kind = "i" if signed else "u"
+        self._dtype = np.dtype(f"{order}{kind}{width}")
+        self._step = width if aligned else 1
+        self._regions = [
+            _SearchRegion(address, buffer, self._dtype, self._step) for address, buffer in regions
+        ]
+
+    @classmethod
+    def from_memory(
+        cls,
+        core: CoreInterface,
+        id: int,
+        *,
+        width: ValueWidth = 1,
+        byteorder: ByteOrder = "little",
+        signed: bool = False,
+        aligned: bool = True,
+    ) -> MemorySearch:
+        """
+        Search a memory region exposed by ``retro_get_memory_data``.
+
+        Reported addresses are offsets into the region.
+        See :meth:`__init__` for the other parameters.
+
+        :param core: The core that exposes the region.
+        :param id: The ``RETRO_MEMORY_*`` identifier of the region to search.
+        :raises ValueError: If the core doesn't expose the requested region.
+        """
+        region = core.get_memory(id)
+        if region is None:
+            raise ValueError(f"Core doesn't expose memory region {id}")
+
+        return cls([(0, region)], width=width, byteorder=byteorder, signed=signed, aligned=aligned)
+
+    @classmethod
+    def from_memory_map(
+        cls,
+        memory_map: retro_memory_map | Iterable[retro_memory_descriptor] | AddressTranslator,
+        *,
+        width: ValueWidth = 1,
+        byteorder: ByteOrder = "little",
+        signed: bool = False,
+        aligned: bool = True,
+    ) -> MemorySearch:
+        """
+        Search every descriptor in a core's memory map that's backed by host memory.
+
+        Reported addresses are in the core's emulated address space,
+        resolved the same way as :class:`.AddressTranslator` resolves them
+        (see :meth:`.AddressTranslator.spans`):
+        each byte of host memory is searched once, at the lowest address that maps to it,
+        even if its descriptor is mirrored or has ``disconnect`` bits.
+        Descriptors without a pointer are skipped.
+        Values that would straddle two separately mapped runs aren't searched.
+        See :meth:`__init__` for the other parameters.
+
+        :param memory_map: The descriptors to search, or an :class:`.AddressTranslator` built from them.
+            Usually :attr:`.CompositeEnvironmentDriver.memory_maps`.
+        :raises ValueError: If any descriptor is one that RetroArch would reject.
+        """
+        translator = (
+            memory_map
+            if isinstance(memory_map, AddressTranslator)
+            else AddressTranslator(memory_map)
+        )
+        regions = [
+            (address, memoryview_at(resolved.pointer, resolved.contiguous, readonly=True))
+            for address, resolved in translator.spans()
+        ]
+        return cls(regions, width=width, byteorder=byteorder, signed=signed, aligned=aligned)
+
+    @property
+    def dtype(self) -> np.dtype[Any]:
+        """The :mod:`numpy` type that each searched value is read as."""
+        return self._dtype
+
+    def __len__(self) -> int:
+        """Return the number of remaining candidates across all regions."""
+        return sum(len(r) for r in self._regions)
+
+    def filter(self, predicate: SearchPredicate) -> int:
+        """
+        Keep only the candidates that pass a custom test.
+
+        All other filters are implemented in terms of this one.
+
+        :param predicate: Called once per region with arrays of the candidates' current values
+            and their values as of the previous filter, in that order.
+            Must return a boolean array of the same length.
+        :return: The number of remaining candidates.
+        """
+        return sum(r.narrow(predicate) for r in self._regions)
+
+    def equal_to(self, value: int) -> int:
+        """
+        Keep only the candidates whose current value is ``value``.
+
+        :return: The number of remaining candidates.
+        """
+        return self.filter(lambda current, _: current == value)
+
+    def not_equal_to(self, value: int) -> int:
+        """
+        Keep only the candidates whose current value isn't ``value``.
+
+        :return: The number of remaining candidates.
+        """
+        return self.filter(lambda current, _: current != value)
+
+    def in_range(self, low: int, high: int) -> int:
+        """
+        Keep only the candidates whose current value is between ``low`` and ``high``, inclusive.
+
+        :return: The number of remaining candidates.
+        """
+        return self.filter(lambda current, _: (current >= low) & (current <= high))
+
+    def changed(self) -> int:
+        """
+        Keep only the candidates whose value changed since the previous filter.
+
+        :return: The number of remaining candidates.
+        """
+        return self.filter(lambda current, previous: current != previous)
+
+    def unchanged(self) -> int:
+        """
+        Keep only the candidates whose value didn't change since the previous filter.
+
+        :return: The number of remaining candidates.
+        """
+        return self.filter(lambda current, previous: current == previous)
+
+    def increased(self, by: int | None = None) -> int:
+        """
+        Keep only the candidates whose value increased since the previous filter.
+
+        Values are compared as integers, not modulo ``2 ** (8 * width)``,
+        so a counter that wrapped around from its maximum value has decreased.
+
+        :param by: If given, the exact amount each value must have increased by.
+        :return: The number of remaining candidates.
+        """
+        if by is None:
+            return self.filter(lambda current, previous: current > previous)
+
+        return self.filter(lambda current, previous: _difference(current, previous) == by)
+
+    def decreased(self, by: int | None = None) -> int:
+        """
+        Keep only the candidates whose value decreased since the previous filter.
+
+        Values are compared as integers, not modulo ``2 ** (8 * width)``,
+        so a counter that wrapped around from zero has increased.
+
+        :param by: If given, the exact amount each value must have decreased by.
+        :return: The number of remaining candidates.
+        """
+        if by is None:
+            return self.filter(lambda current, previous: current < previous)
+
+        return self.filter(lambda current, previous: _difference(previous, current) == by)
+
+    def snapshot(self) -> None:
+        """
+        Record every candidate's current value without discarding any candidates.
+
+        Use this to start comparing from a later point
+        when a filter isn't needed in between.
+        """
+        for region in self._regions:
+            region.values = region.current()
+
+    def reset(self) -> None:
+        """Restore every element of every region as a candidate and take a new snapshot."""
+        for region in self._regions:
+            region.indexes = None
+            region.values = region.live.copy()
+
+    def addresses(self) -> Sequence[int]:
+        """
+        Return the address of every remaining candidate.
+
+        :return: Addresses in the order the regions were given, ascending within each region.
+        """
+        addresses: list[int] = []
+        for region in self._regions:
+            addresses += (region.offsets() * region.step + region.address).tolist()
+
+        return addresses
+
+    def results(self, limit: int | None = None) -> Sequence[SearchResult]:
+        """
+        Return the address and last known value of each remaining candidate.
+
+        :param limit: If given, return at most this many results.
+        :return: Results in the same order as :meth:`addresses`.
+        """
+        results: list[SearchResult] = []
+        for region in self._regions:
+            remaining = None if limit is None else limit - len(results)
+            if remaining is not None and remaining <= 0:
+                break
+
+            offsets = region.offsets()[:remaining]
+            addresses: list[int] = (offsets * region.step + region.address).tolist()
+            values: list[int] = region.values[:remaining].tolist()
+            results += map(SearchResult, addresses, values)
+
+        return results
+
+
+def _difference(minuend: SearchValues, subtrahend: SearchValues) -> NDArray[np.int64]:
+    # Widen first so that unsigned values don't wrap around when subtracted
+    return minuend.astype(np.int64) - subtrahend.astype(np.int64)
+
+
+__all__ = [
+    "MemorySearch",
+    "SearchPredicate",
+    "SearchResult",
+    "SearchValues",
+    "ValueWidth",
+]
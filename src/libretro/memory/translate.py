@@ -0,0 +1,539 @@
+"""
+Translation of a :class:`.Core`'s emulated addresses to the host memory that backs them.
+
+.. seealso::
+
+    :mod:`libretro.api.memory`
+        The descriptor types that :class:`.AddressTranslator` is built from.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections.abc import Buffer, Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass
+from importlib.util import find_spec
+from typing import TYPE_CHECKING, Literal
+
+from libretro.api._utils import address as address_of
+from libretro.api._utils import memoryview_at
+from libretro.api.memory import MemoryDescriptorFlag, retro_memory_descriptor, retro_memory_map
+
+if TYPE_CHECKING:
+    import numpy as np
+    from numpy.typing import NDArray
+
+# numpy is optional here, unlike in libretro.memory.search;
+# bulk reads and writes use it for vectorized access if it's installed
+_HAS_NUMPY = find_spec("numpy") is not None
+_NUMPY_WIDTHS = frozenset((1, 2, 4, 8))
+
+type ByteOrder = Literal["little", "big"]
+"""The byte order of a multi-byte value, named as in :meth:`int.from_bytes`."""
+
+
+def _add_bits_down(n: int) -> int:
+    # Sets every bit below n's highest set bit
+    return (1 << n.bit_length()) - 1 if n > 0 else 0
+
+
+def _highest_bit(n: int) -> int:
+    return 1 << (n.bit_length() - 1) if n > 0 else 0
+
+
+def _inflate(addr: int, mask: int) -> int:
+    # Inserts a zero bit into addr at each set bit of mask
+    while mask:
+        tmp = (mask - 1) & ~mask
+        addr = ((addr & ~tmp) << 1) | (addr & tmp)
+        mask &= mask - 1
+
+    return addr
+
+
+def _reduce(addr: int, mask: int) -> int:
+    # Removes the bits of addr at each set bit of mask; the inverse of _inflate
+    while mask:
+        tmp = (mask - 1) & ~mask
+        addr = (addr & tmp) | ((addr >> 1) & ~tmp)
+        mask = (mask & (mask - 1)) >> 1
+
+    return addr
+
+
+def _lowest_bit(n: int) -> int:
+    return n & -n
+
+
+class _Descriptor:
+    """A :class:`retro_memory_descriptor` with RetroArch's defaults filled in."""
+
+    __slots__ = ("descriptor", "start", "select", "disconnect", "len", "host", "breaks", "last")
+
+    def __init__(self, descriptor: retro_memory_descriptor, top: int):
+        # Defaults and validation follow mmap_preprocess_descriptors in RetroArch's runloop.c
+        start: int = descriptor.start
+        select: int = descriptor.select
+        disconnect: int = descriptor.disconnect
+        length: int = descriptor.len
+
+        if select == 0:
+            if length == 0 or length & (length - 1):
+                raise ValueError(
+                    f"Descriptor at {start:#x} has no select mask, "
+                    f"so its length must be a nonzero power of two (got {length:#x})"
+                )
+            select = top & ~_inflate(length - 1, disconnect)
+
+        if length == 0:
+            length = _add_bits_down(_reduce(top & ~select, disconnect)) + 1
+
+        if start & ~select:
+            raise ValueError(
+                f"Descriptor start {start:#x} has bits outside its select mask {select:#x}"
+            )
+
+        self.descriptor = descriptor
+        self.start = start
+        self.select = select
+        self.disconnect = disconnect
+        self.len = length
+        self.host = address_of(descriptor.ptr) + descriptor.offset if descriptor.ptr else 0
+        # Address bits that, when they change, may change which descriptor an address maps to
+        # or stop it from mapping linearly to host memory
+        # (including the bits that make offsets past len wrap around)
+        self.breaks = (
+            select | disconnect | ~_inflate(_add_bits_down(length - 1), disconnect)
+        ) & top
+        # The highest address this descriptor can possibly match
+        self.last = start | (top & ~select)
+
+    def matches(self, address: int) -> bool:
+        return not ((self.start ^ address) & self.select)
+
+    def offset(self, address: int) -> int:
+        # libretro.h: "subtract 'start', pick off 'disconnect', apply 'len'",
+        # where applying len clears the offset's highest bit until it's in range
+        offset = _reduce(address - self.start, self.disconnect)
+        while offset >= self.len:
+            offset &= ~_highest_bit(offset)
+
+        return offset
+
+
+class _Segment:
+    """A range of addresses that can only be matched by the same descriptors."""
+
+    __slots__ = ("first", "end", "candidates", "granule")
+
+    def __init__(self, first: int, end: int, candidates: tuple[_Descriptor, ...]):
+        self.first = first
+        self.end = end
+        self.candidates = candidates
+        breaks = 0
+        for c in candidates:
+            breaks |= c.breaks
+        # Within each aligned block of this many bytes,
+        # every address maps to the same descriptor at consecutive offsets
+        self.granule = _lowest_bit(breaks)
+
+
+@dataclass(frozen=True, slots=True)
+class ResolvedAddress:
+    """The host memory that an emulated address maps to."""
+
+    descriptor: retro_memory_descriptor
+    """The descriptor that the address was resolved with."""
+    offset: int
+    """Offset of the address's byte relative to the descriptor's ``ptr + offset``."""
+    pointer: int
+    """Host address of the resolved byte."""
+    contiguous: int
+    """
+    The number of bytes, starting at this address,
+    that map to consecutive bytes of host memory.
+    """
+
+
+class AddressTranslator:
+    """
+    Maps addresses in a core's emulated address space to the host memory that backs them.
+
+    Descriptors are interpreted the same way RetroArch interprets them.
+    An address belongs to a descriptor if it matches
+    :attr:`~.retro_memory_descriptor.start` in every bit of
+    :attr:`~.retro_memory_descriptor.select`;
+    its offset is what remains after subtracting ``start``,
+    removing the :attr:`~.retro_memory_descriptor.disconnect` bits,
+    and clearing high bits until it's less than :attr:`~.retro_memory_descriptor.len`.
+    Descriptors without a ``select`` mask must have a power-of-two ``len``,
+    and are given a mask that covers the smallest address space spanning every descriptor.
+    When more than one descriptor matches an address, the first one wins.
+
+    All of this is done once, when the translator is built.
+    The address space is then split into sorted, non-overlapping segments
+    that each know which descriptors can match them,
+    so resolving an address is a binary search over the segments
+    followed by a check of the (usually single) candidate descriptor.
+    The most recently used segment is cached,
+    so consecutive lookups in the same region skip the search entirely.
+    """
+
+    def __init__(self, memory_map: retro_memory_map | Iterable[retro_memory_descriptor]):
+        """
+        Build a translator from a core's memory descriptors.
+
+        The descriptors are not modified,
+        but their backing memory must remain valid for as long as this translator is used.
+
+        :param memory_map: The descriptors to translate addresses with.
+            Usually :attr:`.CompositeEnvironmentDriver.memory_maps`.
+        :raises ValueError: If any descriptor is one that RetroArch would reject.
+        """
+        descriptors = tuple(memory_map)
+        top = 1
+        for desc in descriptors:
+            top |= desc.select if desc.select else desc.start + desc.len - 1
+
+        self._top = _add_bits_down(top)
+        self._descriptors = descriptors
+        self._entries = tuple(_Descriptor(d, self._top) for d in descriptors)
+
+        bounds = sorted(
+            {
+                0,
+                self._top + 1,
+                *(e.start for e in self._entries),
+                *(e.last + 1 for e in self._entries),
+            }
+        )
+        segments: list[_Segment] = []
+        for first, end in zip(bounds, bounds[1:]):
+            candidates = tuple(e for e in self._entries if e.start <= first and end - 1 <= e.last)
+            if segments and segments[-1].candidates == candidates:
+                segments[-1] = _Segment(segments[-1].first, end, candidates)
+            else:
+                segments.append(_Segment(first, end, candidates))
+
+        self._segments = segments
+        self._firsts = [s.first for s in segments]
+        self._cached: _Segment | None = None
+
+    @property
+    def descriptors(self) -> Sequence[retro_memory_descriptor]:
+        """The descriptors this translator was built from, in their original order."""
+        return self._descriptors
+
+    @property
+    def address_mask(self) -> int:
+        """
+        A mask of every bit used by any descriptor.
+
+        Addresses greater than this are never mapped.
+        """
+        return self._top
+
+    def _segment(self, address: int) -> _Segment:
+        segment = self._cached
+        if segment is None or not segment.first <= address < segment.end:
+            segment = self._segments[bisect_right(self._firsts, address) - 1]
+            self._cached = segment
+
+        return segment
+
+    def _find(self, address: int) -> tuple[_Descriptor, _Segment] | None:
+        if not 0 <= address <= self._top:
+            return None
+
+        segment = self._segment(address)
+        for entry in segment.candidates:
+            if entry.matches(address):
+                return entry, segment
+
+        return None
+
+    def _locate(self, address: int) -> tuple[_Descriptor, int, int] | None:
+        # The descriptor, offset, and contiguous length that resolve() reports,
+        # without allocating a ResolvedAddress
+        found = self._find(address)
+        if found is None:
+            return None
+
+        entry, segment = found
+        if not entry.host:
+            return None
+
+        offset = entry.offset(address)
+        return entry, offset, min(_run(segment, address), entry.len - offset)
+
+    def resolve(self, address: int) -> ResolvedAddress | None:
+        """
+        Find the host memory that an emulated address maps to.
+
+        :param address: An address in the core's emulated address space.
+        :return: The resolved address,
+            or :obj:`None` if no descriptor maps it to host memory.
+        """
+        located = self._locate(address)
+        if located is None:
+            return None
+
+        entry, offset, contiguous = located
+        return ResolvedAddress(entry.descriptor, offset, entry.host + offset, contiguous)
+
+    def spans(self) -> Iterator[tuple[int, ResolvedAddress]]:
+        """
+        Yield each run of host memory that the descriptors map, exactly once.
+
+        Each run is reported at the lowest emulated address that resolves to it,
+        so mirrors (including those implied by ``select`` and a ``len`` of zero)
+        don't repeat memory,
+        ``disconnect`` bits split a descriptor's memory into runs at the right addresses,
+        and memory hidden behind an earlier descriptor is left out.
+
+        :return: Pairs of the emulated address of each run's first byte
+            and the :class:`ResolvedAddress` of that byte,
+            whose :attr:`~ResolvedAddress.contiguous` is the run's length.
+            Runs are in descriptor order, then address order.
+        """
+        for entry in self._entries:
+            if not entry.host:
+                continue
+
+            offset = 0
+            while offset < entry.len:
+                # The lowest address whose offset is this one, since it sets no disconnect bits
+                address = entry.start + _inflate(offset, entry.disconnect)
+                if address > self._top:
+                    break
+
+                resolved = self.resolve(address)
+                if (
+                    resolved is not None
+                    and resolved.descriptor is entry.descriptor
+                    and resolved.offset == offset
+                ):
+                    yield address, resolved
+                    offset += resolved.contiguous
+                else:
+                    # Shadowed by an earlier descriptor
+                    offset += min(_run(self._segment(address), address), entry.len - offset)
+
+    def __contains__(self, address: object) -> bool:
+        """Return whether ``address`` maps to host memory."""
+        return isinstance(address, int) and self.resolve(address) is not None
+
+    def _locate_or_raise(self, address: int, writable: bool) -> tuple[_Descriptor, int, int]:
+        located = self._locate(address)
+        if located is None:
+            raise ValueError(f"Address {address:#x} isn't mapped to host memory")
+
+        if writable and located[0].descriptor.flags & MemoryDescriptorFlag.CONST:
+            raise ValueError(f"Address {address:#x} is mapped to read-only memory")
+
+        return located
+
+    def _group(
+        self, addresses: Sequence[int], width: int, writable: bool
+    ) -> tuple[dict[_Descriptor, tuple[list[int], list[int]]], list[tuple[int, _Descriptor]]]:
+        # Groups the index of each address by the descriptor it resolves to,
+        # alongside its offset into that descriptor's memory,
+        # so that each descriptor's memory is accessed through a single view.
+        # Values that cross from one run of host memory into another are returned separately.
+        groups: dict[_Descriptor, tuple[list[int], list[int]]] = {}
+        split: list[tuple[int, _Descriptor]] = []
+        for i, address in enumerate(addresses):
+            entry, offset, contiguous = self._locate_or_raise(address, writable)
+            if contiguous < width:
+                split.append((i, entry))
+            else:
+                indices, offsets = groups.setdefault(entry, ([], []))
+                indices.append(i)
+                offsets.append(offset)
+
+        return groups, split
+
+    def read(self, address: int, size: int) -> bytes:
+        """
+        Read a range of emulated memory.
+
+        The range may span more than one descriptor or mirror,
+        in which case each contiguous run of host memory is copied at once.
+
+        :param address: The emulated address of the first byte to read.
+        :param size: The number of bytes to read.
+        :return: The bytes at the given range.
+        :raises ValueError: If any address in the range isn't mapped to host memory.
+        """
+        chunks: list[bytes] = []
+        end = address + size
+        while address < end:
+            entry, offset, contiguous = self._locate_or_raise(address, writable=False)
+            n = min(contiguous, end - address)
+            chunks.append(bytes(memoryview_at(entry.host + offset, n, readonly=True)))
+            address += n
+
+        return b"".join(chunks)
+
+    def write(self, address: int, data: Buffer) -> None:
+        """
+        Write to a range of emulated memory.
+
+        :param address: The emulated address of the first byte to write.
+        :param data: The bytes to write.
+        :raises ValueError: If any address in the range isn't mapped to host memory,
+            or is mapped by a descriptor with the :attr:`~.MemoryDescriptorFlag.CONST` flag.
+            If so, none of the data is written.
+        """
+        source = memoryview(data).cast("B")
+        runs: list[tuple[int, int, int]] = []
+        pos = 0
+        while pos < len(source):
+            entry, offset, contiguous = self._locate_or_raise(address + pos, writable=True)
+            n = min(contiguous, len(source) - pos)
+            runs.append((entry.host + offset, pos, n))
+            pos += n
+
+        for pointer, pos, n in runs:
+            memoryview_at(pointer, n, readonly=False)[:] = source[pos : pos + n]
+
+    def read_values(
+        self, addresses: Iterable[int], width: int = 1, byteorder: ByteOrder | None = None
+    ) -> list[int]:
+        """
+        Read an unsigned integer from each of many emulated addresses.
+
+        Addresses are resolved first and grouped by the descriptor they map to,
+        then each descriptor's values are read through one view of its memory;
+        if :mod:`numpy` is installed, that's a single vectorized gather per descriptor.
+
+        :param addresses: The emulated address of each value's first byte.
+        :param width: The size of each value, in bytes.
+        :param byteorder: The byte order of each value.
+            If :obj:`None`, each value uses the byte order
+            given by its descriptor's :attr:`~.MemoryDescriptorFlag.BIGENDIAN` flag.
+        :return: The value at each address, in the same order.
+        :raises ValueError: If any value isn't entirely mapped to host memory.
+        """
+        addresses = list(addresses)
+        groups, split = self._group(addresses, width, writable=False)
+        values = [0] * len(addresses)
+        for entry, (indices, offsets) in groups.items():
+            view = memoryview_at(entry.host, entry.len, readonly=True)
+            order = byteorder or _byteorder(entry.descriptor)
+            for i, value in zip(indices, _unpack(view, offsets, width, order)):
+                values[i] = value
+
+        for i, entry in split:
+            data = self.read(addresses[i], width)
+            values[i] = int.from_bytes(data, byteorder or _byteorder(entry.descriptor))
+
+        return values
+
+    def write_values(
+        self,
+        values: Mapping[int, int] | Iterable[tuple[int, int]],
+        width: int = 1,
+        byteorder: ByteOrder | None = None,
+    ) -> None:
+        """
+        Write an unsigned integer to each of many emulated addresses.
+
+        Values are grouped by descriptor as in :meth:`read_values`.
+
+        :param values: Pairs of emulated addresses and the values to write there.
+        :param width: The size of each value, in bytes.
+        :param byteorder: The byte order of each value.
+            If :obj:`None`, each value uses the byte order
+            given by its descriptor's :attr:`~.MemoryDescriptorFlag.BIGENDIAN` flag.
+        :raises ValueError: If any value isn't entirely mapped to writable host memory.
+            If so, none of the values are written.
+        :raises OverflowError: If any value doesn't fit in ``width`` bytes.
+            If so, none of the values are written.
+        """
+        pairs = dict(values)
+        addresses = list(pairs)
+        groups, split = self._group(addresses, width, writable=True)
+        encoded: list[tuple[_Descriptor, list[int], bytes]] = []
+        for entry, (indices, offsets) in groups.items():
+            order = byteorder or _byteorder(entry.descriptor)
+            data = _pack([pairs[addresses[i]] for i in indices], width, order)
+            encoded.append((entry, offsets, data))
+
+        split_data = [
+            (
+                addresses[i],
+                pairs[addresses[i]].to_bytes(width, byteorder or _byteorder(e.descriptor)),
+            )
+            for i, e in split
+        ]
+
+        for entry, offsets, data in encoded:
+            _scatter(memoryview_at(entry.host, entry.len, readonly=False), offsets, width, data)
+
+        for address, data in split_data:
+            self.write(address, data)
+
+
+def _run(segment: _Segment, address: int) -> int:
+    # The number of addresses from this one that map linearly to the same descriptor
+    run = segment.end - address
+    if segment.granule:
+        run = min(run, segment.granule - (address % segment.granule))
+
+    return run
+
+
+def _byteorder(descriptor: retro_memory_descriptor) -> ByteOrder:
+    return "big" if descriptor.flags & MemoryDescriptorFlag.BIGENDIAN else "little"
+
+
+def _index(offsets: Sequence[int], width: int) -> NDArray[np.intp]:
+    import numpy as np
+
+    # Row i holds the offsets of each byte of the value at offsets[i]
+    return np.add.outer(np.asarray(offsets, np.intp), np.arange(width, dtype=np.intp))
+
+
+def _dtype(width: int, byteorder: ByteOrder) -> str:
+    return f"{'<' if byteorder == 'little' else '>'}u{width}"
+
+
+def _unpack(
+    view: memoryview, offsets: Sequence[int], width: int, byteorder: ByteOrder
+) -> list[int]:
+    if _HAS_NUMPY and width in _NUMPY_WIDTHS:
+        import numpy as np
+
+        gathered = np.frombuffer(view, np.uint8)[_index(offsets, width)]
+        return gathered.view(_dtype(width, byteorder)).ravel().tolist()
+
+    return [int.from_bytes(view[o : o + width], byteorder) for o in offsets]
+
+
+def _pack(values: Sequence[int], width: int, byteorder: ByteOrder) -> bytes:
+    if _HAS_NUMPY and width in _NUMPY_WIDTHS:
+        import numpy as np
+
+        return np.asarray(values, _dtype(width, byteorder)).tobytes()
+
+    return b"".join([v.to_bytes(width, byteorder) for v in values])
+
+
+def _scatter(view: memoryview, offsets: Sequence[int], width: int, data: bytes) -> None:
+    if _HAS_NUMPY:
+        import numpy as np
+
+        source = np.frombuffer(data, np.uint8).reshape(-1, width)
+        np.frombuffer(view, np.uint8)[_index(offsets, width)] = source
+        return
+
+    for i, offset in enumerate(offsets):
+        view[offset : offset + width] = data[i * width : (i + 1) * width]
+
+
+__all__ = [
+    "AddressTranslator",
+    "ByteOrder",
+    "ResolvedAddress",
+]
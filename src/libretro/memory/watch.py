@@ -0,0 +1,334 @@
+"""
+Change detection for regions of a :class:`.Core`'s memory.
+
+.. seealso::
+
+    :mod:`libretro.api.memory`
+        The descriptor types that :meth:`.MemoryWatcher.watch_address` resolves addresses with.
+    :mod:`libretro.memory.translate`
+        The translator that resolves them.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from libretro.api._utils import memoryview_at
+from libretro.api.memory import retro_memory_descriptor, retro_memory_map
+
+from .translate import AddressTranslator
+
+if TYPE_CHECKING:
+    from libretro.core import CoreInterface
+
+_CHANGED_RUN = re.compile(rb"[^\x00]+")
+# Matches each maximal run of nonzero bytes in the XOR of two snapshots,
+# i.e. each contiguous span of bytes that differs between them.
+# Both the XOR and the scan run in C,
+# so finding the changes costs no Python work per unchanged byte.
+
+type MemoryChangeCallback = Callable[[MemoryChange], object]
+"""A callable that a :class:`MemoryWatch` invokes with each :class:`MemoryChange` it detects."""
+
+
+@dataclass(frozen=True, slots=True)
+class MemoryChange:
+    """A contiguous run of bytes within a :class:`MemoryWatch` that changed between two polls."""
+
+    watch: MemoryWatch
+    """The watch whose region changed."""
+    offset: int
+    """Offset of the first changed byte, relative to the start of :attr:`watch`."""
+    old: bytes
+    """The bytes that were in this run as of the previous poll."""
+    new: bytes
+    """The bytes that are in this run as of this poll."""
+
+    @property
+    def address(self) -> int:
+        """
+        The address of the first changed byte,
+        in the same address space as :attr:`.MemoryWatch.address`.
+        """
+        return self.watch.address + self.offset
+
+
+class MemoryWatch:
+    """
+    A single region of memory registered with a :class:`MemoryWatcher`.
+
+    Keeps a snapshot of the region as of the last poll
+    and a live view of the core's memory to compare it against.
+    Instances are created by :meth:`.MemoryWatcher.watch_memory`
+    and :meth:`.MemoryWatcher.watch_address`;
+    don't construct them directly.
+    """
+
+    __slots__ = ("_view", "_snapshot", "_address", "_memory_id", "_callback")
+
+    def __init__(
+        self,
+        view: memoryview,
+        address: int,
+        memory_id: int | None,
+        callback: MemoryChangeCallback | None,
+    ):
+        """
+        Take an initial snapshot of ``view``.
+
+        :param view: A live, byte-formatted view of the watched region.
+        :param address: The address of the region's first byte.
+        :param memory_id: The ``RETRO_MEMORY_*`` region this watch was created from,
+            or :obj:`None` if it was resolved from a memory map.
+        :param callback: Called with each :class:`MemoryChange` detected by :meth:`poll`.
+        """
+        self._view = view
+        self._snapshot = bytes(view)
+        self._address = address
+        self._memory_id = memory_id
+        self._callback = callback
+
+    @property
+    def address(self) -> int:
+        """
+        The address of the watched region's first byte.
+
+        For watches created with :meth:`.MemoryWatcher.watch_address`
+        this is an address in the core's emulated address space;
+        for watches created with :meth:`.MemoryWatcher.watch_memory`
+        this is an offset into the memory region given by :attr:`memory_id`.
+        """
+        return self._address
+
+    @property
+    def memory_id(self) -> int | None:
+        """
+        The ``RETRO_MEMORY_*`` region this watch was created from,
+        or :obj:`None` if it was resolved from the core's memory map.
+        """
+        return self._memory_id
+
+    @property
+    def callback(self) -> MemoryChangeCallback | None:
+        """The callable that :meth:`poll` invokes with each detected change, if any."""
+        return self._callback
+
+    @property
+    def snapshot(self) -> bytes:
+        """The contents of the watched region as of the last poll."""
+        return self._snapshot
+
+    def __len__(self) -> int:
+        """Return the length of the watched region in bytes."""
+        return len(self._snapshot)
+
+    def poll(self) -> list[MemoryChange]:
+        """
+        Compare the watched region to its snapshot and replace the snapshot.
+
+        Invokes :attr:`callback` once for each change, in address order.
+
+        :return: One :class:`MemoryChange` for each contiguous run of changed bytes,
+            in address order; empty if nothing changed.
+        """
+        current = bytes(self._view)
+        previous = self._snapshot
+        if current == previous:
+            return []
+
+        self._snapshot = current
+        size = len(current)
+        diff = int.from_bytes(current, "little") ^ int.from_bytes(previous, "little")
+        changes = [
+            MemoryChange(self, start, previous[start:end], current[start:end])
+            for start, end in (
+                m.span() for m in _CHANGED_RUN.finditer(diff.to_bytes(size, "little"))
+            )
+        ]
+
+        if self._callback is not None:
+            for change in changes:
+                self._callback(change)
+
+        return changes
+
+    def reset(self) -> None:
+        """Replace the snapshot with the region's current contents without reporting changes."""
+        self._snapshot = bytes(self._view)
+
+
+class MemoryWatcher:
+    """
+    Detects changes to registered regions of a core's memory from one poll to the next.
+
+    Register regions with :meth:`watch_memory` or :meth:`watch_address`,
+    then call :meth:`poll` after each frame.
+    To do that automatically, register :meth:`poll` with :meth:`.Session.add_frame_hook`.
+
+    Each poll copies every watched region once
+    and compares it to the previous copy in a single C-level comparison,
+    so regions that didn't change cost about as much as a ``memcmp``.
+    Changed regions are diffed as a whole
+    instead of one byte at a time.
+
+    .. warning::
+
+        Watches hold views of the core's memory,
+        so they must not be polled after the core unloads its content.
+    """
+
+    def __init__(
+        self,
+        core: CoreInterface | None = None,
+        memory_map: retro_memory_map
+        | Iterable[retro_memory_descriptor]
+        | AddressTranslator
+        | None = None,
+    ):
+        """
+        Initialize a watcher with no watched regions.
+
+        :param core: The core whose ``retro_get_memory_data`` regions
+            :meth:`watch_memory` resolves memory IDs with.
+            Usually :attr:`.Session.core`.
+        :param memory_map: The descriptors that :meth:`watch_address` resolves addresses with,
+            or an :class:`.AddressTranslator` built from them.
+            Usually :attr:`.CompositeEnvironmentDriver.memory_maps`.
+        """
+        self._core = core
+        self._descriptors: tuple[retro_memory_descriptor, ...] = ()
+        self._translator: AddressTranslator | None = None
+        if isinstance(memory_map, AddressTranslator):
+            self._translator = memory_map
+        elif memory_map is not None:
+            # Built on first use, so that a map RetroArch would reject
+            # doesn't stop the watcher from being used with watch_memory
+            self._descriptors = tuple(memory_map)
+        self._watches: list[MemoryWatch] = []
+        self._changes: Sequence[MemoryChange] = ()
+
+    @property
+    def watches(self) -> Sequence[MemoryWatch]:
+        """All regions currently registered with this watcher, in registration order."""
+        return tuple(self._watches)
+
+    @property
+    def changes(self) -> Sequence[MemoryChange]:
+        """The changes detected by the most recent call to :meth:`poll`."""
+        return self._changes
+
+    def watch_memory(
+        self,
+        id: int,
+        offset: int = 0,
+        length: int | None = None,
+        callback: MemoryChangeCallback | None = None,
+    ) -> MemoryWatch:
+        """
+        Watch part of a memory region exposed by ``retro_get_memory_data``.
+
+        :param id: The ``RETRO_MEMORY_*`` identifier of the region to watch.
+        :param offset: Offset of the first watched byte within the region.
+        :param length: Number of bytes to watch;
+            defaults to the rest of the region after ``offset``.
+        :param callback: Called with each :class:`MemoryChange` detected in this region.
+        :return: The new :class:`MemoryWatch`.
+        :raises RuntimeError: If this watcher wasn't given a core.
+        :raises ValueError: If the core doesn't expose the requested region,
+            or if the requested range doesn't fit inside it.
+        """
+        if self._core is None:
+            raise RuntimeError("Can't watch memory by ID without a core")
+
+        region = self._core.get_memory(id)
+        if region is None:
+            raise ValueError(f"Core doesn't expose memory region {id}")
+
+        if length is None:
+            length = len(region) - offset
+
+        if offset < 0 or length <= 0 or offset + length > len(region):
+            raise ValueError(
+                f"Expected a range within memory region {id} (0-{len(region):#x}), "
+                f"got {offset:#x}+{length:#x}"
+            )
+
+        watch = MemoryWatch(region[offset : offset + length], offset, id, callback)
+        self._watches.append(watch)
+        return watch
+
+    def watch_address(
+        self, address: int, length: int, callback: MemoryChangeCallback | None = None
+    ) -> MemoryWatch:
+        """
+        Watch a range of the core's emulated address space.
+
+        The range must map to one contiguous run of host memory,
+        as resolved by :meth:`.AddressTranslator.resolve`.
+
+        :param address: The emulated address of the first watched byte.
+        :param length: Number of bytes to watch.
+        :param callback: Called with each :class:`MemoryChange` detected in this range.
+        :return: The new :class:`MemoryWatch`.
+        :raises ValueError: If ``length`` isn't positive,
+            if no memory descriptor maps the entire range to contiguous host memory,
+            or if this watcher's memory map is one that RetroArch would reject.
+        """
+        if length <= 0:
+            raise ValueError(f"Expected a positive length, got {length}")
+
+        if self._translator is None:
+            self._translator = AddressTranslator(self._descriptors)
+
+        resolved = self._translator.resolve(address)
+        if resolved is None or resolved.contiguous < length:
+            raise ValueError(
+                f"No memory descriptor maps {address:#x}+{length:#x} to contiguous host memory"
+            )
+
+        view = memoryview_at(resolved.pointer, length, readonly=True)
+        watch = MemoryWatch(view, address, None, callback)
+        self._watches.append(watch)
+        return watch
+
+    def unwatch(self, watch: MemoryWatch) -> None:
+        """
+        Stop watching a region.
+
+        :param watch: A watch previously returned by this watcher.
+        :raises ValueError: If ``watch`` isn't registered with this watcher.
+        """
+        self._watches.remove(watch)
+
+    def poll(self) -> Sequence[MemoryChange]:
+        """
+        Compare every watched region to its snapshot from the previous poll.
+
+        Invokes each watch's :attr:`~.MemoryWatch.callback` for the changes detected in it.
+
+        :return: Every detected change, grouped by watch in registration order.
+            Also available as :attr:`changes` until the next poll.
+        """
+        changes: list[MemoryChange] = []
+        for watch in self._watches:
+            changes += watch.poll()
+
+        self._changes = changes
+        return changes
+
+    def reset(self) -> None:
+        """Re-snapshot every watched region without reporting changes."""
+        for watch in self._watches:
+            watch.reset()
+        self._changes = ()
+
+
+__all__ = [
+    "MemoryChange",
+    "MemoryChangeCallback",
+    "MemoryWatch",
+    "MemoryWatcher",
+]
@@ -7,7 +7,13 @@ from typing import Annotated, Any
 from click import BadArgumentUsage, FileError
 from typer import Argument, Option, Typer  # pyright: ignore[reportUnknownVariableType]
 
-from libretro import DEFAULT_DRIVER_MAP, Core, HardwareContext
+from libretro import (
+    DEFAULT_DRIVER_MAP,
+    Core,
+    HardwareContext,
+    ModernGlVideoDriver,
+    VideoDriver,
+)
 
 
 def load_core(value: str):
@@ -160,6 +166,45 @@ WindowOption = Annotated[
 ]
 
 
+def video_driver_map(
+    software_video: str, windowed: bool = False
+) -> dict[HardwareContext, Callable[[], VideoDriver]]:
+    driver_map = dict(DEFAULT_DRIVER_MAP)
+    if windowed and HardwareContext.OPENGL in driver_map:
+
+        def init_with_window():
+            return ModernGlVideoDriver(window="default")
+
+        driver_map[HardwareContext.OPENGL] = init_with_window
+        driver_map[HardwareContext.OPENGL_CORE] = init_with_window
+
+    match software_video:
+        case SoftwareVideoDriverType.OPENGL:
+            driver_map[HardwareContext.NONE] = driver_map[HardwareContext.OPENGL]
+        case SoftwareVideoDriverType.OPENGL_CORE:
+            driver_map[HardwareContext.NONE] = driver_map[HardwareContext.OPENGL_CORE]
+        case SoftwareVideoDriverType.OPENGLES2:
+            driver_map[HardwareContext.NONE] = driver_map[HardwareContext.OPENGLES2]
+        case SoftwareVideoDriverType.OPENGLES3:
+            driver_map[HardwareContext.NONE] = driver_map[HardwareContext.OPENGLES3]
+        case SoftwareVideoDriverType.OPENGLES:
+            driver_map[HardwareContext.NONE] = driver_map[HardwareContext.OPENGLES_VERSION]
+        case SoftwareVideoDriverType.VULKAN:
+            driver_map[HardwareContext.NONE] = driver_map[HardwareContext.VULKAN]
+        case SoftwareVideoDriverType.D3D9:
+            driver_map[HardwareContext.NONE] = driver_map[HardwareContext.D3D9]
+        case SoftwareVideoDriverType.D3D10:
+            driver_map[HardwareContext.NONE] = driver_map[HardwareContext.D3D10]
+        case SoftwareVideoDriverType.D3D11:
+            driver_map[HardwareContext.NONE] = driver_map[HardwareContext.D3D11]
+        case SoftwareVideoDriverType.D3D12:
+            driver_map[HardwareContext.NONE] = driver_map[HardwareContext.D3D12]
+        case _:
+            pass
+
+    return driver_map
+
+
 def prepare(
     function: Callable[..., Any],
 ) -> Typer:
@@ -179,4 +224,5 @@ __all__ = [
     "SoftwareVideoDriverType",
     "WindowOption",
     "prepare",
+    "video_driver_map",
 ]
@@ -0,0 +1,147 @@
+"""Measure how fast a :term:`core` runs with content under libretro.py."""
+
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Annotated
+
+from typer import Option  # pyright: ignore[reportUnknownVariableType]
+from typer.main import get_command
+
+from libretro import (
+    CallbackProfiler,
+    Content,
+    HardwareContext,
+    NullVideoDriver,
+    Session,
+    SubsystemContent,
+)
+from libretro.bench import BenchmarkReport, BenchmarkResult, profile_results, time_frames
+
+from ._common import (
+    ContentArg,
+    CoreArg,
+    CoreOptionsOption,
+    FrameCountOption,
+    SoftwareVideoDriverType,
+    SubsystemOption,
+    VideoDriverOption,
+    prepare,
+    video_driver_map,
+)
+
+WarmupOption = Annotated[
+    int,
+    Option(
+        "--warmup",
+        help="The number of frames to run before timing starts.",
+        min=0,
+    ),
+]
+
+NullOption = Annotated[
+    bool,
+    Option(
+        "--null",
+        help="Discard software-rendered frames with NullVideoDriver instead of keeping them, to measure the core and libretro.py alone.",
+    ),
+]
+
+ProfileOption = Annotated[
+    bool,
+    Option(
+        "--profile/--no-profile",
+        help="Time each callback to report how much of retro_run is spent in libretro.py. Adds a little overhead to every callback.",
+    ),
+]
+
+JsonOption = Annotated[
+    Path | None,
+    Option(
+        "--json",
+        help="Also write the results to this file as JSON, for comparing runs with libretro.bench.BenchmarkReport.",
+        dir_okay=False,
+        writable=True,
+    ),
+]
+
+
+def main(
+    libretro: CoreArg,
+    subsystem: SubsystemOption = None,
+    content_paths: ContentArg = None,
+    frames: FrameCountOption = 600,
+    warmup: WarmupOption = 60,
+    options: CoreOptionsOption = None,
+    software_video: VideoDriverOption = SoftwareVideoDriverType.DEFAULT,  # type: ignore[assignment]
+    null: NullOption = False,
+    profile: ProfileOption = True,
+    json: JsonOption = None,
+):
+    """
+    Load a libretro core with zero or more content files,
+    run it for a number of warm-up frames,
+    then time each of the next frames
+    and print the frame rate, frame-time percentiles,
+    and how much of retro_run was spent in the core
+    versus in libretro.py's callbacks.
+
+    Exits with 0 if no errors are raised during this time.
+    """
+    content: Content | SubsystemContent | None
+    match subsystem, content_paths:
+        case None, [path]:
+            content = path
+        case None, [] | None:
+            content = None
+        case str(subsystem), [*paths]:
+            content = SubsystemContent(subsystem, paths)
+        case _:
+            raise ValueError("Invalid combination of subsystem and content")
+
+    core_options: Mapping[str, str] = (
+        {k: v for k, v in (opt.split("=", 1) for opt in options)} if options else dict()
+    )
+
+    driver_map = video_driver_map(software_video)
+    if null:
+        driver_map[HardwareContext.NONE] = NullVideoDriver
+
+    profiler = CallbackProfiler() if profile else None
+    with Session(
+        libretro, content, video=driver_map, options=core_options, profiler=profiler
+    ) as session:
+        time_frames(session, warmup)
+        if profiler is not None:
+            profiler.reset()
+
+        samples = time_frames(session, frames)
+
+    name = Path(libretro.path).stem.removesuffix("_libretro")
+    timed = BenchmarkResult.from_samples("frames", name, samples)
+    print(f"{timed.count} frames in {timed.total / 1e9:.3f} s: {timed.rate:.1f} frames/s")
+    if timed.count:
+        percentiles = ", ".join(f"{p} {t / 1e6:.3f}" for p, t in timed.percentiles.items())
+        print(f"frame time (ms): {percentiles}, max {timed.max / 1e6:.3f}")
+
+    results = [timed]
+    if profiler is not None:
+        report = profiler.report()
+        if report.run.total:
+            print(
+                f"retro_run: {report.core_time / report.run.total:.1%} in the core, "
+                f"{report.callback_time / report.run.total:.1%} in libretro.py callbacks"
+            )
+
+        print(report)
+        results.extend(profile_results(profiler, name))
+
+    if json is not None:
+        with open(json, "w", encoding="utf-8") as f:
+            BenchmarkReport(results).write(f)
+
+
+app = prepare(main)
+command = get_command(app)
+
+if __name__ == "__main__":
+    app()
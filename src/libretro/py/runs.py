@@ -1,17 +1,12 @@
 """Run a :term:`core` with content for a fixed number of frames."""
 
 from collections.abc import Mapping
+from typing import Annotated
 
+from typer import Option  # pyright: ignore[reportUnknownVariableType]
 from typer.main import get_command
 
-from libretro import (
-    DEFAULT_DRIVER_MAP,
-    Content,
-    HardwareContext,
-    ModernGlVideoDriver,
-    Session,
-    SubsystemContent,
-)
+from libretro import Content, PacingTimingDriver, Session, SubsystemContent
 
 from ._common import (
     ContentArg,
@@ -23,8 +18,17 @@ from ._common import (
     VideoDriverOption,
     WindowOption,
     prepare,
+    video_driver_map,
 )
 
+RealtimeOption = Annotated[
+    bool,
+    Option(
+        "--realtime",
+        help="Run at the core's own frame rate instead of as fast as possible, e.g. to watch it in a window.",
+    ),
+]
+
 
 def main(
     libretro: CoreArg,
@@ -34,6 +38,7 @@ def main(
     options: CoreOptionsOption = None,
     software_video: VideoDriverOption = SoftwareVideoDriverType.DEFAULT,  # type: ignore[assignment]
     windowed: WindowOption = False,
+    realtime: RealtimeOption = False,
 ):
     """
     Load a libretro core with zero or more content files
@@ -46,7 +51,7 @@ def main(
         case None, [path]:
             # No subsystem, single content (most common case)
             content = path
-        case None, []:
+        case None, [] | None:
             # No subsystem, no content (ok if core uses RETRO_ENVIRONMENT_SET_SUPPORT_NO_GAME)
             content = None
         case str(subsystem), [*paths]:
@@ -58,42 +63,19 @@ def main(
         {k: v for k, v in (opt.split("=", 1) for opt in options)} if options else dict()
     )
 
-    driver_map = dict(DEFAULT_DRIVER_MAP)
-    if windowed and HardwareContext.OPENGL in driver_map:
-
-        def init_with_window():
-            return ModernGlVideoDriver(window="default")
-
-        driver_map[HardwareContext.OPENGL] = init_with_window
-        driver_map[HardwareContext.OPENGL_CORE] = init_with_window
-
-    match software_video:
-        case SoftwareVideoDriverType.OPENGL:
-            driver_map[HardwareContext.NONE] = driver_map[HardwareContext.OPENGL]
-        case SoftwareVideoDriverType.OPENGL_CORE:
-            driver_map[HardwareContext.NONE] = driver_map[HardwareContext.OPENGL_CORE]
-        case SoftwareVideoDriverType.OPENGLES2:
-            driver_map[HardwareContext.NONE] = driver_map[HardwareContext.OPENGLES2]
-        case SoftwareVideoDriverType.OPENGLES3:
-            driver_map[HardwareContext.NONE] = driver_map[HardwareContext.OPENGLES3]
-        case SoftwareVideoDriverType.OPENGLES:
-            driver_map[HardwareContext.NONE] = driver_map[HardwareContext.OPENGLES_VERSION]
-        case SoftwareVideoDriverType.VULKAN:
-            driver_map[HardwareContext.NONE] = driver_map[HardwareContext.VULKAN]
-        case SoftwareVideoDriverType.D3D9:
-            driver_map[HardwareContext.NONE] = driver_map[HardwareContext.D3D9]
-        case SoftwareVideoDriverType.D3D10:
-            driver_map[HardwareContext.NONE] = driver_map[HardwareContext.D3D10]
-        case SoftwareVideoDriverType.D3D11:
-            driver_map[HardwareContext.NONE] = driver_map[HardwareContext.D3D11]
-        case SoftwareVideoDriverType.D3D12:
-            driver_map[HardwareContext.NONE] = driver_map[HardwareContext.D3D12]
-        case _:
-            pass
+    driver_map = video_driver_map(software_video, windowed)
 
     # TODO: Allow a window to be created for the session
 
-    with Session(libretro, content, video=driver_map, options=core_options) as session:
+    if realtime:
+        session = Session(
+            libretro, content, video=driver_map, options=core_options, timing=PacingTimingDriver()
+        )
+    else:
+        # Keep the session's default timing driver (and the throttle state it reports)
+        session = Session(libretro, content, video=driver_map, options=core_options)
+
+    with session:
         for _ in range(frames):
             session.run()
 
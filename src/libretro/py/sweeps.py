@@ -0,0 +1,178 @@
+"""Run a :term:`core` with content under many combinations of core options."""
+
+import sys
+from pathlib import Path
+from typing import Annotated
+
+from click import BadArgumentUsage, BadParameter
+from typer import Option  # pyright: ignore[reportUnknownVariableType]
+from typer.main import get_command
+
+from libretro import Content, SubsystemContent
+from libretro.sweep import (
+    OptionSpace,
+    all_combinations,
+    format_results,
+    load_option_space,
+    run_sweep,
+    sample_combinations,
+    write_results,
+)
+
+from ._common import (
+    ContentArg,
+    CoreArg,
+    CoreOptionsOption,
+    FrameCountOption,
+    SubsystemOption,
+    prepare,
+)
+
+
+def _parse_sweep(value: list[str] | None) -> dict[str, tuple[str, ...] | None] | None:
+    if value is None:
+        return None
+
+    swept: dict[str, tuple[str, ...] | None] = {}
+    for v in value:
+        key, sep, values = v.partition("=")
+        if not key or (sep and not values):
+            raise BadParameter(f"Invalid sweep format: {v}")
+        swept[key] = tuple(values.split(",")) if sep else None
+
+    return swept
+
+
+SweepOption = Annotated[
+    list[str] | None,
+    Option(
+        "--sweep",
+        "-k",
+        help="An option to sweep. Format: 'option' to sweep all of its values, or 'option=a,b,c' to sweep only those. May be specified multiple times. If omitted, all options are swept.",
+    ),
+]
+
+SampleOption = Annotated[
+    int | None,
+    Option(
+        "--sample",
+        help="Run this many randomly-chosen combinations instead of all of them.",
+        min=1,
+    ),
+]
+
+SeedOption = Annotated[
+    int | None,
+    Option("--seed", help="Seed for --sample, for reproducible runs."),
+]
+
+WorkersOption = Annotated[
+    int,
+    Option(
+        "--workers",
+        "-j",
+        help="The number of processes to run combinations in. Each one keeps its own core loaded.",
+        min=1,
+    ),
+]
+
+RestartOption = Annotated[
+    bool,
+    Option(
+        "--restart",
+        help="Start a new session for every combination instead of switching options on a running core.",
+    ),
+]
+
+OutputOption = Annotated[
+    Path | None,
+    Option(
+        "--output",
+        "-o",
+        help="Also write the results to this file as CSV.",
+        dir_okay=False,
+        writable=True,
+    ),
+]
+
+
+def main(
+    libretro: CoreArg,
+    subsystem: SubsystemOption = None,
+    content_paths: ContentArg = None,
+    frames: FrameCountOption = 60,
+    sweep: SweepOption = None,
+    options: CoreOptionsOption = None,
+    sample: SampleOption = None,
+    seed: SeedOption = None,
+    workers: WorkersOption = 1,
+    restart: RestartOption = False,
+    output: OutputOption = None,
+):
+    """
+    Load a libretro core with zero or more content files
+    and run it for a fixed number of frames
+    under each combination of the swept core options,
+    then print a table of the results.
+
+    Options set with --option are held fixed for every combination.
+
+    Exits with 0 if every combination ran without errors.
+    """
+    content: Content | SubsystemContent | None
+    match subsystem, content_paths:
+        case None, [path]:
+            content = path
+        case None, [] | None:
+            content = None
+        case str(subsystem), [*paths]:
+            content = SubsystemContent(subsystem, paths)
+        case _:
+            raise ValueError("Invalid combination of subsystem and content")
+
+    swept = _parse_sweep(sweep)
+    fixed = {k: v for k, v in (opt.split("=", 1) for opt in options)} if options else {}
+
+    space: dict[str, tuple[str, ...]] = {}
+    if swept is None or any(v is None for v in swept.values()):
+        defined = load_option_space(libretro.path, content)
+        keys = [k for k in defined if k not in fixed] if swept is None else list(swept)
+        for key in keys:
+            if key not in defined:
+                raise BadArgumentUsage(f"Core doesn't define option {key}")
+            space[key] = defined[key]
+
+    for key, values in (swept or {}).items():
+        if values is not None:
+            space[key] = values
+
+    option_space: OptionSpace = {**{k: (v,) for k, v in fixed.items()}, **space}
+    combinations = (
+        sample_combinations(option_space, sample, seed=seed)
+        if sample is not None
+        else all_combinations(option_space)
+    )
+
+    results = run_sweep(
+        libretro.path,
+        content,
+        combinations,
+        frames=frames,
+        workers=workers,
+        live=False if restart else None,
+    )
+
+    print(format_results(results))
+    if output is not None:
+        with open(output, "w", newline="", encoding="utf-8") as f:
+            write_results(results, f)
+
+    if not all(r.passed for r in results):
+        sys.exit(1)
+
+
+app = prepare(main)
+command = get_command(app)
+
+if __name__ == "__main__":
+    app()
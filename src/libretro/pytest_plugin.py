@@ -0,0 +1,411 @@
+"""
+A :mod:`pytest` plugin that provides fixtures for testing cores with libretro.py.
+
+Installed with libretro.py and loaded automatically by pytest.
+Provides these fixtures:
+
+``core``
+    The :class:`.Core` under test.
+``session``
+    An entered :class:`.Session` running ``core`` with the configured content.
+``session_factory``
+    A :class:`SessionFactory` for tests that need more than one session
+    or different arguments for each.
+
+The core, content, and :class:`.Session` arguments come from
+``@pytest.mark.libretro(...)`` markers (with those closer to the test taking precedence),
+falling back to the ``--libretro-core``
+and ``--libretro-content`` options (or the ``libretro_core`` and ``libretro_content`` ini settings).
+The scope of ``core``, ``session``, and ``session_factory``
+is set with ``--libretro-session-scope`` or the ``libretro_session_scope`` ini setting,
+and defaults to ``function``.
+
+Loaded cores are cached for the lifetime of the process,
+and so are savestates taken after a session's ``warmup`` frames,
+so each core is loaded and booted at most once per ``pytest -n`` worker.
+
+The ``golden_frame`` and ``audio_digest`` markers compare the ``session``
+fixture's final video frame or audio output to a known SHA-256 digest
+(see :func:`frame_digest` and :func:`audio_digest`) once the test body finishes.
+
+.. code-block:: python
+
+    import pytest
+
+    pytestmark = pytest.mark.libretro(core=("custom", "audio_query_test"), warmup=60)
+
+    @pytest.mark.golden_frame("3b0c...")
+    def test_title_screen(session):
+        for _ in range(10):
+            session.run()
+"""
+
+import hashlib
+import os
+from collections.abc import Generator, Hashable, Mapping
+from contextlib import ExitStack
+from os import PathLike
+from pathlib import Path
+from typing import Any, Literal, cast
+
+import pytest
+
+from libretro.core import Core
+from libretro.drivers import ArrayAudioDriver
+from libretro.session import Session
+
+type CoreSpec = Core | str | PathLike[str] | tuple[str, str]
+"""
+Identifies a core for the ``libretro`` marker and :class:`SessionFactory`:
+a loaded :class:`.Core`, the path to one,
+or the ``(category, name)`` of a bundled sample core.
+"""
+
+type _Scope = Literal["session", "package", "module", "class", "function"]
+
+_SCOPES = ("session", "package", "module", "class", "function")
+
+_cores: dict[str, Core] = {}
+_warm_states: dict[Hashable, bytes | None] = {}
+
+
+def load_core(spec: CoreSpec) -> Core:
+    """
+    Return the :class:`.Core` identified by ``spec``,
+    loading it on first use and reusing it for the rest of the process.
+
+    :param spec: The :obj:`CoreSpec` to load.
+    :raises ImportError: If ``spec`` names a sample core that isn't bundled.
+    :raises OSError: If the core can't be loaded.
+    """
+    match spec:
+        case Core():
+            return spec
+        case (str(category), str(name)):
+            from libretro.samples._loader import load_sample_core
+
+            return load_sample_core(category, name)
+        case _:
+            key = os.fspath(Path(spec).resolve())
+            core = _cores.get(key)
+            if core is None:
+                core = _cores[key] = Core(key)
+
+            return core
+
+
+def frame_digest(session: Session) -> str | None:
+    """
+    Return the SHA-256 digest of ``session``'s most recent video frame,
+    or :obj:`None` if it hasn't rendered one.
+
+    The digest covers the frame's dimensions and pixel format as well as its pixels,
+    so it's stable across runs but changes if anything visible does.
+    """
+    screenshot = session.video.screenshot()
+    if screenshot is None:
+        return None
+
+    digest = hashlib.sha256(
+        f"{screenshot.width}x{screenshot.height}:{screenshot.pixel_format.name}".encode()
+    )
+    digest.update(screenshot.data)
+    return digest.hexdigest()
+
+
+def audio_digest(session: Session, start: int = 0) -> str:
+    """
+    Return the SHA-256 digest of the audio samples ``session`` has received.
+
+    :param session: A session whose audio driver is an :class:`.ArrayAudioDriver`.
+    :param start: The index of the first sample to include.
+    :raises TypeError: If ``session``'s audio driver isn't an :class:`.ArrayAudioDriver`.
+    """
+    audio = session.audio
+    if not isinstance(audio, ArrayAudioDriver):
+        raise TypeError(f"Expected an ArrayAudioDriver, got {type(audio).__name__}")
+
+    return hashlib.sha256(memoryview(audio.buffer)[start:]).hexdigest()
+
+
+class SessionFactory:
+    """
+    Creates entered :class:`.Session` objects that are exited when the fixture is torn down.
+
+    Returned by the ``session_factory`` fixture.
+    """
+
+    def __init__(
+        self,
+        stack: ExitStack,
+        core: CoreSpec | None = None,
+        content: Any = None,
+        **kwargs: Any,
+    ):
+        """
+        Initialize the factory.
+
+        :param stack: Exits every session this factory creates when closed.
+        :param core: The core to use if none is given to :meth:`__call__`.
+        :param content: The content to use if none is given to :meth:`__call__`.
+        :param kwargs: Default arguments for :meth:`__call__`.
+        """
+        self._stack = stack
+        self._core = core
+        self._content = content
+        self._kwargs = kwargs
+        self._audio_starts: dict[int, int] = {}
+
+    def __call__(
+        self,
+        core: CoreSpec | None = None,
+        content: Any = None,
+        *,
+        warmup: int = 0,
+        **kwargs: Any,
+    ) -> Session:
+        """
+        Create and enter a :class:`.Session`.
+
+        :param core: The core to run;
+            defaults to the one configured for the test.
+            Skips the test if there isn't one.
+        :param content: The content to load;
+            defaults to the content configured for the test.
+        :param warmup: The number of frames to run before returning the session.
+            If the only other argument is ``options``,
+            the state reached after these frames is saved the first time
+            and restored on every later call with the same core, content, and options
+            instead of running the frames again.
+        :param kwargs: Passed to :class:`.Session`,
+            overriding any configured for the test.
+        :return: The entered session.
+        """
+        spec = core if core is not None else self._core
+        if spec is None:
+            pytest.skip(
+                "No libretro core configured; "
+                "pass --libretro-core or use @pytest.mark.libretro(core=...)"
+            )
+
+        loaded = load_core(spec)
+        game = content if content is not None else self._content
+        arguments = {**self._kwargs, **kwargs}
+        session = self._stack.enter_context(Session(loaded, game, **arguments))
+
+        if warmup > 0:
+            key = _warm_key(loaded, game, warmup, arguments)
+            state = _warm_states.get(key) if key is not None else None
+            if state is None or not session.core.unserialize(state):
+                for _ in range(warmup):
+                    session.run()
+
+                if key is not None and key not in _warm_states:
+                    _warm_states[key] = _serialize(session)
+
+        if isinstance(session.audio, ArrayAudioDriver):
+            self._audio_starts[id(session)] = len(session.audio.buffer)
+
+        return session
+
+    def audio_start(self, session: Session) -> int:
+        """
+        Return the index of the first audio sample ``session`` received after this factory returned it,
+        so that warm-up audio can be left out of :func:`audio_digest`.
+        """
+        return self._audio_starts.get(id(session), 0)
+
+
+def _warm_key(core: Core, content: Any, warmup: int, kwargs: Mapping[str, Any]) -> Hashable | None:
+    if set(kwargs) - {"options"}:
+        # Other arguments (e.g. drivers) may affect the state but can't be compared
+        return None
+
+    options = kwargs.get("options")
+    if options is not None and not isinstance(options, Mapping):
+        return None
+
+    option_items = frozenset(cast(Mapping[Any, Any], options).items()) if options else None
+    try:
+        key = (core.path, content, warmup, option_items)
+        hash(key)
+    except TypeError:
+        return None
+
+    return key
+
+
+def _serialize(session: Session) -> bytes | None:
+    size = session.core.serialize_size()
+    if size <= 0:
+        return None
+
+    state = bytearray(size)
+    return bytes(state) if session.core.serialize(state) else None
+
+
+def _scope(fixture_name: str, config: pytest.Config) -> _Scope:  # noqa: ARG001
+    scope = config.getoption("libretro_session_scope", None)
+    if scope is None:
+        try:
+            scope = config.getini("libretro_session_scope")
+        except ValueError:
+            # This module was imported (e.g. by --doctest-modules) without registering the plugin
+            scope = "function"
+
+    if scope not in _SCOPES:
+        raise pytest.UsageError(f"libretro_session_scope must be one of {_SCOPES}, not {scope!r}")
+
+    return scope
+
+
+def _marker(request: pytest.FixtureRequest) -> tuple[tuple[Any, ...], dict[str, Any]]:
+    # FixtureRequest.node isn't annotated
+    node = cast(pytest.Item | pytest.Collector, request.node)  # pyright: ignore[reportUnknownMemberType]
+    args: tuple[Any, ...] = ()
+    kwargs: dict[str, Any] = {}
+    # Closer markers (e.g. on the test) override farther ones (e.g. on the module)
+    for marker in reversed(list(node.iter_markers("libretro"))):
+        args = marker.args + args[len(marker.args) :]
+        kwargs.update(marker.kwargs)
+
+    return args, kwargs
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Register libretro.py's command-line options and ini settings."""
+    group = parser.getgroup("libretro", "libretro.py fixtures")
+    group.addoption(
+        "--libretro-core",
+        dest="libretro_core",
+        help="Path to the core used by the core and session fixtures.",
+    )
+    group.addoption(
+        "--libretro-content",
+        dest="libretro_content",
+        help="Path to the content loaded by the session fixture.",
+    )
+    group.addoption(
+        "--libretro-session-scope",
+        dest="libretro_session_scope",
+        choices=_SCOPES,
+        help="Scope of the core, session, and session_factory fixtures.",
+    )
+    parser.addini("libretro_core", "Path to the core used by the core and session fixtures.")
+    parser.addini("libretro_content", "Path to the content loaded by the session fixture.")
+    parser.addini(
+        "libretro_session_scope",
+        "Scope of the core, session, and session_factory fixtures.",
+        default="function",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Register libretro.py's markers."""
+    config.addinivalue_line(
+        "markers",
+        "libretro(core=None, content=None, *, warmup=0, **session_kwargs): "
+        "the core, content, and Session arguments used by libretro.py's fixtures",
+    )
+    config.addinivalue_line(
+        "markers",
+        "golden_frame(digest): fail unless the session fixture's last frame has this SHA-256 digest",
+    )
+    config.addinivalue_line(
+        "markers",
+        "audio_digest(digest): fail unless the session fixture's audio has this SHA-256 digest",
+    )
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item: pytest.Item) -> Generator[None, object, object]:
+    """Check the ``golden_frame`` and ``audio_digest`` markers after the test body passes."""
+    result = yield
+    funcargs: dict[str, object] = getattr(item, "funcargs", {})
+    if not isinstance(funcargs.get("session"), Session):
+        return result
+
+    session = cast(Session, funcargs["session"])
+
+    golden = item.get_closest_marker("golden_frame")
+    if golden is not None:
+        expected = golden.args[0]
+        actual = frame_digest(session)
+        if actual != expected:
+            pytest.fail(f"Frame digest {actual} doesn't match golden_frame {expected}")
+
+    marker = item.get_closest_marker("audio_digest")
+    if marker is not None:
+        expected = marker.args[0]
+        factory = funcargs.get("session_factory")
+        start = factory.audio_start(session) if isinstance(factory, SessionFactory) else 0
+        actual = audio_digest(session, start)
+        if actual != expected:
+            pytest.fail(f"Audio digest {actual} doesn't match audio_digest {expected}")
+
+    return result
+
+
+@pytest.fixture(scope=_scope)
+def core(request: pytest.FixtureRequest) -> Core:
+    """
+    Provide the :class:`.Core` configured for this test.
+
+    Skips the test if none is configured.
+    """
+    args, kwargs = _marker(request)
+    spec: CoreSpec | None = kwargs.get("core", args[0] if args else None)
+    if spec is None:
+        spec = request.config.getoption("libretro_core") or request.config.getini("libretro_core")
+
+    if not spec:
+        pytest.skip(
+            "No libretro core configured; "
+            "pass --libretro-core or use @pytest.mark.libretro(core=...)"
+        )
+
+    return load_core(spec)
+
+
+@pytest.fixture(scope=_scope)
+def session_factory(
+    request: pytest.FixtureRequest, core: Core
+) -> Generator[SessionFactory, None, None]:
+    """
+    Provide a :class:`SessionFactory` that defaults to this test's core, content, and session arguments.
+
+    Every session it creates is exited when the fixture is torn down.
+    """
+    args, kwargs = _marker(request)
+    kwargs.pop("core", None)
+    kwargs.pop("warmup", None)
+    content = kwargs.pop("content", args[1] if len(args) > 1 else None)
+    if content is None:
+        content = request.config.getoption("libretro_content") or request.config.getini(
+            "libretro_content"
+        )
+
+    with ExitStack() as stack:
+        yield SessionFactory(stack, core, content or None, **kwargs)
+
+
+@pytest.fixture(scope=_scope)
+def session(request: pytest.FixtureRequest, session_factory: SessionFactory) -> Session:
+    """
+    Provide an entered :class:`.Session` for this test's core, content, and session arguments,
+    already advanced by the ``libretro`` marker's ``warmup`` frames.
+
+    The session is shared by every test in the fixture's scope.
+    """
+    _, kwargs = _marker(request)
+    warmup: int = kwargs.get("warmup", 0)
+    return session_factory(warmup=warmup)
+
+
+__all__ = [
+    "CoreSpec",
+    "SessionFactory",
+    "audio_digest",
+    "frame_digest",
+    "load_core",
+]
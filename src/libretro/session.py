@@ -29,6 +29,7 @@ from libretro.core import Core, CoreInterface
 from libretro.drivers import (
     ArrayAudioDriver,
     AudioDriver,
+    CallbackProfiler,
     CameraDriver,
     CompositeEnvironmentDriver,
     ConstantPowerDriver,
@@ -40,6 +41,7 @@ from libretro.drivers import (
     DictLedDriver,
     DictOptionDriver,
     DictRumbleDriver,
+    DiskDriver,
     DriverMap,
     FileSystemDriver,
     GeneratorMicrophoneDriver,
@@ -63,6 +65,7 @@ from libretro.drivers import (
     PerfDriver,
     PowerDriver,
     RumbleDriver,
+    SensorArray,
     SensorDriver,
     SensorStateGenerator,
     SensorStateIterable,
@@ -76,8 +79,7 @@ from libretro.drivers import (
 )
 from libretro.drivers.types import Pollable
 from libretro.error import (
-    CallbackException,
-    CallbackExceptionGroup,
+    CallbackExceptionCollector,
     CoreShutDownException,
 )
 
@@ -103,7 +105,11 @@ type OptionDriverArg[O: OptionDriver | None] = (
 type PathDriverArg[P: PathDriver | None] = P | Callable[[Core], P | None] | None
 type RumbleDriverArg[R: RumbleDriver | None] = _OptionalArg[R]
 type SensorDriverArg[S: SensorDriver | None] = (
-    _OptionalArg[S] | SensorStateGenerator | SensorStateIterable | SensorStateIterator
+    _OptionalArg[S]
+    | SensorStateGenerator
+    | SensorStateIterable
+    | SensorStateIterator
+    | SensorArray
 )
 type CameraDriverArg[C: CameraDriver | None] = _OptionalArg[C]
 type LogDriverArg[L: LogDriverArg | None] = _OptionalArg[L] | Logger
@@ -121,6 +127,7 @@ type ThrottleStateArg = _OptionalArg[retro_throttle_state]
 type SavestateContextArg = _OptionalArg[SavestateContext]
 type MicDriverArg[M: MicrophoneDriver | None] = _OptionalArg[M]
 type PowerDriverArg[P: PowerDriver | None] = _OptionalArg[P] | retro_device_power
+type DiskDriverArg[D: DiskDriver | None] = _OptionalArg[D]
 
 
 def _to_audio_driver[A: AudioDriver](audio: AudioDriverArg[A]) -> A:
@@ -325,7 +332,7 @@ def _to_sensor_driver[S: SensorDriver](sensor: Callable[[], S | None]) -> S | No
 
 @overload
 def _to_sensor_driver(
-    sensor: SensorStateGenerator | SensorStateIterable | SensorStateIterator,
+    sensor: SensorStateGenerator | SensorStateIterable | SensorStateIterator | SensorArray,
 ) -> IterableSensorDriver: ...
 
 
@@ -333,7 +340,7 @@ def _to_sensor_driver[S: SensorDriver](
     sensor: SensorDriverArg[S],
 ) -> S | None | IterableSensorDriver:
     match sensor:
-        case Generator() | Iterable() | Iterator():
+        case SensorArray() | Generator() | Iterable() | Iterator():
             return IterableSensorDriver(sensor)
         case Callable() as func:
             # Either a generator or a driver type
@@ -545,6 +552,18 @@ def _to_power_driver[P: PowerDriver](power: PowerDriverArg[P]) -> P | ConstantPo
             )
 
 
+def _to_disk_driver[D: DiskDriver](disk: DiskDriverArg[D]) -> D | None:
+    match disk:
+        case Callable():
+            return disk()
+        case DiskDriver() | None:
+            return disk
+        case _:
+            raise TypeError(
+                f"Expected a DiskDriver, a callable that returns one, or None; got {type(disk).__name__}"
+            )
+
+
 def _default_timing_driver():
     return DefaultTimingDriver(retro_throttle_state(ThrottleMode.UNBLOCKED, 0.0), 60.0)
 
@@ -662,6 +681,9 @@ class Session(
         jit_capable: bool | None = True,
         mic: MicDriverArg[_Mic] = GeneratorMicrophoneDriver,
         device_power: PowerDriverArg[_Power] = ConstantPowerDriver,
+        profiler: CallbackProfiler | None = None,
+        disk: DiskDriverArg[DiskDriver] = None,
+        callback_exceptions: CallbackExceptionCollector | None = None,
     ):
         """
         Initialize the session with a core, optional game content, and driver implementations.
@@ -853,6 +875,10 @@ class Session(
                 Will be wrapped in an :class:`.IterableSensorDriver`
                 that yields elements as described in :class:`.IterableSensorDriver`.
 
+            :class:`.SensorArray`
+                Will be wrapped in an :class:`.IterableSensorDriver`
+                that replays one frame of readings per poll.
+
             :class:`~collections.abc.Callable` () -> :class:`.SensorDriver` | iterable
                 Zero-argument function that returns either a :class:`.SensorDriver`
                 or an iterable/iterator/generator
@@ -1001,6 +1027,7 @@ class Session(
                 The corresponding environment calls will be unavailable to the core.
 
             Defaults to a :class:`.DefaultTimingDriver` running unblocked at 60 FPS.
+            Pass :class:`.PacingTimingDriver` to run at the core's own frame rate instead.
 
         :param preferred_hw: The preferred hardware context to report to the core.
             May be one of the following:
@@ -1077,6 +1104,35 @@ class Session(
             Defaults to a :class:`.ConstantPowerDriver`
             reporting a fully charged, plugged-in device.
 
+        :param profiler: If given, times every callback the core invokes
+            and every call to ``retro_run``.
+            Defaults to :obj:`None`, which adds no overhead.
+
+        :param disk: The disk-control driver. May be one of the following:
+
+            :class:`.DiskDriver`
+                Will be used as-is.
+                If it's also :class:`.Pollable` (like :class:`.ScriptedDiskDriver`),
+                it's polled once per frame by :meth:`run`.
+
+            :class:`~collections.abc.Callable` () -> :class:`.DiskDriver` | :obj:`None`
+                Zero-argument function that returns a :class:`.DiskDriver` or :obj:`None`.
+
+            :obj:`None`
+                The disk-control interface will be unavailable to the core.
+
+            Defaults to :obj:`None`.
+
+        :param callback_exceptions: Collects exceptions raised by libretro.py's callbacks
+            until the call into the core that triggered them returns,
+            at which point they're raised as a single :class:`.CallbackException`
+            or :class:`.CallbackExceptionGroup`.
+            A warning is issued for the first exception from each :class:`.ExceptionSite`.
+            If the collector's :attr:`~.CallbackExceptionCollector.abort_after` is reached,
+            every remaining callback returns a default value without running
+            until the call into the core returns.
+            Defaults to a :class:`.CallbackExceptionCollector` with its default configuration.
+
         :raises TypeError: If ``core`` is not a :class:`.Core`,
             :class:`ctypes.CDLL`, or a filesystem path,
             or if any driver argument is not one of its permitted types.
@@ -1123,12 +1179,22 @@ class Session(
             jit_capable=jit_capable,
             mic=_to_mic_driver(mic),
             device_power=_to_power_driver(device_power),
+            profiler=profiler,
+            disk=_to_disk_driver(disk),
         )
 
         self._game = game
 
         self._system_av_info: retro_system_av_info | None = None
-        self._pending_callback_exceptions: list[Exception] = []
+        if callback_exceptions is None:
+            callback_exceptions = CallbackExceptionCollector()
+        elif not isinstance(callback_exceptions, CallbackExceptionCollector):
+            raise TypeError(
+                f"Expected CallbackExceptionCollector or None, got {type(callback_exceptions).__name__}"
+            )
+
+        self._callback_exceptions = callback_exceptions
+        self._frame_hooks: list[Callable[[], object]] = []
         self._is_exited = False
 
     def __enter__(self):
@@ -1148,17 +1214,22 @@ class Session(
                 f"libretro.py is only compatible with API version {API_VERSION}, but the core uses {api_version}"
             )
 
-        self._core.set_video_refresh(self.video_refresh)
+        self._core.set_video_refresh(self._profiled("video_refresh", self.video_refresh))
         self._raise_pending_exceptions("retro_set_video_refresh")
-        self._core.set_audio_sample(self.audio_sample)
+        self._core.set_audio_sample(self._profiled("audio_sample", self.audio_sample))
         self._raise_pending_exceptions("retro_set_audio_sample")
-        self._core.set_audio_sample_batch(self.audio_sample_batch)
+        self._core.set_audio_sample_batch(
+            self._profiled("audio_sample_batch", self.audio_sample_batch)
+        )
         self._raise_pending_exceptions("retro_set_audio_sample_batch")
-        self._core.set_input_poll(self.input_poll)
+        self._core.set_input_poll(self._profiled("input_poll", self.input_poll))
         self._raise_pending_exceptions("retro_set_input_poll")
-        self._core.set_input_state(self.input_state)
+        self._core.set_input_state(self._profiled("input_state", self.input_state))
         self._raise_pending_exceptions("retro_set_input_state")
-        self._core.set_environment(self.environment)
+        if self._profiler is not None:
+            self._core.set_environment(self._profiler.wrap_environment(self.environment))
+        else:
+            self._core.set_environment(self.environment)
         self._raise_pending_exceptions("retro_set_environment")
 
         system_info = self._core.get_system_info()
@@ -1207,9 +1278,17 @@ class Session(
             # to avoid calling side effects twice on the same driver.
             self._audio.system_av_info = self._system_av_info
 
+        if self._timing is not None:
+            self._timing.system_av_info = self._system_av_info
+
         return self
 
-    def __exit__(self, exc_type: type[Exception], exc_val: Exception, exc_tb: TracebackType):
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ):
         """
         Unload the game and deinitialize the core, propagating exceptions unless the core shut down.
 
@@ -1395,7 +1474,8 @@ class Session(
         """
         Advance the core by one frame.
 
-        Polls per-frame drivers, ticks the timing driver, and calls ``retro_run``.
+        Polls per-frame drivers, ticks the timing driver, calls ``retro_run``,
+        then invokes every hook registered with :meth:`add_frame_hook`.
 
         :raises CoreShutDownException: If the session has exited or the core has shut down.
         """
@@ -1415,16 +1495,49 @@ class Session(
             self._mic.poll()
 
         if self._timing is not None:
+            # Drivers that pace frames (e.g. PacingTimingDriver) wait here
+            # and report the real time elapsed since the last frame
             self._timing.frame_time(None)
-            # TODO: Get the time elapsed since the last frame and pass it to frame_time
-            # or if throttle_state is set, use that to determine the time elapsed
 
         # TODO: self._environment.audio.report_buffer_status()
-        # TODO: self._environment.camera.poll() (see runloop_iterate in runloop.c, lion)
+        if self._camera is not None:
+            # See runloop_iterate in runloop.c
+            self._camera.poll()
+
+        if isinstance(self._disk, Pollable):
+            self._disk.poll()
+
         # TODO: Ensure that input is not polled more than once per frame
-        self._core.run()
+        if self._profiler is not None:
+            self._profiler.run(self._core.run)
+        else:
+            self._core.run()
         self._raise_pending_exceptions("retro_run")
 
+        for hook in self._frame_hooks:
+            hook()
+
+    def add_frame_hook(self, hook: Callable[[], object]) -> None:
+        """
+        Register a callable to be invoked at the end of every :meth:`run`.
+
+        Hooks run in registration order,
+        after ``retro_run`` returns and after any pending callback exceptions are raised.
+        A hook that raises an exception interrupts the remaining hooks for that frame.
+
+        :param hook: A zero-argument callable; its return value is ignored.
+        """
+        self._frame_hooks.append(hook)
+
+    def remove_frame_hook(self, hook: Callable[[], object]) -> None:
+        """
+        Unregister a callable previously passed to :meth:`add_frame_hook`.
+
+        :param hook: The callable to remove.
+        :raises ValueError: If ``hook`` isn't registered.
+        """
+        self._frame_hooks.remove(hook)
+
     def reset(self) -> None:
         """
         Reset the running core, equivalent to flipping the emulated power switch.
@@ -1478,31 +1591,34 @@ class Session(
         self._core.cheat_set(index, enabled, code)
         self._raise_pending_exceptions("retro_cheat_set", index, enabled, code)
 
+    @property
+    def callback_exceptions(self) -> CallbackExceptionCollector:
+        """The collector for exceptions raised by this session's callbacks."""
+        return self._callback_exceptions
+
     @override
     def _handle_callback_exception(self, exception: Exception) -> None:
-        warnings.warn(f"Exception raised in libretro.py callback: {exception}")
-        # TODO: Look at the warnings module to see how I can improve the warning message
-        self._pending_callback_exceptions.append(exception)
+        collector = self._callback_exceptions
+        if collector.add(exception):
+            # Only warn about the first exception from each site;
+            # a core that hits the same bug on every callback would otherwise
+            # spend most of its time formatting warnings
+            warnings.warn(f"Exception raised in libretro.py callback: {exception!r}")
+
+        if collector.aborted:
+            self._suspend_callbacks = True
 
     def _raise_pending_exceptions(self, function: str, *args: object) -> None:
-        match self._pending_callback_exceptions:
-            # If there are no pending exceptions, do nothing
-            case []:
-                return
-            # If there is exactly one pending exception, raise it directly to preserve the original traceback
-            case [exception]:
-                self._pending_callback_exceptions.clear()
-                raise CallbackException(
-                    f"Exception raised in libretro.py callbacks during {function}", *args
-                ) from exception
-            # If there are multiple pending exceptions, raise them as an ExceptionGroup
-            case [*exceptions]:
-                self._pending_callback_exceptions.clear()
-                raise CallbackExceptionGroup(
-                    f"Exceptions raised in libretro.py callbacks during {function}",
-                    exceptions,
-                    *args,
-                )
+        self._suspend_callbacks = False
+        if not self._callback_exceptions:
+            return
+
+        call = f"{function}({', '.join(map(repr, args))})" if args else function
+        summary = self._callback_exceptions.summarize(
+            f"Exception raised in libretro.py callbacks during {call}"
+        )
+        if summary is not None:
+            raise summary
 
 
 __all__ = [
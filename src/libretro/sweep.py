@@ -0,0 +1,426 @@
+"""
+Run the same content under many combinations of core options.
+
+.. seealso::
+
+    :mod:`libretro.py.sweeps`
+        A command-line interface to this module.
+"""
+
+from __future__ import annotations
+
+import csv
+import itertools
+import math
+import os
+import random
+from collections.abc import Callable, Collection, Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass
+from time import perf_counter_ns
+from typing import IO
+
+from libretro.api import Content, SubsystemContent, retro_core_option_v2_definition
+from libretro.error import CoreShutDownException
+from libretro.session import Session
+
+type OptionSpace = Mapping[str, Sequence[str]]
+"""Each swept option's key, mapped to the values it will take."""
+
+type OptionCombination = Mapping[str, str]
+"""One value for each swept option, keyed by option key."""
+
+type SweepCheck = Callable[[Session, OptionCombination], object]
+"""
+Called after each combination's frames have run.
+Raise an exception to mark the combination as failed.
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class SweepResult:
+    """The outcome of running content under one combination of core options."""
+
+    options: OptionCombination
+    """The option values that were in effect."""
+    frames: int
+    """
+    The number of frames that were run; may be fewer than requested if the core shut down.
+    Still counted if the combination failed afterwards, e.g. in its check,
+    but 0 if it failed before any frames ran.
+    """
+    duration: int
+    """Nanoseconds spent running frames, excluding the time spent loading the core."""
+    restarted: bool
+    """
+    Whether a new session was started for this combination,
+    rather than switching options on an already-running session.
+    """
+    error: str | None = None
+    """A description of the exception that failed this combination, or :obj:`None` if it passed."""
+
+    @property
+    def passed(self) -> bool:
+        """Whether this combination ran without raising an exception."""
+        return self.error is None
+
+
+def option_space(
+    definitions: Mapping[bytes, retro_core_option_v2_definition],
+    keys: Collection[str] | None = None,
+) -> dict[str, tuple[str, ...]]:
+    """
+    Build an option space from a core's option definitions.
+
+    :param definitions: The core's option definitions,
+        usually :attr:`.OptionDriver.definitions`.
+    :param keys: The options to include.
+        If :obj:`None`, every defined option is included.
+    :return: Each included option's key, mapped to all of its legal values
+        in the order the core defined them.
+    :raises KeyError: If ``keys`` names an option that the core doesn't define.
+    """
+    space: dict[str, tuple[str, ...]] = {}
+    for key, definition in definitions.items():
+        k = key.decode()
+        if keys is None or k in keys:
+            space[k] = tuple(v.value.decode() for v in definition.values if v.value is not None)
+
+    if keys is not None and (missing := set(keys) - space.keys()):
+        raise KeyError(f"Core doesn't define these options: {', '.join(sorted(missing))}")
+
+    return space
+
+
+def load_option_space(
+    core: str | os.PathLike[str],
+    game: Content | SubsystemContent | None = None,
+    keys: Collection[str] | None = None,
+) -> dict[str, tuple[str, ...]]:
+    """
+    Load a core just long enough to read its option definitions.
+
+    :param core: Path to the core to load.
+    :param game: The content to load, as accepted by :class:`.Session`.
+        Some cores only define options after content is loaded.
+    :param keys: The options to include, as in :func:`option_space`.
+    :return: The core's option space, as returned by :func:`option_space`.
+    :raises KeyError: If ``keys`` names an option that the core doesn't define.
+    """
+    with Session(core, game) as session:
+        definitions = session.options.definitions
+
+    return option_space(definitions or {}, keys)
+
+
+def all_combinations(space: OptionSpace) -> Iterator[dict[str, str]]:
+    """
+    Enumerate every combination in an option space.
+
+    >>> from libretro.sweep import all_combinations
+    >>> list(all_combinations({"renderer": ["hw", "sw"], "scale": ["1x", "2x"]}))  # doctest: +NORMALIZE_WHITESPACE
+    [{'renderer': 'hw', 'scale': '1x'}, {'renderer': 'hw', 'scale': '2x'},
+     {'renderer': 'sw', 'scale': '1x'}, {'renderer': 'sw', 'scale': '2x'}]
+
+    :param space: The option space to enumerate.
+    :return: An iterator over each combination,
+        ordered so that the last option changes fastest.
+    """
+    keys = tuple(space.keys())
+    for values in itertools.product(*space.values()):
+        yield dict(zip(keys, values, strict=True))
+
+
+def sample_combinations(
+    space: OptionSpace, count: int, *, seed: int | None = None
+) -> list[dict[str, str]]:
+    """
+    Pick distinct combinations from an option space at random.
+
+    The space is never enumerated,
+    so this is cheap even when the space has far more combinations than ``count``.
+
+    :param space: The option space to sample.
+    :param count: The number of combinations to pick.
+        If this is at least the size of the space, every combination is returned.
+    :param seed: Seed for the random number generator, for reproducible samples.
+    :return: The sampled combinations, ordered as :func:`all_combinations` would order them.
+    :raises ValueError: If ``count`` is negative.
+    """
+    if count < 0:
+        raise ValueError(f"Expected a non-negative count, got {count}")
+
+    total = math.prod(len(v) for v in space.values())
+    if count >= total:
+        return list(all_combinations(space))
+
+    keys = tuple(space.keys())
+    values = tuple(space.values())
+    sampled: list[dict[str, str]] = []
+    rng = random.Random(seed)
+    if count > total // 2:
+        indexes = set(rng.sample(range(total), count))
+    else:
+        # The space may be too large for random.sample,
+        # but collisions are rare enough that rejecting them is cheap
+        indexes: set[int] = set()
+        while len(indexes) < count:
+            indexes.add(rng.randrange(total))
+
+    for index in sorted(indexes):
+        # Decode the index as a mixed-radix number, last option least significant
+        combination: dict[str, str] = {}
+        for key, options in zip(reversed(keys), reversed(values), strict=True):
+            index, digit = divmod(index, len(options))
+            combination[key] = options[digit]
+        sampled.append({k: combination[k] for k in keys})
+
+    return sampled
+
+
+class _SweepRunner:
+    """Runs combinations one after another, reusing one session whenever possible."""
+
+    def __init__(
+        self,
+        core: str | os.PathLike[str],
+        game: Content | SubsystemContent | None,
+        frames: int,
+        live: bool | None,
+        check: SweepCheck | None,
+    ):
+        self._core = core
+        self._game = game
+        self._frames = frames
+        self._live = live
+        self._check = check
+        self._stack = ExitStack()
+        self._session: Session | None = None
+        self._current: dict[str, str] = {}
+
+    def _start(self, options: OptionCombination) -> Session:
+        self.close()
+        session: Session = self._stack.enter_context(
+            Session(self._core, self._game, options=dict(options))
+        )
+        self._session = session
+        self._current = dict(options)
+        return session
+
+    def _switch(self, session: Session, options: OptionCombination) -> bool:
+        changed = False
+        for key, value in options.items():
+            if self._current.get(key) != value:
+                if not session.options.set_variable(key.encode(), value.encode()):
+                    raise ValueError(f"Core rejected option {key}={value}")
+                self._current[key] = value
+                changed = True
+
+        return changed
+
+    def _run_frames(self, session: Session) -> tuple[int, int]:
+        frames = 0
+        start = perf_counter_ns()
+        try:
+            for _ in range(self._frames):
+                session.run()
+                frames += 1
+        except CoreShutDownException:
+            # The core may exit on its own, that's not necessarily an error
+            pass
+
+        return frames, perf_counter_ns() - start
+
+    def run(self, options: OptionCombination) -> SweepResult:
+        restarted = self._session is None or self._live is False
+        frames = duration = 0
+        try:
+            if restarted:
+                session = self._start(options)
+                frames, duration = self._run_frames(session)
+            else:
+                session = self._session
+                assert session is not None
+                changed = self._switch(session, options)
+                frames, duration = self._run_frames(session)
+                if changed and self._live is None:
+                    # If the core hasn't re-read its options since they changed,
+                    # it can't switch them on the fly;
+                    # rerun this combination (and all later ones) from scratch
+                    self._live = not session.options.variable_updated
+                    if not self._live:
+                        session = self._start(options)
+                        restarted = True
+                        frames, duration = self._run_frames(session)
+
+            if self._check is not None:
+                self._check(session, options)
+        except Exception as e:
+            # Don't trust the core's state after a failure
+            self.close()
+            error = f"{type(e).__name__}: {e}"
+            return SweepResult(dict(options), frames, duration, restarted, error)
+
+        return SweepResult(dict(options), frames, duration, restarted)
+
+    def close(self) -> None:
+        self._session = None
+        self._current = {}
+        self._stack.close()
+
+
+def _run_chunk(
+    core: str | os.PathLike[str],
+    game: Content | SubsystemContent | None,
+    chunk: Sequence[tuple[int, OptionCombination]],
+    frames: int,
+    live: bool | None,
+    check: SweepCheck | None,
+) -> list[tuple[int, SweepResult]]:
+    runner = _SweepRunner(core, game, frames, live, check)
+    try:
+        return [(index, runner.run(options)) for index, options in chunk]
+    finally:
+        runner.close()
+
+
+def run_sweep(
+    core: str | os.PathLike[str],
+    game: Content | SubsystemContent | None,
+    combinations: Iterable[OptionCombination],
+    *,
+    frames: int = 60,
+    workers: int = 1,
+    live: bool | None = None,
+    check: SweepCheck | None = None,
+) -> list[SweepResult]:
+    """
+    Run content for a fixed number of frames under each combination of core options.
+
+    Each worker keeps one session warm across combinations,
+    switching options with :meth:`.OptionDriver.set_variable`
+    so the core sees :attr:`.OptionDriver.variable_updated`
+    on its next ``RETRO_ENVIRONMENT_GET_VARIABLE_UPDATE``.
+    A new session is started for the first combination,
+    after any failure,
+    and for every combination if the core can't switch options on the fly.
+
+    .. code-block:: python
+
+        space = load_option_space("mycore_libretro.so", "game.bin", ["renderer", "scale"])
+        results = run_sweep("mycore_libretro.so", "game.bin", all_combinations(space), workers=4)
+        print(format_results(results))
+
+    :param core: Path to the core to test.
+    :param game: The content to load, as accepted by :class:`.Session`.
+        Must be picklable if ``workers`` is more than 1.
+    :param combinations: The option combinations to run.
+    :param frames: The number of frames to run for each combination.
+    :param workers: The number of processes to spread combinations across.
+        If 1, combinations run in this process.
+    :param live: Whether to switch options on a running session.
+        If :obj:`None`, this is detected:
+        if the core hasn't re-read its options after a frame,
+        that combination is rerun in a new session
+        and all later combinations get a new session too.
+        If :obj:`False`, every combination gets a new session.
+    :param check: Called with the session and the combination after each combination's frames.
+        Must be picklable if ``workers`` is more than 1.
+    :return: One result per combination, in the order they were given.
+    :raises ValueError: If ``frames`` is negative or ``workers`` is less than 1.
+    """
+    if frames < 0:
+        raise ValueError(f"Expected a non-negative frame count, got {frames}")
+
+    if workers < 1:
+        raise ValueError(f"Expected at least one worker, got {workers}")
+
+    indexed = list(enumerate(combinations))
+    if workers == 1 or len(indexed) <= 1:
+        return [result for _, result in _run_chunk(core, game, indexed, frames, live, check)]
+
+    # Deal combinations out round-robin so each worker gets a similar mix
+    chunks = [indexed[i::workers] for i in range(min(workers, len(indexed)))]
+    results: list[SweepResult | None] = [None] * len(indexed)
+    with ProcessPoolExecutor(max_workers=len(chunks)) as executor:
+        futures = [
+            executor.submit(_run_chunk, core, game, chunk, frames, live, check) for chunk in chunks
+        ]
+        for future in futures:
+            for index, result in future.result():
+                results[index] = result
+
+    assert all(r is not None for r in results)
+    return results  # pyright: ignore[reportReturnType]
+
+
+def format_results(results: Sequence[SweepResult]) -> str:
+    """
+    Format sweep results as a compact plain-text table.
+
+    :param results: The results to format, as returned by :func:`run_sweep`.
+    :return: One row per result, with a column per option,
+        followed by a summary line.
+    """
+    keys = list(dict.fromkeys(k for r in results for k in r.options))
+    header = [*keys, "status", "frames", "ms", "restart"]
+    rows = [
+        [
+            *(r.options.get(k, "") for k in keys),
+            "ok" if r.passed else "FAIL",
+            str(r.frames),
+            f"{r.duration / 1e6:.1f}",
+            "yes" if r.restarted else "no",
+        ]
+        for r in results
+    ]
+    widths = [max(len(c) for c in column) for column in zip(header, *rows, strict=True)]
+    lines = [
+        "  ".join(c.ljust(w) for c, w in zip(row, widths, strict=True)).rstrip()
+        for row in (header, *rows)
+    ]
+    lines.extend(f"FAIL {dict(r.options)}: {r.error}" for r in results if not r.passed)
+
+    failed = sum(not r.passed for r in results)
+    lines.append(f"{len(results) - failed} passed, {failed} failed")
+    return "\n".join(lines)
+
+
+def write_results(results: Sequence[SweepResult], file: IO[str]) -> None:
+    """
+    Write sweep results as CSV, one row per result.
+
+    :param results: The results to write, as returned by :func:`run_sweep`.
+    :param file: An open text file to write to.
+        Should be opened with ``newline=""``.
+    """
+    keys = list(dict.fromkeys(k for r in results for k in r.options))
+    writer = csv.writer(file)
+    writer.writerow([*keys, "passed", "frames", "duration_ns", "restarted", "error"])
+    for r in results:
+        writer.writerow(
+            [
+                *(r.options.get(k, "") for k in keys),
+                r.passed,
+                r.frames,
+                r.duration,
+                r.restarted,
+                r.error or "",
+            ]
+        )
+
+
+__all__ = [
+    "OptionCombination",
+    "OptionSpace",
+    "SweepCheck",
+    "SweepResult",
+    "all_combinations",
+    "format_results",
+    "load_option_space",
+    "option_space",
+    "run_sweep",
+    "sample_combinations",
+    "write_results",
+]
@@ -0,0 +1,84 @@
+"""Integration tests for :mod:`libretro.bench` against the ``custom`` sample cores."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from libretro.bench import (
+    ENVIRONMENT_CALLS,
+    bench_callbacks,
+    bench_environment,
+    bench_frames,
+    bench_options,
+    bench_serialize,
+    bench_session,
+    bench_vfs,
+    run_suite,
+)
+
+from .conftest import SampleCoreLoader
+
+
+def test_frames_and_callbacks(load_core: SampleCoreLoader) -> None:
+    core = load_core("custom", "video_query_test")
+    (frames,) = bench_frames(core, frames=10, warmup=2)
+    callbacks = {r.name: r for r in bench_callbacks(core, frames=10, warmup=2)}
+
+    assert frames.key == "video_query_test:frames"
+    assert frames.count == 10
+    assert frames.total >= frames.max > 0
+    assert callbacks["frames.core"].count == 10
+    assert callbacks["callback.video_refresh"].count == 10
+
+
+def test_environment_and_session(load_core: SampleCoreLoader) -> None:
+    core = load_core("custom", "video_query_test")
+    results = bench_environment(core, iterations=5)
+    sessions = bench_session(core, iterations=2)
+
+    assert [r.name for r in results] == [f"environment.{call.name}" for call in ENVIRONMENT_CALLS]
+    assert all(r.count == 5 for r in results)
+    assert [(r.name, r.count) for r in sessions] == [("session.enter", 2), ("session.exit", 2)]
+
+
+def test_options_with_many_v2_options(load_core: SampleCoreLoader) -> None:
+    results = bench_options(load_core("custom", "video_query_test"), iterations=600, options=300)
+
+    assert [(r.name, r.count) for r in results] == [
+        ("options.GET_VARIABLE", 600),
+        ("options.GET_VARIABLE.changed", 600),
+    ]
+    assert all(r.total >= r.max > 0 for r in results)
+
+
+def test_serialize_throughput(load_core: SampleCoreLoader) -> None:
+    serialize, unserialize = bench_serialize(load_core("custom", "savestate_test"), iterations=4)
+
+    assert serialize.count == unserialize.count == 4
+    assert serialize.nbytes == unserialize.nbytes > 0
+    assert serialize.throughput
+
+
+def test_vfs_operations(load_core: SampleCoreLoader, tmp_path: Path) -> None:
+    results = bench_vfs(load_core("custom", "vfs_test"), tmp_path, iterations=3, size=16)
+
+    assert [r.name for r in results] == [
+        "vfs.open",
+        "vfs.write",
+        "vfs.seek",
+        "vfs.read",
+        "vfs.close",
+    ]
+    assert all(r.count == 3 for r in results)
+    assert results[1].nbytes == results[3].nbytes == 48
+    assert not any(tmp_path.iterdir())
+
+
+def test_suite_runs_each_benchmark_in_its_own_process() -> None:
+    # perf_test can't be initialized twice in one process
+    report = run_suite(frames=3, warmup=1, iterations=2, cores=["perf_test"])
+    keys = {r.key for r in report.results}
+
+    assert {"perf_test:frames", "perf_test:frames.core", "savestate_test:serialize"} <= keys
+    assert "vfs_test:vfs.read" in keys
+    assert "video_query_test:options.GET_VARIABLE" in keys
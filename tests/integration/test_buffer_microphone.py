@@ -0,0 +1,23 @@
+"""Integration tests for :class:`~libretro.drivers.BufferMicrophoneDriver` against ``microphone_test``."""
+
+from __future__ import annotations
+
+from array import array
+
+from libretro.drivers import BufferMicrophoneDriver
+from libretro.session import Session
+
+from .conftest import SampleCoreLoader
+
+
+def test_core_reads_directly_from_buffer(load_core: SampleCoreLoader) -> None:
+    """``microphone_test`` reads 1024 frames per ``retro_run``."""
+    core = load_core("custom", "microphone_test")
+    mic = BufferMicrophoneDriver(array("h", range(4096)))
+    with Session(core, None, mic=mic) as session:
+        for _ in range(3):
+            session.run()
+
+        (opened,) = mic.microphones
+        assert opened.state
+        assert opened.position == 3 * 1024
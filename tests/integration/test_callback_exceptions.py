@@ -0,0 +1,87 @@
+"""Integration tests for how :class:`~libretro.Session` reports exceptions raised in callbacks."""
+
+from __future__ import annotations
+
+from typing import override
+
+import pytest
+
+from libretro import Session
+from libretro.drivers import IterableInputDriver, NullVideoDriver
+from libretro.error import CallbackException, CallbackExceptionCollector, CallbackExceptionGroup
+
+from .conftest import SampleCoreLoader
+
+
+class _BrokenInputDriver(IterableInputDriver):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    @property
+    @override
+    def bitmasks_supported(self) -> bool | None:
+        self.calls += 1
+        raise ValueError("bitmasks_supported")
+
+    @bitmasks_supported.setter
+    @override
+    def bitmasks_supported(self, bitmask_supported: bool) -> None:
+        pass
+
+    @bitmasks_supported.deleter
+    @override
+    def bitmasks_supported(self) -> None:
+        pass
+
+    @property
+    @override
+    def max_users(self) -> int | None:
+        self.calls += 1
+        raise RuntimeError("max_users")
+
+    @max_users.setter
+    @override
+    def max_users(self, max_users: int | None) -> None:
+        pass
+
+    @max_users.deleter
+    @override
+    def max_users(self) -> None:
+        pass
+
+
+def test_exceptions_are_summarized_per_call(load_core: SampleCoreLoader) -> None:
+    core = load_core("custom", "input_query_test")
+    driver = _BrokenInputDriver()
+    with Session(core, None, input=driver, video=NullVideoDriver) as session:
+        for _ in range(2):
+            with pytest.warns(UserWarning), pytest.raises(CallbackExceptionGroup) as info:
+                session.run()
+
+            assert "retro_run" in str(info.value)
+            assert [type(e) for e in info.value.exceptions] == [ValueError, RuntimeError]
+
+        assert not session.callback_exceptions
+
+    assert driver.calls == 4
+
+
+def test_abort_skips_remaining_callbacks(load_core: SampleCoreLoader) -> None:
+    core = load_core("custom", "input_query_test")
+    driver = _BrokenInputDriver()
+    collector = CallbackExceptionCollector(abort_after=1)
+    with Session(
+        core, None, input=driver, video=NullVideoDriver, callback_exceptions=collector
+    ) as session:
+        with pytest.warns(UserWarning), pytest.raises(CallbackException) as info:
+            session.run()
+
+        assert isinstance(info.value.__cause__, ValueError)
+        assert driver.calls == 1
+
+        # Callbacks resume on the next frame
+        with pytest.warns(UserWarning), pytest.raises(CallbackException):
+            session.run()
+
+    assert driver.calls == 2
@@ -0,0 +1,34 @@
+"""Integration tests for :class:`~libretro.drivers.CallbackProfiler`."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from libretro.drivers import CallbackProfiler
+from libretro.session import Session
+
+from .conftest import SampleCoreLoader
+
+
+def test_profiler_times_envcalls_and_vfs(
+    load_core: SampleCoreLoader, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """``vfs_test`` writes a file through the VFS interface on its first frame."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "libretro_py_vfs_test.tmp").touch()
+    core = load_core("custom", "vfs_test")
+    profiler = CallbackProfiler()
+    with Session(core, None, profiler=profiler) as session:
+        for _ in range(3):
+            session.run()
+
+    report = profiler.report()
+    assert report.frames == 3
+    assert report.callbacks["environment.GET_VFS_INTERFACE"].calls >= 1
+    assert report.callbacks["vfs.open"].calls == 1
+    assert report.callbacks["vfs.write"].calls == 1
+    assert report.callbacks["vfs.close"].calls == 1
+    assert "vfs.write" in profiler.frames[0].callbacks
+    assert all(f.core_time >= 0 for f in profiler.frames)
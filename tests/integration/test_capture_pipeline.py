@@ -0,0 +1,45 @@
+"""Integration tests for :class:`~libretro.drivers.CaptureVideoDriver`."""
+
+from __future__ import annotations
+
+from concurrent.futures import Future
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from libretro import Session  # noqa: E402
+from libretro.drivers import (  # noqa: E402
+    ArrayVideoDriver,
+    CapturePipeline,
+    CaptureVideoDriver,
+    compare_to,
+    frame_digest,
+)
+
+from .conftest import SampleCoreLoader  # noqa: E402
+
+
+def test_matches_synchronous_screenshot(load_core: SampleCoreLoader) -> None:
+    """Frames captured in the background match the wrapped driver's screenshots."""
+    core = load_core("custom", "pixel_format_test")
+    with CapturePipeline(workers=2) as pipeline:
+        video = CaptureVideoDriver(pipeline, ArrayVideoDriver())
+        with Session(core, None, video=video) as session:
+            # The first 30 frames are submitted with a pitch that doesn't match their format
+            for _ in range(30):
+                session.run()
+
+            digests: list[Future[str]] = []
+            for _ in range(3):
+                digests.append(video.capture_next(frame_digest))
+                session.run()
+
+            captured = video.capture_next(lambda frame: frame)
+            session.run()
+            screenshot = video.screenshot(prerotate=False)
+            assert screenshot is not None
+            comparison = pipeline.submit_screenshot(compare_to(captured.result()), screenshot)
+
+        assert all(len(digest.result()) == 64 for digest in digests)
+        assert comparison.result().matches
@@ -0,0 +1,75 @@
+"""Integration tests for :class:`~libretro.frameskip.FrameSkipPolicy`."""
+
+from __future__ import annotations
+
+from libretro import Session
+from libretro.api import AvEnableFlags, ThrottleMode
+from libretro.drivers import NullVideoDriver
+from libretro.frameskip import FrameSkipPolicy
+
+from .conftest import SampleCoreLoader
+
+
+def test_every_nth_frame_is_rendered(load_core: SampleCoreLoader) -> None:
+    core = load_core("custom", "audio_query_test")
+    seen: list[AvEnableFlags | None] = []
+    captured: list[int] = []
+    with Session(core, None, video=NullVideoDriver) as session:
+        # Registered first, so it sees the flags the core saw during the frame
+        session.add_frame_hook(lambda: seen.append(session.av_enable))
+        policy = FrameSkipPolicy(every=3, on_capture=captured.append, skip_audio=True)
+        policy.attach(session)
+        for _ in range(7):
+            session.run()
+
+        policy.detach()
+        assert session.av_enable == AvEnableFlags.ALL
+
+    skipped = AvEnableFlags.ALL & ~(AvEnableFlags.VIDEO | AvEnableFlags.AUDIO)
+    assert seen == [AvEnableFlags.ALL, skipped, skipped] * 2 + [AvEnableFlags.ALL]
+    assert captured == [0, 3, 6]
+    assert (policy.frames, policy.captured) == (7, 3)
+
+
+def test_trigger_captures_the_next_frame(load_core: SampleCoreLoader) -> None:
+    core = load_core("custom", "audio_query_test")
+    captured: list[int] = []
+    with Session(core, None, video=NullVideoDriver) as session:
+        policy = FrameSkipPolicy(
+            trigger=lambda: session.video.frames == 4, on_capture=captured.append
+        )
+        policy.attach(session)
+        for _ in range(8):
+            session.run()
+
+        policy.detach()
+
+    assert captured == [0, 4]
+
+
+def test_skipped_frames_are_fast_forwarded(load_core: SampleCoreLoader) -> None:
+    core = load_core("custom", "timing_query_test")
+    modes: list[ThrottleMode | None] = []
+    with Session(core, None, video=NullVideoDriver) as session:
+        assert session.timing is not None
+        original = session.timing.throttle_state
+        assert original is not None
+        original_mode = ThrottleMode(original.mode)
+
+        def record() -> None:
+            assert session.timing is not None
+            state = session.timing.throttle_state
+            modes.append(None if state is None else ThrottleMode(state.mode))
+
+        session.add_frame_hook(record)
+        policy = FrameSkipPolicy(every=2)
+        policy.attach(session)
+        for _ in range(4):
+            session.run()
+
+        policy.detach()
+        restored = session.timing.throttle_state
+        assert restored is not None
+        assert ThrottleMode(restored.mode) == original_mode
+
+    assert modes == [original_mode, ThrottleMode.FAST_FORWARD] * 2
@@ -0,0 +1,25 @@
+"""Integration tests for :class:`~libretro.drivers.HistogramPerfDriver` against ``perf_test``."""
+
+from __future__ import annotations
+
+from libretro.drivers import HistogramPerfDriver
+from libretro.session import Session
+
+from .conftest import SampleCoreLoader
+
+
+def test_histogram_perf_driver_records_core_counters(load_core: SampleCoreLoader) -> None:
+    """The core's ``frame_loop`` counter is recorded once per frame."""
+    core = load_core("custom", "perf_test")
+    perf = HistogramPerfDriver()
+    with Session(core, None, perf=perf) as session:
+        session.add_frame_hook(perf.end_frame)
+        for _ in range(5):
+            session.run()
+
+    assert perf.histograms[b"frame_loop"].count == 5
+    assert [f.frame for f in perf.frames] == [0, 1, 2, 3, 4]
+    assert all(b"frame_loop" in f.counters for f in perf.frames)
+    names = {e["name"] for e in perf.trace()["traceEvents"]}
+    assert "frame_loop" in names
+    assert "frame 4" in names
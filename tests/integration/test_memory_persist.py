@@ -0,0 +1,79 @@
+"""Integration tests for :mod:`libretro.memory.persist` against real sample cores."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from libretro.api import RETRO_MEMORY_SYSTEM_RAM
+from libretro.memory import SaveRamFile, load_state, save_state
+from libretro.session import Session
+
+from .conftest import SampleCoreLoader
+
+
+def test_state_round_trips_through_file(load_core: SampleCoreLoader, tmp_path: Path) -> None:
+    path = tmp_path / "state.bin"
+    with Session(load_core("custom", "savestate_test"), None) as session:
+        for _ in range(5):
+            session.run()
+
+        assert save_state(session.core, path)
+        saved = path.read_bytes()
+        assert len(saved) == session.core.serialize_size()
+        assert saved[:6] == bytes([0, 1, 2, 3, 4, 0])
+        assert not (tmp_path / "state.bin.tmp").exists()
+
+        for _ in range(5):
+            session.run()
+
+        assert load_state(session.core, path)
+        state = bytearray(session.core.serialize_size())
+        assert session.core.serialize(state)
+        assert state == saved
+        assert path.read_bytes() == saved, "Loading must not modify the file"
+
+
+def test_state_unsupported(load_core: SampleCoreLoader, tmp_path: Path) -> None:
+    path = tmp_path / "state.bin"
+    with Session(load_core("custom", "memory_map_test"), None) as session:
+        assert not save_state(session.core, path)
+        assert list(tmp_path.iterdir()) == []
+
+        path.touch()
+        assert not load_state(session.core, path)
+
+
+def test_save_ram_writes_back_only_changes(load_core: SampleCoreLoader, tmp_path: Path) -> None:
+    path = tmp_path / "game.srm"
+    with Session(load_core("custom", "memory_map_test"), None) as session:
+        ram = session.core.get_memory(RETRO_MEMORY_SYSTEM_RAM)
+        assert ram is not None
+        ram[:] = bytes(len(ram))
+
+        with SaveRamFile(session.core, path, RETRO_MEMORY_SYSTEM_RAM) as sram:
+            assert not sram.load(), "There's nothing to load yet"
+            session.add_frame_hook(sram.flush)
+
+            session.run()
+            assert path.stat().st_size == len(ram)
+            assert sram.writes == 0
+
+            ram[0x10] = 0x42
+            session.run()
+            session.run()
+            assert sram.writes == 1
+            assert path.read_bytes()[0x10] == 0x42
+
+            ram[0x11] = 0x43
+            session.remove_frame_hook(sram.flush)
+
+        # Closing flushes unsaved changes
+        assert sram.writes == 2
+        assert path.read_bytes()[0x10:0x12] == b"\x42\x43"
+
+        ram[:] = bytes(len(ram))
+        with SaveRamFile(session.core, path, RETRO_MEMORY_SYSTEM_RAM) as sram:
+            assert sram.load()
+            assert ram[0x10:0x12] == b"\x42\x43"
+
+        assert sram.writes == 0
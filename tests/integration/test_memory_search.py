@@ -0,0 +1,36 @@
+"""Integration tests for :class:`~libretro.memory.MemorySearch` against ``memory_map_test``."""
+
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from libretro.api import RETRO_MEMORY_SYSTEM_RAM  # noqa: E402
+from libretro.memory import MemorySearch  # noqa: E402
+from libretro.session import Session  # noqa: E402
+
+from .conftest import SampleCoreLoader  # noqa: E402
+
+
+def test_memory_search_finds_written_value(load_core: SampleCoreLoader) -> None:
+    """A value written to system RAM is found both by memory ID and through the memory map."""
+    core = load_core("custom", "memory_map_test")
+    with Session(core, None) as session:
+        assert session.memory_maps is not None
+        by_id = MemorySearch.from_memory(session.core, RETRO_MEMORY_SYSTEM_RAM, width=2)
+        by_map = MemorySearch.from_memory_map(session.memory_maps, width=2)
+        ram = session.core.get_memory(RETRO_MEMORY_SYSTEM_RAM)
+        assert ram is not None
+
+        ram[0x200:0x202] = (0x1234).to_bytes(2, "little")
+        session.run()
+        assert by_id.equal_to(0x1234) >= 1
+        assert by_map.equal_to(0x1234) >= 1
+
+        ram[0x200:0x202] = (0x1235).to_bytes(2, "little")
+        session.run()
+        assert by_id.increased(by=1) == 1
+        assert by_id.addresses() == [0x200]
+        assert by_map.increased(by=1) >= 1
+        assert 0x200 in by_map.addresses()
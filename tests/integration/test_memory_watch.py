@@ -0,0 +1,40 @@
+"""Integration tests for :class:`~libretro.memory.MemoryWatcher` against ``memory_map_test``."""
+
+from __future__ import annotations
+
+from libretro.api import RETRO_MEMORY_SYSTEM_RAM
+from libretro.memory import MemoryChange, MemoryWatcher
+from libretro.session import Session
+
+from .conftest import SampleCoreLoader
+
+
+def test_memory_watcher_polls_after_each_frame(load_core: SampleCoreLoader) -> None:
+    """Changes made to system RAM between frames are reported by a frame hook."""
+    core = load_core("custom", "memory_map_test")
+    with Session(core, None) as session:
+        assert session.memory_maps is not None
+        watcher = MemoryWatcher(session.core, session.memory_maps)
+        received: list[MemoryChange] = []
+        by_id = watcher.watch_memory(RETRO_MEMORY_SYSTEM_RAM, 0x100, 0x100)
+        by_address = watcher.watch_address(0x100, 0x100, callback=received.append)
+        session.add_frame_hook(watcher.poll)
+
+        session.run()
+        assert watcher.changes == []
+
+        ram = session.core.get_memory(RETRO_MEMORY_SYSTEM_RAM)
+        assert ram is not None
+        ram[0x180] = 0x42
+        session.run()
+
+        assert [(c.watch, c.address, c.new) for c in watcher.changes] == [
+            (by_id, 0x180, b"\x42"),
+            (by_address, 0x180, b"\x42"),
+        ]
+        assert [c.address for c in received] == [0x180]
+
+        session.remove_frame_hook(watcher.poll)
+        ram[0x181] = 0x43
+        session.run()
+        assert len(watcher.changes) == 2, "Removed hooks must not run"
@@ -0,0 +1,25 @@
+"""Integration tests for :class:`~libretro.drivers.NullVideoDriver`."""
+
+from __future__ import annotations
+
+from libretro import Session
+from libretro.api import PixelFormat, Rotation
+from libretro.drivers import NullVideoDriver
+
+from .conftest import SampleCoreLoader
+
+
+def test_counts_frames_across_format_changes(load_core: SampleCoreLoader) -> None:
+    """``pixel_format_test`` switches pixel format and rotation every 30 frames."""
+    core = load_core("custom", "pixel_format_test")
+    video = NullVideoDriver(checksum_rows=8)
+    with Session(core, None, video=video) as session:
+        for _ in range(61):
+            session.run()
+
+    assert video.frames == 61
+    assert video.dupes == 0
+    assert len(video.size_changes) == 1
+    assert video.checksum is not None
+    assert video.pixel_format == PixelFormat.RGB1555
+    assert video.rotation == Rotation.ONE_EIGHTY
@@ -0,0 +1,43 @@
+"""Integration tests for :class:`~libretro.drivers.PacingTimingDriver`."""
+
+from __future__ import annotations
+
+import time
+
+from libretro import Session
+from libretro.api import ThrottleMode
+from libretro.drivers import NullVideoDriver, PacingTimingDriver
+
+from .conftest import SampleCoreLoader
+
+
+def test_session_runs_at_core_frame_rate(load_core: SampleCoreLoader) -> None:
+    core = load_core("custom", "timing_query_test")
+    with Session(core, None, video=NullVideoDriver, timing=PacingTimingDriver) as session:
+        timing = session.timing
+        assert isinstance(timing, PacingTimingDriver)
+        assert timing.fps is not None
+        assert timing.fps > 0
+
+        session.run()
+        start = time.perf_counter()
+        for _ in range(6):
+            session.run()
+
+        elapsed = time.perf_counter() - start
+
+    # Six frames after the first can't finish before their deadlines
+    assert elapsed >= 6 / timing.fps * 0.95
+
+
+def test_unblocked_runs_unthrottled(load_core: SampleCoreLoader) -> None:
+    core = load_core("custom", "timing_query_test")
+    timing = PacingTimingDriver(1.0, mode=ThrottleMode.UNBLOCKED)
+    with Session(core, None, video=NullVideoDriver, timing=timing) as session:
+        start = time.perf_counter()
+        for _ in range(3):
+            session.run()
+
+        elapsed = time.perf_counter() - start
+
+    assert elapsed < 1.0
@@ -0,0 +1,147 @@
+"""Integration tests for :mod:`libretro.pytest_plugin`, run through :class:`pytest.Pytester`."""
+
+from __future__ import annotations
+
+from importlib.metadata import entry_points
+
+import pytest
+
+from libretro.drivers import ArrayAudioDriver
+from libretro.pytest_plugin import audio_digest, frame_digest
+from libretro.session import Session
+
+from .conftest import SampleCoreLoader
+
+pytest_plugins = ["pytester"]
+
+_HEADER = """
+import pytest
+
+pytestmark = pytest.mark.libretro(core=("custom", "savestate_test"))
+"""
+
+
+def _run(
+    pytester: pytest.Pytester, source: str, *args: str, header: str = _HEADER
+) -> pytest.RunResult:
+    (pytester.path / "test_cores.py").write_text(header + source)
+    if not entry_points(group="pytest11", name="libretro"):
+        # Not installed with the entry point (e.g. an editable install predating it)
+        args = ("-p", "libretro.pytest_plugin", *args)
+
+    return pytester.runpytest_subprocess("-p", "no:cacheprovider", *args)
+
+
+def test_session_fixture(pytester: pytest.Pytester) -> None:
+    result = _run(
+        pytester,
+        """
+from libretro.session import Session
+
+def test_core(core):
+    assert core.path.endswith(("savestate_test_libretro.so", "savestate_test_libretro.dll", "savestate_test_libretro.dylib"))
+
+def test_session(session):
+    assert isinstance(session, Session)
+    session.run()
+
+@pytest.mark.libretro(warmup=5)
+def test_warmup(session):
+    state = bytearray(session.core.serialize_size())
+    assert session.core.serialize(state)
+    assert state[:6] == bytes([0, 1, 2, 3, 4, 0])
+""",
+    )
+    result.assert_outcomes(passed=3)
+
+
+def test_warm_state_is_reused(pytester: pytest.Pytester) -> None:
+    result = _run(
+        pytester,
+        """
+@pytest.mark.parametrize("attempt", range(3))
+def test_warmup(session_factory, attempt):
+    session = session_factory(warmup=8)
+    state = bytearray(session.core.serialize_size())
+    assert session.core.serialize(state)
+    assert state[:9] == bytes([0, 1, 2, 3, 4, 5, 6, 7, 0])
+""",
+    )
+    result.assert_outcomes(passed=3)
+
+
+def test_session_scope(pytester: pytest.Pytester) -> None:
+    source = """
+sessions = []
+
+@pytest.mark.parametrize("attempt", range(2))
+def test_session(session, attempt):
+    sessions.append(id(session))
+
+def test_count():
+    assert len(set(sessions)) == EXPECTED
+"""
+    result = _run(pytester, source.replace("EXPECTED", "1"), "--libretro-session-scope=module")
+    result.assert_outcomes(passed=3)
+
+    result = _run(pytester, source.replace("EXPECTED", "2"))
+    result.assert_outcomes(passed=3)
+
+
+def test_skips_without_core(pytester: pytest.Pytester) -> None:
+    result = _run(pytester, "def test_session(session):\n    pass\n", header="")
+    result.assert_outcomes(skipped=1)
+
+
+def test_golden_frame(pytester: pytest.Pytester, load_core: SampleCoreLoader) -> None:
+    with Session(load_core("custom", "savestate_test"), None) as session:
+        session.run()
+        digest = frame_digest(session)
+
+    assert digest is not None
+    result = _run(
+        pytester,
+        f"""
+@pytest.mark.golden_frame("{digest}")
+def test_matches(session):
+    session.run()
+
+@pytest.mark.golden_frame("{"0" * 64}")
+def test_mismatch(session):
+    session.run()
+""",
+    )
+    result.assert_outcomes(passed=1, failed=1)
+    result.stdout.fnmatch_lines(["*doesn't match golden_frame*"])
+
+
+def test_audio_digest(pytester: pytest.Pytester, load_core: SampleCoreLoader) -> None:
+    with Session(load_core("audio", "audio_no_callback"), None) as session:
+        assert isinstance(session.audio, ArrayAudioDriver)
+        start = len(session.audio.buffer)
+        for _ in range(3):
+            session.run()
+
+        digest = audio_digest(session, start)
+
+    result = _run(
+        pytester,
+        f"""
+import pytest
+
+pytestmark = pytest.mark.libretro(core=("audio", "audio_no_callback"))
+
+@pytest.mark.audio_digest("{digest}")
+def test_matches(session):
+    for _ in range(3):
+        session.run()
+
+@pytest.mark.audio_digest("{"0" * 64}")
+def test_mismatch(session):
+    for _ in range(3):
+        session.run()
+""",
+        header="",
+    )
+    result.assert_outcomes(passed=1, failed=1)
+    result.stdout.fnmatch_lines(["*doesn't match audio_digest*"])
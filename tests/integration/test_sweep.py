@@ -0,0 +1,83 @@
+"""Integration tests for :mod:`libretro.sweep` against ``options_v2_test``."""
+
+from __future__ import annotations
+
+from libretro.session import Session
+from libretro.sweep import OptionCombination, all_combinations, load_option_space, run_sweep
+
+from .conftest import SampleCoreLoader
+
+
+def test_load_option_space_reads_definitions(load_core: SampleCoreLoader) -> None:
+    core = load_core("custom", "options_v2_test")
+
+    assert load_option_space(core.path) == {
+        "test_choice": ("a", "b", "c"),
+        "test_bool": ("true", "false"),
+    }
+
+
+def test_sweep_restarts_when_core_ignores_option_updates(load_core: SampleCoreLoader) -> None:
+    """``options_v2_test`` never re-reads its options, so each combination gets a new session."""
+    core = load_core("custom", "options_v2_test")
+    seen: list[dict[str, str]] = []
+
+    def check(session: Session, options: OptionCombination) -> None:
+        seen.append({k: session.options.variables[k.encode()].decode() for k in options})
+
+    space = load_option_space(core.path, keys=["test_choice", "test_bool"])
+    results = run_sweep(core.path, None, all_combinations(space), frames=3, check=check)
+
+    assert len(results) == 6
+    assert all(r.passed and r.frames == 3 and r.restarted for r in results)
+    assert seen == [dict(r.options) for r in results]
+
+
+def test_live_sweep_reuses_one_session(load_core: SampleCoreLoader) -> None:
+    core = load_core("custom", "options_v2_test")
+    sessions: set[int] = set()
+
+    def check(session: Session, options: OptionCombination) -> None:
+        sessions.add(id(session))
+        assert session.options.variables[b"test_choice"] == options["test_choice"].encode()
+
+    combos = [{"test_choice": v} for v in ("a", "b", "c")]
+    results = run_sweep(core.path, None, combos, frames=2, live=True, check=check)
+
+    assert all(r.passed for r in results)
+    assert [r.restarted for r in results] == [True, False, False]
+    assert len(sessions) == 1
+
+
+def test_rejected_option_fails_only_that_combination(load_core: SampleCoreLoader) -> None:
+    core = load_core("custom", "options_v2_test")
+    combos = [{"test_choice": "a"}, {"test_choice": "z"}, {"test_choice": "b"}]
+    results = run_sweep(core.path, None, combos, frames=1, live=True)
+
+    assert [r.passed for r in results] == [True, False, True]
+    assert "test_choice=z" in (results[1].error or "")
+    assert results[2].restarted
+
+
+def test_failed_check_reports_frames_that_ran(load_core: SampleCoreLoader) -> None:
+    core = load_core("custom", "options_v2_test")
+
+    def check(session: Session, options: OptionCombination) -> None:
+        assert session.options.variables[b"test_choice"] != b"b", f"{options} is broken"
+
+    combos = [{"test_choice": v} for v in ("a", "b")]
+    results = run_sweep(core.path, None, combos, frames=3, check=check)
+
+    assert [r.passed for r in results] == [True, False]
+    assert "is broken" in (results[1].error or "")
+    assert results[1].frames == 3
+    assert results[1].duration > 0
+
+
+def test_sweep_across_worker_processes_keeps_order(load_core: SampleCoreLoader) -> None:
+    core = load_core("custom", "options_v2_test")
+    combos = list(all_combinations({"test_choice": ("a", "b", "c"), "test_bool": ("true",)}))
+    results = run_sweep(core.path, None, combos, frames=2, workers=2)
+
+    assert [dict(r.options) for r in results] == combos
+    assert all(r.passed for r in results)
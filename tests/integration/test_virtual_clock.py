@@ -0,0 +1,40 @@
+"""Integration tests for :class:`~libretro.drivers.VirtualClock`."""
+
+from __future__ import annotations
+
+from libretro import Session
+from libretro.drivers import (
+    DefaultPerfDriver,
+    NullVideoDriver,
+    VirtualClock,
+    VirtualTimingDriver,
+)
+
+from .conftest import SampleCoreLoader
+
+
+def test_each_frame_advances_one_period(load_core: SampleCoreLoader) -> None:
+    core = load_core("custom", "timing_query_test")
+    clock = VirtualClock()
+    steps: list[tuple[int, int]] = []
+    with Session(
+        core,
+        None,
+        video=NullVideoDriver,
+        perf=DefaultPerfDriver(clock),
+        timing=VirtualTimingDriver(clock),
+    ) as session:
+        timing = session.timing
+        assert isinstance(timing, VirtualTimingDriver)
+        assert session.perf is not None
+        for _ in range(20):
+            before = clock.ns
+            period = timing.period
+            session.run()
+            steps.append((clock.ns - before, period))
+
+        assert session.perf.get_time_usec() == clock.usec
+
+    # The core asks to fast-forward at 2x on frame 10; the clock follows it
+    assert [step for step, _ in steps] == [16_666_667] * 11 + [8_333_333] * 9
+    assert all(step == period for step, period in steps)
@@ -0,0 +1,145 @@
+"""Unit tests for :class:`~libretro.drivers.BufferCameraDriver`."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from ctypes import addressof, c_uint32
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("numpy")
+
+import numpy as np  # noqa: E402
+from numpy.typing import NDArray  # noqa: E402
+
+from libretro.api import CameraCapabilityFlags  # noqa: E402
+from libretro.api.camera import retro_camera_frame_raw_framebuffer_t  # noqa: E402
+from libretro.ctypes import TypedPointer  # noqa: E402
+from libretro.drivers import BufferCameraDriver, CameraDriver  # noqa: E402
+
+
+class _Receiver:
+    def __init__(self):
+        self.frames: list[NDArray[np.uint32]] = []
+        self.addresses: list[int] = []
+        self.callback = retro_camera_frame_raw_framebuffer_t(self._receive)
+
+    def _receive(
+        self, buffer: TypedPointer[c_uint32], width: int, height: int, pitch: int
+    ) -> None:
+        self.addresses.append(addressof(buffer.contents))
+        rows = np.ctypeslib.as_array(buffer, (height, pitch // 4))
+        self.frames.append(rows[:, :width].copy())
+
+
+def _start(driver: BufferCameraDriver, width: int = 0, height: int = 0) -> _Receiver:
+    receiver = _Receiver()
+    driver.width = width
+    driver.height = height
+    driver.frame_raw_framebuffer = receiver.callback
+    assert driver.start()
+    return receiver
+
+
+def _stack(count: int, height: int = 2, width: int = 3) -> NDArray[np.uint32]:
+    return np.arange(count * height * width, dtype=np.uint32).reshape(count, height, width)
+
+
+def test_delivers_frames_without_copying() -> None:
+    frames = _stack(2)
+    driver = BufferCameraDriver(frames)
+    assert isinstance(driver, CameraDriver)
+
+    driver.poll()  # Not started yet
+    receiver = _start(driver)
+    for _ in range(3):
+        driver.poll()
+
+    assert driver.delivered == 3
+    assert [f.tolist() for f in receiver.frames] == [
+        frames[0].tolist(),
+        frames[1].tolist(),
+        frames[0].tolist(),
+    ]
+    assert receiver.addresses[0] == frames.ctypes.data
+    assert receiver.addresses[1] == frames[1].ctypes.data
+
+    driver.stop()
+    driver.poll()
+    assert driver.delivered == 3
+
+
+def test_holds_last_frame_without_loop() -> None:
+    frames = _stack(2)
+    driver = BufferCameraDriver(frames, loop=False)
+    receiver = _start(driver)
+    for _ in range(3):
+        driver.poll()
+
+    assert receiver.frames[-1].tolist() == frames[1].tolist()
+
+
+def test_converts_rgb_and_scales_once() -> None:
+    rgb = np.zeros((1, 1, 2, 3), np.uint8)
+    rgb[0, 0, 0] = (0x12, 0x34, 0x56)
+    rgb[0, 0, 1] = (0xFF, 0x00, 0x80)
+    driver = BufferCameraDriver(rgb)
+    receiver = _start(driver, width=4, height=2)
+    driver.poll()
+    driver.poll()
+
+    assert receiver.frames[0].tolist() == [[0x123456, 0x123456, 0xFF0080, 0xFF0080]] * 2
+    assert receiver.addresses[0] == receiver.addresses[1]
+
+
+def test_reads_memory_mapped_file(tmp_path: Path) -> None:
+    frames = _stack(3, 2, 2)
+    path = tmp_path / "camera.raw"
+    frames.tofile(path)
+    driver = BufferCameraDriver(path, width=2, height=2)
+    receiver = _start(driver)
+    for _ in range(3):
+        driver.poll()
+
+    assert [f.tolist() for f in receiver.frames] == frames.tolist()
+
+    with pytest.raises(ValueError):
+        BufferCameraDriver(path)
+
+
+def test_generator_factory_restarts() -> None:
+    def _frames() -> Iterator[NDArray[np.uint32]]:
+        yield np.full((1, 1), 1, np.uint32)
+        yield np.full((1, 1), 2, np.uint32)
+
+    driver = BufferCameraDriver(_frames)
+    receiver = _start(driver)
+    for _ in range(3):
+        driver.poll()
+
+    assert [f.item() for f in receiver.frames] == [1, 2, 1]
+
+
+def test_iterable_holds_last_frame() -> None:
+    driver = BufferCameraDriver(iter([np.full((1, 1), 7, np.uint32)]))
+    receiver = _start(driver)
+    driver.poll()
+    driver.poll()
+
+    assert [f.item() for f in receiver.frames] == [7, 7]
+
+
+def test_start_requires_raw_framebuffer() -> None:
+    driver = BufferCameraDriver(_stack(1))
+    assert not driver.start()
+
+    driver.frame_raw_framebuffer = _Receiver().callback
+    driver.caps = CameraCapabilityFlags.OPENGL_TEXTURE
+    assert not driver.start()
+    assert not driver.started
+
+
+def test_rejects_unsupported_arrays() -> None:
+    with pytest.raises(ValueError):
+        BufferCameraDriver(np.zeros((2, 2), np.float32))
@@ -0,0 +1,148 @@
+"""Unit tests for :class:`~libretro.drivers.BufferMicrophoneDriver`."""
+
+from __future__ import annotations
+
+import wave
+from array import array
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from libretro.api import retro_microphone_params
+from libretro.drivers import BufferMicrophoneDriver, DirectMicrophoneDriver
+
+
+def _open(driver: BufferMicrophoneDriver, rate: int = 44100):
+    mic = driver.open_mic(retro_microphone_params(rate))
+    assert mic is not None
+    driver.set_mic_state(mic, True)
+    return mic
+
+
+def _read(driver: BufferMicrophoneDriver, frames: int) -> list[int]:
+    (mic,) = driver.microphones
+    buffer = array("h", bytes(frames * 2))
+    with memoryview(buffer) as view:
+        assert driver.read_mic_into(mic.handle, view) == frames
+    return buffer.tolist()
+
+
+def test_array_source_is_read_in_blocks_then_silence() -> None:
+    driver = BufferMicrophoneDriver(array("h", range(1, 6)))
+    assert isinstance(driver, DirectMicrophoneDriver)
+    _open(driver)
+
+    assert _read(driver, 3) == [1, 2, 3]
+    assert _read(driver, 4) == [4, 5, 0, 0]
+    assert _read(driver, 2) == [0, 0]
+
+
+def test_loop_wraps_around() -> None:
+    driver = BufferMicrophoneDriver(array("h", [1, 2, 3]), loop=True)
+    _open(driver)
+
+    assert _read(driver, 8) == [1, 2, 3, 1, 2, 3, 1, 2]
+    assert _read(driver, 2) == [3, 1]
+
+
+def test_read_matches_read_into() -> None:
+    driver = BufferMicrophoneDriver(array("h", range(10)))
+    mic = _open(driver)
+
+    samples = driver.read_mic(mic, 4)
+    assert samples is not None
+    assert samples.tolist() == [0, 1, 2, 3]
+    assert _read(driver, 2) == [4, 5]
+
+
+def test_chunked_generator_uses_ring_buffer() -> None:
+    def chunks() -> Iterator[array[int]]:
+        yield array("h", [1, 2])
+        yield array("h", range(3, 9000))  # Larger than the ring's initial capacity
+        yield array("h", [9000])
+
+    driver = BufferMicrophoneDriver(chunks)
+    _open(driver)
+
+    assert _read(driver, 3) == [1, 2, 3]
+    assert _read(driver, 8995) == list(range(4, 8999))
+    assert _read(driver, 4) == [8999, 9000, 0, 0]
+
+
+def test_each_mic_restarts_generator_function() -> None:
+    driver = BufferMicrophoneDriver(lambda: iter([array("h", [7, 8])]))
+    first = _open(driver)
+    _open(driver)
+
+    for mic in driver.microphones:
+        buffer = array("h", bytes(4))
+        with memoryview(buffer) as view:
+            driver.read_mic_into(mic.handle, view)
+        assert buffer.tolist() == [7, 8]
+
+    driver.close_mic(first)
+    assert len(driver.microphones) == 1
+
+
+def test_closed_or_disabled_mic_reads_none() -> None:
+    driver = BufferMicrophoneDriver(array("h", [1]))
+    mic = _open(driver)
+    driver.set_mic_state(mic, False)
+
+    with memoryview(array("h", [0])) as view:
+        assert driver.read_mic_into(mic, view) is None
+    assert driver.read_mic(mic, 1) is None
+
+
+def _write_wav(path: Path, channels: int, width: int, rate: int, frames: bytes) -> None:
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(channels)
+        w.setsampwidth(width)
+        w.setframerate(rate)
+        w.writeframes(frames)
+
+
+def test_mono_wav_is_mapped_and_advertises_its_rate(tmp_path: Path) -> None:
+    path = tmp_path / "mono.wav"
+    _write_wav(path, 1, 2, 16000, array("h", [100, -200, 300]).tobytes())
+
+    driver = BufferMicrophoneDriver(path)
+    mic = _open(driver, 44100)
+
+    params = driver.get_mic_params(mic)
+    assert params is not None
+    assert params.rate == 16000
+    assert _read(driver, 4) == [100, -200, 300, 0]
+
+
+def test_close_unmaps_wav(tmp_path: Path) -> None:
+    path = tmp_path / "mono.wav"
+    _write_wav(path, 1, 2, 16000, array("h", [100, -200, 300]).tobytes())
+
+    with BufferMicrophoneDriver(path) as driver:
+        mapped = driver._mmap  # pyright: ignore[reportPrivateUsage]
+        assert mapped is not None
+        mic = _open(driver)
+        assert _read(driver, 1) == [100]
+
+    assert mapped.closed
+    assert driver.read_mic(mic, 1) is None
+    assert not driver.microphones
+    driver.close()
+
+
+def test_stereo_8_bit_wav_is_decoded(tmp_path: Path) -> None:
+    path = tmp_path / "stereo.wav"
+    _write_wav(path, 2, 1, 8000, bytes([128, 0, 255, 0, 0, 0]))
+
+    driver = BufferMicrophoneDriver(path)
+    _open(driver)
+
+    assert _read(driver, 3) == [0, 127 << 8, -128 << 8]
+
+
+@pytest.mark.parametrize("source", [array("i", [1]), array("f", [1.0])])
+def test_non_16_bit_buffers_raise(source: array[int] | array[float]) -> None:
+    with pytest.raises(ValueError):
+        BufferMicrophoneDriver(source)
@@ -0,0 +1,129 @@
+"""Unit tests for :class:`~libretro.drivers.BufferMidiDriver` and :mod:`libretro.drivers.midi.smf`."""
+
+from __future__ import annotations
+
+import io
+import struct
+from array import array
+from pathlib import Path
+
+import pytest
+
+from libretro.drivers import BufferMidiDriver, MidiDriver, MidiFileWriter, read_midi_file
+
+NOTE_ON = bytes([0x90, 60, 64])
+NOTE_OFF = bytes([0x80, 60, 0])
+
+
+def _smf(division: int, *tracks: bytes) -> bytes:
+    header = b"MThd" + struct.pack(">IHHH", 6, 1 if len(tracks) > 1 else 0, len(tracks), division)
+    return header + b"".join(b"MTrk" + struct.pack(">I", len(t)) + t for t in tracks)
+
+
+def _read_all(driver: MidiDriver) -> bytes:
+    out = bytearray()
+    while (byte := driver.read()) is not None:
+        out.append(byte)
+    return bytes(out)
+
+
+def test_untimed_buffer_is_read_immediately() -> None:
+    driver = BufferMidiDriver(NOTE_ON + NOTE_OFF)
+
+    assert isinstance(driver, MidiDriver)
+    assert driver.input_enabled
+    assert _read_all(driver) == NOTE_ON + NOTE_OFF
+    assert not driver.input_enabled
+
+
+def test_timed_buffer_waits_for_advance() -> None:
+    driver = BufferMidiDriver(NOTE_ON + NOTE_OFF, times=[0, 0, 0, 1000, 1000, 1000])
+
+    assert _read_all(driver) == NOTE_ON
+    driver.advance(999)
+    assert driver.read() is None
+    driver.advance(1)
+    assert _read_all(driver) == NOTE_OFF
+
+
+def test_mismatched_times_raise() -> None:
+    with pytest.raises(ValueError):
+        BufferMidiDriver(NOTE_ON, times=[0])
+
+
+def test_no_source_disables_input() -> None:
+    driver = BufferMidiDriver()
+
+    assert not driver.input_enabled
+    assert driver.read() is None
+
+
+def test_write_collects_parallel_arrays() -> None:
+    driver = BufferMidiDriver()
+    for byte, delta in zip(NOTE_ON, (5, 0, 0), strict=True):
+        assert driver.write(byte, delta)
+
+    assert driver.output_bytes == array("B", NOTE_ON)
+    assert driver.output_delta_times == array("I", [5, 0, 0])
+    assert driver.flush()
+    assert driver.output_bytes.tobytes() == NOTE_ON
+
+
+def test_flush_streams_to_midi_file() -> None:
+    file = io.BytesIO()
+    driver = BufferMidiDriver(output=file)
+
+    # Split a message across flushes, and use running status for the second note
+    for byte, delta in ((0x90, 0), (60, 0)):
+        driver.write(byte, delta)
+    driver.flush()
+    for byte, delta in (
+        (64, 0),
+        (62, 250_000),
+        (64, 0),
+        (0xF8, 0),
+        (0x80, 250_000),
+        (60, 0),
+        (0, 0),
+    ):
+        driver.write(byte, delta)
+    driver.close()
+
+    stream = read_midi_file(file.getvalue())
+    assert stream.data == bytes([0x90, 60, 64, 0x90, 62, 64, 0x80, 60, 0])
+    assert list(stream.times) == [0] * 3 + [250_000] * 3 + [500_000] * 3
+
+
+def test_sysex_round_trip(tmp_path: Path) -> None:
+    sysex = bytes([0xF0, 0x7E, 0x7F, 0x09, 0x01, 0xF7])
+    path = tmp_path / "sysex.mid"
+    with MidiFileWriter(path) as writer:
+        writer.write(sysex + NOTE_ON, [0] * 9)
+
+    driver = BufferMidiDriver(path)
+    assert _read_all(driver) == sysex + NOTE_ON
+
+
+def test_read_format_1_with_tempo_change() -> None:
+    # 96 ticks per quarter note; tempo doubles to 250ms/quarter after the first beat
+    tempo_track = (
+        b"\x00\xff\x51\x03" + (500_000).to_bytes(3) + b"\x60\xff\x51\x03" + (250_000).to_bytes(3)
+    )
+    notes = b"\x00" + NOTE_ON + b"\x60" + NOTE_OFF[:1] + b"\x3c\x00" + b"\x60\x3e\x40"
+    stream = read_midi_file(_smf(96, tempo_track + b"\x00\xff\x2f\x00", notes))
+
+    assert stream.data == NOTE_ON + NOTE_OFF + bytes([0x80, 62, 64])
+    assert list(stream.times) == [0] * 3 + [500_000] * 3 + [750_000] * 3
+
+
+def test_read_smpte_division() -> None:
+    # 25 fps, 40 ticks per frame: one tick per millisecond
+    division = ((256 - 25) << 8) | 40
+    stream = read_midi_file(_smf(division, b"\x00" + NOTE_ON + b"\x83\x60" + NOTE_OFF))
+
+    assert list(stream.times) == [0] * 3 + [480_000] * 3
+
+
+def test_read_rejects_non_midi_files() -> None:
+    with pytest.raises(ValueError):
+        read_midi_file(b"RIFF\0\0\0\0")
@@ -0,0 +1,86 @@
+"""Unit tests for :mod:`libretro.drivers.environment.profiler`."""
+
+from __future__ import annotations
+
+from libretro.api import EnvironmentCall
+from libretro.ctypes import c_void_ptr
+from libretro.drivers import CallbackProfiler, HistogramPerfDriver
+from libretro.error import UnsupportedEnvCall
+
+
+def test_wrap_records_calls_and_preserves_results() -> None:
+    def double(x: int) -> int:
+        return x * 2
+
+    profiler = CallbackProfiler()
+    wrapped = profiler.wrap("double", double)
+
+    assert wrapped(2) == 4
+    assert wrapped(3) == 6
+    assert profiler.stats["double"].calls == 2
+    assert profiler.stats["double"].max <= profiler.stats["double"].total
+
+
+def test_wrap_records_calls_that_raise() -> None:
+    profiler = CallbackProfiler()
+
+    def fail() -> None:
+        raise UnsupportedEnvCall("nope")
+
+    wrapped = profiler.wrap("fail", fail)
+    try:
+        wrapped()
+    except UnsupportedEnvCall:
+        pass
+
+    assert profiler.stats["fail"].calls == 1
+
+
+def test_envcalls_are_timed_separately() -> None:
+    profiler = CallbackProfiler()
+    environment = profiler.wrap_environment(lambda _cmd, _data: True)
+
+    environment(EnvironmentCall.GET_VARIABLE, c_void_ptr())
+    environment(EnvironmentCall.GET_VARIABLE, c_void_ptr())
+    environment(0xDEAD, c_void_ptr())
+
+    assert profiler.stats["environment.GET_VARIABLE"].calls == 2
+    assert profiler.stats["environment.0xdead"].calls == 1
+
+
+def test_run_attributes_nested_callbacks_to_the_frame() -> None:
+    profiler = CallbackProfiler()
+    refresh = profiler.wrap("video_refresh", lambda: None)
+    refresh()  # Outside of retro_run, so not part of any frame
+
+    frame = profiler.run(refresh)
+    report = profiler.report()
+
+    assert frame.frame == 0
+    assert set(frame.callbacks) == {"video_refresh"}
+    assert frame.core_time == frame.run - frame.callback_time
+    assert report.frames == 1
+    assert report.callbacks["video_refresh"].calls == 2
+    assert report.callback_time == frame.callback_time
+    assert "video_refresh" in str(report)
+
+
+def test_spans_are_forwarded_to_trace() -> None:
+    perf = HistogramPerfDriver()
+    profiler = CallbackProfiler(trace=perf)
+    profiler.run(profiler.wrap("input_poll", lambda: None))
+
+    assert [(e.name, e.category) for e in perf.events] == [
+        ("input_poll", "host"),
+        ("retro_run", "core"),
+    ]
+
+
+def test_reset_discards_measurements() -> None:
+    profiler = CallbackProfiler()
+    profiler.run(profiler.wrap("input_poll", lambda: None))
+    profiler.reset()
+
+    assert profiler.report().frames == 0
+    assert not profiler.stats
+    assert not profiler.frames
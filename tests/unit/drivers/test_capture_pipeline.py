@@ -0,0 +1,229 @@
+"""Unit tests for :class:`~libretro.drivers.CapturePipeline` and :class:`~libretro.drivers.CaptureVideoDriver`."""
+
+from __future__ import annotations
+
+import threading
+import zlib
+from concurrent.futures import CancelledError
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("numpy")
+
+import numpy as np  # noqa: E402
+
+from libretro.api import PixelFormat  # noqa: E402
+from libretro.api.video import Rotation  # noqa: E402
+from libretro.drivers import (  # noqa: E402
+    ArrayVideoDriver,
+    Backpressure,
+    CaptureBacklogError,
+    CapturePipeline,
+    CaptureVideoDriver,
+    FrameBufferSpecial,
+    FrameComparison,
+    RgbFrame,
+    Screenshot,
+    VideoDriver,
+    compare_to,
+    encode_png,
+    frame_digest,
+    save_png,
+)
+
+
+def _xrgb(*pixels: tuple[int, int, int]) -> memoryview:
+    return memoryview(b"".join(bytes((b, g, r, 0)) for r, g, b in pixels))
+
+
+def _blocking_task(release: threading.Event):
+    def _task(frame: RgbFrame) -> list[int]:
+        release.wait()
+        return frame.ravel().tolist()
+
+    return _task
+
+
+def test_submit_converts_on_worker() -> None:
+    with CapturePipeline() as pipeline:
+        future = pipeline.submit(
+            lambda f: f.tolist(), _xrgb((1, 2, 3), (4, 5, 6)), 2, 1, 8, PixelFormat.XRGB8888
+        )
+        assert future.result() == [[[1, 2, 3], [4, 5, 6]]]
+
+
+def test_submitted_data_is_copied() -> None:
+    release = threading.Event()
+    data = bytearray(_xrgb((1, 2, 3)))
+    with CapturePipeline() as pipeline:
+        future = pipeline.submit(_blocking_task(release), data, 1, 1, 4, PixelFormat.XRGB8888)
+        data[:] = bytes(4)
+        release.set()
+        assert future.result() == [1, 2, 3]
+
+
+def test_buffers_are_recycled() -> None:
+    with CapturePipeline(max_pending=1) as pipeline:
+        for value in range(4):
+            future = pipeline.submit(
+                lambda f: f.tolist(), _xrgb((value, 0, 0)), 1, 1, 4, PixelFormat.XRGB8888
+            )
+            assert future.result() == [[[value, 0, 0]]]
+
+        assert len(pipeline._pool) == 1  # pyright: ignore[reportPrivateUsage]
+
+
+def test_submit_screenshot() -> None:
+    screenshot = Screenshot(
+        memoryview(bytes((9, 8, 7, 255))), 1, 1, Rotation.NONE, PixelFormat.RGB565
+    )
+    with CapturePipeline() as pipeline:
+        assert pipeline.submit_screenshot(lambda f: f.tolist(), screenshot).result() == [
+            [[9, 8, 7]]
+        ]
+
+
+def test_task_errors_are_delivered_through_future() -> None:
+    def _fail(frame: RgbFrame) -> None:
+        raise KeyError(frame.shape)
+
+    with CapturePipeline() as pipeline:
+        future = pipeline.submit(_fail, _xrgb((0, 0, 0)), 1, 1, 4, PixelFormat.XRGB8888)
+        with pytest.raises(KeyError):
+            future.result()
+
+
+@pytest.mark.parametrize("backpressure", [Backpressure.DROP, Backpressure.RAISE])
+def test_backpressure_when_full(backpressure: Backpressure) -> None:
+    release = threading.Event()
+    frame = _xrgb((1, 1, 1))
+    with CapturePipeline(max_pending=1, backpressure=backpressure) as pipeline:
+        first = pipeline.submit(_blocking_task(release), frame, 1, 1, 4, PixelFormat.XRGB8888)
+        if backpressure == Backpressure.DROP:
+            second = pipeline.submit(_blocking_task(release), frame, 1, 1, 4, PixelFormat.XRGB8888)
+            assert second.cancelled()
+            assert pipeline.dropped == 1
+        else:
+            with pytest.raises(CaptureBacklogError):
+                pipeline.submit(_blocking_task(release), frame, 1, 1, 4, PixelFormat.XRGB8888)
+
+        release.set()
+        assert first.result() == [1, 1, 1]
+
+
+def test_block_backpressure_waits() -> None:
+    release = threading.Event()
+    frame = _xrgb((1, 1, 1))
+    with CapturePipeline(max_pending=1) as pipeline:
+        pipeline.submit(_blocking_task(release), frame, 1, 1, 4, PixelFormat.XRGB8888)
+        second = threading.Thread(
+            target=pipeline.submit,
+            args=(_blocking_task(release), frame, 1, 1, 4, PixelFormat.XRGB8888),
+        )
+        second.start()
+        second.join(0.2)
+        assert second.is_alive()
+
+        release.set()
+        second.join()
+
+
+def test_capture_video_driver() -> None:
+    with CapturePipeline() as pipeline:
+        driver = CaptureVideoDriver(pipeline, ArrayVideoDriver())
+        assert isinstance(driver, VideoDriver)
+        driver.pixel_format = PixelFormat.XRGB8888
+
+        future = driver.capture_next(frame_digest)
+        driver.refresh(FrameBufferSpecial.DUPE, 1, 1, 4)
+        assert not future.done()
+
+        driver.refresh(_xrgb((5, 6, 7)), 1, 1, 4)
+        assert future.result() == frame_digest(np.array([[[5, 6, 7]]], np.uint8))
+        assert isinstance(driver.inner, ArrayVideoDriver)
+        assert driver.inner.screenshot() is not None
+
+
+def test_capture_video_driver_dropped_frame() -> None:
+    release = threading.Event()
+    with CapturePipeline(max_pending=1, backpressure=Backpressure.DROP) as pipeline:
+        driver = CaptureVideoDriver(pipeline)
+        driver.pixel_format = PixelFormat.XRGB8888
+        first = driver.capture_next(_blocking_task(release))
+        second = driver.capture_next(frame_digest)
+        driver.refresh(_xrgb((0, 0, 0)), 1, 1, 4)
+
+        with pytest.raises(CancelledError):
+            second.result()
+
+        release.set()
+        assert first.result() == [0, 0, 0]
+
+
+def test_capture_video_driver_backlog_fails_pending_requests() -> None:
+    release = threading.Event()
+    with CapturePipeline(max_pending=1, backpressure=Backpressure.RAISE) as pipeline:
+        driver = CaptureVideoDriver(pipeline)
+        driver.pixel_format = PixelFormat.XRGB8888
+        first = driver.capture_next(_blocking_task(release))
+        second = driver.capture_next(frame_digest)
+        third = driver.capture_next(frame_digest)
+        with pytest.raises(CaptureBacklogError):
+            driver.refresh(_xrgb((0, 0, 0)), 1, 1, 4)
+
+        for future in (second, third):
+            with pytest.raises(CaptureBacklogError):
+                future.result(timeout=1)
+
+        release.set()
+        assert first.result() == [0, 0, 0]
+
+
+def test_capture_video_driver_closed_pipeline_fails_requests() -> None:
+    pipeline = CapturePipeline()
+    pipeline.close()
+    driver = CaptureVideoDriver(pipeline)
+    driver.pixel_format = PixelFormat.XRGB8888
+    future = driver.capture_next(frame_digest)
+    with pytest.raises(RuntimeError):
+        driver.refresh(_xrgb((0, 0, 0)), 1, 1, 4)
+
+    with pytest.raises(RuntimeError):
+        future.result(timeout=1)
+
+
+def test_encode_png(tmp_path: Path) -> None:
+    frame = np.arange(2 * 3 * 3, dtype=np.uint8).reshape(2, 3, 3)
+    png = encode_png(frame)
+    assert png.startswith(b"\x89PNG\r\n\x1a\n")
+    assert png[12:16] == b"IHDR"
+    assert int.from_bytes(png[16:20]) == 3
+    assert int.from_bytes(png[20:24]) == 2
+
+    idat_length = int.from_bytes(png[33:37])
+    assert png[37:41] == b"IDAT"
+    rows = zlib.decompress(png[41 : 41 + idat_length])
+    assert rows == b"\x00" + frame[0].tobytes() + b"\x00" + frame[1].tobytes()
+
+    path = tmp_path / "frame.png"
+    assert save_png(path)(frame) == path
+    assert path.read_bytes() == png
+
+
+def test_compare_to(tmp_path: Path) -> None:
+    golden = np.full((2, 2, 3), 100, np.uint8)
+    frame = golden.copy()
+    frame[0, 0, 1] = 103
+
+    assert compare_to(golden)(golden) == FrameComparison(True, 0, 0)
+    assert compare_to(golden)(frame) == FrameComparison(False, 1, 3)
+    assert compare_to(golden, tolerance=3)(frame) == FrameComparison(True, 0, 3)
+    assert not compare_to(golden)(frame[:1]).matches
+
+    path = tmp_path / "golden.npy"
+    np.save(path, golden)
+    assert compare_to(path)(golden).matches
+
+    with pytest.raises(ValueError):
+        compare_to(golden, tolerance=-1)
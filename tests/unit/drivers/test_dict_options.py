@@ -0,0 +1,95 @@
+"""Unit tests for :mod:`libretro.drivers.options.dict`."""
+
+from __future__ import annotations
+
+from libretro.api import retro_variable
+from libretro.drivers import DictOptionDriver
+
+
+def _driver(**options: list[bytes]) -> DictOptionDriver:
+    driver = DictOptionDriver()
+    driver.set_variables(
+        [retro_variable(k.encode(), b"Description; " + b"|".join(v)) for k, v in options.items()]
+    )
+    return driver
+
+
+def test_get_variable_returns_default_until_set() -> None:
+    driver = _driver(speed=[b"1x", b"2x", b"4x"])
+
+    assert driver.get_variable(b"speed") == b"1x"
+    assert driver.set_variable(b"speed", b"4x")
+    assert driver.get_variable(b"speed") == b"4x"
+    assert not driver.set_variable(b"speed", b"8x")
+    assert driver.get_variable(b"speed") == b"4x"
+
+
+def test_get_variable_sees_assignment_through_variables() -> None:
+    driver = _driver(speed=[b"1x", b"2x"])
+    assert driver.get_variable(b"speed") == b"1x"
+
+    driver.variables["speed"] = "2x"
+    assert driver.get_variable(b"speed") == b"2x"
+
+    driver.variables["speed"] = "99x"
+    assert driver.get_variable(b"speed") == b"1x", "Illegal values fall back to the default"
+
+    del driver.variables["speed"]
+    assert driver.get_variable(b"speed") == b"1x"
+
+
+def test_get_variable_revalidates_when_definitions_change() -> None:
+    driver = _driver(speed=[b"1x", b"2x"])
+    driver.variables["speed"] = "2x"
+    assert driver.get_variable(b"speed") == b"2x"
+
+    driver.set_variables([retro_variable(b"speed", b"Speed; 1x|3x")])
+    assert driver.get_variable(b"speed") == b"1x"
+
+    driver.set_variables([retro_variable(b"speed", b"Speed; 3x|2x")])
+    assert driver.get_variable(b"speed") == b"2x", "The stored value becomes legal again"
+
+
+def test_get_variable_unknown_key() -> None:
+    driver = _driver(speed=[b"1x"])
+    assert driver.get_variable(b"missing") is None
+    assert DictOptionDriver().get_variable(b"speed") is None
+
+
+def test_get_variable_clears_variable_updated() -> None:
+    driver = _driver(speed=[b"1x", b"2x"])
+    driver.get_variable(b"speed")
+    assert not driver.variable_updated
+
+    driver.set_variable(b"speed", b"2x")
+    assert driver.variable_updated
+    driver.get_variable(b"speed")
+    assert not driver.variable_updated
+
+
+def test_get_variable_cache_is_reused_and_invalidated() -> None:
+    driver = _driver(speed=[b"1x", b"2x", b"4x"], size=[b"s", b"m"])
+    cache = driver._resolved  # pyright: ignore[reportPrivateUsage]
+    assert driver.get_variable(b"speed") == b"1x"
+    assert driver.get_variable(b"size") == b"s"
+    assert cache == {b"speed": b"1x", b"size": b"s"}
+
+    # Repeated reads are answered from the cache without revalidating
+    cache[b"speed"] = b"cached"
+    assert driver.get_variable(b"speed") == b"cached"
+
+    assert driver.set_variable(b"speed", b"4x")
+    assert cache == {b"size": b"s"}, "Only the changed option is invalidated"
+    assert driver.get_variable(b"speed") == b"4x"
+
+    driver.variables["speed"] = "2x"
+    assert b"speed" not in cache
+    assert driver.get_variable(b"speed") == b"2x"
+
+    del driver.variables["speed"]
+    assert b"speed" not in cache
+    assert driver.get_variable(b"speed") == b"1x"
+
+    driver.set_variables([retro_variable(b"speed", b"Speed; 1x|3x")])
+    assert cache == {}
+    assert driver.get_variable(b"speed") == b"1x"
@@ -0,0 +1,106 @@
+"""Unit tests for :mod:`libretro.drivers.perf.histogram`."""
+
+from __future__ import annotations
+
+import io
+import json
+import logging
+
+import pytest
+
+from libretro.api import retro_perf_counter
+from libretro.drivers import HistogramPerfDriver, LatencyHistogram
+
+
+def test_histogram_empty() -> None:
+    h = LatencyHistogram()
+    assert h.count == 0
+    assert h.p50 == 0
+    assert h.p99 == 0
+    assert h.max == 0
+
+
+@pytest.mark.parametrize("value", [0, 1, 15, 16, 17, 1000, 123_456_789, 2**62])
+def test_histogram_single_value_percentiles_are_exact(value: int) -> None:
+    h = LatencyHistogram()
+    h.record(value)
+    assert h.p50 == value
+    assert h.p99 == value
+
+
+def test_histogram_percentiles_are_within_bucket_error() -> None:
+    h = LatencyHistogram()
+    for ns in range(1, 10_001):
+        h.record(ns * 100)
+
+    assert h.count == 10_000
+    assert h.max == 1_000_000
+    assert h.min == 100
+    assert 500_000 <= h.p50 <= 500_000 * 1.125
+    assert 990_000 <= h.p99 <= 1_000_000
+
+
+def test_histogram_rejects_bad_percentile() -> None:
+    with pytest.raises(ValueError):
+        LatencyHistogram().percentile(101)
+
+
+def test_driver_records_histograms_frames_and_trace() -> None:
+    perf = HistogramPerfDriver()
+    counter = retro_perf_counter(ident=b"loop")
+    perf.perf_register(counter)
+
+    for _ in range(3):
+        perf.perf_start(counter)
+        perf.perf_stop(counter)
+
+    frame = perf.end_frame()
+    perf.add_trace_event("callback", 0, 1000)
+
+    histogram = perf.histograms[b"loop"]
+    assert histogram.count == 3
+    assert counter.call_cnt == 3
+    assert counter.total == histogram.total
+    assert frame.frame == 0
+    assert frame.counters == {b"loop": histogram.total}
+    assert list(perf.frames) == [frame]
+
+    f = io.StringIO()
+    perf.export_trace(f)
+    trace = json.loads(f.getvalue())
+    events = trace["traceEvents"]
+    assert [e["cat"] for e in events] == ["core", "core", "core", "frame", "host"]
+    assert all(e["ph"] == "X" for e in events)
+    assert events[-1]["dur"] == 1.0
+
+
+def test_driver_without_tracing_records_no_events() -> None:
+    perf = HistogramPerfDriver(trace=False)
+    counter = retro_perf_counter(ident=b"loop")
+    perf.perf_register(counter)
+    perf.perf_start(counter)
+    perf.perf_stop(counter)
+    perf.end_frame()
+
+    assert len(perf.events) == 0
+    assert perf.histograms[b"loop"].count == 1
+
+
+def test_perf_log_writes_decoded_summary_to_logger(
+    caplog: pytest.LogCaptureFixture, capsys: pytest.CaptureFixture[str]
+) -> None:
+    perf = HistogramPerfDriver(trace=False)
+    called = retro_perf_counter(ident=b"loop")
+    idle = retro_perf_counter(ident=b"idle")
+    perf.perf_register(called)
+    perf.perf_register(idle)
+    perf.perf_start(called)
+    perf.perf_stop(called)
+
+    with caplog.at_level(logging.INFO, logger="libretro.perf"):
+        perf.perf_log()
+
+    assert [r.name for r in caplog.records] == ["libretro.perf", "libretro.perf"]
+    assert caplog.messages[0].startswith("loop: 1 calls, p50 ")
+    assert caplog.messages[1] == "idle: Not called"
+    assert capsys.readouterr().out == ""
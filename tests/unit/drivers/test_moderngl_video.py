@@ -0,0 +1,76 @@
+"""Tests for :class:`~libretro.drivers.ModernGlVideoDriver` on a headless EGL context."""
+
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("moderngl")
+pytest.importorskip("OpenGL")
+
+from libretro.api import PixelFormat  # noqa: E402
+from libretro.api.av import retro_game_geometry, retro_system_av_info  # noqa: E402
+from libretro.drivers import ModernGlVideoDriver  # noqa: E402
+
+WIDTH = 4
+HEIGHT = 3
+
+
+def _frame(index: int) -> memoryview:
+    # XRGB8888 (stored as BGRX); the top row is red, and each row's blue channel is unique
+    rows = (
+        bytes((row * 10 + index, 0, 255 if row == 0 else 0, 0)) * WIDTH for row in range(HEIGHT)
+    )
+    return memoryview(b"".join(rows))
+
+
+def _driver(readback_buffers: int = 0, finish: bool = True) -> ModernGlVideoDriver:
+    driver = ModernGlVideoDriver(backend="egl", readback_buffers=readback_buffers, finish=finish)
+    try:
+        driver.system_av_info = retro_system_av_info(
+            retro_game_geometry(WIDTH, HEIGHT, WIDTH, HEIGHT, 0.0)
+        )
+    except Exception as e:
+        pytest.skip(f"Headless OpenGL context unavailable: {e}")
+
+    driver.pixel_format = PixelFormat.XRGB8888
+    return driver
+
+
+def _pixel(data: memoryview, row: int) -> bytes:
+    start = row * WIDTH * 4
+    return bytes(data[start : start + 4])
+
+
+def test_screenshot_is_right_side_up() -> None:
+    driver = _driver()
+    assert driver.readback_latency == 0
+
+    driver.refresh(_frame(1), WIDTH, HEIGHT, WIDTH * 4)
+    screenshot = driver.screenshot()
+
+    assert screenshot is not None
+    assert (screenshot.width, screenshot.height) == (WIDTH, HEIGHT)
+    assert _pixel(screenshot.data, 0) == bytes((255, 0, 1, 255))
+    assert _pixel(screenshot.data, 2) == bytes((0, 0, 21, 255))
+
+
+@pytest.mark.parametrize("buffers", [2, 3])
+@pytest.mark.parametrize("finish", [True, False])
+def test_pbo_readback_lags_by_latency(buffers: int, finish: bool) -> None:
+    driver = _driver(buffers, finish)
+    assert driver.readback_latency == buffers - 1
+
+    for index in range(6):
+        driver.refresh(_frame(index), WIDTH, HEIGHT, WIDTH * 4)
+        screenshot = driver.screenshot()
+        assert screenshot is not None
+
+        # Until the ring fills up, the oldest frame read back is the first one
+        expected = max(index - driver.readback_latency, 0)
+        assert _pixel(screenshot.data, 0) == bytes((255, 0, expected, 255))
+        assert _pixel(screenshot.data, 1) == bytes((0, 0, 10 + expected, 255))
+
+
+def test_negative_readback_buffers() -> None:
+    with pytest.raises(ValueError):
+        ModernGlVideoDriver(readback_buffers=-1)
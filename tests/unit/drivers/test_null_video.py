@@ -0,0 +1,93 @@
+"""Unit tests for :class:`~libretro.drivers.NullVideoDriver`."""
+
+from __future__ import annotations
+
+import pytest
+
+from libretro.api import PixelFormat, Rotation
+from libretro.api.av import retro_game_geometry, retro_system_av_info
+from libretro.drivers import FrameBufferSpecial, FrameSize, NullVideoDriver, VideoDriver
+
+
+def _frame(height: int, pitch: int, fill: int = 0) -> memoryview:
+    return memoryview(bytes([fill]) * (height * pitch))
+
+
+def test_counts_frames_dupes_and_size_changes() -> None:
+    driver = NullVideoDriver()
+    assert isinstance(driver, VideoDriver)
+
+    driver.refresh(_frame(2, 8), 4, 2, 8)
+    driver.refresh(FrameBufferSpecial.DUPE, 4, 2, 8)
+    driver.refresh(_frame(2, 16), 8, 2, 16)
+    driver.refresh(FrameBufferSpecial.HARDWARE, 8, 2, 16)
+
+    assert driver.frames == 4
+    assert driver.dupes == 1
+    assert driver.hardware_frames == 1
+    assert driver.size_changes == [FrameSize(0, 4, 2, 8), FrameSize(2, 8, 2, 16)]
+    assert driver.checksum is None
+    assert driver.screenshot() is None
+
+    driver.reset()
+    assert driver.frames == 0
+    assert driver.size_changes == []
+
+
+def test_checksum_samples_visible_rows() -> None:
+    driver = NullVideoDriver(checksum_rows=2)
+    driver.pixel_format = PixelFormat.XRGB8888
+
+    # Row 1 is skipped by sampling, and the padding after each row is never read
+    frame = bytearray(3 * 12)
+    frame[12:16] = b"\xff" * 4
+    frame[8:12] = b"\xff" * 4
+    driver.refresh(memoryview(frame), 2, 3, 12)
+    blank = driver.checksum
+
+    driver.refresh(_frame(3, 12), 2, 3, 12)
+    assert driver.checksum == blank
+
+    frame[24] = 1
+    driver.refresh(memoryview(frame), 2, 3, 12)
+    changed = driver.checksum
+    assert changed != blank
+
+    driver.refresh(FrameBufferSpecial.DUPE, 2, 3, 12)
+    assert driver.checksum == changed
+
+
+@pytest.mark.parametrize("rows", [0, -1])
+def test_invalid_checksum_rows(rows: int) -> None:
+    with pytest.raises(ValueError):
+        NullVideoDriver(checksum_rows=rows)
+
+
+@pytest.mark.parametrize("rotation", list(Rotation))
+@pytest.mark.parametrize("pixel_format", list(PixelFormat))
+def test_accepts_every_format_and_rotation(pixel_format: PixelFormat, rotation: Rotation) -> None:
+    driver = NullVideoDriver(checksum_rows=1)
+    driver.pixel_format = pixel_format
+    driver.rotation = rotation
+    pitch = 4 * pixel_format.bytes_per_pixel
+    driver.refresh(_frame(4, pitch, 0x5A), 4, 4, pitch)
+
+    assert driver.pixel_format == pixel_format
+    assert driver.rotation == rotation
+    assert driver.checksum is not None
+    assert not driver.needs_reinit
+
+
+def test_records_geometry_changes() -> None:
+    driver = NullVideoDriver()
+    with pytest.raises(RuntimeError):
+        driver.geometry = retro_game_geometry(320, 240, 320, 240, 4 / 3)
+
+    driver.system_av_info = retro_system_av_info(retro_game_geometry(320, 240, 640, 480, 4 / 3))
+    driver.geometry = retro_game_geometry(640, 480, 0, 0, 4 / 3)
+
+    (change,) = driver.geometry_changes
+    assert (change.base_width, change.base_height) == (640, 480)
+    geometry = driver.geometry
+    assert geometry is not None
+    assert (geometry.base_width, geometry.max_width) == (640, 640)
@@ -0,0 +1,214 @@
+"""Unit tests for :class:`~libretro.drivers.PacingTimingDriver`."""
+
+from __future__ import annotations
+
+import pytest
+
+from libretro.api import (
+    ThrottleMode,
+    retro_fastforwarding_override,
+    retro_frame_time_callback,
+    retro_system_av_info,
+    retro_throttle_state,
+)
+from libretro.api.timing import retro_frame_time_callback_t
+from libretro.drivers import DefaultTimingDriver, PacingTimingDriver, TimingDriver
+
+
+class _Clock:
+    """A fake nanosecond clock that only advances when slept on or spun."""
+
+    def __init__(self, spin_step: int = 1000):
+        self.now = 0
+        self.sleeps: list[float] = []
+        self.spin_step = spin_step
+
+    def __call__(self) -> int:
+        now = self.now
+        self.now += self.spin_step
+        return now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += round(seconds * 1_000_000_000)
+
+
+class _Core:
+    def __init__(self, reference: int = 10_000):
+        self.times: list[int] = []
+        self.callback = retro_frame_time_callback(
+            retro_frame_time_callback_t(self.times.append), reference
+        )
+
+
+def _driver(
+    clock: _Clock,
+    fps: float | None = 100.0,
+    *,
+    mode: ThrottleMode = ThrottleMode.NONE,
+    fastforward_ratio: float = 0.0,
+    slowmotion_ratio: float = 3.0,
+) -> PacingTimingDriver:
+    return PacingTimingDriver(
+        fps,
+        mode=mode,
+        fastforward_ratio=fastforward_ratio,
+        slowmotion_ratio=slowmotion_ratio,
+        spin=0.001,
+        clock=clock,
+        sleep=clock.sleep,
+    )
+
+
+def test_paces_to_fps_and_reports_elapsed_time() -> None:
+    clock = _Clock()
+    driver = _driver(clock)
+    assert isinstance(driver, TimingDriver)
+    core = _Core()
+    driver.frame_time_callback = core.callback
+
+    for _ in range(4):
+        driver.frame_time(None)
+
+    # The first frame reports the reference time; later ones are 10ms apart
+    assert core.times[0] == 10_000
+    assert all(10_000 <= t < 10_100 for t in core.times[1:])
+    assert len(clock.sleeps) == 3
+    assert all(0.0085 < s < 0.0095 for s in clock.sleeps)
+    assert driver.elapsed == core.times[-1]
+
+
+def test_takes_fps_from_system_av_info() -> None:
+    clock = _Clock()
+    driver = _driver(clock, fps=None)
+    assert driver.fps is None
+    assert driver.rate == 0.0
+
+    info = retro_system_av_info()
+    info.timing.fps = 50.0
+    driver.system_av_info = info
+    assert driver.fps == 50.0
+    assert driver.throttle_state.rate == 50.0
+
+
+def test_system_av_info_is_optional_for_timing_drivers() -> None:
+    info = retro_system_av_info()
+    info.timing.fps = 50.0
+    driver = DefaultTimingDriver()
+    driver.system_av_info = info
+
+    assert driver.system_av_info is None
+
+
+def test_slow_frames_do_not_cause_a_burst() -> None:
+    clock = _Clock()
+    driver = _driver(clock)
+    driver.frame_time(None)
+    clock.now += 50_000_000  # A 50ms hitch
+    driver.frame_time(None)
+    assert clock.sleeps == []
+
+    driver.frame_time(None)
+    assert len(clock.sleeps) == 1
+
+
+@pytest.mark.parametrize(
+    ("mode", "rate"),
+    [
+        (ThrottleMode.NONE, 100.0),
+        (ThrottleMode.SLOW_MOTION, 50.0),
+        (ThrottleMode.FAST_FORWARD, 400.0),
+        (ThrottleMode.VSYNC, 60.0),
+        (ThrottleMode.UNBLOCKED, 0.0),
+        (ThrottleMode.FRAME_STEPPING, 0.0),
+    ],
+)
+def test_throttle_modes(mode: ThrottleMode, rate: float) -> None:
+    driver = _driver(_Clock(), fastforward_ratio=4.0, slowmotion_ratio=2.0)
+    driver.throttle_state = retro_throttle_state(mode, 0.0)
+
+    assert driver.mode == mode
+    assert driver.rate == rate
+    assert driver.throttle_state.mode == mode
+    assert driver.throttle_state.rate == rate
+
+    del driver.throttle_state
+    assert driver.mode == ThrottleMode.NONE
+
+
+def test_unpaced_modes_report_reference_time() -> None:
+    clock = _Clock()
+    driver = _driver(clock, mode=ThrottleMode.UNBLOCKED)
+    core = _Core()
+    driver.frame_time_callback = core.callback
+    for _ in range(3):
+        driver.frame_time(None)
+
+    assert core.times == [10_000] * 3
+    assert clock.sleeps == []
+
+
+def test_slow_motion_scales_reported_time() -> None:
+    clock = _Clock()
+    driver = _driver(clock, mode=ThrottleMode.SLOW_MOTION, slowmotion_ratio=2.0)
+    core = _Core()
+    driver.frame_time_callback = core.callback
+    driver.frame_time(None)
+    driver.frame_time(None)
+
+    # Frames are 20ms apart, but the core is told 10ms have passed
+    assert 10_000 <= core.times[1] < 10_100
+
+
+def test_fastforwarding_override() -> None:
+    driver = _driver(_Clock(), fastforward_ratio=4.0)
+
+    driver.fastforwarding_override = retro_fastforwarding_override(2.0, True, False, False)
+    assert driver.effective_mode == ThrottleMode.FAST_FORWARD
+    assert driver.rate == 200.0
+
+    driver.fastforwarding_override = retro_fastforwarding_override(-1.0, True, False, False)
+    assert driver.rate == 400.0
+
+    driver.fastforwarding_override = retro_fastforwarding_override(0.0, True, False, False)
+    assert driver.rate == 0.0
+
+    driver.mode = ThrottleMode.FAST_FORWARD
+    driver.fastforwarding_override = retro_fastforwarding_override(0.0, False, False, True)
+    assert driver.effective_mode == ThrottleMode.NONE
+
+    driver.fastforwarding_override = retro_fastforwarding_override(0.0, False, False, False)
+    assert driver.effective_mode == ThrottleMode.FAST_FORWARD
+
+
+def test_reset_reports_reference_time() -> None:
+    clock = _Clock()
+    driver = _driver(clock)
+    core = _Core()
+    driver.frame_time_callback = core.callback
+    driver.frame_time(None)
+    clock.now += 1_000_000_000
+    driver.reset()
+    driver.frame_time(None)
+
+    assert core.times == [10_000, 10_000]
+
+
+def test_explicit_time_is_passed_through() -> None:
+    driver = _driver(_Clock())
+    core = _Core()
+    driver.frame_time_callback = core.callback
+    driver.frame_time(1234)
+
+    assert core.times == [1234]
+
+
+def test_rejects_invalid_arguments() -> None:
+    with pytest.raises(ValueError):
+        PacingTimingDriver(0.0)
+
+    with pytest.raises(ValueError):
+        PacingTimingDriver(slowmotion_ratio=0.0)
+
+    with pytest.raises(ValueError):
+        PacingTimingDriver(spin=-1.0)
@@ -0,0 +1,103 @@
+"""Unit tests for :class:`~libretro.drivers.QueuedLogDriver`."""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import Iterator
+from typing import override
+
+import pytest
+
+from libretro.api import LogLevel
+from libretro.drivers import LogDriver, QueuedLogDriver
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self, block: threading.Event | None = None):
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+        self.block = block
+
+    @override
+    def emit(self, record: logging.LogRecord) -> None:
+        if self.block is not None:
+            self.block.wait()
+        self.records.append(record)
+
+
+@pytest.fixture
+def logger(request: pytest.FixtureRequest) -> Iterator[logging.Logger]:
+    logger = logging.getLogger(f"libretro.test.{request.function.__name__}")
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    yield logger
+    logger.handlers.clear()
+
+
+def test_forwards_decoded_messages(logger: logging.Logger) -> None:
+    handler = _ListHandler()
+    logger.addHandler(handler)
+    with QueuedLogDriver(logger) as driver:
+        assert isinstance(driver, LogDriver)
+        driver.log(LogLevel.INFO, b"hello\n")
+        driver.log(LogLevel.ERROR, b"bad \xff byte")
+        driver.flush()
+        assert [(r.levelno, r.getMessage()) for r in handler.records] == [
+            (logging.INFO, "hello"),
+            (logging.ERROR, "bad � byte"),
+        ]
+        assert handler.records[0].threadName != threading.current_thread().name
+
+
+def test_filters_by_level_before_queueing(logger: logging.Logger) -> None:
+    handler = _ListHandler()
+    logger.addHandler(handler)
+    with QueuedLogDriver(logger, level=LogLevel.WARNING) as driver:
+        driver.log(LogLevel.DEBUG, b"quiet")
+        driver.log(LogLevel.WARNING, b"loud")
+        driver.level = LogLevel.DEBUG
+        driver.log(LogLevel.DEBUG, b"now loud")
+
+    assert [r.getMessage() for r in handler.records] == ["loud", "now loud"]
+
+
+def test_full_queue_drops_oldest(logger: logging.Logger) -> None:
+    release = threading.Event()
+    handler = _ListHandler(release)
+    logger.addHandler(handler)
+    driver = QueuedLogDriver(logger, capacity=2)
+
+    driver.log(LogLevel.INFO, b"0")
+    while driver._queue.qsize():  # pyright: ignore[reportPrivateUsage]
+        pass  # Wait for the listener to take "0" and block on it
+
+    for i in range(1, 6):
+        driver.log(LogLevel.INFO, str(i).encode())
+
+    assert driver.dropped == 3
+    release.set()
+    driver.flush()
+    driver.close()
+
+    assert [r.getMessage() for r in handler.records] == ["0", "4", "5"]
+
+
+def test_close_flushes_and_discards_later_messages(logger: logging.Logger) -> None:
+    handler = _ListHandler()
+    logger.addHandler(handler)
+    driver = QueuedLogDriver(logger)
+    for i in range(100):
+        driver.log(LogLevel.DEBUG, b"%d" % i)
+
+    driver.close()
+    assert len(handler.records) == 100
+
+    driver.log(LogLevel.ERROR, b"late")
+    driver.close()
+    assert len(handler.records) == 100
+
+
+def test_invalid_capacity() -> None:
+    with pytest.raises(ValueError):
+        QueuedLogDriver(logging.getLogger("libretro.test"), capacity=0)
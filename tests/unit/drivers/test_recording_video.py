@@ -0,0 +1,206 @@
+"""Unit tests for :class:`~libretro.drivers.RecordingVideoDriver`."""
+
+from __future__ import annotations
+
+import io
+import threading
+import wave
+from fractions import Fraction
+from pathlib import Path
+from typing import override
+
+import pytest
+
+pytest.importorskip("numpy")
+
+import numpy as np  # noqa: E402
+
+from libretro.api import PixelFormat  # noqa: E402
+from libretro.api.av import (  # noqa: E402
+    retro_game_geometry,
+    retro_system_av_info,
+    retro_system_timing,
+)
+from libretro.drivers import (  # noqa: E402
+    AudioDriver,
+    FrameBufferSpecial,
+    FrameSink,
+    RecordingVideoDriver,
+    RgbFrame,
+    VideoDriver,
+    frame_to_rgb,
+)
+
+
+class _ListSink(FrameSink):
+    def __init__(self, block: threading.Event | None = None):
+        self.opened: tuple[int, int, Fraction] | None = None
+        self.frames: list[RgbFrame] = []
+        self.closed = False
+        self.block = block
+
+    @override
+    def open(self, width: int, height: int, fps: Fraction) -> None:
+        self.opened = (width, height, fps)
+
+    @override
+    def write(self, frame: RgbFrame) -> None:
+        if self.block is not None:
+            self.block.wait()
+        self.frames.append(frame)
+
+    @override
+    def close(self) -> None:
+        self.closed = True
+
+
+def _av_info(width: int, height: int) -> retro_system_av_info:
+    return retro_system_av_info(
+        retro_game_geometry(width, height, width, height, 0.0),
+        retro_system_timing(60.0, 32000.0),
+    )
+
+
+def _xrgb(pixels: list[tuple[int, int, int]], pitch: int) -> memoryview:
+    row = b"".join(bytes((b, g, r, 0)) for r, g, b in pixels)
+    return memoryview(row.ljust(pitch, b"\xee"))
+
+
+@pytest.mark.parametrize(
+    ("pixel_format", "pixel", "expected"),
+    [
+        (PixelFormat.XRGB8888, bytes((0x30, 0x20, 0x10, 0xFF)), [0x10, 0x20, 0x30]),
+        (PixelFormat.RGB565, (0xF800 | 0x07E0).to_bytes(2, "little"), [255, 255, 0]),
+        (PixelFormat.RGB1555, 0x001F.to_bytes(2, "little"), [0, 0, 255]),
+        (None, bytes((1, 2, 3, 4)), [1, 2, 3]),
+    ],
+)
+def test_frame_to_rgb(pixel_format: PixelFormat | None, pixel: bytes, expected: list[int]) -> None:
+    pitch = len(pixel) * 2 + 4  # Two pixels plus padding
+    data = (pixel * 2).ljust(pitch, b"\xaa") * 2
+    rgb = frame_to_rgb(data, 2, 2, pitch, pixel_format)
+    assert rgb.shape == (2, 2, 3)
+    assert rgb.tolist() == [[expected] * 2] * 2
+
+
+def test_records_frames_and_dupes() -> None:
+    sink = _ListSink()
+    driver = RecordingVideoDriver(sink)
+    assert isinstance(driver, VideoDriver)
+    driver.system_av_info = _av_info(2, 1)
+    driver.pixel_format = PixelFormat.XRGB8888
+
+    driver.refresh(_xrgb([(255, 0, 0), (0, 255, 0)], 12), 2, 1, 12)
+    driver.refresh(FrameBufferSpecial.DUPE, 2, 1, 12)
+    driver.refresh(_xrgb([(0, 0, 255), (1, 2, 3)], 8), 2, 1, 8)
+    driver.close()
+
+    assert driver.frames == 3
+    assert sink.opened == (2, 1, Fraction(60))
+    assert sink.closed
+    assert [f.tolist() for f in sink.frames] == [
+        [[[255, 0, 0], [0, 255, 0]]],
+        [[[255, 0, 0], [0, 255, 0]]],
+        [[[0, 0, 255], [1, 2, 3]]],
+    ]
+
+    with pytest.raises(RuntimeError):
+        driver.refresh(FrameBufferSpecial.DUPE, 2, 1, 8)
+
+
+def test_resized_frames_are_fitted_to_the_first() -> None:
+    sink = _ListSink()
+    driver = RecordingVideoDriver(sink)
+    driver.pixel_format = PixelFormat.XRGB8888
+
+    driver.refresh(_xrgb([(9, 9, 9)] * 2, 8), 2, 1, 8)
+    driver.refresh(memoryview(_xrgb([(5, 5, 5)], 4).tobytes() * 2), 1, 2, 4)
+    driver.close()
+
+    assert sink.frames[1].tolist() == [[[5, 5, 5], [0, 0, 0]]]
+
+
+def test_writes_y4m(tmp_path: Path) -> None:
+    path = tmp_path / "out.y4m"
+    driver = RecordingVideoDriver(path)
+    driver.system_av_info = _av_info(2, 1)
+    driver.pixel_format = PixelFormat.XRGB8888
+    driver.refresh(_xrgb([(255, 255, 255), (0, 0, 0)], 8), 2, 1, 8)
+    driver.close()
+
+    header = b"YUV4MPEG2 W2 H1 F60:1 Ip A1:1 C444\n"
+    assert path.read_bytes() == header + b"FRAME\n" + bytes((235, 16, 128, 128, 128, 128))
+
+
+def test_writes_raw_video(tmp_path: Path) -> None:
+    path = tmp_path / "out.rgb"
+    driver = RecordingVideoDriver(path)
+    driver.pixel_format = PixelFormat.XRGB8888
+    driver.refresh(_xrgb([(1, 2, 3), (4, 5, 6)], 8), 2, 1, 8)
+    driver.refresh(FrameBufferSpecial.DUPE, 2, 1, 8)
+    driver.close()
+
+    assert path.read_bytes() == bytes((1, 2, 3, 4, 5, 6)) * 2
+
+
+def test_audio_is_written_with_each_frame() -> None:
+    sink = _ListSink()
+    audio_out = io.BytesIO()
+    driver = RecordingVideoDriver(sink, audio=audio_out)
+    assert isinstance(driver.audio, AudioDriver)
+    driver.system_av_info = _av_info(1, 1)
+    driver.pixel_format = PixelFormat.XRGB8888
+
+    driver.audio.sample(1, -1)
+    driver.audio.sample_batch(memoryview(np.array([2, -2, 3, -3], np.int16).tobytes()))
+    driver.refresh(_xrgb([(0, 0, 0)], 4), 1, 1, 4)
+    driver.audio.sample(4, -4)
+    driver.close()
+
+    audio_out.seek(0)
+    with wave.open(audio_out, "rb") as wav:
+        assert wav.getnchannels() == 2
+        assert wav.getframerate() == 32000
+        samples = np.frombuffer(wav.readframes(wav.getnframes()), np.int16)
+
+    assert samples.tolist() == [1, -1, 2, -2, 3, -3, 4, -4]
+
+
+def test_refresh_blocks_when_queue_is_full() -> None:
+    release = threading.Event()
+    sink = _ListSink(release)
+    driver = RecordingVideoDriver(sink, queue_size=1)
+    driver.pixel_format = PixelFormat.XRGB8888
+    frame = _xrgb([(0, 0, 0)], 4)
+
+    driver.refresh(frame, 1, 1, 4)  # Taken by the worker, which blocks in write()
+    driver.refresh(FrameBufferSpecial.DUPE, 1, 1, 4)  # Fills the queue
+
+    third = threading.Thread(target=driver.refresh, args=(FrameBufferSpecial.DUPE, 1, 1, 4))
+    third.start()
+    third.join(0.2)
+    assert third.is_alive()
+
+    release.set()
+    third.join()
+    driver.close()
+    assert len(sink.frames) == 3
+
+
+def test_worker_errors_are_raised() -> None:
+    class _FailingSink(_ListSink):
+        @override
+        def write(self, frame: RgbFrame) -> None:  # noqa: ARG002
+            raise OSError("disk full")
+
+    driver = RecordingVideoDriver(_FailingSink())
+    driver.pixel_format = PixelFormat.XRGB8888
+    driver.refresh(_xrgb([(0, 0, 0)], 4), 1, 1, 4)
+
+    with pytest.raises(OSError, match="disk full"):
+        driver.close()
+
+
+def test_invalid_queue_size() -> None:
+    with pytest.raises(ValueError):
+        RecordingVideoDriver(_ListSink(), queue_size=0)
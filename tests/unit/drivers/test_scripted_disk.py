@@ -0,0 +1,162 @@
+"""Unit tests for :class:`~libretro.drivers.ScriptedDiskDriver`."""
+
+from __future__ import annotations
+
+from ctypes import string_at
+from pathlib import Path
+
+import pytest
+
+from libretro.api.content import retro_game_info
+from libretro.api.disk import (
+    retro_add_image_index_t,
+    retro_disk_control_callback,
+    retro_disk_control_ext_callback,
+    retro_get_eject_state_t,
+    retro_get_image_index_t,
+    retro_get_num_images_t,
+    retro_replace_image_index_t,
+    retro_set_eject_state_t,
+    retro_set_image_index_t,
+)
+from libretro.ctypes import TypedPointer
+from libretro.drivers import DiskDriver, ScriptedDiskDriver, read_m3u
+from libretro.drivers.types import Pollable
+from libretro.error import UnsupportedEnvCall
+
+
+class _Core:
+    """Core-side disk state, exposed through a disk-control callback."""
+
+    def __init__(self, images: list[bytes | None]):
+        self.images = images
+        self.index = 0
+        self.tray_open = False
+        self.log: list[str] = []
+        self.callback = retro_disk_control_ext_callback(
+            set_eject_state=retro_set_eject_state_t(self._set_eject_state),
+            get_eject_state=retro_get_eject_state_t(lambda: self.tray_open),
+            get_image_index=retro_get_image_index_t(lambda: self.index),
+            set_image_index=retro_set_image_index_t(self._set_image_index),
+            get_num_images=retro_get_num_images_t(lambda: len(self.images)),
+            replace_image_index=retro_replace_image_index_t(self._replace_image_index),
+            add_image_index=retro_add_image_index_t(self._add_image_index),
+        )
+
+    def _set_eject_state(self, ejected: bool) -> bool:
+        self.tray_open = ejected
+        self.log.append("open" if ejected else "close")
+        return True
+
+    def _set_image_index(self, index: int) -> bool:
+        if not self.tray_open:
+            return False
+
+        self.index = index
+        self.log.append(f"select {index}")
+        return True
+
+    def _add_image_index(self) -> bool:
+        self.images.append(None)
+        return True
+
+    def _replace_image_index(self, index: int, info: TypedPointer[retro_game_info]) -> bool:
+        game = info[0]
+        assert game.path is not None
+        data = string_at(game.data.value, game.size) if game.data and game.data.value else b""
+        self.images[index] = Path(game.path.decode()).name.encode() + b":" + data
+        return True
+
+
+@pytest.fixture
+def discs(tmp_path: Path) -> Path:
+    for i in range(3):
+        (tmp_path / f"disc{i}.bin").write_bytes(b"DISC%d" % i)
+
+    playlist = tmp_path / "game.m3u"
+    playlist.write_text("# Multi-disc game\ndisc0.bin\n\ndisc1.bin|Disc 2\ndisc2.bin\n")
+    return playlist
+
+
+def test_reads_m3u(discs: Path) -> None:
+    assert read_m3u(discs) == [discs.parent / f"disc{i}.bin" for i in range(3)]
+
+    with ScriptedDiskDriver(discs) as driver:
+        assert isinstance(driver, DiskDriver)
+        assert isinstance(driver, Pollable)
+        assert driver.images == tuple(read_m3u(discs))
+
+
+def test_callback_versions(discs: Path) -> None:
+    with ScriptedDiskDriver(discs) as driver:
+        assert driver.version == 0
+        with pytest.raises(UnsupportedEnvCall):
+            _ = driver.eject_state
+
+        driver.callback = retro_disk_control_callback()
+        assert driver.version == 1
+        driver.callback = _Core([b"0"]).callback
+        assert driver.version == 2
+        del driver.callback
+        assert driver.callback is None
+
+
+def test_swaps_on_scripted_frames(discs: Path) -> None:
+    core = _Core([b"0", b"1"])
+    with ScriptedDiskDriver(discs, swaps={2: None, 4: 1, 5: 0}) as driver:
+        driver.callback = core.callback
+        for _ in range(4):
+            driver.poll()
+
+        assert core.log == ["open"]
+        assert driver.eject_state
+
+        driver.poll()
+        assert core.log == ["open", "select 1", "close"]
+        assert driver.index == 1
+
+        driver.poll()
+        assert core.log[3:] == ["open", "select 0", "close"]
+        assert driver.frame == 6
+
+
+def test_appends_premapped_images(discs: Path) -> None:
+    core = _Core([b"0"])
+    with ScriptedDiskDriver(discs) as driver:
+        driver.callback = core.callback
+        driver.insert(2)
+
+        assert driver.num_images == 3
+        assert core.images[1:] == [b"disc1.bin:DISC1", b"disc2.bin:DISC2"]
+        assert core.index == 2
+        assert not core.tray_open
+
+        with pytest.raises(IndexError):
+            driver.insert(3)
+
+
+def test_appends_paths_without_premap(discs: Path) -> None:
+    core = _Core([b"0"])
+    driver = ScriptedDiskDriver(discs, premap=False)
+    driver.callback = core.callback
+    driver.insert(1)
+
+    assert core.images[1] == b"disc1.bin:"
+
+
+def test_refused_swap_raises(discs: Path) -> None:
+    core = _Core([b"0", b"1"])
+
+    def _refuse(ejected: bool) -> bool:  # noqa: ARG001
+        return False
+
+    core.callback.set_eject_state = retro_set_eject_state_t(_refuse)
+    with ScriptedDiskDriver(discs, swaps={0: 1}) as driver:
+        driver.callback = core.callback
+        with pytest.raises(RuntimeError):
+            driver.poll()
+
+
+def test_missing_image_fails_early(tmp_path: Path) -> None:
+    with pytest.raises(OSError):
+        ScriptedDiskDriver([tmp_path / "missing.bin"])
@@ -0,0 +1,159 @@
+"""Unit tests for :class:`~libretro.drivers.SensorArray` replay through :class:`~libretro.drivers.IterableSensorDriver`."""
+
+from __future__ import annotations
+
+from array import array
+from pathlib import Path
+
+import pytest
+
+from libretro.api import Sensor, SensorAction
+from libretro.api.input.device import Port
+from libretro.drivers import (
+    SENSOR_COUNT,
+    IterableSensorDriver,
+    PortInput,
+    SensorArray,
+)
+
+
+def _readings(frames: int, ports: int) -> array[float]:
+    # Each reading encodes its own frame, port, and sensor
+    return array(
+        "f",
+        (
+            f * 100 + p * 10 + s
+            for f in range(frames)
+            for p in range(ports)
+            for s in range(SENSOR_COUNT)
+        ),
+    )
+
+
+def _enable_all(driver: IterableSensorDriver, port: Port) -> None:
+    for action in (
+        SensorAction.ACCELEROMETER_ENABLE,
+        SensorAction.GYROSCOPE_ENABLE,
+        SensorAction.ILLUMINANCE_ENABLE,
+    ):
+        assert driver.set_sensor_state(port, action, 60)
+
+
+def test_poll_advances_one_frame() -> None:
+    driver = IterableSensorDriver(SensorArray(_readings(3, 2), ports=2))
+    _enable_all(driver, Port(0))
+    _enable_all(driver, Port(1))
+
+    assert driver.get_sensor_input(Port(0), Sensor.ACCELEROMETER_X) == 0.0  # Not polled yet
+
+    driver.poll()
+    assert driver.get_sensor_input(Port(0), Sensor.GYROSCOPE_Y) == 4.0
+    assert driver.get_sensor_input(Port(1), Sensor.ILLUMINANCE) == 16.0
+
+    driver.poll()
+    driver.poll()
+    assert driver.get_sensor_input(Port(1), Sensor.ACCELEROMETER_Z) == 212.0
+
+    driver.poll()  # Past the end
+    assert driver.get_sensor_input(Port(1), Sensor.ACCELEROMETER_Z) == 0.0
+
+
+def test_disabled_sensors_and_extra_ports_read_zero() -> None:
+    driver = IterableSensorDriver(SensorArray(_readings(1, 1), ports=1))
+    driver.poll()
+
+    assert driver.get_sensor_input(Port(0), Sensor.GYROSCOPE_X) == 0.0
+
+    assert driver.set_sensor_state(Port(0), SensorAction.GYROSCOPE_ENABLE, 0)
+    assert driver.get_sensor_input(Port(0), Sensor.GYROSCOPE_X) == 3.0
+    assert driver.get_sensor_input(Port(0), Sensor.ACCELEROMETER_X) == 0.0
+    assert driver.get_sensor_input(Port(1), Sensor.GYROSCOPE_X) == 0.0
+
+    assert driver.set_sensor_state(Port(0), SensorAction.GYROSCOPE_DISABLE, 0)
+    assert driver.get_sensor_input(Port(0), Sensor.GYROSCOPE_X) == 0.0
+
+
+def test_matches_iterable_source() -> None:
+    inputs: list[PortInput | float] = [PortInput(illuminance=3.0), 2.5]
+    flat = array(
+        "d",
+        (r[s] if isinstance(r, PortInput) else r for r in inputs for s in Sensor),
+    )
+
+    expected = IterableSensorDriver(inputs)
+    actual = IterableSensorDriver(SensorArray(flat, ports=1))
+    for driver in (expected, actual):
+        _enable_all(driver, Port(0))
+
+    for _ in inputs:
+        expected.poll()
+        actual.poll()
+        for sensor in Sensor:
+            assert actual.get_sensor_input(Port(0), sensor) == expected.get_sensor_input(
+                Port(0), sensor
+            )
+
+
+def test_three_dimensional_buffer_sets_ports() -> None:
+    np = pytest.importorskip("numpy")
+    readings = np.arange(2 * 3 * SENSOR_COUNT, dtype=np.float32).reshape(2, 3, SENSOR_COUNT)
+    source = SensorArray(readings)
+
+    assert len(source) == 2
+    assert source.ports == 3
+    assert source[1, 2, Sensor.ILLUMINANCE] == readings[1, 2, 6]
+
+
+def test_from_file(tmp_path: Path) -> None:
+    path = tmp_path / "sensors.bin"
+    path.write_bytes(_readings(4, 1).tobytes())
+
+    source = SensorArray.from_file(path)
+    try:
+        assert len(source) == 4
+        assert source[3, 0, Sensor.GYROSCOPE_Z] == 305.0
+    finally:
+        source.close()
+
+
+@pytest.mark.parametrize(
+    ("readings", "ports"),
+    [
+        (array("f", [0.0] * 10), 1),  # Not a whole frame
+        (array("i", [0] * 7), 1),  # Not floating-point
+        (array("f", [0.0] * 7), 0),
+        (memoryview(array("f", [0.0] * 14))[::2], 1),  # Not contiguous
+    ],
+)
+def test_invalid_readings_raise(readings: memoryview | array[float], ports: int) -> None:
+    with pytest.raises(ValueError):
+        SensorArray(readings, ports=ports)
+
+
+def test_empty_readings_raise() -> None:
+    np = pytest.importorskip("numpy")
+
+    with pytest.raises(ValueError):
+        SensorArray(np.zeros((0, 1, SENSOR_COUNT), np.float32))
+
+    with pytest.raises(ValueError):
+        SensorArray(array("f"), ports=1)
+
+
+@pytest.mark.parametrize(
+    ("data", "ports"),
+    [
+        (b"\0" * 10, 1),  # Truncated mid-frame
+        (_readings(2, 1).tobytes()[:-4], 1),  # Missing the last reading
+        (b"", 1),
+        (_readings(2, 1).tobytes(), 0),
+    ],
+)
+def test_from_file_rejects_malformed_files(tmp_path: Path, data: bytes, ports: int) -> None:
+    path = tmp_path / "sensors.bin"
+    path.write_bytes(data)
+
+    with pytest.raises(ValueError) as excinfo:
+        SensorArray.from_file(path, ports=ports)
+
+    assert excinfo.value.__context__ is None
@@ -0,0 +1,145 @@
+"""Unit tests for :class:`~libretro.drivers.VirtualClock` and the drivers that share it."""
+
+from __future__ import annotations
+
+import pytest
+
+from libretro.api import (
+    ThrottleMode,
+    retro_frame_time_callback,
+    retro_system_av_info,
+)
+from libretro.api.location import retro_location_lifetime_status_t
+from libretro.api.timing import retro_frame_time_callback_t
+from libretro.drivers import (
+    DefaultPerfDriver,
+    LocationDriver,
+    Position,
+    TimingDriver,
+    VirtualClock,
+    VirtualLocationDriver,
+    VirtualTimingDriver,
+)
+
+
+def test_clock_only_moves_forward() -> None:
+    clock = VirtualClock(5_000)
+    assert clock() == clock.ns == 5_000
+    assert clock.usec == 5
+
+    clock.advance(0)
+    assert clock.ns == 5_000
+
+    with pytest.raises(ValueError):
+        clock.advance(-1)
+
+    with pytest.raises(ValueError):
+        VirtualClock(-1)
+
+
+def test_timing_advances_one_frame_per_call() -> None:
+    clock = VirtualClock()
+    timing = VirtualTimingDriver(clock)
+    assert isinstance(timing, TimingDriver)
+    times: list[int] = []
+    timing.frame_time_callback = retro_frame_time_callback(
+        retro_frame_time_callback_t(times.append), 16_667
+    )
+
+    info = retro_system_av_info()
+    info.timing.fps = 50.0
+    timing.system_av_info = info
+    for _ in range(4):
+        timing.frame_time(None)
+
+    assert clock.ns == 80_000_000
+    assert times == [16_667, 20_000, 20_000, 20_000]
+    assert timing.throttle_state.mode == ThrottleMode.NONE
+    assert timing.throttle_state.rate == 50.0
+
+
+def test_timing_advances_by_nominal_period_when_unthrottled() -> None:
+    clock = VirtualClock()
+    timing = VirtualTimingDriver(clock, 100.0, mode=ThrottleMode.UNBLOCKED)
+    timing.frame_time(None)
+    assert clock.ns == 10_000_000
+
+    timing.mode = ThrottleMode.SLOW_MOTION
+    timing.frame_time(None)
+    assert clock.ns == 40_000_000
+
+    with pytest.raises(TypeError):
+        VirtualTimingDriver(0)  # type: ignore[arg-type]
+
+
+def test_perf_reads_clock() -> None:
+    clock = VirtualClock()
+    perf = DefaultPerfDriver(clock)
+    assert perf.clock is clock
+    clock.advance(1_234_567)
+
+    assert perf.get_time_usec() == 1_234
+    assert perf.get_perf_counter() == 1_234_567
+
+    with pytest.raises(TypeError):
+        DefaultPerfDriver(object())  # type: ignore[arg-type]
+
+
+_A = Position(0.0, 0.0, 1.0, 1.0)
+_B = Position(0.0, 0.001, 1.0, 1.0)  # About 111m east of _A
+_C = Position(0.0, 0.01, 1.0, 1.0)
+
+
+def test_location_follows_track() -> None:
+    clock = VirtualClock()
+    driver = VirtualLocationDriver(clock, [(2_000, _B), (0, _A)])
+    assert isinstance(driver, LocationDriver)
+    assert driver.get_position() is None
+
+    assert driver.start()
+    assert driver.get_position() == _A
+    clock.advance(2_000_000)
+    assert driver.get_position() == _B
+
+    driver.stop()
+    assert driver.get_position() is None
+
+
+def test_location_honors_interval_and_distance() -> None:
+    clock = VirtualClock()
+    driver = VirtualLocationDriver(clock, {0: _A, 1_000: _B, 2_000: _C})
+    driver.set_interval(3, 200)
+    assert driver.interval == (3, 200)
+    driver.start()
+
+    assert driver.get_position() == _A
+    clock.advance(1_000_000)
+    assert driver.get_position() == _A  # Too soon
+
+    clock.advance(2_000_000)
+    assert driver.get_position() == _C  # _B was skipped, and _C is far enough away
+
+
+def test_location_calls_lifetime_callbacks() -> None:
+    events: list[str] = []
+
+    def _initialized() -> None:
+        events.append("initialized")
+
+    def _deinitialized() -> None:
+        events.append("deinitialized")
+
+    driver = VirtualLocationDriver(VirtualClock(), {0: _A})
+    driver.initialized = retro_location_lifetime_status_t(_initialized)
+    driver.deinitialized = retro_location_lifetime_status_t(_deinitialized)
+    driver.start()
+    driver.start()
+    driver.stop()
+    driver.stop()
+
+    assert events == ["initialized", "deinitialized"]
+
+
+def test_location_rejects_duplicate_times() -> None:
+    with pytest.raises(ValueError):
+        VirtualLocationDriver(VirtualClock(), [(0, _A), (0, _B)])
@@ -0,0 +1,54 @@
+"""Unit tests for :mod:`libretro.memory.persist`."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING, cast
+
+from libretro.api import RETRO_MEMORY_SAVE_RAM
+from libretro.api._utils import buffers_equal
+from libretro.memory import SaveRamFile
+
+if TYPE_CHECKING:
+    from libretro.core import CoreInterface
+
+
+class _Core:
+    # Just enough of a core for SaveRamFile
+    def __init__(self, size: int):
+        self.ram = bytearray(size)
+
+    def get_memory(self, id: int) -> memoryview:
+        assert id == RETRO_MEMORY_SAVE_RAM
+        return memoryview(self.ram)
+
+
+def test_unchanged_frames_do_not_write(tmp_path: Path) -> None:
+    core = _Core(0x2000)
+    path = tmp_path / "game.srm"
+    core.ram[0x100] = 1
+
+    with SaveRamFile(cast("CoreInterface", core), path) as sram:
+        assert sram.flush(), "The first flush creates the file"
+        assert sram.writes == 1
+
+        for _ in range(60):
+            assert not sram.flush()
+
+        assert sram.writes == 1
+
+        core.ram[-1] = 2
+        assert sram.flush()
+        assert not sram.flush()
+        assert sram.writes == 2
+
+    assert path.read_bytes() == core.ram
+
+
+def test_buffers_equal() -> None:
+    a = bytearray(b"\x00\x01\x02\x03")
+
+    assert buffers_equal(a, bytearray(a))
+    assert buffers_equal(bytearray(), bytearray())
+    assert not buffers_equal(a, bytearray(b"\x00\x01\x02\x04"))
+    assert not buffers_equal(a, bytearray(b"\x00\x01\x02"))
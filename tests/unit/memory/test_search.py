@@ -0,0 +1,142 @@
+"""Unit tests for :mod:`libretro.memory.search`."""
+
+from __future__ import annotations
+
+from ctypes import addressof, c_uint8
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from libretro.api import retro_memory_descriptor  # noqa: E402
+from libretro.memory import ByteOrder, MemorySearch, SearchResult  # noqa: E402
+
+
+def test_equal_to_then_changed_narrows_to_single_address() -> None:
+    ram = bytearray(0x1000)
+    ram[0x10] = 3
+    ram[0x20] = 3
+    search = MemorySearch([(0x8000, ram)])
+
+    assert len(search) == 0x1000
+    assert search.equal_to(3) == 2
+
+    ram[0x20] = 2
+    assert search.decreased(by=1) == 1
+    assert search.results() == [SearchResult(0x8020, 2)]
+
+
+def test_increased_and_unchanged() -> None:
+    ram = bytearray(8)
+    search = MemorySearch([(0, ram)])
+
+    ram[1] = 5
+    ram[2] = 9
+    assert search.increased() == 2
+    assert search.addresses() == [1, 2]
+
+    ram[1] = 6
+    assert search.unchanged() == 1
+    assert search.addresses() == [2]
+
+
+def test_in_range_is_inclusive() -> None:
+    ram = bytearray(range(10))
+    search = MemorySearch([(0, ram)])
+
+    assert search.in_range(3, 5) == 3
+    assert search.addresses() == [3, 4, 5]
+
+
+@pytest.mark.parametrize("byteorder", ["little", "big"])
+def test_wide_values_respect_byteorder(byteorder: ByteOrder) -> None:
+    ram = bytearray(16)
+    ram[4:8] = (0x12345678).to_bytes(4, byteorder)
+    search = MemorySearch([(0x100, ram)], width=4, byteorder=byteorder)
+
+    assert len(search) == 4
+    assert search.equal_to(0x12345678) == 1
+    assert search.results() == [SearchResult(0x104, 0x12345678)]
+
+
+def test_unaligned_search_considers_every_byte() -> None:
+    ram = bytearray(8)
+    ram[3:5] = (0xBEEF).to_bytes(2, "little")
+
+    assert MemorySearch([(0, ram)], width=2).equal_to(0xBEEF) == 0
+
+    search = MemorySearch([(0, ram)], width=2, aligned=False)
+    assert len(search) == 7
+    assert search.equal_to(0xBEEF) == 1
+    assert search.addresses() == [3]
+
+
+def test_signed_values() -> None:
+    ram = bytearray(4)
+    ram[2] = 0xFF
+    search = MemorySearch([(0, ram)], signed=True)
+
+    assert search.equal_to(-1) == 1
+    assert search.results() == [SearchResult(2, -1)]
+
+
+def test_increased_by_does_not_wrap() -> None:
+    ram = bytearray([0xFF])
+    search = MemorySearch([(0, ram)])
+
+    ram[0] = 0
+    assert search.increased(by=1) == 0
+
+
+def test_multiple_regions_and_limit() -> None:
+    low = bytearray([1, 0, 1])
+    high = bytearray([1, 1])
+    search = MemorySearch([(0x0, low), (0x100, high)])
+
+    assert search.equal_to(1) == 4
+    assert search.addresses() == [0x0, 0x2, 0x100, 0x101]
+    assert [r.address for r in search.results(limit=3)] == [0x0, 0x2, 0x100]
+
+
+def test_reset_restores_candidates() -> None:
+    ram = bytearray(4)
+    search = MemorySearch([(0, ram)])
+
+    assert search.not_equal_to(0) == 0
+    search.reset()
+    assert len(search) == 4
+
+
+def test_snapshot_moves_comparison_point() -> None:
+    ram = bytearray(4)
+    search = MemorySearch([(0, ram)])
+
+    ram[0] = 1
+    search.snapshot()
+    assert search.changed() == 0
+
+
+@pytest.mark.parametrize("width", [0, 3, 8])
+def test_unsupported_width_raises(width: int) -> None:
+    with pytest.raises(ValueError):
+        MemorySearch([(0, bytearray(8))], width=width)  # pyright: ignore[reportArgumentType]
+
+
+def test_from_memory_map_honors_disconnect_and_mirrors() -> None:
+    disconnected = (c_uint8 * 0x100)()
+    mirrored = (c_uint8 * 0x2000)()
+    descriptors = [
+        # Offsets 0x80-0xFF skip address bit 7, so they live at 0x1100-0x117F
+        retro_memory_descriptor(
+            ptr=addressof(disconnected), start=0x1000, select=0xF000, disconnect=0x80, len=0x100
+        ),
+        # No length: fills (and mirrors across) 0x6000-0x7FFF
+        retro_memory_descriptor(ptr=addressof(mirrored), start=0x6000, select=0xE000),
+    ]
+    disconnected[0x90] = 7
+    mirrored[0x1234] = 7
+    search = MemorySearch.from_memory_map(descriptors)
+
+    assert len(search) == 0x100 + 0x2000
+    assert search.equal_to(7) == 2
+    assert search.addresses() == [0x1110, 0x7234]
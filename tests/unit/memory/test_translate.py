@@ -0,0 +1,180 @@
+"""Unit tests for :mod:`libretro.memory.translate`."""
+
+from __future__ import annotations
+
+from ctypes import Array, addressof, c_uint8
+
+import pytest
+
+from libretro.api import MemoryDescriptorFlag, retro_memory_descriptor
+from libretro.memory import AddressTranslator, translate
+
+
+def _desc(ram: Array[c_uint8], **kwargs: int) -> retro_memory_descriptor:
+    return retro_memory_descriptor(ptr=addressof(ram), len=len(ram), **kwargs)
+
+
+def test_resolve_simple_descriptor() -> None:
+    ram = (c_uint8 * 0x100)()
+    translator = AddressTranslator([_desc(ram, start=0x8000)])
+
+    resolved = translator.resolve(0x8010)
+    assert resolved is not None
+    assert resolved.offset == 0x10
+    assert resolved.pointer == addressof(ram) + 0x10
+    assert resolved.contiguous == 0xF0
+    assert translator.resolve(0x7FFF) is None
+    assert translator.resolve(0x8100) is None
+    assert 0x80FF in translator
+    assert 0x8100 not in translator
+
+
+def test_select_mirrors_region() -> None:
+    # 2 KiB of RAM mirrored four times across 0x0000-0x1FFF, as on the NES
+    ram = (c_uint8 * 0x800)()
+    translator = AddressTranslator([_desc(ram, start=0, select=0xE000)])
+
+    ram[0x123] = 0x42
+    assert translator.read_values([0x0123, 0x0923, 0x1123, 0x1923]) == [0x42] * 4
+    assert translator.resolve(0x2000) is None
+
+    resolved = translator.resolve(0x07FF)
+    assert resolved is not None
+    assert resolved.contiguous == 1, "The next byte is a mirror, so it isn't contiguous"
+
+
+def test_disconnect_removes_address_bits() -> None:
+    # Bit 0x100 is ignored, so 0x000-0x0FF and 0x200-0x2FF are consecutive in host memory
+    ram = (c_uint8 * 0x200)()
+    translator = AddressTranslator([_desc(ram, start=0, select=0xFC00, disconnect=0x100)])
+
+    ram[0x100] = 7
+    assert translator.read_values([0x200]) == [7]
+    assert translator.read_values([0x300]) == [7]
+
+
+def test_first_matching_descriptor_wins() -> None:
+    low = (c_uint8 * 0x100)()
+    high = (c_uint8 * 0x1000)()
+    low[0] = 1
+    high[0x100] = 2
+    translator = AddressTranslator([_desc(low, start=0x100), _desc(high, start=0)])
+
+    assert translator.read_values([0x100]) == [1]
+    assert translator.read_values([0x200]) == [0]
+    assert translator.read(0xFF, 2) == b"\x00\x01"
+
+
+def test_read_and_write_span_descriptors() -> None:
+    first = (c_uint8 * 0x100)()
+    second = (c_uint8 * 0x100)()
+    translator = AddressTranslator([_desc(first, start=0), _desc(second, start=0x100)])
+
+    translator.write(0xFE, b"\x01\x02\x03\x04")
+    assert bytes(first[0xFE:]) == b"\x01\x02"
+    assert bytes(second[:2]) == b"\x03\x04"
+    assert translator.read(0xFE, 4) == b"\x01\x02\x03\x04"
+
+
+def test_write_values_respects_bigendian_flag() -> None:
+    ram = (c_uint8 * 0x100)()
+    translator = AddressTranslator([_desc(ram, start=0, flags=MemoryDescriptorFlag.BIGENDIAN)])
+
+    translator.write_values({0x10: 0x1234, 0x20: 0x5678}, width=2)
+    assert bytes(ram[0x10:0x12]) == b"\x12\x34"
+    assert translator.read_values([0x10, 0x20], width=2) == [0x1234, 0x5678]
+    assert translator.read_values([0x10], width=2, byteorder="little") == [0x3412]
+
+
+def test_write_to_const_descriptor_raises() -> None:
+    ram = (c_uint8 * 0x100)()
+    translator = AddressTranslator([_desc(ram, start=0, flags=MemoryDescriptorFlag.CONST)])
+
+    with pytest.raises(ValueError):
+        translator.write(0, b"\x01")
+
+    assert ram[0] == 0
+
+
+def test_unmapped_read_raises() -> None:
+    ram = (c_uint8 * 0x100)()
+    translator = AddressTranslator([_desc(ram, start=0x100)])
+
+    with pytest.raises(ValueError):
+        translator.read(0xFF, 2)
+
+
+@pytest.mark.parametrize(
+    "desc",
+    [
+        retro_memory_descriptor(start=0, len=0x300),
+        retro_memory_descriptor(start=0x10, select=0xFF00, len=0x100),
+    ],
+)
+def test_invalid_descriptors_raise(desc: retro_memory_descriptor) -> None:
+    with pytest.raises(ValueError):
+        AddressTranslator([desc])
+
+
+def test_spans_cover_each_byte_once() -> None:
+    ram = (c_uint8 * 0x100)()
+    shadow = (c_uint8 * 0x10)()
+    translator = AddressTranslator(
+        [
+            _desc(shadow, start=0x1000, select=0xFFF0),
+            _desc(ram, start=0x1000, select=0xF000, disconnect=0x80),
+        ]
+    )
+
+    spans = [(address, r.offset, r.contiguous) for address, r in translator.spans()]
+    # The first descriptor hides the second's first 16 bytes,
+    # and the second's upper half skips address bit 7
+    assert spans == [(0x1000, 0, 0x10), (0x1010, 0x10, 0x70), (0x1100, 0x80, 0x80)]
+
+
+@pytest.mark.parametrize("vectorized", [True, False], ids=["numpy", "python"])
+@pytest.mark.parametrize("width", [1, 2, 3, 4])
+def test_bulk_values_group_by_descriptor(
+    monkeypatch: pytest.MonkeyPatch, vectorized: bool, width: int
+) -> None:
+    if vectorized:
+        pytest.importorskip("numpy")
+    monkeypatch.setattr(translate, "_HAS_NUMPY", vectorized)
+
+    little = (c_uint8 * 0x100)()
+    big = (c_uint8 * 0x100)()
+    translator = AddressTranslator(
+        [
+            _desc(little, start=0),
+            _desc(big, start=0x100, flags=MemoryDescriptorFlag.BIGENDIAN),
+        ]
+    )
+
+    # Interleaved across both descriptors, including one value that crosses between them
+    addresses = [0x10, 0x110, 0x100 - width + 1, 0x20, 0x120]
+    values = [(0x01 << (8 * (width - 1))) + i for i in range(len(addresses))]
+    translator.write_values(zip(addresses, values), width=width)
+
+    assert translator.read_values(addresses, width=width) == values
+    assert bytes(little[0x10 : 0x10 + width]) == values[0].to_bytes(width, "little")
+    assert bytes(big[0x10 : 0x10 + width]) == values[1].to_bytes(width, "big")
+    swapped = int.from_bytes(values[1].to_bytes(width, "big"), "little")
+    assert translator.read_values([0x110], width=width, byteorder="little") == [swapped]
+
+
+@pytest.mark.parametrize("vectorized", [True, False], ids=["numpy", "python"])
+def test_write_values_is_all_or_nothing(monkeypatch: pytest.MonkeyPatch, vectorized: bool) -> None:
+    if vectorized:
+        pytest.importorskip("numpy")
+    monkeypatch.setattr(translate, "_HAS_NUMPY", vectorized)
+
+    ram = (c_uint8 * 0x100)()
+    translator = AddressTranslator([_desc(ram, start=0)])
+
+    with pytest.raises(ValueError):
+        translator.write_values({0x10: 1, 0x200: 2})
+
+    with pytest.raises(OverflowError):
+        translator.write_values({0x10: 1, 0x20: 0x100})
+
+    assert not any(ram)
@@ -0,0 +1,95 @@
+"""Unit tests for :mod:`libretro.memory.watch`."""
+
+from __future__ import annotations
+
+from ctypes import Array, addressof, c_uint8
+
+import pytest
+
+from libretro.api import retro_memory_descriptor, retro_memory_map
+from libretro.memory import MemoryChange, MemoryWatcher
+
+
+def _make_map(ram: Array[c_uint8], start: int = 0x8000) -> retro_memory_map:
+    desc = retro_memory_descriptor(ptr=addressof(ram), start=start, len=len(ram))
+    return retro_memory_map([desc])
+
+
+def test_watch_address_reports_no_changes_when_memory_is_untouched() -> None:
+    ram = (c_uint8 * 0x100)()
+    watcher = MemoryWatcher(memory_map=_make_map(ram))
+    watcher.watch_address(0x8000, 0x100)
+
+    assert watcher.poll() == []
+    assert watcher.changes == []
+
+
+def test_watch_address_groups_contiguous_changes() -> None:
+    ram = (c_uint8 * 0x100)()
+    watcher = MemoryWatcher(memory_map=_make_map(ram))
+    watch = watcher.watch_address(0x8010, 0x20)
+
+    ram[0x12] = 1
+    ram[0x13] = 2
+    ram[0x20] = 3
+    ram[0x40] = 4  # outside the watched range
+
+    changes = watcher.poll()
+    assert [(c.address, c.offset, c.old, c.new) for c in changes] == [
+        (0x8012, 2, b"\x00\x00", b"\x01\x02"),
+        (0x8020, 0x10, b"\x00", b"\x03"),
+    ]
+    assert all(c.watch is watch for c in changes)
+
+    # The snapshot is replaced, so the same changes aren't reported twice
+    assert watcher.poll() == []
+
+
+def test_watch_callback_receives_each_change() -> None:
+    ram = (c_uint8 * 0x100)()
+    received: list[MemoryChange] = []
+    watcher = MemoryWatcher(memory_map=_make_map(ram))
+    watcher.watch_address(0x8000, 0x10, callback=received.append)
+
+    ram[0] = 0xFF
+    ram[5] = 0xFF
+    watcher.poll()
+
+    assert [c.address for c in received] == [0x8000, 0x8005]
+
+
+def test_reset_discards_pending_changes() -> None:
+    ram = (c_uint8 * 0x100)()
+    watcher = MemoryWatcher(memory_map=_make_map(ram))
+    watch = watcher.watch_address(0x8000, 4)
+
+    ram[1] = 7
+    watcher.reset()
+
+    assert watcher.poll() == []
+    assert watch.snapshot == b"\x00\x07\x00\x00"
+
+
+def test_unwatch_stops_reporting() -> None:
+    ram = (c_uint8 * 0x100)()
+    watcher = MemoryWatcher(memory_map=_make_map(ram))
+    watch = watcher.watch_address(0x8000, 4)
+    watcher.unwatch(watch)
+
+    ram[0] = 1
+    assert watcher.poll() == []
+    assert watcher.watches == ()
+
+
+@pytest.mark.parametrize(("address", "length"), [(0x7FFF, 2), (0x80FF, 2), (0x9000, 1)])
+def test_watch_address_outside_map_raises(address: int, length: int) -> None:
+    ram = (c_uint8 * 0x100)()
+    watcher = MemoryWatcher(memory_map=_make_map(ram))
+
+    with pytest.raises(ValueError):
+        watcher.watch_address(address, length)
+
+
+def test_watch_memory_without_core_raises() -> None:
+    with pytest.raises(RuntimeError):
+        MemoryWatcher().watch_memory(0)
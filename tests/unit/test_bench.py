@@ -0,0 +1,83 @@
+"""Unit tests for :mod:`libretro.bench`."""
+
+from __future__ import annotations
+
+import io
+
+import pytest
+
+from libretro.bench import BenchmarkReport, BenchmarkResult, format_report
+from libretro.drivers import CallbackStats
+
+
+def _report(*means: int) -> BenchmarkReport:
+    return BenchmarkReport(
+        [
+            BenchmarkResult(f"op{i}", "core", 10, mean * 10, mean * 2)
+            for i, mean in enumerate(means)
+        ],
+        {"python": "3.12"},
+    )
+
+
+def test_result_statistics() -> None:
+    stats = CallbackStats()
+    for elapsed in (100, 300, 200):
+        stats.add(elapsed)
+
+    result = BenchmarkResult.from_stats("serialize", "savestate_test", stats, nbytes=3000)
+
+    assert result.key == "savestate_test:serialize"
+    assert result.mean == 200
+    assert result.max == 300
+    assert result.rate == 5e6
+    assert result.throughput == 5e9
+    assert BenchmarkResult("frames", "core", 0, 0, 0).throughput is None
+
+
+def test_report_round_trips_through_json() -> None:
+    report = _report(100, 200)
+    file = io.StringIO()
+    report.write(file)
+    file.seek(0)
+
+    assert BenchmarkReport.read(file) == BenchmarkReport(list(report.results), report.metadata)
+
+
+def test_read_rejects_other_json() -> None:
+    with pytest.raises(ValueError):
+        BenchmarkReport.read(io.StringIO('{"results": [{"name": "frames"}]}'))
+
+
+def test_compare_matches_results_by_key() -> None:
+    baseline = _report(100, 200)
+    current = _report(150, 190, 50)
+
+    comparisons = current.compare(baseline)
+
+    assert [c.key for c in comparisons] == ["core:op0", "core:op1"]
+    assert comparisons[0].ratio == 1.5
+    assert comparisons[0].regressed()
+    assert not comparisons[1].regressed()
+    assert not comparisons[0].regressed(threshold=0.5)
+
+
+def test_default_metadata_describes_environment() -> None:
+    report = BenchmarkReport([])
+
+    assert {"libretro.py", "python", "platform", "timestamp"} <= report.metadata.keys()
+
+
+def test_format_report() -> None:
+    lines = format_report(_report(1000)).splitlines()
+
+    assert lines[0].split() == ["benchmark", "count", "mean", "us", "max", "us", "ops/s", "MB/s"]
+    assert lines[1].split() == ["core:op0", "10", "1.00", "2.00", "1000000"]
+
+
+def test_from_samples_keeps_percentiles() -> None:
+    result = BenchmarkResult.from_samples("frames", "core", [40, 10, 30, 20])
+
+    assert (result.count, result.total, result.max) == (4, 100, 40)
+    assert result.percentiles == {"p50": 20, "p90": 40, "p99": 40}
+    assert BenchmarkResult.from_samples("frames", "core", []).percentiles == {}
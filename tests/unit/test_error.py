@@ -0,0 +1,114 @@
+"""Unit tests for :mod:`libretro.error`."""
+
+from __future__ import annotations
+
+import pytest
+
+from libretro.error import (
+    CallbackException,
+    CallbackExceptionCollector,
+    CallbackExceptionGroup,
+    ExceptionSite,
+)
+
+
+def _raise(exception: Exception) -> Exception:
+    try:
+        raise exception
+    except Exception as e:
+        return e
+
+
+def _key_error(key: str) -> Exception:
+    try:
+        _ = dict[str, int]()[key]
+    except KeyError as e:
+        return e
+
+    raise AssertionError("unreachable")
+
+
+def test_site_is_innermost_frame() -> None:
+    site = ExceptionSite.of(_key_error("a"))
+
+    assert site.type is KeyError
+    assert site.filename == __file__
+    assert site.function == "_key_error"
+    assert ExceptionSite.of(_key_error("b")) == site
+    assert ExceptionSite.of(KeyError()).lineno == 0
+    assert str(site).startswith("KeyError at ")
+
+
+def test_deduplicates_by_site() -> None:
+    collector = CallbackExceptionCollector()
+    first = _key_error("a")
+    assert collector.add(first)
+    assert not collector.add(_key_error("b"))
+    assert collector.add(_raise(ValueError()))
+
+    assert collector.total == len(collector) == 3
+    assert list(collector.counts.values()) == [2, 1]
+    assert collector.exceptions[0] is first
+
+
+def test_limit_caps_kept_exceptions() -> None:
+    collector = CallbackExceptionCollector(limit=1)
+    collector.add(_key_error("a"))
+    collector.add(_raise(ValueError()))
+
+    assert len(collector.exceptions) == 1
+    assert len(collector.counts) == 2
+
+
+def test_aborts_after_threshold() -> None:
+    collector = CallbackExceptionCollector(abort_after=2)
+    collector.add(_key_error("a"))
+    assert not collector.aborted
+    collector.add(_key_error("a"))
+    assert collector.aborted
+
+    collector.clear()
+    assert not collector.aborted
+    assert not collector
+
+
+def test_summarizes_single_site_as_exception() -> None:
+    collector = CallbackExceptionCollector()
+    assert collector.summarize("nothing") is None
+
+    first = _key_error("a")
+    collector.add(first)
+    summary = collector.summarize("once")
+    assert isinstance(summary, CallbackException)
+    assert summary.__cause__ is first
+    assert not getattr(summary, "__notes__", None)
+
+    for key in "abc":
+        collector.add(_key_error(key))
+
+    summary = collector.summarize("thrice")
+    assert isinstance(summary, CallbackException)
+    assert "3x KeyError" in "\n".join(summary.__notes__)
+    assert not collector
+
+
+def test_summarizes_many_sites_as_group() -> None:
+    collector = CallbackExceptionCollector()
+    for _ in range(100):
+        collector.add(_key_error("a"))
+        collector.add(_raise(ValueError()))
+
+    summary = collector.summarize("many")
+    assert isinstance(summary, CallbackExceptionGroup)
+    assert len(summary.exceptions) == 2
+    notes = summary.__notes__
+    assert notes[0] == "200 exceptions from 2 sites, 2 kept:"
+    assert [note.split("x ", 1)[0].strip() for note in notes[1:]] == ["100", "100"]
+
+
+def test_rejects_invalid_arguments() -> None:
+    with pytest.raises(ValueError):
+        CallbackExceptionCollector(-1)
+
+    with pytest.raises(ValueError):
+        CallbackExceptionCollector(abort_after=0)
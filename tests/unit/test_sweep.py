@@ -0,0 +1,71 @@
+"""Unit tests for :mod:`libretro.sweep`."""
+
+from __future__ import annotations
+
+import io
+
+import pytest
+
+from libretro.sweep import (
+    SweepResult,
+    all_combinations,
+    format_results,
+    sample_combinations,
+    write_results,
+)
+
+SPACE = {"renderer": ("hw", "sw"), "scale": ("1x", "2x", "4x"), "frameskip": ("0", "1")}
+
+
+def test_all_combinations_is_the_cartesian_product() -> None:
+    combos = list(all_combinations(SPACE))
+
+    assert len(combos) == 12
+    assert combos[0] == {"renderer": "hw", "scale": "1x", "frameskip": "0"}
+    assert combos[-1] == {"renderer": "sw", "scale": "4x", "frameskip": "1"}
+    assert len({tuple(c.items()) for c in combos}) == 12
+
+
+def test_sample_combinations_is_a_reproducible_ordered_subset() -> None:
+    combos = list(all_combinations(SPACE))
+    sample = sample_combinations(SPACE, 5, seed=1234)
+
+    assert sample == sample_combinations(SPACE, 5, seed=1234)
+    assert len(sample) == 5
+    assert all(c in combos for c in sample)
+    assert sample == sorted(sample, key=combos.index)
+
+
+def test_sample_combinations_larger_than_space_returns_everything() -> None:
+    assert sample_combinations(SPACE, 100) == list(all_combinations(SPACE))
+
+
+def test_sample_combinations_handles_huge_spaces() -> None:
+    space = {f"option{i}": tuple(str(v) for v in range(10)) for i in range(30)}
+    sample = sample_combinations(space, 3, seed=0)
+
+    assert len(sample) == 3
+    assert all(list(c) == list(space) for c in sample)
+
+
+def test_sample_combinations_rejects_negative_count() -> None:
+    with pytest.raises(ValueError):
+        sample_combinations(SPACE, -1)
+
+
+def test_format_and_write_results() -> None:
+    results = [
+        SweepResult({"renderer": "hw"}, 60, 2_000_000, True),
+        SweepResult({"renderer": "sw"}, 0, 0, False, "RuntimeError: boom"),
+    ]
+
+    table = format_results(results)
+    assert "renderer" in table.splitlines()[0]
+    assert "FAIL {'renderer': 'sw'}: RuntimeError: boom" in table
+    assert table.endswith("1 passed, 1 failed")
+
+    file = io.StringIO(newline="")
+    write_results(results, file)
+    rows = file.getvalue().splitlines()
+    assert rows[0] == "renderer,passed,frames,duration_ns,restarted,error"
+    assert rows[1] == "hw,True,60,2000000,True,"